@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Vectorized Accretion/Dilution Engine
+Deal math from ProfessionalAccretionDilutionModel expressed as array functions
+
+Features:
+- Purchase price, financing, pro forma and accretion/dilution in one broadcast pass
+- Full grids over premium x cost synergies x consideration mix x interest rate
+- Closed-form breakeven cost synergies for every (premium, mix, rate) cell
+
+Grid results are shaped (premium, synergies, mix, rate). A mix is a
+(cash_pct, stock_pct, debt_pct) row; rows are normalized to 100% the same
+way _create_deal_structure normalizes a single mix.
+"""
+
+import numpy as np
+
+
+def _grid_axes(deal_structure, synergies, premiums, cost_synergies, mixes, interest_rates):
+    """Resolve grid axes, defaulting each to the base case"""
+
+    mix = deal_structure['consideration_mix']
+    premiums = np.atleast_1d(np.asarray(
+        premiums if premiums is not None else deal_structure['purchase_premium_pct'], dtype=float))
+    cost_synergies = np.atleast_1d(np.asarray(
+        cost_synergies if cost_synergies is not None else synergies['cost_synergies'], dtype=float))
+    mixes = np.atleast_2d(np.asarray(
+        mixes if mixes is not None else [mix['cash_pct'], mix['stock_pct'], mix['debt_pct']], dtype=float))
+    interest_rates = np.atleast_1d(np.asarray(
+        interest_rates if interest_rates is not None else deal_structure['financing']['interest_rate'], dtype=float))
+
+    mixes = mixes / mixes.sum(axis=1, keepdims=True)
+    return premiums, cost_synergies, mixes, interest_rates
+
+
+def accretion_dilution_grid(financial_inputs, deal_structure, synergies, premiums=None,
+                            cost_synergies=None, mixes=None, interest_rates=None):
+    """
+    Evaluate the full deal for every grid point at once.
+
+    Mirrors _calculate_purchase_price, _calculate_financing,
+    _calculate_proforma_financials and _calculate_accretion_dilution.
+    """
+
+    premiums, cost_synergies, mixes, interest_rates = _grid_axes(
+        deal_structure, synergies, premiums, cost_synergies, mixes, interest_rates)
+
+    buyer = financial_inputs['buyer']
+    seller = financial_inputs['seller']
+    tax_rate = deal_structure['financing']['tax_rate']
+
+    premium_g = premiums[:, None, None, None]
+    synergy_g = cost_synergies[None, :, None, None]
+    cash_g = mixes[None, None, :, 0, None]
+    stock_g = mixes[None, None, :, 1, None]
+    debt_g = mixes[None, None, :, 2, None]
+    rate_g = interest_rates[None, None, None, :]
+
+    # Purchase price & consideration
+    purchase_price = seller['market_cap'] * (1 + premium_g)
+    cash_consideration = purchase_price * cash_g
+    stock_consideration = purchase_price * stock_g
+    debt_consideration = purchase_price * debt_g
+    buyer_price = buyer['eps'] * buyer['pe_ratio']
+    shares_to_issue = stock_consideration / buyer_price if buyer['eps'] > 0 else np.zeros_like(stock_consideration)
+
+    # Financing
+    net_interest_expense = debt_consideration * rate_g * (1 - tax_rate)
+    foregone_interest_income = cash_consideration * rate_g * (1 - tax_rate)
+    net_financing_impact = net_interest_expense - foregone_interest_income
+
+    # Pro forma
+    synergies_impact = (synergies['revenue_synergies'] + synergy_g) * (1 - tax_rate)
+    one_time_impact = synergies['one_time_costs'] * (1 - tax_rate)
+    proforma_net_income = (buyer['net_income'] + seller['net_income'] + synergies_impact
+                           - net_financing_impact - one_time_impact)
+    proforma_shares = buyer['shares_outstanding'] + shares_to_issue
+    with np.errstate(divide='ignore', invalid='ignore'):
+        proforma_eps = np.where(proforma_shares > 0, proforma_net_income / proforma_shares, 0.0)
+
+    standalone_eps = buyer['eps']
+    accretion_dilution_pct = (proforma_eps - standalone_eps) / standalone_eps if standalone_eps != 0 else proforma_eps * 0
+
+    shape = np.broadcast(premium_g, synergy_g, cash_g, rate_g).shape
+    return {
+        'premiums': premiums,
+        'cost_synergies': cost_synergies,
+        'mixes': mixes,
+        'interest_rates': interest_rates,
+        'purchase_price': np.broadcast_to(purchase_price, shape),
+        'shares_to_issue': np.broadcast_to(shares_to_issue, shape),
+        'net_financing_impact': np.broadcast_to(net_financing_impact, shape),
+        'proforma_net_income': np.broadcast_to(proforma_net_income, shape),
+        'proforma_shares': np.broadcast_to(proforma_shares, shape),
+        'proforma_eps': np.broadcast_to(proforma_eps, shape),
+        'accretion_dilution_pct': np.broadcast_to(accretion_dilution_pct, shape),
+        'is_accretive': np.broadcast_to(accretion_dilution_pct > 0, shape)
+    }
+
+
+def breakeven_cost_synergies(financial_inputs, deal_structure, synergies, premiums=None,
+                             mixes=None, interest_rates=None):
+    """
+    Annual cost synergies at which pro forma EPS equals standalone EPS,
+    shaped (premium, mix, rate). Pro forma net income is linear in
+    synergies, so this is solved in closed form for every cell.
+    """
+
+    grid = accretion_dilution_grid(financial_inputs, deal_structure, synergies, premiums=premiums,
+                                   cost_synergies=[0.0], mixes=mixes, interest_rates=interest_rates)
+    tax_rate = deal_structure['financing']['tax_rate']
+
+    required_net_income = financial_inputs['buyer']['eps'] * grid['proforma_shares'][:, 0]
+    shortfall = required_net_income - grid['proforma_net_income'][:, 0]
+    return shortfall / (1 - tax_rate)
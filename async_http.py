@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Async HTTP - Non-blocking upstream access and executors for the async API server
+
+Features:
+- One pooled httpx.AsyncClient (keep-alive connections shared by every request)
+- Per-host concurrency limits, so hundreds of in-flight requests do not all
+  land on one upstream at once (SEC asks for at most 10 requests a second)
+- Blocking libraries (yfinance, SQLite) run on a bounded thread pool
+- CPU-heavy work (workbook builds) runs on a process pool
+- In-loop single flight: concurrent awaits of the same key share one task
+
+Without httpx, requests are made with `requests` on the thread pool, so
+callers see the same interface either way.
+
+Usage:
+    http = AsyncHTTP()
+    response = await http.get('https://finviz.com/quote.ashx?t=AAPL', headers=HEADERS)
+    info = await run_blocking(fetch_info, 'AAPL')
+    path = await run_cpu(build_workbook, company_data)
+"""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+IO_WORKERS = int(os.getenv('ASYNC_IO_WORKERS', '64'))
+CPU_WORKERS = int(os.getenv('MODEL_BUILD_WORKERS', str(os.cpu_count() or 2)))
+MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', '200'))
+PER_HOST_LIMIT = int(os.getenv('ASYNC_HTTP_PER_HOST', '8'))
+DEFAULT_TIMEOUT = 10.0
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    with _pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='async-io')
+        return _io_pool
+
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    global _cpu_pool
+    with _pool_lock:
+        if _cpu_pool is None:
+            # spawn: forking a process that runs an event loop and thread pools is not safe
+            _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _cpu_pool
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking call (network library, SQLite) on the shared thread pool.
+    The caller's context variables (e.g. the progress job) go with it.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_get_io_pool(), functools.partial(context.run, fn, *args, **kwargs))
+
+
+async def run_cpu(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run CPU-bound work on the process pool (fn and its arguments must be picklable)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_cpu_pool(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_executors(wait: bool = True):
+    """Stop the shared pools (server shutdown)."""
+    global _io_pool, _cpu_pool
+    with _pool_lock:
+        pools, _io_pool, _cpu_pool = (_io_pool, _cpu_pool), None, None
+    for pool in pools:
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+class AsyncHTTP:
+    """Pooled async HTTP client with a concurrency cap per upstream host."""
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS, per_host: int = PER_HOST_LIMIT,
+                 timeout: float = DEFAULT_TIMEOUT, transport: Any = None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._client = None
+        if HTTPX_AVAILABLE:
+            self._client = httpx.AsyncClient(
+                timeout=timeout, follow_redirects=True, transport=transport,
+                limits=httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections // 2))
+        self.stats = {'requests': 0, 'errors': 0}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None):
+        """
+        GET a URL without blocking the event loop. The response has
+        status_code, content, text and json() like a requests.Response.
+        """
+        self.stats['requests'] += 1
+        async with self._host_limit(url):
+            try:
+                if self._client is not None:
+                    return await self._client.get(url, headers=headers, timeout=timeout or self.timeout)
+                import requests
+                return await run_blocking(requests.get, url, headers=headers, timeout=timeout or self.timeout)
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+
+class AsyncSingleFlight:
+    """Concurrent awaits of the same key share one in-flight task."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {'leaders': 0, 'followers': 0}
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether a call for key is in flight (the next do() will join it)."""
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats['leaders'] += 1
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats['followers'] += 1
+        # shield: one caller disconnecting must not cancel the fetch the others wait on
+        return await asyncio.shield(task)
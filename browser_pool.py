@@ -0,0 +1,163 @@
+"""
+Bounded, lazily started pool of headless Chrome drivers for dynamic pages.
+
+Drivers are only launched when a dynamic page is actually requested, the
+pool never holds more than ``max_size`` browsers, and each driver is
+recycled after ``max_pages_per_driver`` page loads or as soon as it crashes.
+Images, fonts and stylesheets are blocked to keep page weight (and browser
+memory) down, since only the rendered HTML is needed.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable
+
+try:
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    HAS_SELENIUM = True
+except ImportError:
+    HAS_SELENIUM = False
+    WebDriverException = Exception
+
+# Resource patterns blocked in every browser (only the DOM is needed)
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*.css',
+    '*.mp4', '*.webm'
+]
+
+
+def create_chrome_driver(user_agent: str, block_resources: bool = True, page_load_timeout: int = 30):
+    """Launch a headless Chrome configured for lightweight scraping."""
+    if not HAS_SELENIUM:
+        raise RuntimeError("selenium is required for dynamic sources (pip install selenium)")
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument(f'user-agent={user_agent}')
+    if block_resources:
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.managed_default_content_settings.stylesheets': 2,
+            'profile.managed_default_content_settings.fonts': 2,
+        })
+
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.set_page_load_timeout(page_load_timeout)
+    if block_resources:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_PATTERNS})
+        except Exception as e:
+            logging.debug(f"Could not enable resource blocking via CDP: {e}")
+    return driver
+
+
+class BrowserPool:
+    """Thread-safe pool of reusable WebDriver instances."""
+
+    def __init__(self, driver_factory: Callable[[], object], max_size: int = 3,
+                 max_pages_per_driver: int = 50, wait_timeout: int = 10):
+        self.driver_factory = driver_factory
+        self.max_size = max_size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.wait_timeout = wait_timeout
+
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._page_counts = {}
+        self.stats = {'launched': 0, 'recycled': 0, 'crashed': 0, 'pages': 0}
+
+    @property
+    def size(self) -> int:
+        """Number of live drivers (idle or in use)."""
+        with self._lock:
+            return len(self._page_counts)
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver; it is returned to the pool (or recycled) afterwards."""
+        self._slots.acquire()
+        driver = None
+        failed = False
+        try:
+            driver = self._checkout()
+            yield driver
+        except WebDriverException:
+            failed = True
+            raise
+        finally:
+            if driver is not None:
+                self._checkin(driver, failed)
+            self._slots.release()
+
+    def fetch(self, url: str, retries: int = 1) -> str:
+        """Load a page in a pooled browser and return its rendered HTML."""
+        for attempt in range(retries + 1):
+            try:
+                with self.driver() as driver:
+                    driver.get(url)
+                    if HAS_SELENIUM:
+                        WebDriverWait(driver, self.wait_timeout).until(
+                            EC.presence_of_element_located((By.TAG_NAME, "body"))
+                        )
+                    return driver.page_source
+            except WebDriverException as e:
+                logging.warning(f"Browser failed on {url} (attempt {attempt + 1}): {e}")
+        return ""
+
+    def close(self) -> None:
+        """Quit every idle driver (drivers in use are quit when returned)."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            driver = self.driver_factory()
+            with self._lock:
+                self._page_counts[id(driver)] = 0
+                self.stats['launched'] += 1
+            return driver
+
+    def _checkin(self, driver, failed: bool) -> None:
+        with self._lock:
+            self._page_counts[id(driver)] = self._page_counts.get(id(driver), 0) + 1
+            self.stats['pages'] += 1
+            worn_out = self._page_counts[id(driver)] >= self.max_pages_per_driver
+
+        if failed:
+            self.stats['crashed'] += 1
+            self._discard(driver)
+        elif worn_out:
+            self.stats['recycled'] += 1
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def _discard(self, driver) -> None:
+        with self._lock:
+            self._page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.debug(f"Error quitting browser: {e}")
@@ -6,7 +6,7 @@ Check how many companies the system has data for
 import sys
 sys.path.append('financial-models-app/backend')
 from app import get_comprehensive_company_data
-import yfinance as yf
+import yfinance_gateway
 
 def check_company_coverage():
     """Check company data coverage"""
@@ -86,7 +86,7 @@ def check_company_coverage():
         
         try:
             # Quick test with yfinance first
-            stock = yf.Ticker(ticker)
+            stock = yfinance_gateway.ticker(ticker)
             info = stock.info
             
             if info and len(info) > 5:  # Valid data
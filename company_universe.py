@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+"""
+Company Universe - Column-wise, array-backed storage for thousands of companies
+
+Holds the same fields as the per-company dataclasses (`CompanyFinancials` in
+financial_data_manager.py, `FinancialData` in finmodai/data_ingestion.py)
+without one Python object per company.
+
+Features:
+- Schema read from the dataclass itself: float/int fields become typed NumPy
+  columns, low-cardinality strings (sector, industry, currency...) become
+  int32 category codes, names and tickers live in one UTF-8 buffer, List[float]
+  histories become (company x fiscal year) float matrices, nested dataclasses
+  (data_quality) are flattened into their own columns
+- A per-company validity bitmask (one bit per field) telling reported values
+  apart from missing ones; NaN (or None) marks a missing number. A float equal
+  to its dataclass default (the 0.0 an unset field keeps) is ingested as NaN,
+  since the record cannot tell it apart from a field nobody filled in
+- (ticker, year) indexing on a shared fiscal-year axis; histories are
+  right-aligned so the last list element is the company's latest fiscal year
+- Zero-copy views back to the per-company API: universe['AAPL'].revenue is a
+  view into the revenue matrix, universe['AAPL'].market_cap reads the column
+- Vectorized screens, cross-sections, growth rates and DataFrame export
+
+Usage:
+    universe = CompanyUniverse.from_records(manager.get_multiple_companies(tickers).values())
+    large_tech = universe.screen(sector='Technology', market_cap=(1e11, None))
+    print(large_tech.latest('revenue'), universe.value('revenue', 'AAPL', 2023))
+"""
+
+import dataclasses
+import math
+import typing
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# String fields that are (nearly) unique per company; every other str field is a category
+TEXT_FIELDS = {'ticker', 'corrected_ticker', 'company_name', 'last_updated'}
+DEFAULT_LAST_YEAR = datetime.now().year - 1
+
+FLOAT, INT, CATEGORY, TEXT, DATETIME, TAGS, SERIES, OBJECT = (
+    'float', 'int', 'category', 'text', 'datetime', 'tags', 'series', 'object')
+REQUIRED_DEFAULTS = {FLOAT: 0.0, INT: 0, CATEGORY: '', TEXT: ''}
+
+
+@dataclasses.dataclass(frozen=True)
+class UniverseField:
+    """One stored field: `name` is dotted for nested dataclass members (data_quality.overall_score)."""
+    name: str
+    kind: str
+    default: Any
+    path: Tuple[str, ...]
+
+
+def _strip_optional(annotation):
+    if typing.get_origin(annotation) is Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _field_default(field: dataclasses.Field) -> Any:
+    if field.default is not dataclasses.MISSING:
+        return field.default
+    if field.default_factory is not dataclasses.MISSING:
+        return field.default_factory()
+    return None
+
+
+def _field_kind(name: str, annotation) -> str:
+    annotation = _strip_optional(annotation)
+    origin = typing.get_origin(annotation)
+    if origin in (list, List):
+        (item,) = typing.get_args(annotation) or (Any,)
+        return SERIES if item in (float, int) else TAGS if item is str else OBJECT
+    if annotation is bool:
+        return OBJECT
+    if annotation is float:
+        return FLOAT
+    if annotation is int:
+        return INT
+    if annotation is str:
+        return TEXT if name in TEXT_FIELDS else CATEGORY
+    if annotation is datetime:
+        return DATETIME
+    return OBJECT
+
+
+class UniverseSchema:
+    """Flattened field layout of a company dataclass."""
+
+    def __init__(self, record_type: type):
+        if not dataclasses.is_dataclass(record_type):
+            raise TypeError(f"{record_type!r} is not a dataclass")
+        self.record_type = record_type
+        self.nested_types: Dict[Tuple[str, ...], type] = {}
+        self.fields: List[UniverseField] = []
+        self._collect(record_type, ())
+        self.by_name = {f.name: f for f in self.fields}
+        self.bits = {f.name: i for i, f in enumerate(self.fields)}
+        if 'ticker' not in self.by_name:
+            raise ValueError(f"{record_type.__name__} has no 'ticker' field to index companies by")
+
+    def _collect(self, record_type: type, prefix: Tuple[str, ...]):
+        hints = typing.get_type_hints(record_type)
+        for field in dataclasses.fields(record_type):
+            path = prefix + (field.name,)
+            annotation = _strip_optional(hints.get(field.name, Any))
+            if dataclasses.is_dataclass(annotation) and not prefix:
+                self.nested_types[path] = annotation
+                self._collect(annotation, path)
+                continue
+            kind = _field_kind(field.name, annotation)
+            default = _field_default(field)
+            if default is None and field.default is dataclasses.MISSING:
+                default = REQUIRED_DEFAULTS.get(kind)    # Required fields (FinancialData.company_name)
+            self.fields.append(UniverseField('.'.join(path), kind, default, path))
+
+    def of_kind(self, *kinds: str) -> List[UniverseField]:
+        return [f for f in self.fields if f.kind in kinds]
+
+
+def _is_reported(value: Any) -> bool:
+    """False for None, NaN and empty values; a numeric 0 is a reported value."""
+    if value is None:
+        return False
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    if isinstance(value, (str, list, tuple, np.ndarray)) and len(value) == 0:
+        return False
+    return True
+
+
+class _TextColumn:
+    """Append-only UTF-8 buffer with (start, end) offsets per row."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.spans = np.zeros((0, 2), dtype=np.int64)
+
+    def set(self, row: int, value: str):
+        data = value.encode('utf-8')
+        start = len(self.buffer)
+        self.buffer += data
+        self.spans[row] = (start, start + len(data))
+
+    def get(self, row: int) -> str:
+        start, end = self.spans[row]
+        return self.buffer[start:end].decode('utf-8')
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.spans.nbytes
+
+
+class CompanyView:
+    """
+    Per-company facade over one row of a CompanyUniverse. Scalar attributes
+    read (and write) the columns; histories are NumPy views into the series
+    matrices, so no data is copied. to_record() builds the original dataclass.
+    """
+
+    __slots__ = ('_universe', '_row')
+
+    def __init__(self, universe: 'CompanyUniverse', row: int):
+        object.__setattr__(self, '_universe', universe)
+        object.__setattr__(self, '_row', row)
+
+    def __getattr__(self, name: str):
+        universe = self._universe
+        if name in universe.schema.by_name:
+            return universe._get(self._row, name)
+        prefix = (name,)
+        if prefix in universe.schema.nested_types:
+            return universe._build_nested(self._row, prefix)
+        raise AttributeError(f"{universe.schema.record_type.__name__} has no field '{name}'")
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in self._universe.schema.by_name:
+            raise AttributeError(f"Cannot set '{name}' on a company view")
+        self._universe._set(self._row, name, value)
+
+    def __repr__(self) -> str:
+        return f"CompanyView({self.ticker!r}, row={self._row})"
+
+    @property
+    def last_year(self) -> int:
+        return int(self._universe._last_year[self._row])
+
+    def years(self, name: str) -> np.ndarray:
+        """Fiscal years matching the values of a history."""
+        values = self._universe._get(self._row, name)
+        return np.arange(self.last_year - len(values) + 1, self.last_year + 1)
+
+    def to_record(self):
+        return self._universe.record(self._row)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self.to_record())
+
+
+class CompanyUniverse:
+    """Column-wise store of company records with validity bits and (ticker, year) indexing."""
+
+    def __init__(self, record_type: type, years: Optional[Sequence[int]] = None):
+        self.schema = UniverseSchema(record_type)
+        self.rows: Dict[str, int] = {}
+        self._size = 0
+        self._words = (len(self.schema.fields) + 63) // 64
+
+        self._columns: Dict[str, np.ndarray] = {}
+        self._text: Dict[str, _TextColumn] = {}
+        self._objects: Dict[str, List[Any]] = {}
+        self.categories: Dict[str, List[str]] = {}
+        self._category_codes: Dict[str, Dict[str, int]] = {}
+        self.tags: Dict[str, List[str]] = {}
+
+        self.years = np.array(sorted(years) if years is not None else [], dtype=np.int16)
+        self._valid = np.zeros((0, self._words), dtype=np.uint64)
+        self._last_year = np.zeros(0, dtype=np.int16)
+
+        for field in self.schema.fields:
+            if field.kind == FLOAT:
+                self._columns[field.name] = np.zeros(0, dtype=np.float64)
+            elif field.kind == INT:
+                self._columns[field.name] = np.zeros(0, dtype=np.int64)
+            elif field.kind == CATEGORY:
+                self._columns[field.name] = np.zeros(0, dtype=np.int32)
+                self.categories[field.name] = []
+                self._category_codes[field.name] = {}
+            elif field.kind == DATETIME:
+                self._columns[field.name] = np.zeros(0, dtype='datetime64[us]')
+            elif field.kind == TAGS:
+                self._columns[field.name] = np.zeros(0, dtype=np.uint64)
+                self.tags[field.name] = []
+            elif field.kind == SERIES:
+                self._columns[field.name] = np.zeros((0, len(self.years)), dtype=np.float64)
+            elif field.kind == TEXT:
+                self._text[field.name] = _TextColumn()
+            else:
+                self._objects[field.name] = []
+
+    # ------------------------------------------------------------ building
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any], record_type: Optional[type] = None,
+                     last_years: Optional[Dict[str, int]] = None,
+                     default_last_year: int = DEFAULT_LAST_YEAR) -> 'CompanyUniverse':
+        """
+        Build a universe from dataclass records. Histories are read in list
+        order with the last element at the company's latest fiscal year:
+        last_years[ticker] when given, otherwise default_last_year.
+        """
+        records = list(records)
+        if record_type is None:
+            if not records:
+                raise ValueError("record_type is required for an empty universe")
+            record_type = type(records[0])
+        universe = cls(record_type)
+        universe.reserve(len(records))
+        last_years = last_years or {}
+        for record in records:
+            universe.add(record, last_years.get(str(record.ticker).upper(), default_last_year))
+        return universe
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, ticker: str) -> bool:
+        return str(ticker).upper() in self.rows
+
+    def __iter__(self) -> Iterator[CompanyView]:
+        return (CompanyView(self, row) for row in range(self._size))
+
+    def __getitem__(self, key: Union[str, int]) -> CompanyView:
+        return CompanyView(self, self.row(key))
+
+    def row(self, key: Union[str, int]) -> int:
+        if isinstance(key, (int, np.integer)):
+            if not 0 <= key < self._size:
+                raise IndexError(key)
+            return int(key)
+        try:
+            return self.rows[str(key).upper()]
+        except KeyError:
+            raise KeyError(f"{key} is not in the universe") from None
+
+    def reserve(self, capacity: int):
+        """Grow every column to hold at least `capacity` companies."""
+        if capacity <= len(self._last_year):
+            return
+        capacity = max(capacity, 2 * len(self._last_year), 16)
+        for name, column in self._columns.items():
+            fill = np.nan if column.dtype == np.float64 else 0
+            grown = np.full((capacity,) + column.shape[1:], fill, dtype=column.dtype)
+            if column.dtype.kind == 'M':
+                grown[:] = np.datetime64('NaT')
+            grown[:len(column)] = column
+            self._columns[name] = grown
+        for text in self._text.values():
+            grown = np.zeros((capacity, 2), dtype=np.int64)
+            grown[:len(text.spans)] = text.spans
+            text.spans = grown
+        valid = np.zeros((capacity, self._words), dtype=np.uint64)
+        valid[:len(self._valid)] = self._valid
+        self._valid = valid
+        last_year = np.zeros(capacity, dtype=np.int16)
+        last_year[:len(self._last_year)] = self._last_year
+        self._last_year = last_year
+
+    def _extend_years(self, first: int, last: int):
+        """Widen the shared fiscal-year axis (and every series matrix) to cover first..last."""
+        if len(self.years) and self.years[0] <= first and self.years[-1] >= last:
+            return
+        lo = min(first, int(self.years[0])) if len(self.years) else first
+        hi = max(last, int(self.years[-1])) if len(self.years) else last
+        offset = int(self.years[0]) - lo if len(self.years) else 0
+        for field in self.schema.of_kind(SERIES):
+            old = self._columns[field.name]
+            grown = np.full((old.shape[0], hi - lo + 1), np.nan)
+            grown[:, offset:offset + old.shape[1]] = old
+            self._columns[field.name] = grown
+        self.years = np.arange(lo, hi + 1, dtype=np.int16)
+
+    def add(self, record: Any, last_year: int = DEFAULT_LAST_YEAR) -> int:
+        """Insert or replace one company record; returns its row."""
+        ticker = str(record.ticker).upper()
+        row = self.rows.get(ticker)
+        if row is None:
+            row = self._size
+            self.reserve(row + 1)
+            self._size += 1
+            self.rows[ticker] = row
+        self._valid[row] = 0
+        self._last_year[row] = last_year
+
+        longest = max([len(getattr(record, f.name) or []) for f in self.schema.of_kind(SERIES)] + [1])
+        self._extend_years(last_year - longest + 1, last_year)
+
+        for field in self.schema.fields:
+            value = record
+            for part in field.path:
+                value = getattr(value, part, None) if value is not None else None
+            if field.kind == FLOAT and field.default is not None and value == field.default:
+                value = np.nan  # Left at the dataclass default: not reported
+            self._set(row, field.name, value)
+        return row
+
+    # ----------------------------------------------------- cell access
+
+    def _set_bit(self, row: int, name: str, on: bool):
+        word, bit = divmod(self.schema.bits[name], 64)
+        mask = np.uint64(1 << bit)
+        if on:
+            self._valid[row, word] |= mask
+        else:
+            self._valid[row, word] &= ~mask
+
+    def _category_code(self, name: str, value: str) -> int:
+        codes = self._category_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+        return code
+
+    def _set(self, row: int, name: str, value: Any):
+        field = self.schema.by_name[name]
+        reported = _is_reported(value)
+        self._set_bit(row, name, reported)
+        kind = field.kind
+
+        if kind in (FLOAT, INT):
+            self._columns[name][row] = value if reported else (np.nan if kind == FLOAT else 0)
+        elif kind == CATEGORY:
+            self._columns[name][row] = self._category_code(name, str(value)) if reported else -1
+        elif kind == TEXT:
+            self._text[name].set(row, str(value) if reported else '')
+        elif kind == DATETIME:
+            self._columns[name][row] = np.datetime64(value, 'us') if reported else np.datetime64('NaT')
+        elif kind == TAGS:
+            flags = 0
+            for tag in (value or []):
+                if tag not in self.tags[name]:
+                    if len(self.tags[name]) == 64:
+                        raise ValueError(f"'{name}' supports at most 64 distinct values")
+                    self.tags[name].append(tag)
+                flags |= 1 << self.tags[name].index(tag)
+            self._columns[name][row] = flags
+        elif kind == SERIES:
+            values = np.asarray(value if reported else [], dtype=np.float64)
+            end = int(self._last_year[row]) - int(self.years[0]) + 1 if len(self.years) else 0
+            if len(values) > end:
+                self._extend_years(int(self._last_year[row]) - len(values) + 1, int(self._last_year[row]))
+                end = int(self._last_year[row]) - int(self.years[0]) + 1
+            matrix = self._columns[name]
+            matrix[row] = np.nan
+            matrix[row, end - len(values):end] = values
+        else:
+            objects = self._objects[name]
+            objects.extend([None] * (row + 1 - len(objects)))
+            objects[row] = value
+
+    def _get(self, row: int, name: str):
+        field = self.schema.by_name[name]
+        kind = field.kind
+        if kind == SERIES:
+            matrix = self._columns[name]
+            end = int(self._last_year[row]) - int(self.years[0]) + 1 if len(self.years) else 0
+            present = np.flatnonzero(~np.isnan(matrix[row, :end]))
+            start = present[0] if len(present) else end
+            return matrix[row, start:end]
+        if not self.is_reported(row, name):
+            if kind == FLOAT and field.default is not None:
+                return float('nan')  # The missing marker, not the dataclass's 0.0
+            return [] if kind == TAGS else field.default
+        if kind == FLOAT:
+            return float(self._columns[name][row])
+        if kind == INT:
+            return int(self._columns[name][row])
+        if kind == CATEGORY:
+            return self.categories[name][self._columns[name][row]]
+        if kind == TEXT:
+            return self._text[name].get(row)
+        if kind == DATETIME:
+            return self._columns[name][row].item()
+        if kind == TAGS:
+            flags = int(self._columns[name][row])
+            return [tag for i, tag in enumerate(self.tags[name]) if flags >> i & 1]
+        return self._objects[name][row]
+
+    def is_reported(self, row: int, name: str) -> bool:
+        word, bit = divmod(self.schema.bits[name], 64)
+        return bool(int(self._valid[row, word]) >> bit & 1)
+
+    def _build_nested(self, row: int, prefix: Tuple[str, ...]):
+        nested_type = self.schema.nested_types[prefix]
+        kwargs = {f.path[-1]: self._record_value(row, f) for f in self.schema.fields
+                  if f.path[:-1] == prefix}
+        return nested_type(**kwargs)
+
+    def _record_value(self, row: int, field: UniverseField):
+        value = self._get(row, field.name)
+        if field.kind == SERIES:
+            return value.tolist() if len(value) else field.default
+        return value
+
+    def record(self, key: Union[str, int]):
+        """Materialize one company as its original dataclass."""
+        row = self.row(key)
+        kwargs = {}
+        for field in self.schema.fields:
+            if len(field.path) == 1:
+                kwargs[field.name] = self._record_value(row, field)
+        for prefix in self.schema.nested_types:
+            kwargs[prefix[0]] = self._build_nested(row, prefix)
+        return self.schema.record_type(**kwargs)
+
+    def to_records(self) -> List[Any]:
+        return [self.record(row) for row in range(self._size)]
+
+    def value(self, name: str, ticker: str, year: int) -> float:
+        """One history value by (ticker, fiscal year); NaN when not reported."""
+        row = self.row(ticker)
+        if not len(self.years) or not self.years[0] <= year <= min(self.years[-1], self._last_year[row]):
+            return float('nan')
+        return float(self._columns[name][row, year - int(self.years[0])])
+
+    # ------------------------------------------------- vectorized access
+
+    @property
+    def tickers(self) -> np.ndarray:
+        return np.array([self._text['ticker'].get(row) for row in range(self._size)], dtype=object)
+
+    def valid(self, name: str) -> np.ndarray:
+        """Boolean mask of companies that reported a field."""
+        word, bit = divmod(self.schema.bits[name], 64)
+        return (self._valid[:self._size, word] >> np.uint64(bit) & np.uint64(1)).astype(bool)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Column view (no copy) for numeric, datetime, category-code and tag
+        fields; decoded object array for text fields. Histories return the
+        latest value (see latest()).
+        """
+        field = self.schema.by_name[name]
+        if field.kind == SERIES:
+            return self.latest(name)
+        if field.kind == TEXT:
+            return np.array([self._text[name].get(row) for row in range(self._size)], dtype=object)
+        if field.kind == OBJECT:
+            return np.array(self._objects[name][:self._size] + [None] * (self._size - len(self._objects[name])),
+                            dtype=object)
+        return self._columns[name][:self._size]
+
+    def labels(self, name: str) -> np.ndarray:
+        """Decoded category values (None where not reported)."""
+        lookup = np.array(self.categories[name] + [None], dtype=object)
+        return lookup[self._columns[name][:self._size]]
+
+    def series(self, name: str, years: Optional[Sequence[int]] = None) -> np.ndarray:
+        """(company x year) matrix of a history; a view when years is None."""
+        matrix = self._columns[name][:self._size]
+        if years is None:
+            return matrix
+        columns = np.asarray(years) - int(self.years[0])
+        inside = (columns >= 0) & (columns < len(self.years))
+        result = np.full((self._size, len(columns)), np.nan)
+        result[:, inside] = matrix[:, columns[inside]]
+        return result
+
+    def cross_section(self, name: str, year: int) -> np.ndarray:
+        """Every company's value of a history for one fiscal year."""
+        return self.series(name, [year])[:, 0]
+
+    def latest(self, name: str, lag: int = 0) -> np.ndarray:
+        """Each company's history value at its own latest fiscal year (minus lag years)."""
+        if not len(self.years):
+            return np.full(self._size, np.nan)
+        columns = self._last_year[:self._size].astype(np.int64) - int(self.years[0]) - lag
+        inside = columns >= 0
+        result = np.full(self._size, np.nan)
+        rows = np.flatnonzero(inside)
+        result[rows] = self._columns[name][rows, columns[inside]]
+        return result
+
+    def growth(self, name: str, periods: int = 1) -> np.ndarray:
+        """Annualized growth of a history over `periods` years to each company's latest year."""
+        current, previous = self.latest(name), self.latest(name, lag=periods)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = (current / previous) ** (1.0 / periods) - 1.0
+        growth[~(previous > 0) | ~(current >= 0)] = np.nan
+        return growth
+
+    def mask(self, **conditions) -> np.ndarray:
+        """
+        Boolean screen over the universe. Each keyword is a field with one of:
+        a value (equality), a (low, high) range with None for open ends, a
+        list/set of allowed values or a callable taking the column. Histories
+        are screened on their latest values; unreported fields never match.
+        """
+        selected = np.ones(self._size, dtype=bool)
+        for name, condition in conditions.items():
+            field = self.schema.by_name.get(name)
+            if field is None:
+                raise KeyError(f"Unknown field '{name}'")
+            if field.kind == CATEGORY:
+                codes = self._columns[name][:self._size]
+                allowed = [condition] if isinstance(condition, str) else condition
+                if callable(allowed):
+                    selected &= np.asarray(allowed(self.labels(name)), dtype=bool)
+                    continue
+                wanted = [self._category_codes[name][v] for v in allowed if v in self._category_codes[name]]
+                selected &= np.isin(codes, wanted)
+                continue
+
+            values = self.column(name)
+            present = ~np.isnan(values) if field.kind == SERIES else self.valid(name)
+            if callable(condition):
+                hit = np.asarray(condition(values), dtype=bool)
+            elif isinstance(condition, tuple) and len(condition) == 2:
+                low, high = condition
+                hit = np.ones(self._size, dtype=bool)
+                if low is not None:
+                    hit &= values >= low
+                if high is not None:
+                    hit &= values <= high
+            elif isinstance(condition, (list, set, frozenset)):
+                hit = np.isin(values, list(condition))
+            else:
+                hit = values == condition
+            selected &= hit & present
+        return selected
+
+    def screen(self, **conditions) -> 'CompanyUniverse':
+        """Sub-universe of the companies matching mask(**conditions)."""
+        return self.subset(self.mask(**conditions))
+
+    def subset(self, selector: Union[np.ndarray, Iterable[str], Iterable[int]]) -> 'CompanyUniverse':
+        """Copy of the selected companies (boolean mask, rows or tickers)."""
+        selector = np.asarray(list(selector) if not isinstance(selector, np.ndarray) else selector)
+        if selector.dtype == bool:
+            rows = np.flatnonzero(selector)
+        elif selector.dtype.kind in 'iu':
+            rows = selector.astype(np.int64)
+        else:
+            rows = np.array([self.row(t) for t in selector], dtype=np.int64)
+
+        subset = CompanyUniverse(self.schema.record_type, self.years)
+        subset.reserve(len(rows))
+        subset._size = len(rows)
+        for name, column in self._columns.items():
+            subset._columns[name][:len(rows)] = column[rows]
+        for name in self.categories:
+            subset.categories[name] = list(self.categories[name])
+            subset._category_codes[name] = dict(self._category_codes[name])
+        for name in self.tags:
+            subset.tags[name] = list(self.tags[name])
+        for name, text in self._text.items():
+            for i, row in enumerate(rows):
+                subset._text[name].set(i, text.get(row))
+        for name, objects in self._objects.items():
+            subset._objects[name] = [objects[row] if row < len(objects) else None for row in rows]
+        subset._valid[:len(rows)] = self._valid[rows]
+        subset._last_year[:len(rows)] = self._last_year[rows]
+        tickers = {row: ticker for ticker, row in self.rows.items()}  # Upper-cased keys, as add() stores them
+        subset.rows = {tickers[row]: i for i, row in enumerate(rows)}
+        return subset
+
+    def to_frame(self, year: Optional[int] = None) -> pd.DataFrame:
+        """One row per company: scalar fields plus each history at `year` (default: latest)."""
+        data = {}
+        for field in self.schema.fields:
+            if field.kind == SERIES:
+                data[field.name] = self.latest(field.name) if year is None else self.cross_section(field.name, year)
+            elif field.kind == CATEGORY:
+                data[field.name] = self.labels(field.name)
+            elif field.kind == TAGS:
+                data[field.name] = [self._get(row, field.name) for row in range(self._size)]
+            else:
+                values = self.column(field.name)
+                if field.kind == INT:
+                    values = np.where(self.valid(field.name), values, field.default or 0)
+                data[field.name] = values
+        frame = pd.DataFrame(data)
+        frame['fiscal_year'] = self._last_year[:self._size] if year is None else year
+        return frame.set_index('ticker', drop=False)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays and text buffers (object fields and the ticker index excluded)."""
+        total = self._valid.nbytes + self._last_year.nbytes
+        total += sum(column.nbytes for column in self._columns.values())
+        total += sum(text.nbytes for text in self._text.values())
+        return total
@@ -15,6 +15,8 @@ from datetime import datetime
 from openpyxl import Workbook
 from urllib.parse import urljoin
 
+import finance_kernel
+
 def install_and_import(package, pip_name=None):
     """Auto-install missing packages."""
     pip_name = pip_name or package
@@ -50,6 +52,7 @@ try:
     import yfinance as yf
 except ImportError:
     yf = None
+import yfinance_gateway
 try:
     import gspread
     from google.oauth2.service_account import Credentials
@@ -79,7 +82,7 @@ def get_comprehensive_financials(ticker, years):
         print("yfinance not available")
         return {}
     try:
-        ticker_obj = yf.Ticker(ticker)
+        ticker_obj = yfinance_gateway.ticker(ticker)
         
         # Get financial statements
         fin = ticker_obj.financials.T
@@ -198,17 +201,12 @@ def calculate_terminal_value(final_fcf, wacc, growth_rate=TERMINAL_GROWTH):
     """Calculate terminal value using Gordon Growth Model."""
     return final_fcf * (1 + growth_rate) / (wacc - growth_rate)
 
-def discount_cash_flows(fcfs, terminal_value, wacc):
+def discount_cash_flows(fcfs, terminal_value, wacc, mid_year=False, stub=1.0):
     """Discount cash flows to present value."""
-    discounted_fcfs = []
-    for i, fcf in enumerate(fcfs):
-        pv = fcf / ((1 + wacc) ** (i + 1))
-        discounted_fcfs.append(round(pv, 2))
-    
-    # Discount terminal value
-    pv_terminal = terminal_value / ((1 + wacc) ** len(fcfs))
+    pv_fcfs, pv_terminal = finance_kernel.discount_cash_flows(fcfs, terminal_value, wacc, mid_year=mid_year, stub=stub)
+    discounted_fcfs = [round(pv, 2) for pv in pv_fcfs.tolist()]
     
-    return discounted_fcfs, round(pv_terminal, 2)
+    return discounted_fcfs, round(float(pv_terminal), 2)
 
 def calculate_equity_value(enterprise_value, total_debt, cash):
     """Calculate equity value from enterprise value."""
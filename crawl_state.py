@@ -0,0 +1,165 @@
+"""
+Persistent crawl state for the grant scraper.
+
+Each crawled URL (feed, source page or article) is recorded in a small SQLite
+database together with its HTTP validators (ETag / Last-Modified), a hash of
+the fetched content and the extraction result. Subsequent runs send
+conditional requests and reuse the stored result whenever the server answers
+304 Not Modified or the content hash is unchanged, so only new or edited
+pages are downloaded in full and re-extracted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_state (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    result TEXT,
+    fetched_at REAL NOT NULL,
+    changed_at REAL NOT NULL
+)
+"""
+
+
+def content_hash(content: Any) -> str:
+    """Stable SHA-256 hex digest of bytes, text or a JSON-serializable value."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    elif not isinstance(content, bytes):
+        content = json.dumps(content, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def _encode_result(result: Any) -> str:
+    def default(value):
+        if isinstance(value, datetime):
+            return {'__datetime__': value.isoformat()}
+        return str(value)
+    return json.dumps(result, default=default)
+
+
+def _decode_result(text: Optional[str]) -> Any:
+    if text is None:
+        return None
+
+    def hook(obj):
+        if set(obj) == {'__datetime__'}:
+            return datetime.fromisoformat(obj['__datetime__'])
+        return obj
+    return json.loads(text, object_hook=hook)
+
+
+class CrawlStateDB:
+    """SQLite-backed record of what was fetched, when, and what it produced."""
+
+    def __init__(self, path: str = 'crawl_state.db'):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.stats = {'not_modified': 0, 'unchanged': 0, 'changed': 0, 'fresh': 0, 'bytes': 0}
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored state for a URL, or None if never crawled."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, kind, etag, last_modified, content_hash, result, fetched_at, changed_at '
+                'FROM crawl_state WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ['url', 'kind', 'etag', 'last_modified', 'content_hash', 'result', 'fetched_at', 'changed_at']
+        state = dict(zip(keys, row))
+        state['result'] = _decode_result(state['result'])
+        return state
+
+    def is_fresh(self, url: str, max_age: float) -> bool:
+        """True if the URL was fetched within the last max_age seconds."""
+        state = self.get(url)
+        return state is not None and time.time() - state['fetched_at'] < max_age
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a previously seen URL."""
+        state = self.get(url)
+        headers = {}
+        if state:
+            if state['etag']:
+                headers['If-None-Match'] = state['etag']
+            if state['last_modified']:
+                headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def record(self, url: str, kind: str, result: Any, etag: Optional[str] = None,
+               last_modified: Optional[str] = None, digest: Optional[str] = None) -> None:
+        """Store a fresh fetch and its extraction result."""
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                'SELECT content_hash, changed_at FROM crawl_state WHERE url = ?', (url,)
+            ).fetchone()
+            changed_at = previous[1] if previous and digest and previous[0] == digest else now
+            self._conn.execute(
+                'INSERT OR REPLACE INTO crawl_state '
+                '(url, kind, etag, last_modified, content_hash, result, fetched_at, changed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, kind, etag, last_modified, digest, _encode_result(result), now, changed_at)
+            )
+            self._conn.commit()
+
+    def touch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Mark an unchanged URL as checked now (keeping validators up to date)."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE crawl_state SET fetched_at = ?, etag = COALESCE(?, etag), '
+                'last_modified = COALESCE(?, last_modified) WHERE url = ?',
+                (time.time(), etag, last_modified, url)
+            )
+            self._conn.commit()
+
+    def conditional_get(self, session: 'requests.Session', url: str,
+                        **kwargs) -> Tuple[Optional['requests.Response'], Optional[Dict[str, Any]]]:
+        """
+        Fetch a URL with validators from the previous crawl.
+
+        Returns (response, state). response is None when the server answered
+        304 Not Modified; state is the stored state (None if never crawled).
+        """
+        state = self.get(url)
+        headers = dict(kwargs.pop('headers', {}) or {})
+        headers.update(self.conditional_headers(url))
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and state is not None:
+            self.stats['not_modified'] += 1
+            self.touch(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return None, state
+
+        self.stats['bytes'] += len(response.content or b'')
+        return response, state
+
+    def counts(self) -> Dict[str, int]:
+        """Number of stored URLs per kind."""
+        with self._lock:
+            rows = self._conn.execute('SELECT kind, COUNT(*) FROM crawl_state GROUP BY kind').fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
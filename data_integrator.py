@@ -6,13 +6,13 @@ Combines data from multiple sources: Yahoo Finance, Finviz, SEC, MacroTrends, Ti
 
 import sys
 import os
-import json
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import yfinance as yf
+import yfinance_gateway
+from serialization import write_file
 import time
 import random
 from typing import Dict, List, Optional, Any
@@ -120,21 +120,25 @@ class ComprehensiveDataIntegrator:
     def _collect_yfinance_data(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Collect data from Yahoo Finance"""
         try:
-            ticker_obj = yf.Ticker(ticker)
+            # All six datasets fetched concurrently through the shared gateway
+            data = yfinance_gateway.get_gateway().statements(
+                ticker, ['info', 'financials', 'balance_sheet', 'cashflow',
+                         'recommendations', 'institutional_holders'])
+            info = data['info']
+            if info is None:
+                raise ValueError("no company info returned")
 
-            # Get basic info
-            info = ticker_obj.info
+            def frame(name: str) -> pd.DataFrame:
+                return data[name] if data[name] is not None else pd.DataFrame()
 
             # Get financial statements (last 4 years)
-            financials = ticker_obj.financials.T.head(4) if not ticker_obj.financials.empty else pd.DataFrame()
-            balance_sheet = ticker_obj.balance_sheet.T.head(4) if not ticker_obj.balance_sheet.empty else pd.DataFrame()
-            cash_flow = ticker_obj.cashflow.T.head(4) if not ticker_obj.cashflow.empty else pd.DataFrame()
+            financials = frame('financials').T.head(4)
+            balance_sheet = frame('balance_sheet').T.head(4)
+            cash_flow = frame('cashflow').T.head(4)
 
-            # Get analyst recommendations
-            recommendations = ticker_obj.recommendations if hasattr(ticker_obj, 'recommendations') else pd.DataFrame()
-
-            # Get institutional holders
-            institutional_holders = ticker_obj.institutional_holders if hasattr(ticker_obj, 'institutional_holders') else pd.DataFrame()
+            # Get analyst recommendations and institutional holders
+            recommendations = frame('recommendations')
+            institutional_holders = frame('institutional_holders')
 
             return {
                 'info': info,
@@ -420,14 +424,16 @@ class ComprehensiveDataIntegrator:
         return cleaned
 
     def export_integrated_data(self, data: Dict[str, Any], filename: str = None) -> str:
-        """Export integrated data to JSON file"""
+        """Export integrated data (JSON by default; .msgpack filenames are written as msgpack)"""
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             ticker = data['company_info'].get('ticker', 'unknown')
             filename = f"integrated_data_{ticker}_{timestamp}.json"
 
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        if filename.endswith('.msgpack'):
+            write_file(filename, data, schema='integrated_data')
+        else:
+            write_file(filename, data, format='fast_json', pretty=True)
 
         print(f"💾 Integrated data exported to {filename}")
         return filename
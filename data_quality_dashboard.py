@@ -10,6 +10,7 @@ Features:
 - Performance tracking
 - Risk assessment
 - Visual reports and recommendations
+- Batch scoring of whole universes with an indexed, incremental quality store
 """
 
 import pandas as pd
@@ -19,17 +20,22 @@ from typing import Dict, List, Any, Optional
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from collections import deque
 
 from financial_data_manager import FinancialDataManager
 from data_models import ValuationMethod, ModelOutputs
+from data_quality_scoring import QualityStore, score_incremental
+
+QUALITY_HISTORY_LIMIT = 1000  # In-memory reports kept; the quality store holds the full history
 
 
 class DataQualityDashboard:
     """Comprehensive dashboard for monitoring data quality across financial models."""
 
-    def __init__(self):
+    def __init__(self, quality_db_path: str = 'data_quality.db'):
         self.data_manager = FinancialDataManager()
-        self.quality_history = []
+        self.quality_store = QualityStore(quality_db_path)
+        self.quality_history = deque(maxlen=QUALITY_HISTORY_LIMIT)
         self.model_performance = {}
         self.source_reliability = {}
 
@@ -90,6 +96,38 @@ class DataQualityDashboard:
 
         return report
 
+    def score_universe(self, tickers: List[str], force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Score many companies in one vectorized pass.
+
+        Only tickers whose financial data changed since their last stored score
+        are re-scored (all of them with force=True); the rest reuse the
+        stored report. Results are persisted in the quality store.
+
+        Args:
+            tickers: Company ticker symbols
+            force: Re-score every ticker
+
+        Returns:
+            Quality reports (same format as analyze_company_data_quality)
+        """
+        print(f"🔍 Scoring data quality for {len(tickers)} companies...")
+
+        companies = []
+        for ticker in tickers:
+            try:
+                company_data = self.data_manager.get_company_financials(ticker, years=5)
+                if company_data.company_name:
+                    companies.append(company_data)
+                else:
+                    print(f"   ⚠️ No data available for {ticker}")
+            except Exception as e:
+                print(f"   ⚠️ Error retrieving {ticker}: {e}")
+
+        reports = score_incremental(companies, self.quality_store, force=force)
+        self.quality_history.extend(reports)
+        return reports
+
     def _calculate_completeness_score(self, company_data) -> float:
         """Calculate data completeness score (0-100)."""
         metrics_to_check = [
@@ -277,14 +315,7 @@ class DataQualityDashboard:
         """Generate a comprehensive quality report for multiple companies."""
         print(f"📊 Generating quality report for {len(tickers)} companies...")
 
-        reports = []
-        for ticker in tickers:
-            try:
-                report = self.analyze_company_data_quality(ticker)
-                if 'error' not in report:
-                    reports.append(report)
-            except Exception as e:
-                print(f"   ⚠️ Error analyzing {ticker}: {e}")
+        reports = self.score_universe(tickers)
 
         if not reports:
             return "No valid reports generated"
@@ -343,21 +374,14 @@ COMPANY DETAILS:
         print("📊 Creating quality visualization...")
 
         # Collect data
-        quality_data = []
-        for ticker in tickers:
-            try:
-                report = self.analyze_company_data_quality(ticker)
-                if 'error' not in report:
-                    quality_data.append({
-                        'ticker': ticker,
-                        'company': report['company_name'][:15],  # Truncate long names
-                        'quality_score': report['overall_quality_score'],
-                        'completeness': report['completeness_score'],
-                        'consistency': report['consistency_score'],
-                        'sources': len(report['data_sources_used'])
-                    })
-            except:
-                continue
+        quality_data = [{
+            'ticker': report['ticker'],
+            'company': report['company_name'][:15],  # Truncate long names
+            'quality_score': report['overall_quality_score'],
+            'completeness': report['completeness_score'],
+            'consistency': report['consistency_score'],
+            'sources': len(report['data_sources_used'])
+        } for report in self.score_universe(tickers)]
 
         if not quality_data:
             print("❌ No data available for visualization")
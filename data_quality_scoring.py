@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Batch Data Quality Scoring
+Vectorized version of the DataQualityDashboard scores plus a persistent quality index
+
+Features:
+- Columnar financials table built once from CompanyFinancials objects
+- Completeness, consistency, source quality and overall scores for a whole
+  universe in one pass (same rules as the per-company dashboard methods)
+- SQLite quality store indexed by (ticker, scored_at) with a data hash per
+  score, so only tickers whose data changed are re-scored
+"""
+
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Metrics counted for completeness (list metrics need a non-zero value)
+COMPLETENESS_LIST_METRICS = ['revenue', 'ebitda', 'net_income', 'total_assets',
+                             'total_debt', 'operating_cash_flow']
+COMPLETENESS_SCALAR_METRICS = ['market_cap', 'beta', 'pe_ratio']
+
+SOURCE_SCORES = {
+    'alpha_vantage': 95,
+    'finnhub': 90,
+    'yahoo_finance': 80,
+    'sec_edgar': 98
+}
+DEFAULT_SOURCE_SCORE = 70
+
+SCORE_WEIGHTS = {
+    'completeness': 0.4,
+    'consistency': 0.3,
+    'source_quality': 0.2,
+    'source_diversity': 0.1
+}
+
+
+def _first(values) -> float:
+    if values and values[0] is not None:
+        return float(values[0])
+    return np.nan
+
+
+def _source_key(source: str) -> str:
+    return source.lower().replace(' ', '_')
+
+
+def data_hash(company_data) -> str:
+    """Hash of every field the quality scores depend on."""
+    payload = {name: getattr(company_data, name)
+               for name in COMPLETENESS_LIST_METRICS + COMPLETENESS_SCALAR_METRICS + ['roe', 'company_name']}
+    payload['sources'] = list(company_data.data_quality.sources_used or [])
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def financials_table(companies: Iterable) -> pd.DataFrame:
+    """One row per CompanyFinancials with the columns the scorer needs."""
+    rows = []
+    for company in companies:
+        row = {
+            'ticker': company.ticker,
+            'company_name': company.company_name,
+            'data_hash': data_hash(company),
+            'revenue_0': _first(company.revenue),
+            'ebitda_0': _first(company.ebitda),
+            'net_income_0': _first(company.net_income),
+            'total_debt_0': _first(company.total_debt),
+            'total_assets_0': _first(company.total_assets),
+            'revenue_years': len(company.revenue or []),
+            'ebitda_years': len(company.ebitda or []),
+            'market_cap': company.market_cap or 0.0,
+            'roe': company.roe or 0.0,
+            'sources_used': list(company.data_quality.sources_used or []),
+            'data_freshness_hours': company.data_quality.data_freshness_hours,
+            'confidence_level': company.data_quality.confidence_level,
+            'cross_validation_score': company.data_quality.cross_validation_score
+        }
+        for metric in COMPLETENESS_LIST_METRICS:
+            values = getattr(company, metric)
+            row[f'has_{metric}'] = bool(values) and any(v is not None and v != 0 for v in values)
+        for metric in COMPLETENESS_SCALAR_METRICS:
+            value = getattr(company, metric)
+            row[f'has_{metric}'] = value is not None and value != 0
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def score_quality_table(table: pd.DataFrame) -> pd.DataFrame:
+    """Add completeness/consistency/source/overall score columns to a financials table."""
+    scored = table.copy()
+    if scored.empty:
+        return scored
+
+    # Completeness (0-100): available metrics plus history bonus
+    has_columns = [f'has_{m}' for m in COMPLETENESS_LIST_METRICS + COMPLETENESS_SCALAR_METRICS]
+    completeness = scored[has_columns].sum(axis=1).to_numpy(dtype=float) / len(has_columns) * 100
+    completeness += np.where(scored['revenue_years'] > 1, 10, 0) + np.where(scored['ebitda_years'] > 1, 10, 0)
+    scored['completeness_score'] = np.minimum(100, completeness)
+
+    # Consistency (0-100): mean of whichever checks are possible, else neutral 50
+    revenue, ebitda = scored['revenue_0'].to_numpy(), scored['ebitda_0'].to_numpy()
+    debt, assets = scored['total_debt_0'].to_numpy(), scored['total_assets_0'].to_numpy()
+    net_income, roe = scored['net_income_0'].to_numpy(), scored['roe'].to_numpy(dtype=float)
+    equity_estimate = scored['market_cap'].to_numpy(dtype=float) * 0.6
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margin = ebitda / revenue
+        margin_check = np.where((margin >= -0.5) & (margin <= 0.5), 1.0, 0.5)
+        margin_valid = ~np.isnan(ebitda) & (revenue > 0)
+
+        debt_ratio = debt / assets
+        debt_check = np.where((debt_ratio >= 0) & (debt_ratio <= 0.9), 1.0, 0.7)
+        debt_valid = ~np.isnan(debt) & (assets > 0)
+
+        reported_roe = roe / 100
+        roe_gap = np.abs(net_income / equity_estimate - reported_roe) / np.abs(reported_roe)
+        roe_check = np.where(roe_gap < 0.2, 1.0, 0.8)
+        roe_valid = ~np.isnan(net_income) & (roe != 0) & (equity_estimate > 0)
+
+    checks = np.stack([margin_check, debt_check, roe_check])
+    valid = np.stack([margin_valid, debt_valid, roe_valid])
+    n_checks = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        consistency = np.where(n_checks > 0, (checks * valid).sum(axis=0) / n_checks * 100, 50.0)
+    scored['consistency_score'] = consistency
+
+    # Source quality and diversity
+    source_lists = scored['sources_used']
+    counts = source_lists.map(len).to_numpy()
+    source_quality = [[SOURCE_SCORES.get(_source_key(s), DEFAULT_SOURCE_SCORE) for s in sources]
+                      for sources in source_lists]
+    scored['average_source_score'] = [sum(q) / len(q) if q else 0 for q in source_quality]
+    scored['best_source'] = [sources[q.index(max(q))] if q else None
+                             for sources, q in zip(source_lists, source_quality)]
+    scored['source_diversity_score'] = np.where(counts > 0, np.minimum(20, counts * 5), 0)
+    scored['total_sources'] = counts
+
+    overall = (scored['completeness_score'] * SCORE_WEIGHTS['completeness'] +
+               scored['consistency_score'] * SCORE_WEIGHTS['consistency'] +
+               scored['average_source_score'] * SCORE_WEIGHTS['source_quality'] +
+               scored['source_diversity_score'] * SCORE_WEIGHTS['source_diversity'])
+    scored['overall_quality_score'] = overall.to_numpy().round(1)
+
+    scored['recommendations'] = [
+        quality_recommendations(c, k, sources)
+        for c, k, sources in zip(scored['completeness_score'], scored['consistency_score'], source_lists)
+    ]
+    return scored
+
+
+def quality_recommendations(completeness: float, consistency: float, sources_used: List[str]) -> List[str]:
+    """Actionable recommendations (same rules as the dashboard)."""
+    recommendations = []
+
+    if completeness < 70:
+        recommendations.append("Consider using additional data sources to fill gaps")
+        if len(sources_used) < 2:
+            recommendations.append("Add more data sources for better completeness")
+
+    if consistency < 80:
+        recommendations.append("Review financial relationships for potential data inconsistencies")
+        recommendations.append("Cross-validate key ratios with industry benchmarks")
+
+    if 'alpha_vantage' not in [_source_key(s) for s in sources_used]:
+        recommendations.append("Consider adding Alpha Vantage for higher quality data")
+
+    if len(sources_used) < 2:
+        recommendations.append("Use multiple data sources for better validation")
+
+    if completeness > 90 and consistency > 90:
+        recommendations.append("Excellent data quality - proceed with confidence")
+
+    return recommendations
+
+
+def scored_reports(scored: pd.DataFrame, analysis_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Dashboard-format report dicts from a scored table."""
+    analysis_date = analysis_date or datetime.now()
+    reports = []
+    for row in scored.to_dict('records'):
+        reports.append({
+            'ticker': row['ticker'],
+            'company_name': row['company_name'],
+            'analysis_date': analysis_date,
+            'overall_quality_score': float(row['overall_quality_score']),
+            'completeness_score': float(row['completeness_score']),
+            'consistency_score': float(row['consistency_score']),
+            'source_analysis': {
+                'sources_used': row['sources_used'],
+                'average_source_score': row['average_source_score'],
+                'best_source': row['best_source'] if isinstance(row['best_source'], str) else None,
+                'source_diversity_score': int(row['source_diversity_score']),
+                'total_sources': int(row['total_sources'])
+            },
+            'recommendations': row['recommendations'],
+            'data_freshness_hours': row['data_freshness_hours'],
+            'confidence_level': row['confidence_level'],
+            'data_sources_used': row['sources_used'],
+            'cross_validation_score': row['cross_validation_score'],
+            'data_hash': row['data_hash']
+        })
+    return reports
+
+
+class QualityStore:
+    """SQLite store of quality scores, indexed by ticker and time."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS quality_scores (
+        ticker TEXT NOT NULL,
+        scored_at TEXT NOT NULL,
+        data_hash TEXT NOT NULL,
+        overall_quality_score REAL,
+        completeness_score REAL,
+        consistency_score REAL,
+        report TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_quality_ticker_time ON quality_scores (ticker, scored_at);
+    CREATE INDEX IF NOT EXISTS idx_quality_overall ON quality_scores (overall_quality_score);
+    """
+
+    def __init__(self, db_path: str = 'data_quality.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(self.SCHEMA)
+
+    def record(self, reports: List[Dict[str, Any]]):
+        """Append scored reports."""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO quality_scores VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(r['ticker'], r['analysis_date'].isoformat(), r['data_hash'], r['overall_quality_score'],
+                  r['completeness_score'], r['consistency_score'], json.dumps(r, default=str))
+                 for r in reports])
+
+    def latest(self, tickers: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Most recent report per ticker."""
+        query = """
+            SELECT q.ticker, q.report FROM quality_scores q
+            JOIN (SELECT ticker, MAX(scored_at) AS scored_at FROM quality_scores GROUP BY ticker) m
+              ON q.ticker = m.ticker AND q.scored_at = m.scored_at
+        """
+        params = []
+        if tickers is not None:
+            query += f" WHERE q.ticker IN ({','.join('?' * len(tickers))})"
+            params = list(tickers)
+        latest = {}
+        for ticker, report in self.conn.execute(query, params):
+            report = json.loads(report)
+            report['analysis_date'] = datetime.fromisoformat(report['analysis_date'])
+            latest[ticker] = report
+        return latest
+
+    def history(self, ticker: str, limit: int = 30) -> pd.DataFrame:
+        """Score history for one ticker, newest first."""
+        return pd.read_sql_query(
+            'SELECT scored_at, overall_quality_score, completeness_score, consistency_score, data_hash '
+            'FROM quality_scores WHERE ticker = ? ORDER BY scored_at DESC LIMIT ?',
+            self.conn, params=(ticker, limit))
+
+    def close(self):
+        self.conn.close()
+
+
+def score_incremental(companies: Iterable, store: QualityStore,
+                      force: bool = False) -> List[Dict[str, Any]]:
+    """
+    Score companies, reusing stored scores for tickers whose data hash is
+    unchanged. Returns reports in input order.
+    """
+    table = financials_table(companies)
+    if table.empty:
+        return []
+
+    previous = {} if force else store.latest(table['ticker'].tolist())
+    changed = np.array([previous.get(ticker, {}).get('data_hash') != digest
+                        for ticker, digest in zip(table['ticker'], table['data_hash'])])
+
+    fresh = scored_reports(score_quality_table(table[changed]))
+    store.record(fresh)
+
+    by_ticker = {report['ticker']: report for report in fresh}
+    return [by_ticker.get(ticker) or previous[ticker] for ticker in table['ticker']]
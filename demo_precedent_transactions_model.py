@@ -5,6 +5,17 @@ Shows how to use the Professional Precedent Transactions Model with different in
 """
 
 from professional_precedent_transactions_model import ProfessionalPrecedentTransactionsModel
+from precedent_deal_store import load_sample_store
+
+_store = None
+
+
+def _deal_store():
+    """Sample precedent deals, loaded once into an in-memory deal store"""
+    global _store
+    if _store is None:
+        _store = load_sample_store()
+    return _store
 
 def demo_technology_mergers():
     """Demo: Technology Sector Precedent Transactions"""
@@ -23,15 +34,9 @@ def demo_technology_mergers():
         target_net_debt=150.0,      # $150M net debt
         target_shares_outstanding=60.0,  # 60M shares
 
-        # Precedent Technology Deals
-        deal_dates=["2023-01-15", "2023-03-22", "2023-06-10", "2023-09-05", "2023-11-28"],
-        acquirers=["BigTech Corp", "Global Tech Inc", "Mega Soft Ltd", "TechGiant Corp", "Cloud Systems Inc"],
-        targets=["SaaS Startup Inc", "Data Analytics Corp", "AI Platform Ltd", "DevTools Inc", "Cloud Services Co"],
-        equity_values=[800.0, 1200.0, 600.0, 1500.0, 900.0],      # $M
-        enterprise_values=[920.0, 1380.0, 690.0, 1725.0, 1035.0], # $M
-        deal_revenues=[400.0, 600.0, 300.0, 750.0, 450.0],        # $M
-        deal_ebitdas=[120.0, 180.0, 90.0, 225.0, 135.0],          # $M
-        deal_net_incomes=[80.0, 120.0, 60.0, 150.0, 90.0]         # $M
+        # Precedent Technology deals from the deal store
+        deal_store=_deal_store(),
+        deal_filters={'sector': 'Technology'}
     )
 
     return results, excel_file
@@ -53,15 +58,9 @@ def demo_manufacturing_acquisitions():
         target_net_debt=240.0,      # $240M net debt
         target_shares_outstanding=40.0,  # 40M shares
 
-        # Precedent Manufacturing Deals
-        deal_dates=["2022-08-15", "2022-11-22", "2023-02-10", "2023-05-05", "2023-08-28"],
-        acquirers=["AutoGiant Corp", "MetalWorks Inc", "Chemicals Plus", "Equipment Mfg", "Indust Supply"],
-        targets=["Parts Supplier Inc", "Steel Producer Corp", "Chemical Plant Ltd", "Machinery Inc", "Components Co"],
-        equity_values=[500.0, 750.0, 400.0, 1000.0, 600.0],       # $M
-        enterprise_values=[650.0, 975.0, 520.0, 1300.0, 780.0],   # $M
-        deal_revenues=[300.0, 450.0, 250.0, 600.0, 350.0],        # $M
-        deal_ebitdas=[60.0, 90.0, 50.0, 120.0, 70.0],             # $M
-        deal_net_incomes=[40.0, 60.0, 35.0, 80.0, 45.0]           # $M
+        # Precedent Industrials deals from the deal store
+        deal_store=_deal_store(),
+        deal_filters={'sector': 'Industrials'}
     )
 
     return results, excel_file
@@ -83,15 +82,9 @@ def demo_consumer_retail_deals():
         target_net_debt=500.0,      # $500M net debt
         target_shares_outstanding=50.0,  # 50M shares
 
-        # Precedent Retail Deals
-        deal_dates=["2022-06-15", "2022-09-22", "2023-01-10", "2023-04-05", "2023-07-28"],
-        acquirers=["Fashion Retail", "Home Goods Inc", "Sports Store", "Electronics Plus", "Department Store"],
-        targets=["Boutique Chain Inc", "Decor Store Corp", "Sporting Goods Ltd", "Gadget Shop Inc", "Clothing Co"],
-        equity_values=[400.0, 600.0, 300.0, 750.0, 450.0],        # $M
-        enterprise_values=[500.0, 750.0, 375.0, 937.5, 562.5],    # $M
-        deal_revenues=[800.0, 1200.0, 600.0, 1500.0, 900.0],      # $M
-        deal_ebitdas=[80.0, 120.0, 60.0, 150.0, 90.0],            # $M
-        deal_net_incomes=[50.0, 75.0, 40.0, 95.0, 55.0]           # $M
+        # Precedent Consumer Retail deals from the deal store
+        deal_store=_deal_store(),
+        deal_filters={'sector': 'Consumer Retail'}
     )
 
     return results, excel_file
@@ -113,15 +106,9 @@ def demo_healthcare_mergers():
         target_net_debt=360.0,      # $360M net debt
         target_shares_outstanding=50.0,  # 50M shares
 
-        # Precedent Healthcare Deals
-        deal_dates=["2022-07-15", "2022-10-22", "2023-03-10", "2023-06-05", "2023-09-28"],
-        acquirers=["HealthSys Corp", "Clinic Group Inc", "MedTech Corp", "Pharma Services", "Health Systems"],
-        targets=["Specialty Clinic Inc", "Medical Practice Corp", "Device Company Ltd", "Pharma Dist Inc", "Hospital Chain"],
-        equity_values=[600.0, 900.0, 450.0, 1125.0, 675.0],       # $M
-        enterprise_values=[750.0, 1125.0, 562.5, 1406.25, 843.75], # $M
-        deal_revenues=[400.0, 600.0, 300.0, 750.0, 450.0],        # $M
-        deal_ebitdas=[80.0, 120.0, 60.0, 150.0, 90.0],            # $M
-        deal_net_incomes=[60.0, 90.0, 45.0, 112.5, 67.5]          # $M
+        # Precedent Healthcare deals from the deal store
+        deal_store=_deal_store(),
+        deal_filters={'sector': 'Healthcare'}
     )
 
     return results, excel_file
@@ -143,15 +130,9 @@ def demo_energy_acquisitions():
         target_net_debt=720.0,      # $720M net debt
         target_shares_outstanding=50.0,  # 50M shares
 
-        # Precedent Energy Deals
-        deal_dates=["2022-05-15", "2022-08-22", "2022-12-10", "2023-03-05", "2023-06-28"],
-        acquirers=["Oil & Gas Inc", "Pipeline Corp", "Refinery Ltd", "Exploration Co", "Energy Services"],
-        targets=["Shale Producer Inc", "Pipeline Assets Corp", "Refinery Complex Ltd", "Oil Field Inc", "Drilling Co"],
-        equity_values=[800.0, 1200.0, 600.0, 1500.0, 900.0],      # $M
-        enterprise_values=[1400.0, 2100.0, 1050.0, 2625.0, 1575.0], # $M
-        deal_revenues=[600.0, 900.0, 450.0, 1125.0, 675.0],       # $M
-        deal_ebitdas=[120.0, 180.0, 90.0, 225.0, 135.0],          # $M
-        deal_net_incomes=[80.0, 120.0, 60.0, 150.0, 90.0]         # $M
+        # Precedent Energy deals from the deal store
+        deal_store=_deal_store(),
+        deal_filters={'sector': 'Energy'}
     )
 
     return results, excel_file
@@ -173,15 +154,9 @@ def demo_large_cap_mergers():
         target_net_debt=1000.0,     # $1B net debt
         target_shares_outstanding=100.0,  # 100M shares
 
-        # Precedent Large Cap Deals
-        deal_dates=["2022-04-15", "2022-07-22", "2022-11-10", "2023-02-05", "2023-05-28"],
-        acquirers=["Global Corp", "World Enterprises", "International Ltd", "Continental Inc", "Global Systems"],
-        targets=["Regional Leader Inc", "National Champion Corp", "Market Leader Ltd", "Industry Giant Inc", "Sector Leader"],
-        equity_values=[3000.0, 4500.0, 2250.0, 5625.0, 3375.0],   # $M
-        enterprise_values=[3750.0, 5625.0, 2812.5, 7031.25, 4218.75], # $M
-        deal_revenues=[1500.0, 2250.0, 1125.0, 2812.5, 1687.5],   # $M
-        deal_ebitdas=[300.0, 450.0, 225.0, 562.5, 337.5],         # $M
-        deal_net_incomes=[225.0, 337.5, 168.75, 421.875, 253.125] # $M
+        # Precedent Diversified deals from the deal store
+        deal_store=_deal_store(),
+        deal_filters={'sector': 'Diversified'}
     )
 
     return results, excel_file
@@ -2,6 +2,7 @@ import pandas as pd
 import sys
 sys.path.append('financial-models-app/backend')
 from app import get_comprehensive_company_data, create_professional_excel_model
+from xlsx_inspector import dimension_shape, head_rows, inspect_workbook
 
 # Generate a DCF model
 data = get_comprehensive_company_data('MSFT', 'Microsoft Corporation')
@@ -11,17 +12,20 @@ print('=== DCF MODEL CONTENTS ===')
 print(f'File: {result}')
 
 try:
-    xl = pd.ExcelFile(result)
-    print(f'Sheets: {xl.sheet_names}')
+    report = inspect_workbook(result)
+    print(f'Sheets: {report["sheet_names"]}')
+    print(f"Formulas: {report['total_formulas']}, error cells: {report['total_errors']}, "
+          f"defined names: {list(report['defined_names'])}")
     
-    for sheet in xl.sheet_names:
+    for sheet in report['sheet_names']:
+        stats = report['sheets'][sheet]
+        rows, columns = dimension_shape(stats['dimension'])
         print(f'\n--- {sheet} ---')
-        df = pd.read_excel(result, sheet_name=sheet)
-        print(f'Shape: {df.shape}')
-        print(df.head(20).to_string())
+        print(f'Shape: {(rows, columns)}')
+        print(pd.DataFrame(head_rows(result, sheet, 20)).to_string())
         
         # Check for empty cells
-        empty_cells = df.isnull().sum().sum()
+        empty_cells = rows * columns - stats['non_empty_cells']
         print(f'Empty cells: {empty_cells}')
         
 except Exception as e:
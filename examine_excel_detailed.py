@@ -2,6 +2,7 @@ import pandas as pd
 import sys
 sys.path.append('financial-models-app/backend')
 from app import get_comprehensive_company_data, create_professional_excel_model
+from xlsx_inspector import dimension_shape, head_rows, inspect_workbook, iter_cells
 
 # Generate a DCF model
 data = get_comprehensive_company_data('MSFT', 'Microsoft Corporation')
@@ -11,33 +12,34 @@ print('=== DETAILED DCF MODEL EXAMINATION ===')
 print(f'File: {result}')
 
 try:
-    # Read the Excel file with openpyxl to get more details
-    from openpyxl import load_workbook
-    wb = load_workbook(result)
-    ws = wb.active
+    # Sheet list and used range come from the streaming inspector
+    report = inspect_workbook(result)
+    sheet = report['sheet_names'][0]
+    max_row, max_column = dimension_shape(report['sheets'][sheet]['dimension'])
     
-    print(f'Sheet name: {ws.title}')
-    print(f'Max row: {ws.max_row}')
-    print(f'Max column: {ws.max_column}')
+    print(f'Sheet name: {sheet}')
+    print(f'Max row: {max_row}')
+    print(f'Max column: {max_column}')
     
     # Check specific rows where projections should be
     print('\n=== CHECKING PROJECTION ROWS (25-33) ===')
+    rows = head_rows(result, sheet, 33)
     for row in range(25, 34):
+        values = rows[row - 1] if row <= len(rows) else []
         row_data = []
         for col in range(1, 8):  # Check first 7 columns
-            cell_value = ws.cell(row=row, column=col).value
+            cell_value = values[col - 1] if col <= len(values) else None
             row_data.append(str(cell_value) if cell_value is not None else 'None')
         print(f'Row {row}: {row_data}')
     
-    # Check for any non-empty cells in the entire sheet
+    # Stream every non-empty cell from the sheet XML (no full grid walk)
     print('\n=== ALL NON-EMPTY CELLS ===')
     non_empty_count = 0
-    for row in range(1, ws.max_row + 1):
-        for col in range(1, ws.max_column + 1):
-            cell_value = ws.cell(row=row, column=col).value
-            if cell_value is not None and str(cell_value).strip() != '':
-                print(f'Row {row}, Col {col}: "{cell_value}"')
-                non_empty_count += 1
+    for _, coordinate, cell_value, formula in iter_cells(result, sheet):
+        cell_value = formula or cell_value
+        if cell_value is not None and str(cell_value).strip() != '':
+            print(f'{coordinate}: "{cell_value}"')
+            non_empty_count += 1
     
     print(f'\nTotal non-empty cells: {non_empty_count}')
     
@@ -2,6 +2,7 @@ import pandas as pd
 import sys
 sys.path.append('financial-models-app/backend')
 from app import get_comprehensive_company_data, create_professional_excel_model
+from xlsx_inspector import dimension_shape, head_rows, inspect_workbook, iter_cells
 
 # Generate an M&A model
 data = get_comprehensive_company_data('MSFT', 'Microsoft Corporation')
@@ -11,25 +12,20 @@ print('=== M&A MODEL CONTENTS ===')
 print(f'File: {result}')
 
 try:
-    xl = pd.ExcelFile(result)
-    print(f'Sheets: {xl.sheet_names}')
+    report = inspect_workbook(result)
+    print(f'Sheets: {report["sheet_names"]}')
     
-    for sheet in xl.sheet_names:
+    for sheet in report['sheet_names']:
         print(f'\n--- {sheet} ---')
-        df = pd.read_excel(result, sheet_name=sheet)
-        print(f'Shape: {df.shape}')
+        print(f'Shape: {dimension_shape(report["sheets"][sheet]["dimension"])}')
         
-        # Look for any cells that contain formulas or equation-like text
-        formula_indicators = ['=', '+', '-', '*', '/', 'SUM', 'AVERAGE', 'IF', 'VLOOKUP']
-        
-        for idx, row in df.iterrows():
-            for col in df.columns:
-                cell_value = str(row[col]) if pd.notna(row[col]) else ''
-                if any(indicator in cell_value for indicator in formula_indicators):
-                    print(f'Row {idx+1}, Col {col}: "{cell_value}"')
+        # List formula cells straight from the sheet XML (streaming)
+        for _, coordinate, _, formula in iter_cells(result, sheet):
+            if formula:
+                print(f'{coordinate}: "{formula}"')
         
         # Show first 20 rows
-        print(df.head(20).to_string())
+        print(pd.DataFrame(head_rows(result, sheet, 20)).to_string())
         
 except Exception as e:
     print(f'Error reading Excel file: {e}')
@@ -10,6 +10,7 @@ Features:
 - Excel formatting and formula preservation
 - Access logging and security controls
 - Professional metadata output
+- Batch sharing with bounded parallelism, multipart S3 and resumable Drive uploads
 
 Author: FinModAI Engineering Team
 """
@@ -20,11 +21,15 @@ import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import openpyxl
 from openpyxl import load_workbook
 
+from transfer_manager import TransferManager
+from xlsx_inspector import inspect_workbook, inspect_many
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,6 +47,8 @@ class SharingConfig:
     link_expiration_days: int = 30
     enable_access_logging: bool = True
     preserve_formatting: bool = True
+    endpoint_url: Optional[str] = None  # S3-compatible endpoint (MinIO, LocalStack) for testing
+    max_parallel_uploads: int = 8
 
 @dataclass
 class SharingResult:
@@ -71,6 +78,7 @@ class ExcelSharingSystem:
     def __init__(self, config: Optional[SharingConfig] = None):
         self.config = config or SharingConfig()
         self._validate_config()
+        self.transfers = TransferManager(self.config)
         logger.info("📤 Excel Sharing System initialized")
 
     def _validate_config(self):
@@ -277,16 +285,43 @@ class ExcelSharingSystem:
                 error_message=f"Upload failed: {str(e)}"
             )
 
+    def share_many(self, files: List[Tuple[str, str]], max_workers: Optional[int] = None) -> List[SharingResult]:
+        """
+        Share several Excel files concurrently.
+
+        Args:
+            files: (file_path, model_type) pairs
+            max_workers: Maximum concurrent uploads (defaults to config.max_parallel_uploads)
+
+        Returns:
+            SharingResults in the same order as files
+        """
+        if not files:
+            return []
+
+        workers = min(max_workers or self.config.max_parallel_uploads, len(files))
+        logger.info(f"📤 Sharing {len(files)} Excel files ({workers} parallel uploads)")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda item: self.share_excel_file(*item), files))
+
+        shared = sum(1 for result in results if result.success)
+        logger.info(f"✅ Shared {shared}/{len(files)} Excel files")
+        return results
+
     def _upload_to_google_drive(self, file_path: str, model_type: str) -> SharingResult:
-        """Upload to Google Drive using OAuth2 flow."""
+        """Upload to Google Drive using OAuth2 flow (cached service, resumable upload)."""
         try:
-            from google_auth_oauthlib.flow import InstalledAppFlow
-            from google.auth.transport.requests import Request
-            from googleapiclient.discovery import build
-            from googleapiclient.http import MediaFileUpload
             from googleapiclient.errors import HttpError
-            import pickle
-            
+        except ImportError as e:
+            return SharingResult(
+                success=False,
+                model_type=model_type,
+                file_name=os.path.basename(file_path),
+                error_message=f"Google Drive API not installed: {str(e)}"
+            )
+
+        try:
             # Check for credentials file
             credentials_path = self.config.credentials_path or "google_drive_credentials.json"
             if not os.path.exists(credentials_path):
@@ -297,37 +332,6 @@ class ExcelSharingSystem:
                     error_message=f"Google Drive credentials not found at {credentials_path}. Please download from Google Cloud Console."
                 )
             
-            # OAuth2 scopes
-            SCOPES = ['https://www.googleapis.com/auth/drive.file']
-            
-            # Token file for storing OAuth2 credentials
-            token_file = 'google_drive_token.pickle'
-            
-            # Load existing credentials or start OAuth flow
-            creds = None
-            if os.path.exists(token_file):
-                with open(token_file, 'rb') as token:
-                    creds = pickle.load(token)
-            
-            # If there are no (valid) credentials available, let the user log in
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    # For service account, we need to use OAuth2 delegation
-                    # This requires the service account to be configured for domain-wide delegation
-                    # For now, let's use a simpler approach with OAuth2 client credentials
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        credentials_path, SCOPES)
-                    creds = flow.run_local_server(port=0)
-                
-                # Save the credentials for the next run
-                with open(token_file, 'wb') as token:
-                    pickle.dump(creds, token)
-            
-            # Build Drive service
-            service = build('drive', 'v3', credentials=creds)
-            
             # Generate unique filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             safe_model_type = model_type.replace("-", "_").replace(" ", "_")
@@ -335,28 +339,12 @@ class ExcelSharingSystem:
             drive_file_name = f"{timestamp}_{safe_model_type}_{file_name}"
             
             # File metadata
-            file_metadata = {
-                'name': drive_file_name,
-                'parents': [self.config.folder_id] if self.config.folder_id else None
-            }
-            
-            # Upload file
-            media = MediaFileUpload(file_path, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            file = service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id,webViewLink,webContentLink'
-            ).execute()
+            file_metadata = {'name': drive_file_name}
+            if self.config.folder_id:
+                file_metadata['parents'] = [self.config.folder_id]
             
-            # Make file publicly viewable
-            permission = {
-                'type': 'anyone',
-                'role': 'reader'
-            }
-            service.permissions().create(
-                fileId=file.get('id'),
-                body=permission
-            ).execute()
+            # Upload file (chunked, resumable) and make it publicly viewable
+            file = self.transfers.upload_drive(credentials_path, file_path, file_metadata)
             
             # Generate shareable URL
             shareable_url = file.get('webViewLink')
@@ -376,8 +364,12 @@ class ExcelSharingSystem:
                 file_name=file_name,
                 url=shareable_url,
                 expires=expires,
-                file_id=file.get('id'),
-                provider="google_drive"
+                file_size=os.path.getsize(file_path),
+                metadata={
+                    "provider": "google_drive",
+                    "file_id": file.get('id'),
+                    "folder_id": self.config.folder_id
+                }
             )
             
         except ImportError as e:
@@ -416,21 +408,18 @@ class ExcelSharingSystem:
     def _upload_to_aws_s3(self, file_path: str, model_type: str) -> SharingResult:
         """Upload to AWS S3."""
         try:
-            import boto3
-            from botocore.exceptions import NoCredentialsError
-
-            # Initialize S3 client
-            s3_client = boto3.client('s3')
+            # Shared S3 client (cached per provider)
+            s3_client = self.transfers.s3_client()
 
-            # Generate unique filename
+            # Generate unique filename (reusing the key of an earlier upload of the same file)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             safe_model_type = model_type.replace("-", "_").replace(" ", "_")
             file_name = os.path.basename(file_path)
-            s3_key = f"financial_models/{safe_model_type}/{timestamp}_{file_name}"
+            s3_key = (self.transfers.s3_key_for(file_path, self.config.bucket_name)
+                      or f"financial_models/{safe_model_type}/{timestamp}_{file_name}")
 
-            # Upload file
-            with open(file_path, 'rb') as f:
-                s3_client.upload_fileobj(f, self.config.bucket_name, s3_key)
+            # Upload file (concurrent multipart for large files, resumed or skipped when possible)
+            transfer = self.transfers.upload_s3(file_path, self.config.bucket_name, s3_key)
 
             # Generate shareable URL
             if self.config.link_expiration_days > 0:
@@ -456,7 +445,11 @@ class ExcelSharingSystem:
                     "provider": "aws_s3",
                     "bucket": self.config.bucket_name,
                     "key": s3_key,
-                    "expiration_days": self.config.link_expiration_days
+                    "expiration_days": self.config.link_expiration_days,
+                    "parts": transfer["parts"],
+                    "resumed_parts": transfer["resumed_parts"],
+                    "skipped": transfer["skipped"],
+                    "upload_seconds": transfer["seconds"]
                 }
             )
 
@@ -491,6 +484,9 @@ class ExcelSharingSystem:
         """
         Validate Excel file formatting and formulas are preserved.
 
+        Streams the sheet XML (see xlsx_inspector) instead of loading the
+        openpyxl object model, so large workbooks validate quickly.
+
         Args:
             file_path: Path to Excel file
 
@@ -500,39 +496,62 @@ class ExcelSharingSystem:
         logger.info("🔍 Validating Excel formatting...")
 
         try:
-            wb = load_workbook(file_path, read_only=False)
-            validation = {
-                "workbook_loaded": True,
-                "worksheet_count": len(wb.sheetnames),
-                "worksheets": wb.sheetnames,
-                "formatting_preserved": True,
-                "formulas_intact": True,
-                "issues": []
-            }
-
-            # Check each worksheet
-            for sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-
-                # Count cells with formulas
-                formula_count = 0
-                for row in ws.iter_rows():
-                    for cell in row:
-                        if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                            formula_count += 1
-
-                validation[f"{sheet_name}_formulas"] = formula_count
-                logger.info(f"📊 {sheet_name}: {formula_count} formulas found")
-
-            wb.close()
-            return validation
-
+            return self._validation_from_report(inspect_workbook(file_path))
         except Exception as e:
             return {
                 "workbook_loaded": False,
                 "issues": [f"Excel validation failed: {str(e)}"]
             }
 
+    def validate_many(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Validate a batch of workbooks in parallel (results in input order)."""
+        logger.info(f"🔍 Validating {len(file_paths)} Excel files...")
+        results = []
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                results.append({"workbook_loaded": False, "issues": [f"File not found: {file_path}"]})
+                continue
+            results.append(None)
+
+        readable = [path for path, result in zip(file_paths, results) if result is None]
+        try:
+            reports = iter(inspect_many(readable, max_workers=max_workers))
+            return [result if result is not None else self._validation_from_report(next(reports))
+                    for result in results]
+        except Exception:
+            # Fall back to one-by-one so a single corrupt file only fails itself
+            return [result if result is not None else self.validate_excel_formatting(path)
+                    for path, result in zip(file_paths, results)]
+
+    def _validation_from_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn an xlsx_inspector report into the validation result format."""
+        validation = {
+            "workbook_loaded": True,
+            "worksheet_count": len(report["sheet_names"]),
+            "worksheets": report["sheet_names"],
+            "formatting_preserved": True,
+            "styles_used": report["styles_used"],
+            "formulas_intact": report["total_errors"] == 0,
+            "defined_names": report["defined_names"],
+            "style_usage": report["style_usage"],
+            "error_cells": {},
+            "issues": []
+        }
+
+        # Check each worksheet
+        for sheet_name, stats in report["sheets"].items():
+            validation[f"{sheet_name}_formulas"] = stats["formulas"]
+            logger.info(f"📊 {sheet_name}: {stats['formulas']} formulas found")
+
+            if stats["error_count"]:
+                validation["error_cells"][sheet_name] = stats["error_cells"]
+                validation["issues"].append(
+                    f"{sheet_name}: {stats['error_count']} error cells "
+                    f"({', '.join(f'{ref} {error}' for ref, error in stats['error_cells'][:5])})"
+                )
+
+        return validation
+
 def main():
     """Main function for command-line usage."""
     import argparse
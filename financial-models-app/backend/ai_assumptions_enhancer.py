@@ -6,11 +6,29 @@ Significantly improves company assumptions using real data analysis
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings("ignore")
 
+try:
+    from peer_discovery import find_peers
+    PEER_DISCOVERY_AVAILABLE = True
+except ImportError:
+    PEER_DISCOVERY_AVAILABLE = False
+
+# Peer metric -> benchmark key, and whether the metric must be positive (multiples)
+PEER_BENCHMARK_METRICS = {
+    'pe_ratio': ('avg_pe_ratio', True),
+    'ev_ebitda': ('avg_ev_ebitda', True),
+    'ev_revenue': ('avg_ev_revenue', True),
+    'roe': ('avg_roe', False),
+    'roa': ('avg_roa', False),
+    'revenue_growth': ('avg_revenue_growth', False),
+    'ebitda_margin': ('avg_ebitda_margin', False),
+    'beta': ('avg_beta', False)
+}
+MIN_PEERS_PER_METRIC = 3
+
 class AIAssumptionEnhancer:
     """Advanced AI-powered assumption enhancement system"""
     
@@ -193,14 +211,19 @@ class AIAssumptionEnhancer:
         return industry_insights
     
     def _perform_peer_benchmarking(self, ticker, data):
-        """Advanced peer benchmarking using industry data"""
+        """Advanced peer benchmarking using nearest-neighbour peers and industry data"""
         print("   📊 Performing peer benchmarking...")
         
         peer_insights = {}
         
-        # Get industry benchmarks
+        # Get industry benchmarks, overridden by nearest-neighbour peer medians where available
         industry = data.get('industry', 'Unknown')
         benchmarks = self.industry_benchmarks.get(industry, self.industry_benchmarks['Software - Infrastructure'])
+        peers = self._discover_peers(ticker)
+        if peers:
+            benchmarks = {**benchmarks, **self._peer_benchmarks(peers)}
+            peer_insights['ai_peer_tickers'] = [peer['ticker'] for peer in peers]
+            print(f"   🔍 Benchmarking against nearest peers: {', '.join(peer_insights['ai_peer_tickers'])}")
         
         # Current company metrics
         current_pe = data.get('pe_ratio', 18.0)
@@ -226,6 +249,27 @@ class AIAssumptionEnhancer:
         
         return peer_insights
     
+    def _discover_peers(self, ticker, k=8):
+        """Most similar companies in the peer universe (empty if discovery is unavailable)"""
+        if not PEER_DISCOVERY_AVAILABLE:
+            return []
+        try:
+            return find_peers(ticker, k=k)
+        except Exception as e:
+            print(f"   ⚠️ Peer discovery failed: {e}")
+            return []
+
+    def _peer_benchmarks(self, peers):
+        """Median peer metrics as avg_* benchmark overrides"""
+        overrides = {}
+        for metric, (benchmark_key, positive_only) in PEER_BENCHMARK_METRICS.items():
+            values = pd.to_numeric(pd.Series([peer.get(metric) for peer in peers]), errors='coerce').dropna()
+            if positive_only:
+                values = values[values > 0]
+            if len(values) >= MIN_PEERS_PER_METRIC:
+                overrides[benchmark_key] = float(values.median())
+        return overrides
+
     def _optimize_financial_ratios(self, data):
         """AI-powered financial ratio optimization"""
         print("   ⚖️ Optimizing financial ratios...")
@@ -1,11 +1,10 @@
-import yfinance as yf
 import pandas as pd
 from datetime import datetime
 import numpy as np
 import tempfile
 import os
 import uuid
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
@@ -18,11 +17,44 @@ from scipy import stats
 import json
 import time
 from urllib.parse import urljoin, quote
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+# Shared helpers live in the repository root (request coalescing, streaming downloads, serializers)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import yfinance_gateway
+try:
+    from single_flight import get_single_flight
+    single_flight = get_single_flight()
+except ImportError:
+    single_flight = None
+try:
+    from streaming_downloads import file_response
+except ImportError:
+    file_response = None
+try:
+    from serialization import install_json_provider
+except ImportError:
+    install_json_provider = None
+try:
+    from valuation_precompute import get_service as get_precompute_service  # opened on first use
+    from valuation_precompute import is_serving_process
+except ImportError:
+    get_precompute_service = None
+try:
+    from progress_events import SSE_HEADERS, SSE_MIMETYPE, emit, get_bus, parse_last_event_id
+    progress_bus = get_bus()
+except ImportError:
+    progress_bus = None
+
+    def emit(*args, **kwargs):
+        return None
+
 app = Flask(__name__)
 CORS(app)
+if install_json_provider:
+    install_json_provider(app)  # jsonify() through the fast JSON codec
 
 # Professional color scheme
 COLORS = {
@@ -126,33 +158,84 @@ def detect_industry(company_name, sector_info=None):
     else:
         return 'Default'
 
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+TIKR_HEADERS = {
+    **SCRAPE_HEADERS,
+    'Accept': 'application/json, text/plain, */*',
+    'Referer': 'https://app.tikr.com/'
+}
+SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+
+# Each scraper is a request plus a response handler; the handlers are shared by
+# the blocking scrapers (Flask) and the async ones (asgi_app.py)
+
+def _sec_cik(response, ticker):
+    """CIK for a ticker from SEC's company_tickers.json response"""
+    if response.status_code == 200:
+        for company in response.json().values():
+            if company['ticker'].upper() == ticker.upper():
+                return str(company['cik_str']).zfill(10)
+    return None
+
+def _sec_facts_url(cik):
+    return f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+
+def _handle_sec_facts(ticker, response):
+    if response.status_code == 200:
+        facts_data = response.json()
+        print(f"   ✅ SEC EDGAR data retrieved for {ticker}")
+        return parse_sec_facts(facts_data)
+    return {}
+
+def _macrotrends_url(ticker):
+    return f"https://www.macrotrends.net/stocks/charts/{ticker.upper()}/revenue"
+
+def _handle_macrotrends(ticker, response):
+    if response.status_code == 200:
+        soup = BeautifulSoup(response.content, 'html.parser')
+        # Parse Macrotrends revenue data
+        print(f"   ✅ Macrotrends data retrieved for {ticker}")
+        return parse_macrotrends_data(soup)
+    return {}
+
+def _finviz_url(ticker):
+    return f"https://finviz.com/quote.ashx?t={ticker.upper()}"
+
+def _handle_finviz(ticker, response):
+    if response.status_code == 200:
+        soup = BeautifulSoup(response.content, 'html.parser')
+        print(f"   ✅ Finviz data retrieved for {ticker}")
+        return parse_finviz_data(soup)
+    return {}
+
+def _tikr_url(ticker):
+    # Tikr has a public API-like interface for basic data
+    return f"https://app.tikr.com/stock/financials?cid={ticker.upper()}"
+
+def _handle_tikr(ticker, response):
+    if response.status_code == 200:
+        # Try to parse as JSON first
+        try:
+            data = response.json()
+            print(f"   ✅ Tikr JSON data retrieved for {ticker}")
+            return parse_tikr_json_data(data)
+        except:
+            # If not JSON, parse HTML
+            soup = BeautifulSoup(response.content, 'html.parser')
+            print(f"   ✅ Tikr HTML data retrieved for {ticker}")
+            return parse_tikr_html_data(soup)
+    return {}
+
 def scrape_edgar_sec_data(ticker):
     """Scrape financial data from SEC EDGAR filings"""
     print(f"🏛️ Scraping SEC EDGAR data for {ticker}...")
     try:
         # SEC API for company facts
-        cik_url = f"https://www.sec.gov/files/company_tickers.json"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(cik_url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            companies = response.json()
-            cik = None
-            for company in companies.values():
-                if company['ticker'].upper() == ticker.upper():
-                    cik = str(company['cik_str']).zfill(10)
-                    break
-            
-            if cik:
-                facts_url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-                facts_response = requests.get(facts_url, headers=headers, timeout=10)
-                if facts_response.status_code == 200:
-                    facts_data = facts_response.json()
-                    print(f"   ✅ SEC EDGAR data retrieved for {ticker}")
-                    return parse_sec_facts(facts_data)
-        
+        cik = _sec_cik(requests.get(SEC_TICKERS_URL, headers=SCRAPE_HEADERS, timeout=10), ticker)
+        if cik:
+            return _handle_sec_facts(ticker, requests.get(_sec_facts_url(cik), headers=SCRAPE_HEADERS, timeout=10))
         return {}
     except Exception as e:
         print(f"   ⚠️ SEC EDGAR error: {e}")
@@ -162,22 +245,7 @@ def scrape_macrotrends_data(ticker):
     """Scrape financial data from Macrotrends"""
     print(f"📈 Scraping Macrotrends data for {ticker}...")
     try:
-        base_url = f"https://www.macrotrends.net/stocks/charts/{ticker.upper()}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        # Revenue data
-        revenue_url = f"{base_url}/revenue"
-        response = requests.get(revenue_url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            # Parse Macrotrends revenue data
-            print(f"   ✅ Macrotrends data retrieved for {ticker}")
-            return parse_macrotrends_data(soup)
-        
-        return {}
+        return _handle_macrotrends(ticker, requests.get(_macrotrends_url(ticker), headers=SCRAPE_HEADERS, timeout=10))
     except Exception as e:
         print(f"   ⚠️ Macrotrends error: {e}")
         return {}
@@ -186,18 +254,7 @@ def scrape_finviz_data(ticker):
     """Scrape financial data from Finviz"""
     print(f"🔍 Scraping Finviz data for {ticker}...")
     try:
-        url = f"https://finviz.com/quote.ashx?t={ticker.upper()}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            print(f"   ✅ Finviz data retrieved for {ticker}")
-            return parse_finviz_data(soup)
-        
-        return {}
+        return _handle_finviz(ticker, requests.get(_finviz_url(ticker), headers=SCRAPE_HEADERS, timeout=10))
     except Exception as e:
         print(f"   ⚠️ Finviz error: {e}")
         return {}
@@ -206,32 +263,58 @@ def scrape_tikr_data(ticker):
     """Scrape financial data from Tikr.com"""
     print(f"📊 Scraping Tikr data for {ticker}...")
     try:
-        # Tikr has a public API-like interface for basic data
-        url = f"https://app.tikr.com/stock/financials?cid={ticker.upper()}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Referer': 'https://app.tikr.com/'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        if response.status_code == 200:
-            # Try to parse as JSON first
-            try:
-                data = response.json()
-                print(f"   ✅ Tikr JSON data retrieved for {ticker}")
-                return parse_tikr_json_data(data)
-            except:
-                # If not JSON, parse HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
-                print(f"   ✅ Tikr HTML data retrieved for {ticker}")
-                return parse_tikr_html_data(soup)
-        
+        return _handle_tikr(ticker, requests.get(_tikr_url(ticker), headers=TIKR_HEADERS, timeout=15))
+    except Exception as e:
+        print(f"   ⚠️ Tikr error: {e}")
+        return {}
+
+async def scrape_edgar_sec_data_async(ticker, http):
+    """scrape_edgar_sec_data on the async HTTP client"""
+    print(f"🏛️ Scraping SEC EDGAR data for {ticker}...")
+    try:
+        cik = _sec_cik(await http.get(SEC_TICKERS_URL, headers=SCRAPE_HEADERS, timeout=10), ticker)
+        if cik:
+            return _handle_sec_facts(ticker, await http.get(_sec_facts_url(cik), headers=SCRAPE_HEADERS, timeout=10))
         return {}
+    except Exception as e:
+        print(f"   ⚠️ SEC EDGAR error: {e}")
+        return {}
+
+async def scrape_macrotrends_data_async(ticker, http):
+    """scrape_macrotrends_data on the async HTTP client"""
+    print(f"📈 Scraping Macrotrends data for {ticker}...")
+    try:
+        return _handle_macrotrends(ticker, await http.get(_macrotrends_url(ticker), headers=SCRAPE_HEADERS, timeout=10))
+    except Exception as e:
+        print(f"   ⚠️ Macrotrends error: {e}")
+        return {}
+
+async def scrape_finviz_data_async(ticker, http):
+    """scrape_finviz_data on the async HTTP client"""
+    print(f"🔍 Scraping Finviz data for {ticker}...")
+    try:
+        return _handle_finviz(ticker, await http.get(_finviz_url(ticker), headers=SCRAPE_HEADERS, timeout=10))
+    except Exception as e:
+        print(f"   ⚠️ Finviz error: {e}")
+        return {}
+
+async def scrape_tikr_data_async(ticker, http):
+    """scrape_tikr_data on the async HTTP client"""
+    print(f"📊 Scraping Tikr data for {ticker}...")
+    try:
+        return _handle_tikr(ticker, await http.get(_tikr_url(ticker), headers=TIKR_HEADERS, timeout=15))
     except Exception as e:
         print(f"   ⚠️ Tikr error: {e}")
         return {}
 
+# Source name in all_data_sources -> (blocking scraper, async scraper)
+SCRAPERS = {
+    'sec_edgar': (scrape_edgar_sec_data, scrape_edgar_sec_data_async),
+    'finviz': (scrape_finviz_data, scrape_finviz_data_async),
+    'macrotrends': (scrape_macrotrends_data, scrape_macrotrends_data_async),
+    'tikr': (scrape_tikr_data, scrape_tikr_data_async),
+}
+
 def parse_sec_facts(facts_data):
     """Parse SEC EDGAR facts data"""
     try:
@@ -463,8 +546,51 @@ def calculate_financial_ratios(data):
         print(f"   ⚠️ Ratio calculation error: {e}")
         return {}
 
+def company_data_dataset(company_name):
+    """single_flight dataset name for a company's merged data (shared with the async server)"""
+    return f"comprehensive:{company_name}"
+
 def get_comprehensive_company_data(ticker, company_name):
-    """Enhanced company data fetching from multiple sources with comprehensive financial metrics"""
+    """Enhanced company data fetching; concurrent requests for the same ticker share one fetch"""
+    if single_flight is None:
+        return fetch_comprehensive_company_data(ticker, company_name)
+    fetched = []
+
+    def fetch(*args):
+        fetched.append(True)
+        return fetch_comprehensive_company_data(*args)
+
+    data = single_flight.do(ticker, company_data_dataset(company_name), fetch, ticker, company_name)
+    if not fetched:
+        emit('cache', f"Reused company data already fetched for {ticker.upper()}", status='hit')
+    return data
+
+# Source names as shown in progress events
+SOURCE_LABELS = {
+    'yahoo_finance': 'Yahoo Finance',
+    'sec_edgar': 'SEC EDGAR',
+    'finviz': 'Finviz',
+    'macrotrends': 'Macrotrends',
+    'tikr': 'TIKR',
+}
+
+def _scraped(scraped, source, ticker):
+    """A scraper result fetched ahead of time (async server), else a blocking scrape"""
+    if scraped is not None and source in scraped:
+        result = scraped[source]
+    else:
+        emit('data', f"Trying {SOURCE_LABELS[source]}", status='started', source=source)
+        result = SCRAPERS[source][0](ticker)
+    emit('data', f"{SOURCE_LABELS[source]}: {'data retrieved' if result else 'no data'}",
+         status='ok' if result else 'empty', source=source)
+    return result
+
+def fetch_comprehensive_company_data(ticker, company_name, scraped=None):
+    """
+    Enhanced company data fetching from multiple sources with comprehensive financial metrics.
+    scraped maps SCRAPERS names to results the caller already fetched (the async server
+    scrapes concurrently); sources missing from it are scraped here.
+    """
     print(f"🚀 Fetching comprehensive data for {company_name} ({ticker}) from multiple sources...")
     
     # Import AI enhancement module
@@ -544,7 +670,8 @@ def get_comprehensive_company_data(ticker, company_name):
     # 1. Yahoo Finance (Primary source)
     try:
         print(f"📊 Fetching Yahoo Finance data for {ticker}...")
-        stock = yf.Ticker(ticker)
+        emit('data', "Trying Yahoo Finance", status='started', source='yahoo_finance')
+        stock = yfinance_gateway.ticker(ticker)
         info = stock.info
         
         # Get financial statements for comprehensive data
@@ -724,14 +851,17 @@ def get_comprehensive_company_data(ticker, company_name):
                 
         print(f"   ✅ Yahoo Finance data retrieved - Quality: {data['data_quality']}")
         all_data_sources['yahoo_finance'] = True
+        emit('data', "Yahoo Finance: data retrieved", status='ok', source='yahoo_finance',
+             data_quality=data['data_quality'])
         
     except Exception as e:
         print(f"   ⚠️ Yahoo Finance error: {e}")
         all_data_sources['yahoo_finance'] = False
+        emit('data', f"Yahoo Finance failed: {e}", status='failed', source='yahoo_finance')
     
     # 2. SEC EDGAR Data
     try:
-        sec_data = scrape_edgar_sec_data(ticker)
+        sec_data = _scraped(scraped, 'sec_edgar', ticker)
         if sec_data:
             # Cross-validate with SEC data
             if sec_data.get('sec_revenue'):
@@ -762,7 +892,7 @@ def get_comprehensive_company_data(ticker, company_name):
     
     # 3. Finviz Data  
     try:
-        finviz_data = scrape_finviz_data(ticker)
+        finviz_data = _scraped(scraped, 'finviz', ticker)
         if finviz_data:
             # Add Finviz formatted data to our dataset
             for key, value in finviz_data.items():
@@ -776,7 +906,7 @@ def get_comprehensive_company_data(ticker, company_name):
     
     # 4. Macrotrends Data
     try:
-        macrotrends_data = scrape_macrotrends_data(ticker)
+        macrotrends_data = _scraped(scraped, 'macrotrends', ticker)
         if macrotrends_data:
             # Add Macrotrends formatted data to our dataset
             for key, value in macrotrends_data.items():
@@ -790,7 +920,7 @@ def get_comprehensive_company_data(ticker, company_name):
     
     # 5. Tikr Data
     try:
-        tikr_data = scrape_tikr_data(ticker)
+        tikr_data = _scraped(scraped, 'tikr', ticker)
         if tikr_data:
             # Add Tikr formatted data to our dataset
             for key, value in tikr_data.items():
@@ -803,6 +933,7 @@ def get_comprehensive_company_data(ticker, company_name):
         all_data_sources['tikr'] = False
     
     # 5. Calculate comprehensive financial ratios
+    emit('calculation', "Calculating financial ratios", status='started')
     calculated_ratios = calculate_financial_ratios(data)
     for ratio_name, ratio_value in calculated_ratios.items():
         data[f'calculated_{ratio_name}'] = ratio_value
@@ -848,6 +979,8 @@ def get_comprehensive_company_data(ticker, company_name):
     data['data_sources_count'] = len(active_sources)
     
     print(f"✅ Comprehensive data compilation complete for {company_name}")
+    emit('data', f"Data compiled from {len(active_sources)}/5 sources", status='ok',
+         sources=active_sources, data_quality=data.get('data_quality', 'estimated'))
     print(f"   📊 Active sources ({len(active_sources)}/5): {', '.join(active_sources) if active_sources else 'None'}")
     print(f"   💰 Revenue: {data['revenue']}")
     print(f"   📈 EBITDA: {data['ebitda']} ({data['ebitda_margin']*100}% margin)")
@@ -868,6 +1001,7 @@ def get_comprehensive_company_data(ticker, company_name):
     # Apply AI enhancement if available
     if ai_enhancement_available:
         print(f"\n🤖 Applying AI-powered assumption enhancements...")
+        emit('calculation', "Applying AI assumption enhancements", status='started')
         data = enhance_company_data_with_ai(ticker, company_name, data)
     else:
         print(f"\n⚠️ Using standard data without AI enhancements")
@@ -876,6 +1010,7 @@ def get_comprehensive_company_data(ticker, company_name):
     try:
         from enhanced_assumptions_research import get_research_based_assumptions
         print(f"\n🔬 Applying research-based financial assumptions...")
+        emit('calculation', "Applying research-based assumptions", status='started')
         research_assumptions = get_research_based_assumptions(company_name, ticker, data.get('industry'))
         data['research_assumptions'] = research_assumptions
         print(f"   ✅ Research assumptions applied - Confidence: {research_assumptions['research_metadata']['confidence_level']}")
@@ -943,6 +1078,7 @@ def create_professional_excel_model(company_data, model_type):
     
     # Create header section
     create_header_section(ws, company_data, model_type, styles)
+    emit('excel', f"Writing {ws.title} sheet", status='started', sheet=ws.title)
     
     # Route to specific model builders
     if model_type.lower() == 'dcf':
@@ -957,6 +1093,7 @@ def create_professional_excel_model(company_data, model_type):
             from three_statement_model import create_three_statement_model
             output_file = create_three_statement_model(company_data['company_name'], company_data.get('ticker'), None)
             print(f"✅ 3-Statement model created: {output_file}")
+            emit('excel', "3-Statement workbook saved", status='ok', filename=os.path.basename(output_file))
             return output_file
         except ImportError:
             create_comprehensive_3statement_model(ws, company_data, styles)
@@ -968,6 +1105,7 @@ def create_professional_excel_model(company_data, model_type):
         create_comprehensive_options_model(ws, company_data, styles)
     else:
         create_comprehensive_dcf_model(ws, company_data, styles)  # Default to DCF
+    emit('excel', f"{ws.title} sheet written", status='ok', sheet=ws.title)
     
     # Auto-adjust column widths with professional spacing
     for column in ws.columns:
@@ -987,6 +1125,7 @@ def create_professional_excel_model(company_data, model_type):
     filename = f"{company_data['company_name'].replace(' ', '_')}_{model_type.upper()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
     filepath = os.path.join(temp_dir, filename)
     wb.save(filepath)
+    emit('excel', "Workbook saved", status='ok', filename=filename)
     
     return filepath
 
@@ -2278,79 +2417,207 @@ def create_basic_section(ws, company_data, model_type):
         ws[f'B{i}'] = value
         ws[f'B{i}'].fill = PatternFill(start_color='D5F4E6', end_color='D5F4E6', fill_type='solid')
 
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    return jsonify({
+# Request handling shared by the Flask routes below and the async server (asgi_app.py);
+# the Flask handlers are thin shims over these
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+def health_payload():
+    return {
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'message': 'Simple Financial Models API is running'
-    })
+    }
 
-@app.route('/api/generate', methods=['POST'])
-def generate_model():
+def parse_generate_request(data):
+    """(company_name, ticker, model_type) from an /api/generate body, or None and an error message"""
+    data = data or {}
+    company_name = data.get('company_name', '').strip()
+    ticker = data.get('ticker', '').strip()
+    models = data.get('models', [])
+
+    if not all([company_name, ticker, models]):
+        return None, 'Missing required fields'
+    return (company_name, ticker, models[0]), None  # Just handle one model for simplicity
+
+def build_model_file(company_data, model_type):
+    """Build the workbook and return (filepath, filename); CPU-bound, so the async server runs it in a process pool"""
+    result = create_professional_excel_model(company_data, model_type)
+
+    # Handle both tuple and string returns
+    if isinstance(result, tuple):
+        return result
+    return result, os.path.basename(result)
+
+def precompute_service():
+    """The shared valuation precompute service (None when it is not installed)"""
+    return get_precompute_service() if get_precompute_service is not None else None
+
+def precomputed_headline(ticker, model_type):
+    """Headline outputs for (ticker, model type) from the precomputed table, or None for cold tickers"""
+    precompute = precompute_service()
+    if precompute is None or model_type.lower() not in precompute.models:
+        return None
+    hit = precompute.lookup(ticker, model_type.lower())
+    if not hit:
+        return None
+    return {'outputs': hit['outputs'], 'as_of': hit['refreshed_at'], 'computed_at': hit['computed_at']}
+
+def generate_payload(company_name, ticker, model_type, company_data, filename, valuation=None):
+    result = {
+        'model_type': model_type.upper(),
+        'company': company_name,
+        'download_url': f'/api/download/{filename}',
+        'filename': filename,
+        'data_quality': company_data['data_quality']
+    }
+    if valuation:
+        result['valuation'] = dict(valuation, source='precomputed')
+
+    return {
+        'success': True,
+        'results': [result],
+        'company': company_name,
+        'ticker': ticker.upper(),
+        'generated_at': datetime.now().isoformat()
+    }
+
+def run_generate_job(company_name, ticker, model_type):
+    """The /api/generate pipeline; run inside a progress job, every stage publishes events"""
+    print(f"📊 Generating {model_type} model for {company_name} ({ticker})")
+    emit('job', f"Generating {model_type.upper()} model for {company_name} ({ticker.upper()})", status='started')
+
+    # Watchlist tickers: the headline valuation is ready before the workbook is
+    valuation = precomputed_headline(ticker, model_type)
+    if valuation:
+        emit('cache', f"Precomputed {model_type.upper()} valuation as of {valuation['as_of']}", status='hit',
+             valuation=valuation)
+
+    company_data = get_company_data(ticker, company_name)
+    emit('excel', f"Building {model_type.upper()} workbook", status='started')
+    filepath, filename = build_model_file(company_data, model_type)
+
+    print(f"✅ {model_type.upper()} model created successfully")
+    return generate_payload(company_name, ticker, model_type, company_data, filename, valuation)
+
+def job_accepted_payload(job_id):
+    return {
+        'success': True,
+        'job_id': job_id,
+        'status_url': f'/api/jobs/{job_id}',
+        'events_url': f'/api/jobs/{job_id}/events'
+    }
+
+def job_status_payload(job_id):
+    """Status, events so far and (once finished) result of a generation job"""
+    snapshot = progress_bus.snapshot(job_id) if progress_bus is not None else None
+    if snapshot is None:
+        return {'error': 'Job not found'}, 404
+    return snapshot, 200
+
+def generate_error_payload(error):
+    print(f"❌ Error: {str(error)}")
+    return {
+        'error': f'Failed to generate model: {str(error)}',
+        'timestamp': datetime.now().isoformat()
+    }
+
+def valuation_payload(ticker):
+    """Headline DCF / comps / LBO outputs: precomputed table first, live refresh for cold tickers"""
+    precompute = precompute_service()
+    if precompute is None:
+        return {'error': 'Valuation precompute is not available'}, 503
     try:
-        data = request.get_json()
-        company_name = data.get('company_name', '').strip()
-        ticker = data.get('ticker', '').strip()
-        models = data.get('models', [])
-        
-        if not all([company_name, ticker, models]):
-            return jsonify({'error': 'Missing required fields'}), 400
-        
-        print(f"📊 Generating {models[0]} model for {company_name} ({ticker})")
-        
-        # Get company data
-        company_data = get_company_data(ticker, company_name)
-        
-        # Generate comprehensive model
-        model_type = models[0]  # Just handle one model for simplicity
-        result = create_professional_excel_model(company_data, model_type)
-        
-        # Handle both tuple and string returns
-        if isinstance(result, tuple):
-            filepath, filename = result
-        else:
-            filepath = result
-            filename = os.path.basename(filepath)
-        
-        result = {
-            'model_type': model_type.upper(),
-            'company': company_name,
-            'download_url': f'/api/download/{filename}',
-            'filename': filename,
-            'data_quality': company_data['data_quality']
-        }
-        
-        response = {
+        ticker = ticker.strip().upper()
+        valuations = precompute.lookup_all(ticker)
+        source = 'precomputed'
+        if not valuations:
+            # Cold ticker: fetch and compute now (the results also warm the table)
+            precompute.refresh(ticker)
+            valuations = precompute.lookup_all(ticker, record=False)
+            source = 'live'
+        if not valuations:
+            return {'error': f'No valuation data available for {ticker}'}, 404
+
+        return {
             'success': True,
-            'results': [result],
-            'company': company_name,
-            'ticker': ticker.upper(),
-            'generated_at': datetime.now().isoformat()
-        }
-        
-        print(f"✅ {model_type.upper()} model created successfully")
-        return jsonify(response)
-        
+            'ticker': ticker,
+            'source': source,
+            'valuations': {model_type: {'outputs': hit['outputs'], 'as_of': hit['refreshed_at'],
+                                        'computed_at': hit['computed_at']}
+                           for model_type, hit in valuations.items()}
+        }, 200
     except Exception as e:
         print(f"❌ Error: {str(e)}")
-        return jsonify({
-            'error': f'Failed to generate model: {str(e)}',
-            'timestamp': datetime.now().isoformat()
-        }), 500
+        return {'error': f'Failed to value {ticker}: {str(e)}'}, 500
+
+def download_path(filename):
+    """Path of a generated workbook in the temp directory, or None"""
+    filepath = os.path.join(tempfile.gettempdir(), filename)
+    return filepath if os.path.exists(filepath) else None
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    return jsonify(health_payload())
+
+@app.route('/api/generate', methods=['POST'])
+def generate_model():
+    try:
+        fields, error = parse_generate_request(request.get_json())
+        if error:
+            return jsonify({'error': error}), 400
+        return jsonify(run_generate_job(*fields))
+
+    except Exception as e:
+        return jsonify(generate_error_payload(e)), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def create_generate_job():
+    """Start /api/generate in the background; progress streams from events_url"""
+    if progress_bus is None:
+        return jsonify({'error': 'Progress streaming is not available'}), 503
+    fields, error = parse_generate_request(request.get_json())
+    if error:
+        return jsonify({'error': error}), 400
+    company_name, ticker, model_type = fields
+
+    job_id = progress_bus.create_job(company=company_name, ticker=ticker.upper(), model_type=model_type)
+    progress_bus.run_in_thread(job_id, run_generate_job, company_name, ticker, model_type)
+    return jsonify(job_accepted_payload(job_id)), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    body, status = job_status_payload(job_id)
+    return jsonify(body), status
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Server-Sent Events: replays missed events (Last-Event-ID), then streams until the job ends"""
+    body, status = job_status_payload(job_id)
+    if status != 200:
+        return jsonify(body), status
+    last_event_id = parse_last_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    return Response(progress_bus.sse_stream(job_id, last_event_id), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+
+@app.route('/api/valuation/<ticker>', methods=['GET'])
+def headline_valuation(ticker):
+    body, status = valuation_payload(ticker)
+    return jsonify(body), status
 
 @app.route('/api/download/<filename>')
 def download_file(filename):
     try:
-        temp_dir = tempfile.gettempdir()
-        filepath = os.path.join(temp_dir, filename)
-        
-        if os.path.exists(filepath):
+        filepath = download_path(filename)
+
+        if filepath:
+            if file_response is not None:
+                # Chunked body with ETag / Range support (304 on repeat downloads)
+                return file_response(filepath, download_name=filename)
             return send_file(
                 filepath,
                 as_attachment=True,
                 download_name=filename,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                mimetype=XLSX_MIMETYPE
             )
         else:
             return jsonify({'error': 'File not found'}), 404
@@ -2368,5 +2635,9 @@ if __name__ == '__main__':
     print("   🔧 API: http://localhost:5001")
     print("   🌐 Frontend: Open index.html in your browser")
     print("✅ Ready to generate professional models!")
+    debug = True
+    # Only the process that serves requests refreshes, not the reloader's watcher
+    if precompute_service() is not None and is_serving_process(debug):
+        precompute_service().start()  # keep watchlist valuations warm for /api/valuation and /api/generate
     
-    app.run(debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
+    app.run(debug=debug, host='0.0.0.0', port=5001) 
\ No newline at end of file
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Async API server for the financial models backend
+
+Serves the same routes as app.py on an ASGI stack. app.py stays the WSGI
+entry point; both share its request handling, so responses are identical.
+
+Features:
+- SEC EDGAR, Finviz, Macrotrends and TIKR scraped concurrently on one pooled
+  async HTTP client instead of blocking a worker thread per request
+- yfinance (a blocking library) and SQLite reads on a bounded thread pool,
+  workbook builds on a process pool: the event loop only ever waits
+- Concurrent requests for the same company share one data fetch, and the
+  result is shared across worker processes (and with app.py) through the
+  single_flight store for its freshness window
+- Hundreds of in-flight requests per process (limits: ASYNC_IO_WORKERS,
+  MODEL_BUILD_WORKERS, ASYNC_HTTP_MAX_CONNECTIONS, ASYNC_HTTP_PER_HOST)
+- Background generation jobs whose progress streams over Server-Sent Events;
+  every job waiting on a shared data fetch sees that fetch's progress
+
+Jobs live in the process's memory, so run ONE worker process (the event loop
+already handles hundreds of requests): startup fails when WEB_CONCURRENCY > 1
+or another worker holds ASGI_WORKER_LOCK.
+
+Usage:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5001
+    python asgi_app.py
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.abspath(os.path.join(BACKEND_DIR, '..', '..')))
+
+import app as backend  # noqa: E402  (the Flask app: routes' shared handling, scrapers, model builders)
+from async_http import AsyncHTTP, AsyncSingleFlight, run_blocking, run_cpu, shutdown_executors  # noqa: E402
+from progress_events import (SSE_HEADERS, SSE_MIMETYPE, JobGroup, bind, claim_worker, current_job,  # noqa: E402
+                             emit, get_bus, parse_last_event_id)
+from serialization import get_serializer  # noqa: E402
+
+_json_codec = get_serializer('fast_json')
+WORKER_LOCK_PATH = os.getenv('ASGI_WORKER_LOCK', os.path.join(BACKEND_DIR, '.asgi_worker.lock'))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON responses through the same fast codec as the Flask app's jsonify()"""
+
+    def render(self, content) -> bytes:
+        return _json_codec.dumps(content)
+
+
+company_data_flights = AsyncSingleFlight()
+company_data_groups = {}  # flight key -> JobGroup of the jobs waiting on that fetch
+
+
+async def get_company_data_async(ticker, company_name, http):
+    """
+    get_company_data for the async server: the web scrapers run concurrently
+    on the event loop, then yfinance and the merge run on the thread pool.
+    Results go through the same single_flight store and per-key lock file as
+    the Flask path, so concurrent misses in different processes scrape once
+    and the result is reused for the rest of its window.
+    """
+    flights = backend.single_flight
+    if flights is None or not flights.db_path:
+        return await scrape_company_data(ticker, company_name, http)
+
+    key = flights.key(ticker, backend.company_data_dataset(company_name))
+    lock = flights.file_lock(key)
+    await run_blocking(lock.__enter__)  # waits on a pool thread while another process fetches
+    try:
+        found, data = await run_blocking(flights.stored, key)
+        if found:
+            emit('cache', f"Reused company data already fetched for {ticker.upper()}", status='hit')
+            return data
+        data = await scrape_company_data(ticker, company_name, http)
+        await run_blocking(flights.store, key, data)
+        return data
+    finally:
+        await run_blocking(lock.__exit__, None, None, None)
+
+
+async def scrape_company_data(ticker, company_name, http):
+    """Scrape every source concurrently and merge (no store involved)"""
+    sources = list(backend.SCRAPERS)
+    for source in sources:
+        emit('data', f"Trying {backend.SOURCE_LABELS[source]}", status='started', source=source)
+    results = await asyncio.gather(*(backend.SCRAPERS[source][1](ticker, http) for source in sources))
+    return await run_blocking(backend.fetch_comprehensive_company_data, ticker, company_name,
+                              dict(zip(sources, results)))
+
+
+async def shared_company_data(key, group, ticker, company_name, http):
+    """The shared fetch behind company_data_flights: its progress goes to every job in the group"""
+    try:
+        with bind(group):
+            return await get_company_data_async(ticker, company_name, http)
+    finally:
+        if company_data_groups.get(key) is group:
+            del company_data_groups[key]
+
+
+async def generate_company_model(company_name, ticker, model_type, http):
+    """backend.run_generate_job for the async server"""
+    print(f"📊 Generating {model_type} model for {company_name} ({ticker})")
+    emit('job', f"Generating {model_type.upper()} model for {company_name} ({ticker.upper()})", status='started')
+
+    valuation = await run_blocking(backend.precomputed_headline, ticker, model_type)
+    if valuation:
+        emit('cache', f"Precomputed {model_type.upper()} valuation as of {valuation['as_of']}", status='hit',
+             valuation=valuation)
+
+    key = (ticker.upper(), company_name)
+    group = company_data_groups.get(key) if key in company_data_flights else None
+    if group is not None:
+        emit('cache', f"Joined a data fetch already running for {ticker.upper()}", status='hit')
+        group.join(current_job())  # replays the fetch's progress so far
+    else:
+        group = company_data_groups[key] = JobGroup([current_job()])
+    company_data = await company_data_flights.do(key, shared_company_data, key, group, ticker, company_name, http)
+
+    emit('excel', f"Building {model_type.upper()} workbook", status='started')
+    filepath, filename = await run_cpu(backend.build_model_file, company_data, model_type)
+    # Built in a worker process, which publishes nowhere: report the save from here
+    emit('excel', "Workbook saved", status='ok', filename=filename)
+
+    print(f"✅ {model_type.upper()} model created successfully")
+    return backend.generate_payload(company_name, ticker, model_type, company_data, filename, valuation)
+
+
+async def health_check(request):
+    return FastJSONResponse(backend.health_payload())
+
+
+async def generate_model(request):
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        fields, error = backend.parse_generate_request(data)
+        if error:
+            return FastJSONResponse({'error': error}, status_code=400)
+        return FastJSONResponse(await generate_company_model(*fields, request.app.state.http))
+
+    except Exception as e:
+        return FastJSONResponse(backend.generate_error_payload(e), status_code=500)
+
+
+async def create_generate_job(request):
+    """Start a generation in the background; progress streams from events_url"""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    fields, error = backend.parse_generate_request(data)
+    if error:
+        return FastJSONResponse({'error': error}, status_code=400)
+    company_name, ticker, model_type = fields
+
+    bus = get_bus()
+    job_id = bus.create_job(company=company_name, ticker=ticker.upper(), model_type=model_type)
+
+    async def run():
+        with bind(job_id):
+            try:
+                bus.complete(job_id, await generate_company_model(company_name, ticker, model_type,
+                                                                  request.app.state.http))
+            except Exception as e:
+                bus.fail(job_id, e)
+
+    jobs = request.app.state.jobs
+    task = asyncio.create_task(run())
+    jobs.add(task)  # the loop only keeps weak references to tasks
+    task.add_done_callback(jobs.discard)
+    return FastJSONResponse(backend.job_accepted_payload(job_id), status_code=202)
+
+
+async def job_status(request):
+    body, status = backend.job_status_payload(request.path_params['job_id'])
+    return FastJSONResponse(body, status_code=status)
+
+
+async def job_events(request):
+    """Server-Sent Events: replays missed events (Last-Event-ID), then streams until the job ends"""
+    job_id = request.path_params['job_id']
+    body, status = backend.job_status_payload(job_id)
+    if status != 200:
+        return FastJSONResponse(body, status_code=status)
+    last_event_id = parse_last_event_id(request.headers.get('last-event-id')
+                                        or request.query_params.get('last_event_id'))
+    return StreamingResponse(get_bus().asse_stream(job_id, last_event_id),
+                             media_type=SSE_MIMETYPE, headers=SSE_HEADERS)
+
+
+async def headline_valuation(request):
+    body, status = await run_blocking(backend.valuation_payload, request.path_params['ticker'])
+    return FastJSONResponse(body, status_code=status)
+
+
+async def download_file(request):
+    filename = request.path_params['filename']
+    try:
+        filepath = await run_blocking(backend.download_path, filename)
+        if not filepath:
+            return FastJSONResponse({'error': 'File not found'}, status_code=404)
+        # Streamed from disk without blocking the loop (ETag / Range handled by Starlette)
+        return FileResponse(filepath, filename=filename, media_type=backend.XLSX_MIMETYPE)
+    except Exception as e:
+        return FastJSONResponse({'error': f'Download failed: {str(e)}'}, status_code=500)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    worker_lock = claim_worker(WORKER_LOCK_PATH)  # job events are per process: one worker only
+    app.state.http = AsyncHTTP()
+    app.state.jobs = set()
+    if backend.precompute_service() is not None:
+        backend.precompute_service().start()  # keep watchlist valuations warm for /api/valuation and /api/generate
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+        shutdown_executors(wait=False)
+        if worker_lock is not None:
+            worker_lock.close()
+
+
+app = Starlette(
+    routes=[
+        Route('/api/health', health_check, methods=['GET']),
+        Route('/api/generate', generate_model, methods=['POST']),
+        Route('/api/jobs', create_generate_job, methods=['POST']),
+        Route('/api/jobs/{job_id}', job_status, methods=['GET']),
+        Route('/api/jobs/{job_id}/events', job_events, methods=['GET']),
+        Route('/api/valuation/{ticker}', headline_valuation, methods=['GET']),
+        Route('/api/download/{filename}', download_file, methods=['GET']),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🚀 Starting Professional Financial Models API (async)")
+    print("   🔧 API: http://localhost:5001")
+    uvicorn.run(app, host='0.0.0.0', port=5001, workers=1)
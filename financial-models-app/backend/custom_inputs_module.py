@@ -2,6 +2,10 @@
 """
 Custom Inputs Module for Financial Models
 Allows users to override research-based assumptions with custom values
+
+Custom inputs can also update an existing ProfessionalLBOModel incrementally:
+update_lbo_model() maps the overrides to LBO inputs and recomputes only the
+steps (and rewrites only the workbook tabs) that depend on a changed input.
 """
 
 import pandas as pd
@@ -10,6 +14,20 @@ from datetime import datetime
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
 
+# Custom input metric -> (ProfessionalLBOModel input, list index or None)
+LBO_INPUT_MAPPING = {
+    'Revenue Growth Year 1': ('revenue_growth', 0),
+    'Revenue Growth Year 2': ('revenue_growth', 1),
+    'Revenue Growth Year 3': ('revenue_growth', 2),
+    'Revenue Growth Year 4': ('revenue_growth', 3),
+    'Revenue Growth Year 5': ('revenue_growth', 4),
+    'EBITDA Margin': ('ebitda_margin', None),
+    'Tax Rate': ('tax_rate', None),
+    'CapEx as % of Revenue': ('capex_pct', None),
+    'Cost of Debt': ('senior_rate', None),
+    'EV/EBITDA Multiple': ('exit_multiple_base', None)
+}
+
 class CustomInputsManager:
     """Manages custom user inputs for financial models"""
     
@@ -392,6 +410,35 @@ class CustomInputsManager:
         
         return modified_assumptions
     
+    def lbo_input_changes(self, custom_inputs, current_inputs):
+        """LBO input overrides from custom inputs; list inputs are patched from current_inputs"""
+        changes = {}
+        for metric, value in (custom_inputs or {}).items():
+            if metric not in LBO_INPUT_MAPPING:
+                continue
+            name, index = LBO_INPUT_MAPPING[metric]
+            parsed_value = self._parse_custom_value(metric, value)
+            if not isinstance(parsed_value, (int, float)):
+                continue
+            if index is None:
+                changes[name] = parsed_value
+                continue
+            values = list(changes.get(name, current_inputs[name]))
+            if index < len(values):
+                values[index] = parsed_value
+                changes[name] = values
+        return changes
+    
+    def update_lbo_model(self, lbo_model, graph, custom_inputs, excel_file=None):
+        """
+        Apply custom inputs to an LBO model built with build_computation_graph().
+        Only the steps that read a changed input are recomputed, and only their
+        tabs of excel_file are rewritten. Returns (lbo_results, rewritten_sheets).
+        """
+        current_inputs = {name: graph.get(name) for name, _ in LBO_INPUT_MAPPING.values()}
+        changes = self.lbo_input_changes(custom_inputs, current_inputs)
+        return lbo_model.recalculate(graph, changes, excel_file)
+    
     def _parse_custom_value(self, metric, value):
         """Parse custom value based on metric type"""
         if isinstance(value, (int, float)):
@@ -478,4 +525,8 @@ def get_custom_inputs(ws):
 
 def apply_custom_inputs(research_assumptions, custom_inputs):
     """Convenience function to apply custom inputs"""
-    return custom_inputs_manager.apply_custom_inputs(research_assumptions, custom_inputs) 
\ No newline at end of file
+    return custom_inputs_manager.apply_custom_inputs(research_assumptions, custom_inputs) 
+
+def update_lbo_model(lbo_model, graph, custom_inputs, excel_file=None):
+    """Convenience function to apply custom inputs to an LBO model incrementally"""
+    return custom_inputs_manager.update_lbo_model(lbo_model, graph, custom_inputs, excel_file)
\ No newline at end of file
@@ -10,7 +10,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
 from openpyxl.chart import LineChart, Reference
-import yfinance as yf
+import yfinance_gateway
 from datetime import datetime
 import warnings
 warnings.filterwarnings("ignore")
@@ -98,7 +98,7 @@ class ThreeStatementModel:
         # Fetch real data if ticker provided
         if ticker:
             try:
-                stock = yf.Ticker(ticker)
+                stock = yfinance_gateway.ticker(ticker)
                 info = stock.info
                 
                 # Get financial statements
@@ -155,59 +155,170 @@ function handleGenerate() {
     // Show loading screen
     showLoading();
     
-    // Make API request for Excel generation
-    fetch('/api/generate', {
+    const request = {
+        company_name: companyName,
+        ticker: tickerSymbol,
+        models: selectedModels
+    };
+    
+    if (!window.EventSource) {
+        generateAndWait(request);
+        return;
+    }
+    
+    // Start the build as a background job and follow its progress, instead of
+    // holding one request open until the whole pipeline finishes
+    fetch('/api/jobs', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
-        body: JSON.stringify({
-            company_name: companyName,
-            ticker: tickerSymbol,
-            models: selectedModels
-        })
+        body: JSON.stringify(request)
     })
     .then(response => {
+        if (response.status === 404 || response.status === 503) {
+            return null;  // Server without progress streaming
+        }
         if (!response.ok) {
             return response.json().then(err => Promise.reject(err));
         }
         return response.json();
     })
-    .then(data => {
-        hideLoading();
-        
-        if (data.success && data.results && data.results.length > 0) {
-            showResults(data);
+    .then(job => {
+        if (job) {
+            followJob(job);
         } else {
-            showError('Generation Failed', 
-                data.error || 'Failed to generate financial models. Please try again.');
+            generateAndWait(request);
         }
     })
-    .catch(error => {
-        hideLoading();
-        console.error('Generation error:', error);
-        showError('Generation Error', 
-            error.error || error.message || 'An unexpected error occurred. Please try again.');
-    });
+    .catch(handleGenerateError);
+}
+
+function generateAndWait(request) {
+    // Blocking request; the steps are illustrative only
+    animateLoadingSteps(GENERATION_STEPS);
+    
+    fetch('/api/generate', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(request)
+    })
+    .then(response => {
+        if (!response.ok) {
+            return response.json().then(err => Promise.reject(err));
+        }
+        return response.json();
+    })
+    .then(handleGenerateResult)
+    .catch(handleGenerateError);
+}
+
+function followJob(job) {
+    const events = new EventSource(job.events_url);
+    
+    events.onmessage = (message) => {
+        const event = JSON.parse(message.data);
+        renderProgressEvent(event);
+        
+        if (event.stage === 'complete') {
+            events.close();
+            handleGenerateResult(event.result);
+        } else if (event.stage === 'failed') {
+            events.close();
+            handleGenerateError({ error: `Failed to generate model: ${event.error}` });
+        }
+    };
+    
+    // EventSource reconnects by itself after network blips and resumes from the
+    // last event it saw; it only closes for good if the job is gone
+    events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+            handleGenerateError({ error: 'Lost the progress stream for this model. Please try again.' });
+        }
+    };
+}
+
+function handleGenerateResult(data) {
+    hideLoading();
+    
+    if (data && data.success && data.results && data.results.length > 0) {
+        showResults(data);
+    } else {
+        showError('Generation Failed', 
+            (data && data.error) || 'Failed to generate financial models. Please try again.');
+    }
+}
+
+function handleGenerateError(error) {
+    hideLoading();
+    console.error('Generation error:', error);
+    showError('Generation Error', 
+        error.error || error.message || 'An unexpected error occurred. Please try again.');
 }
 
+// Illustrative steps for servers without progress streaming
+const GENERATION_STEPS = [
+    'Fetching real financial data from Yahoo Finance...',
+    'Analyzing company fundamentals and ratios...',
+    'Building Wall Street-grade financial models...',
+    'Applying professional Excel formatting...',
+    'Creating industry-specific assumptions...',
+    'Generating sensitivity analysis tables...',
+    'Finalizing your professional Excel files...'
+];
+
 function showLoading() {
     document.getElementById('companySection').classList.add('hidden');
     document.getElementById('modelSection').classList.add('hidden');
     document.getElementById('loadingScreen').classList.remove('hidden');
+    document.querySelector('.loading-steps').innerHTML = '';
+}
+
+function renderProgressEvent(event) {
+    // One row per stage; events from the same data source update their row in place
+    const stepsList = document.querySelector('.loading-steps');
+    const key = event.source ? `source-${event.source}` : null;
+    let stepElement = key ? stepsList.querySelector(`[data-key="${key}"]`) : null;
     
-    // Enhanced loading steps for Excel generation
-    const steps = [
-        'Fetching real financial data from Yahoo Finance...',
-        'Analyzing company fundamentals and ratios...',
-        'Building Wall Street-grade financial models...',
-        'Applying professional Excel formatting...',
-        'Creating industry-specific assumptions...',
-        'Generating sensitivity analysis tables...',
-        'Finalizing your professional Excel files...'
-    ];
-    
-    animateLoadingSteps(steps);
+    if (event.stage === 'complete' || event.stage === 'failed') {
+        stepsList.querySelectorAll('.loading-step.active').forEach(step => completeLoadingStep(step, 'ok'));
+        return;
+    }
+    
+    if (!stepElement) {
+        // A new stage started, so the stages before it are done
+        stepsList.querySelectorAll('.loading-step.active:not([data-key])')
+            .forEach(step => completeLoadingStep(step, 'ok'));
+        
+        stepElement = document.createElement('div');
+        stepElement.className = 'loading-step active';
+        if (key) {
+            stepElement.dataset.key = key;
+        }
+        stepElement.innerHTML = `
+            <div class="step-icon">
+                <i class="fas fa-circle-notch fa-spin"></i>
+            </div>
+            <div class="step-text"></div>
+        `;
+        stepsList.appendChild(stepElement);
+    }
+    
+    stepElement.querySelector('.step-text').textContent = event.message;
+    if (event.status !== 'started' && event.status !== 'queued') {
+        completeLoadingStep(stepElement, event.status);
+    }
+}
+
+function completeLoadingStep(stepElement, status) {
+    const failed = status === 'failed' || status === 'empty';
+    stepElement.classList.remove('active');
+    stepElement.classList.add('complete');
+    stepElement.querySelector('.step-icon').innerHTML = failed
+        ? '<i class="fas fa-exclamation-circle"></i>'
+        : '<i class="fas fa-check-circle"></i>';
 }
 
 function animateLoadingSteps(steps) {
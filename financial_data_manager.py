@@ -24,6 +24,10 @@ import pandas as pd
 import numpy as np
 from dotenv import load_dotenv
 
+from single_flight import get_single_flight
+from company_universe import DEFAULT_LAST_YEAR, CompanyUniverse
+from serialization import DEFAULT_CACHE_FORMAT, SerializationError, get_serializer, pack, unpack
+
 # Load environment variables
 load_dotenv()
 
@@ -52,6 +56,7 @@ except ImportError:
 
 try:
     import yfinance as yf
+    from yfinance_gateway import get_gateway as get_yfinance_gateway
     YAHOO_FINANCE_AVAILABLE = True
 except ImportError:
     YAHOO_FINANCE_AVAILABLE = False
@@ -213,27 +218,35 @@ class CompanyFinancials:
 class DataCache:
     """Caching system for financial data to improve performance."""
 
-    def __init__(self, cache_dir: str = ".financial_cache", max_age_hours: int = 24):
+    def __init__(self, cache_dir: str = ".financial_cache", max_age_hours: int = 24,
+                 cache_format: Optional[str] = None):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.max_age_hours = max_age_hours
+        # msgpack when installed (compact, arrays kept as buffers), JSON otherwise
+        self.serializer = get_serializer(cache_format or os.getenv('FINANCIAL_CACHE_FORMAT', DEFAULT_CACHE_FORMAT))
 
     def _get_cache_key(self, ticker: str, data_type: str) -> str:
         """Generate cache key for ticker and data type."""
         key_string = f"{ticker}_{data_type}"
         return hashlib.md5(key_string.encode()).hexdigest()
 
-    def _get_cache_path(self, cache_key: str) -> Path:
+    def _get_cache_path(self, cache_key: str, extension: Optional[str] = None) -> Path:
         """Get full path for cache file."""
-        return self.cache_dir / f"{cache_key}.json"
+        return self.cache_dir / f"{cache_key}{extension or self.serializer.extension}"
 
-    def get(self, ticker: str, data_type: str) -> Optional[Dict[str, Any]]:
+    def get(self, ticker: str, data_type: str, schema: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Retrieve data from cache if it exists and is fresh."""
         cache_key = self._get_cache_key(ticker, data_type)
         cache_path = self._get_cache_path(cache_key)
+        serializer = self.serializer
 
         if not cache_path.exists():
-            return None
+            # Entries written before the cache format was configurable
+            cache_path = self._get_cache_path(cache_key, '.json')
+            serializer = get_serializer('fast_json')
+            if not cache_path.exists():
+                return None
 
         try:
             # Check if cache is too old
@@ -242,33 +255,34 @@ class DataCache:
                 cache_path.unlink()  # Delete old cache
                 return None
 
-            with open(cache_path, 'r') as f:
-                return json.load(f)
+            return unpack(cache_path.read_bytes(), schema, serializer.name)
 
-        except (json.JSONDecodeError, OSError):
+        except (SerializationError, OSError):
             return None
 
-    def set(self, ticker: str, data_type: str, data: Dict[str, Any]):
-        """Store data in cache."""
+    def set(self, ticker: str, data_type: str, data: Dict[str, Any], schema: Optional[str] = None):
+        """Store data in cache (in a versioned envelope when a schema is given)."""
         cache_key = self._get_cache_key(ticker, data_type)
         cache_path = self._get_cache_path(cache_key)
 
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-        except OSError:
+            blob = pack(schema, data, self.serializer.name) if schema else self.serializer.dumps(data)
+            tmp_path = cache_path.with_suffix(cache_path.suffix + '.tmp')
+            tmp_path.write_bytes(blob)
+            tmp_path.replace(cache_path)
+        except (SerializationError, OSError):
             pass  # Silently fail if cache write fails
 
     def clear(self, ticker: Optional[str] = None):
         """Clear cache, optionally for specific ticker."""
         if ticker:
             # Clear specific ticker cache
-            for cache_file in self.cache_dir.glob("*.json"):
+            for cache_file in self.cache_dir.glob("*.*"):
                 if ticker.lower() in cache_file.stem.lower():
                     cache_file.unlink()
         else:
             # Clear all cache
-            for cache_file in self.cache_dir.glob("*.json"):
+            for cache_file in self.cache_dir.glob("*.*"):
                 cache_file.unlink()
 
 
@@ -341,6 +355,7 @@ class FinancialDataManager:
         self.cache = DataCache(max_age_hours=max_cache_age_hours) if cache_enabled else None
         self.source_manager = DataSourceManager()
         self.last_request_time = {}  # Rate limiting
+        self.single_flight = get_single_flight()
 
     def get_company_financials(self, ticker: str, years: int = 5, force_refresh: bool = False) -> CompanyFinancials:
         """
@@ -358,11 +373,21 @@ class FinancialDataManager:
 
         # Check cache first (unless force refresh)
         if not force_refresh and self.cache:
-            cached_data = self.cache.get(ticker, "financials")
+            cached_data = self.cache.get(ticker, "financials", schema="company_financials")
             if cached_data:
                 print(f"   📋 Using cached data (age: {self._get_cache_age_hours(ticker, 'financials'):.1f} hours)")
                 return CompanyFinancials.from_dict(cached_data)
 
+        # A forced refresh never reuses a result stored earlier in the window
+        if force_refresh:
+            return self.single_flight.refresh(ticker, f"financials:{years}", self._fetch_company_financials,
+                                              ticker, years)
+
+        # Concurrent requests for the same ticker share one upstream fetch
+        return self.single_flight.do(ticker, f"financials:{years}", self._fetch_company_financials, ticker, years)
+
+    def _fetch_company_financials(self, ticker: str, years: int) -> CompanyFinancials:
+        """Retrieve, cross-validate and cache financials (one in-flight call per ticker)."""
         # Retrieve from multiple sources
         source_data = self._retrieve_from_all_sources(ticker, years)
 
@@ -378,7 +403,7 @@ class FinancialDataManager:
 
         # Cache the result
         if self.cache:
-            self.cache.set(ticker, "financials", merged_data.to_dict())
+            self.cache.set(ticker, "financials", merged_data.to_dict(), schema="company_financials")
 
         return merged_data
 
@@ -482,14 +507,19 @@ class FinancialDataManager:
     def _get_yahoo_finance_data(self, yf_client, ticker: str, years: int) -> Dict:
         """Retrieve data from Yahoo Finance."""
         try:
-            ticker_obj = yf_client.Ticker(ticker)
+            # Get all financial statements (fetched concurrently, memoized for the day)
+            statements = get_yfinance_gateway().statements(ticker)
+            if statements['info'] is None:
+                return None
+
+            def as_dict(frame):
+                return frame.to_dict() if frame is not None and not frame.empty else {}
 
-            # Get all financial statements
             data = {
-                'info': ticker_obj.info,
-                'income_statement': ticker_obj.financials.to_dict() if not ticker_obj.financials.empty else {},
-                'balance_sheet': ticker_obj.balance_sheet.to_dict() if not ticker_obj.balance_sheet.empty else {},
-                'cash_flow': ticker_obj.cashflow.to_dict() if not ticker_obj.cashflow.empty else {}
+                'info': statements['info'],
+                'income_statement': as_dict(statements['financials']),
+                'balance_sheet': as_dict(statements['balance_sheet']),
+                'cash_flow': as_dict(statements['cashflow'])
             }
 
             return data
@@ -700,6 +730,30 @@ class FinancialDataManager:
         print(f"   🎯 Completed: {len([r for r in results.values() if r.company_name])}/{total_companies} companies")
         return results
 
+    def get_universe(self, tickers: List[str], years: int = 5,
+                     last_years: Optional[Dict[str, int]] = None) -> CompanyUniverse:
+        """
+        Get financial data for multiple companies as one array-backed universe.
+
+        Histories are stored by fiscal year (the last value of each series at
+        last_years[ticker], default last calendar year), so screens and
+        cross-sections run vectorized instead of looping over objects. Each
+        company goes into the columns as soon as it is fetched.
+        """
+        universe = CompanyUniverse(CompanyFinancials)
+        universe.reserve(len(tickers))
+        last_years = {str(t).upper(): year for t, year in (last_years or {}).items()}
+
+        print(f"📊 Loading {len(tickers)} companies into the universe...")
+        for ticker in tickers:
+            try:
+                record = self.get_company_financials(ticker, years)
+            except Exception as e:
+                print(f"   ❌ {ticker} failed: {e}")
+                record = CompanyFinancials(ticker=ticker)
+            universe.add(record, last_years.get(str(record.ticker).upper(), DEFAULT_LAST_YEAR))
+        return universe
+
     def clear_cache(self, ticker: Optional[str] = None):
         """Clear cache for specific ticker or all cached data."""
         if self.cache:
@@ -2250,33 +2250,20 @@ def download_file(filename):
 
 @app.route('/download-all')
 def download_all_models():
-    """Download all models as a zip file"""
+    """Download all models as a zip file (streamed, cached for repeat downloads)"""
     try:
-        import zipfile
-        import tempfile
-        from datetime import datetime
-        
-        # Create temporary zip file
+        from streaming_downloads import bundle_response
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         zip_filename = f"FinModAI_All_Models_{timestamp}.zip"
-        
-        # Create zip in memory
-        temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-        
-        with zipfile.ZipFile(temp_zip.name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            models_dir = os.path.join(os.getcwd(), 'generated_models')
-            if os.path.exists(models_dir):
-                for filename in os.listdir(models_dir):
-                    if filename.endswith(('.xlsx', '.xls')):
-                        file_path = os.path.join(models_dir, filename)
-                        zipf.write(file_path, filename)
-        
-        return send_file(
-            temp_zip.name, 
-            as_attachment=True, 
-            download_name=zip_filename,
-            mimetype='application/zip'
-        )
+
+        models_dir = os.path.join(os.getcwd(), 'generated_models')
+        paths = []
+        if os.path.exists(models_dir):
+            paths = [os.path.join(models_dir, filename) for filename in sorted(os.listdir(models_dir))
+                     if filename.endswith(('.xlsx', '.xls'))]
+
+        return bundle_response(paths, zip_filename)
     except Exception as e:
         flash(f"Bulk download error: {str(e)}", "error")
         return redirect(url_for('dashboard'))
@@ -19,10 +19,10 @@ logger = logging.getLogger('FinModAI.DataIngestion')
 
 # Import available data sources
 try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
+    from yfinance_gateway import YFINANCE_AVAILABLE, get_gateway as get_yfinance_gateway
 except ImportError:
     YFINANCE_AVAILABLE = False
+if not YFINANCE_AVAILABLE:
     logger.warning("yfinance not available")
 
 try:
@@ -33,6 +33,13 @@ except ImportError:
     ALPHA_VANTAGE_AVAILABLE = False
     logger.warning("Alpha Vantage not available")
 
+try:
+    from single_flight import get_single_flight
+    SINGLE_FLIGHT_AVAILABLE = True
+except ImportError:
+    SINGLE_FLIGHT_AVAILABLE = False
+    logger.warning("single_flight not available - requests will not be coalesced")
+
 try:
     import numpy as np
     NUMPY_AVAILABLE = True
@@ -40,6 +47,25 @@ except ImportError:
     NUMPY_AVAILABLE = False
     logger.warning("numpy not available")
 
+try:
+    from company_universe import CompanyUniverse
+    COMPANY_UNIVERSE_AVAILABLE = True
+except ImportError:
+    COMPANY_UNIVERSE_AVAILABLE = False
+
+try:
+    from serialization import pack, unpack
+    SERIALIZATION_AVAILABLE = True
+except ImportError:
+    SERIALIZATION_AVAILABLE = False
+
+# Progress events for live build progress (no-ops without the bus)
+try:
+    from progress_events import emit
+except ImportError:
+    def emit(*args, **kwargs):
+        return None
+
 @dataclass
 class DataSourceConfig:
     """Configuration for a data source."""
@@ -99,6 +125,19 @@ class FinancialData:
         """Create from dictionary."""
         return cls(**data)
 
+    def to_bytes(self, format: str = 'msgpack') -> bytes:
+        """Encode as a versioned 'financial_data' payload (msgpack, fast_json or json)."""
+        if not SERIALIZATION_AVAILABLE:
+            raise RuntimeError("serialization module not available")
+        return pack('financial_data', self.to_dict(), format)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes, format: str = 'msgpack') -> 'FinancialData':
+        """Decode a payload written by to_bytes(), migrating older schema versions."""
+        if not SERIALIZATION_AVAILABLE:
+            raise RuntimeError("serialization module not available")
+        return cls.from_dict(unpack(blob, 'financial_data', format))
+
 class DataIngestionEngine:
     """Main data ingestion engine coordinating multiple data sources."""
 
@@ -114,6 +153,9 @@ class DataIngestionEngine:
         self.last_request_time = {}
         self.request_counts = {}
 
+        # Request coalescing (shared across processes when available)
+        self.single_flight = get_single_flight() if SINGLE_FLIGHT_AVAILABLE else None
+
         logger.info("🔄 Data Ingestion Engine initialized")
 
     def _initialize_data_sources(self) -> Dict[str, DataSourceConfig]:
@@ -272,13 +314,50 @@ class DataIngestionEngine:
         """
         Get comprehensive financial data for a company.
 
+        Concurrent requests for the same company share one upstream fetch.
+
         Args:
             company_identifier: Company ticker, name, or CIK
 
         Returns:
             FinancialData object or None if not found
         """
+        if self.single_flight is None:
+            return self._fetch_company_data(company_identifier)
+        fetched = []
 
+        def fetch(identifier):
+            fetched.append(True)
+            return self._fetch_company_data(identifier)
+
+        data = self.single_flight.do(company_identifier, 'company_data', fetch, company_identifier)
+        if not fetched:
+            emit('cache', f"Reused company data already fetched for {company_identifier}", status='hit')
+        return data
+
+    def get_universe(self, company_identifiers: List[str]) -> 'CompanyUniverse':
+        """
+        Get data for many companies as one array-backed CompanyUniverse.
+
+        Companies that cannot be found are skipped. Each company is written
+        into the columns as soon as it is fetched, so no list of FinancialData
+        objects is held; screens run vectorized and universe[ticker] still
+        reads like a FinancialData object.
+        """
+        if not COMPANY_UNIVERSE_AVAILABLE:
+            raise RuntimeError("company_universe (numpy) is required for universe loading")
+
+        universe = CompanyUniverse(FinancialData)
+        universe.reserve(len(company_identifiers))
+        for identifier in company_identifiers:
+            data = self.get_company_data(identifier)
+            if data is not None:
+                universe.add(data)
+        logger.info(f"📊 Loaded {len(universe)}/{len(company_identifiers)} companies into the universe")
+        return universe
+
+    def _fetch_company_data(self, company_identifier: str) -> Optional[FinancialData]:
+        """Pull company data from the sources in priority order."""
         logger.info(f"🔍 Fetching data for: {company_identifier}")
         # Always pull fresh data from multiple sources
         logger.info("🔄 Pulling fresh data from multiple financial sources...")
@@ -291,19 +370,24 @@ class DataIngestionEngine:
                 continue
 
             logger.debug(f"🔍 Trying {source_name}...")
+            emit('data', f"Trying {source_name}", status='started', source=source_name)
             try:
                 data = self._fetch_from_source(source_name, company_identifier)
                 if data:
                     # Check if the data is complete (has essential fields like market_cap)
                     if data.market_cap is not None and data.market_cap > 0:
                         logger.info(f"✅ Complete data retrieved from {source_name}")
+                        emit('data', f"{source_name}: complete data retrieved", status='ok', source=source_name)
                         return data
                     else:
                         logger.debug(f"⚠️ Incomplete data from {source_name}, trying other sources...")
+                        emit('data', f"{source_name}: incomplete data", status='empty', source=source_name)
                         continue
+                emit('data', f"{source_name}: no data", status='empty', source=source_name)
 
             except Exception as e:
                 logger.warning(f"❌ {source_name} failed: {e}")
+                emit('data', f"{source_name} failed: {e}", status='failed', source=source_name)
                 continue
 
         # Suggest common ticker corrections and try corrected version
@@ -319,6 +403,8 @@ class DataIngestionEngine:
         }
 
         suggestion = suggestions.get(company_identifier.upper(), "")
+        if suggestion == company_identifier.upper():
+            suggestion = ""  # Already the canonical ticker; retrying would recurse on the same key
         if suggestion:
             logger.info(f"🔄 Correcting ticker '{company_identifier}' to '{suggestion}' and retrying...")
             corrected_data = self.get_company_data(suggestion)
@@ -664,8 +750,8 @@ class DataIngestionEngine:
     def _fetch_yfinance_data(self, identifier: str) -> Optional[FinancialData]:
         """Fetch data from Yahoo Finance."""
         try:
-            ticker = yf.Ticker(identifier)
-            info = ticker.info
+            gateway = get_yfinance_gateway()
+            info = gateway.get(identifier, 'info')
 
             if not info or info.get('regularMarketPrice') is None:
                 return None
@@ -674,10 +760,11 @@ class DataIngestionEngine:
             if not info.get('marketCap') or info.get('marketCap') <= 0:
                 return None
 
-            # Get financial statements
-            income_stmt = ticker.financials
-            balance_sheet = ticker.balance_sheet
-            cash_flow = ticker.cashflow
+            # Get financial statements (fetched concurrently, memoized for the day)
+            statements = gateway.statements(identifier, ['financials', 'balance_sheet', 'cashflow'])
+            income_stmt = statements['financials'] if statements['financials'] is not None else pd.DataFrame()
+            balance_sheet = statements['balance_sheet'] if statements['balance_sheet'] is not None else pd.DataFrame()
+            cash_flow = statements['cashflow'] if statements['cashflow'] is not None else pd.DataFrame()
 
             data = FinancialData(
                 company_name=info.get('longName', identifier),
@@ -18,6 +18,24 @@ from openpyxl.formatting.rule import FormulaRule, CellIsRule
 from openpyxl.drawing.image import Image
 from openpyxl.chart import LineChart, BarChart, ScatterChart, Reference
 
+try:
+    from serialization import get_serializer, write_file
+    SERIALIZATION_AVAILABLE = True
+except ImportError:
+    SERIALIZATION_AVAILABLE = False
+
+try:
+    from model_manifest import record_artifact
+    MODEL_MANIFEST_AVAILABLE = True
+except ImportError:
+    MODEL_MANIFEST_AVAILABLE = False
+
+try:
+    from progress_events import emit
+except ImportError:
+    def emit(*args, **kwargs):
+        return None
+
 logger = logging.getLogger('FinModAI.ExcelEngine')
 
 class ExcelGenerationEngine:
@@ -99,7 +117,7 @@ class ExcelGenerationEngine:
 
         Args:
             model_spec: ModelSpecification object
-            output_format: Output format (excel, pdf, json)
+            output_format: Output format (excel, json, msgpack)
 
         Returns:
             List of generated file paths
@@ -114,6 +132,8 @@ class ExcelGenerationEngine:
             return files
         elif output_format.lower() == "json":
             return self._generate_json_output(model_spec)
+        elif output_format.lower() == "msgpack":
+            return self._generate_binary_output(model_spec)
         else:
             raise ValueError(f"Unsupported output format: {output_format}")
 
@@ -171,6 +191,19 @@ class ExcelGenerationEngine:
 
         # Save workbook
         wb.save(filepath)
+        emit('excel', f"Sheets written: {', '.join(wb.sheetnames)}", status='ok',
+             sheets=wb.sheetnames, filename=filename)
+
+        # Sidecar + manifest entry (inputs hash and headline outputs) for stale-model detection
+        if MODEL_MANIFEST_AVAILABLE:
+            try:
+                outputs = {k: v for k, v in (model_spec.outputs or {}).items()
+                           if isinstance(v, (int, float, str)) and not isinstance(v, bool)}
+                record_artifact(filepath, getattr(model_spec.company_data, 'ticker', None), model_spec.model_type,
+                                inputs={'company_data': model_spec.company_data, 'assumptions': model_spec.assumptions},
+                                outputs=outputs, company_name=company_name, generator='finmodai_excel_engine')
+            except Exception as e:
+                logger.warning(f"⚠️ Could not record model metadata for {filepath}: {e}")
 
         logger.info(f"✅ Excel file generated: {filepath}")
         return [str(filepath)]
@@ -794,8 +827,29 @@ class ExcelGenerationEngine:
         filename = f"model_output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         filepath = self.output_dir / filename
 
-        with open(filepath, 'w') as f:
-            json.dump(output_data, f, indent=2, default=str)
+        if SERIALIZATION_AVAILABLE:
+            # orjson when installed; NumPy outputs are written without per-element conversion
+            write_file(filepath, output_data, format='fast_json', pretty=True)
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(output_data, f, indent=2, default=str)
 
         logger.info(f"✅ JSON output generated: {filepath}")
         return [str(filepath)]
+
+    def _generate_binary_output(self, model_spec: Any) -> List[str]:
+        """Generate a compact msgpack model specification (versioned 'model_spec' schema)."""
+        if not SERIALIZATION_AVAILABLE:
+            raise ValueError("Unsupported output format: msgpack (serialization module not available)")
+        get_serializer('msgpack')  # Fails early when msgpack is not installed
+
+        spec = {field: getattr(model_spec, field, None) for field in (
+            'model_type', 'company_data', 'assumptions', 'calculations', 'outputs',
+            'sensitivity_analysis', 'scenario_analysis', 'visualization_config', 'audit_trail')}
+        spec['generated_at'] = datetime.now()
+
+        filename = f"model_spec_{datetime.now().strftime('%Y%m%d_%H%M%S')}.msgpack"
+        filepath = write_file(self.output_dir / filename, spec, schema='model_spec')
+
+        logger.info(f"✅ Binary model spec generated: {filepath}")
+        return [str(filepath)]
@@ -16,16 +16,28 @@ import time
 
 # Web framework
 try:
-    from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+    from flask import Flask, Response, render_template, request, jsonify, send_file, flash, redirect, url_for
     from flask_cors import CORS
     FLASK_AVAILABLE = True
 except ImportError:
     FLASK_AVAILABLE = False
     logger.warning("Flask not available - web interface disabled")
 
+try:
+    from serialization import install_json_provider
+except ImportError:
+    install_json_provider = None
+
+# Background generation jobs whose progress streams over Server-Sent Events
+try:
+    from progress_events import SSE_HEADERS, SSE_MIMETYPE, get_bus, parse_last_event_id
+    PROGRESS_EVENTS_AVAILABLE = True
+except ImportError:
+    PROGRESS_EVENTS_AVAILABLE = False
+
 # Alternative simple HTTP server
 try:
-    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
     import urllib.parse
     import html
     HTTP_SERVER_AVAILABLE = True
@@ -68,6 +80,8 @@ class WebInterface:
                    static_folder=str(self.static_dir))
         app.secret_key = os.environ.get('SECRET_KEY', 'finmodai-secret-key')
         CORS(app)
+        if install_json_provider:
+            install_json_provider(app)  # jsonify() through the fast JSON codec
 
         @app.route('/')
         def index():
@@ -98,22 +112,11 @@ class WebInterface:
         def api_generate_model():
             """API endpoint for model generation."""
             try:
-                data = request.get_json()
-                if not data:
-                    return jsonify({'error': 'No data provided'}), 400
-
-                model_type = data.get('model_type')
-                company_identifier = data.get('company_identifier')
-                assumptions = data.get('assumptions', {})
+                fields, error = self._parse_generate_request(request.get_json(silent=True))
+                if error:
+                    return jsonify({'error': error}), 400
 
-                if not model_type or not company_identifier:
-                    return jsonify({'error': 'Model type and company identifier required'}), 400
-
-                result = self.platform.generate_model(
-                    model_type=model_type,
-                    company_identifier=company_identifier,
-                    assumptions=assumptions
-                )
+                result = self.platform.generate_model(**fields)
 
                 return jsonify(result)
 
@@ -121,6 +124,44 @@ class WebInterface:
                 logger.error(f"API error: {e}")
                 return jsonify({'error': str(e)}), 500
 
+        @app.route('/api/jobs', methods=['POST'])
+        def api_create_job():
+            """Start a model generation in the background; progress streams from events_url."""
+            if not PROGRESS_EVENTS_AVAILABLE:
+                return jsonify({'error': 'Progress streaming is not available'}), 503
+            fields, error = self._parse_generate_request(request.get_json(silent=True))
+            if error:
+                return jsonify({'error': error}), 400
+
+            bus = get_bus()
+            job_id = bus.create_job(model_type=fields['model_type'],
+                                    company_identifier=fields['company_identifier'])
+            bus.run_in_thread(job_id, self.platform.generate_model, **fields)
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status_url': f'/api/jobs/{job_id}',
+                'events_url': f'/api/jobs/{job_id}/events'
+            }), 202
+
+        @app.route('/api/jobs/<job_id>', methods=['GET'])
+        def api_job_status(job_id):
+            """Status, events so far and (once finished) result of a generation job."""
+            snapshot = get_bus().snapshot(job_id) if PROGRESS_EVENTS_AVAILABLE else None
+            if snapshot is None:
+                return jsonify({'error': 'Job not found'}), 404
+            return jsonify(snapshot)
+
+        @app.route('/api/jobs/<job_id>/events', methods=['GET'])
+        def api_job_events(job_id):
+            """Server-Sent Events: replays missed events (Last-Event-ID), then streams until the job ends."""
+            if not PROGRESS_EVENTS_AVAILABLE or get_bus().snapshot(job_id) is None:
+                return jsonify({'error': 'Job not found'}), 404
+            last_event_id = parse_last_event_id(
+                request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+            return Response(get_bus().sse_stream(job_id, last_event_id),
+                            mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+
         @app.route('/api/models', methods=['GET'])
         def api_get_models():
             """Get available model types."""
@@ -153,6 +194,22 @@ class WebInterface:
 
         return app
 
+    def _parse_generate_request(self, data) -> tuple:
+        """(generate_model keyword arguments, None) or (None, error message) for an API body."""
+        if not data:
+            return None, 'No data provided'
+
+        model_type = data.get('model_type')
+        company_identifier = data.get('company_identifier')
+        if not model_type or not company_identifier:
+            return None, 'Model type and company identifier required'
+
+        return {
+            'model_type': model_type,
+            'company_identifier': company_identifier,
+            'assumptions': data.get('assumptions', {})
+        }, None
+
     def _handle_model_creation(self, request, model_type):
         """Handle model creation form submission."""
         try:
@@ -435,7 +492,8 @@ class WebInterface:
 
         try:
             server_address = (self.host, self.port)
-            self.server = HTTPServer(server_address, FinModAIHandler)
+            # One thread per connection: a slow client no longer blocks every other request
+            self.server = ThreadingHTTPServer(server_address, FinModAIHandler)
             self.server.web_interface = self
 
             logger.info(f"🌐 Simple HTTP server running on http://{self.host}:{self.port}")
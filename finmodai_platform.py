@@ -33,6 +33,12 @@ from finmodai.model_factory import ModelFactory
 from finmodai.excel_engine import ExcelGenerationEngine
 from finmodai.web_interface import WebInterface
 
+try:
+    from progress_events import emit
+except ImportError:
+    def emit(*args, **kwargs):
+        return None
+
 @dataclass
 class PlatformConfig:
     """Platform configuration settings."""
@@ -115,6 +121,7 @@ class FinModAIPlatform:
             # Step 1: Ingest financial data
             if isinstance(company_identifier, str):
                 logger.info("📊 Fetching financial data...")
+                emit('data', f"Fetching financial data for {company_identifier}", status='started')
                 financial_data = self.data_engine.get_company_data(company_identifier)
             else:
                 logger.info("📊 Using provided financial data...")
@@ -128,6 +135,7 @@ class FinModAIPlatform:
 
             # Step 2: Generate model using AI factory
             logger.info("🤖 AI generating model structure...")
+            emit('calculation', f"Building {model_type.upper()} model structure", status='started')
             model_spec = self.model_factory.create_model(
                 model_type=model_type,
                 financial_data=financial_data,
@@ -138,6 +146,7 @@ class FinModAIPlatform:
 
             # Step 3: Generate output files
             logger.info("📄 Creating output files...")
+            emit('excel', f"Writing {output_format} output", status='started')
             print(f"🔧 DEBUG: About to call excel engine with model_spec.model_type: {model_spec.model_type}")
             try:
                 output_files = self.excel_engine.generate_output(
@@ -163,6 +172,8 @@ class FinModAIPlatform:
                             print(f"🔧 DEBUG: Found fallback file: {file_path}")
             if output_files:
                 print(f"🔧 DEBUG: Using {len(output_files)} output files")
+            emit('excel', f"{len(output_files)} output file(s) written", status='ok' if output_files else 'empty',
+                 files=[os.path.basename(str(path)) for path in output_files])
 
             # Step 4: Calculate performance metrics
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -183,6 +194,7 @@ class FinModAIPlatform:
 
         except Exception as e:
             logger.error(f"❌ Model generation failed: {e}")
+            emit('job', f"Model generation failed: {e}", status='failed')
             return {
                 "success": False,
                 "error": str(e),
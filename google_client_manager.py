@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Google Client Manager - Shared, cached Google Sheets clients for the model builders
+
+Features:
+- Service-account credentials are read once per process and scope set; the
+  access token lives on the shared credentials object and is only refreshed
+  when it expires
+- One authorized gspread client (a persistent, keep-alive HTTP session) and
+  one Sheets API service per thread, reused by every builder
+- Spreadsheets opened by name are cached, so the Drive lookup behind
+  gc.open(name) happens once
+- Worksheet metadata (title -> worksheet) is cached per spreadsheet, so tab
+  lookups do not fetch the spreadsheet metadata again
+- prepare_worksheets() clears every existing tab of a model in one batched
+  values request and creates all missing tabs in one batchUpdate
+
+Usage:
+    clients = get_google_clients()
+    sh = clients.open('Financial Models')
+    tabs = clients.prepare_worksheets(sh, [('Assumptions', 50, 10), ('LBO Model', 50, 15)])
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+SHEETS_SCOPES = (
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+)
+DEFAULT_CREDENTIALS_PATH = 'credentials/google_sheets_credentials.json'
+METADATA_TTL_SECONDS = 300  # Re-read tab metadata after this, in case tabs were edited by hand
+
+WorksheetSpec = Union[str, Tuple[str, int, int]]
+
+
+def default_credentials_path() -> str:
+    return os.getenv('GOOGLE_SHEETS_CREDENTIALS') or DEFAULT_CREDENTIALS_PATH
+
+
+def _a1_sheet_range(title: str) -> str:
+    """A1 range covering a whole tab (quotes escaped)."""
+    return "'" + title.replace("'", "''") + "'"
+
+
+def _load_credentials(path: str, scopes: Tuple[str, ...]):
+    from google.oauth2.service_account import Credentials
+    return Credentials.from_service_account_file(path, scopes=list(scopes))
+
+
+def _authorize(credentials):
+    import gspread
+    return gspread.authorize(credentials)
+
+
+class GoogleClientManager:
+    """Process-wide cache of Google credentials, clients, spreadsheets and tab metadata."""
+
+    def __init__(self, credentials_path: Optional[str] = None,
+                 credentials_loader: Callable = _load_credentials,
+                 authorize: Callable = _authorize,
+                 metadata_ttl: float = METADATA_TTL_SECONDS):
+        self.credentials_path = credentials_path
+        self._load_credentials = credentials_loader
+        self._authorize = authorize
+        self.metadata_ttl = metadata_ttl
+
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._credentials: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+        self._clients: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+        self._spreadsheets: Dict[str, object] = {}
+        self._worksheets: Dict[str, Tuple[float, Dict[str, object]]] = {}
+        self.stats = {'credential_loads': 0, 'opens': 0, 'metadata_fetches': 0,
+                      'batch_clears': 0, 'batch_creates': 0}
+
+    # ------------------------------------------------------------- clients
+
+    def credentials(self, scopes: Iterable[str] = SHEETS_SCOPES):
+        """Service-account credentials for the scopes, loaded once."""
+        key = (self.credentials_path or default_credentials_path(), tuple(scopes))
+        with self._lock:
+            credentials = self._credentials.get(key)
+            if credentials is None:
+                credentials = self._credentials[key] = self._load_credentials(*key)
+                self.stats['credential_loads'] += 1
+            return credentials
+
+    def gspread_client(self, scopes: Iterable[str] = SHEETS_SCOPES):
+        """Authorized gspread client; its HTTP session stays open between builders."""
+        key = (self.credentials_path or default_credentials_path(), tuple(scopes))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._authorize(self.credentials(scopes))
+            return client
+
+    def sheets_service(self, scopes: Iterable[str] = ('https://www.googleapis.com/auth/spreadsheets',)):
+        """Sheets v4 API service for the calling thread (httplib2 transports are not thread-safe)."""
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+        key = tuple(scopes)
+        if key not in services:
+            from googleapiclient.discovery import build
+            services[key] = build('sheets', 'v4', credentials=self.credentials(scopes), cache_discovery=False)
+        return services[key]
+
+    # -------------------------------------------------------- spreadsheets
+
+    def open(self, sheet_name: str):
+        """Spreadsheet by name (raises gspread.SpreadsheetNotFound), cached after the first open."""
+        with self._lock:
+            spreadsheet = self._spreadsheets.get(sheet_name)
+            if spreadsheet is None:
+                spreadsheet = self.gspread_client().open(sheet_name)
+                self._spreadsheets[sheet_name] = spreadsheet
+                self.stats['opens'] += 1
+            return spreadsheet
+
+    def open_by_key(self, key: str):
+        """Spreadsheet by file ID, cached after the first open."""
+        with self._lock:
+            cache_key = f'key:{key}'
+            spreadsheet = self._spreadsheets.get(cache_key)
+            if spreadsheet is None:
+                spreadsheet = self.gspread_client().open_by_key(key)
+                self._spreadsheets[cache_key] = spreadsheet
+                self.stats['opens'] += 1
+            return spreadsheet
+
+    def invalidate(self, spreadsheet=None):
+        """Forget cached tab metadata (for one spreadsheet, or all of them and the open spreadsheets)."""
+        with self._lock:
+            if spreadsheet is None:
+                self._worksheets.clear()
+                self._spreadsheets.clear()
+            else:
+                self._worksheets.pop(spreadsheet.id, None)
+
+    # ---------------------------------------------------------- worksheets
+
+    def worksheet_map(self, spreadsheet, refresh: bool = False) -> Dict[str, object]:
+        """Title -> worksheet for a spreadsheet, from one metadata fetch."""
+        with self._lock:
+            cached = self._worksheets.get(spreadsheet.id)
+            if refresh or cached is None or time.time() - cached[0] > self.metadata_ttl:
+                worksheets = {ws.title: ws for ws in spreadsheet.worksheets()}
+                cached = self._worksheets[spreadsheet.id] = (time.time(), worksheets)
+                self.stats['metadata_fetches'] += 1
+            return cached[1]
+
+    def worksheet(self, spreadsheet, title: str, rows: int = 100, cols: int = 20, clear: bool = True):
+        """Existing tab (cleared) or a new one; no metadata round trip when cached."""
+        with self._lock:
+            worksheets = self.worksheet_map(spreadsheet)
+            ws = worksheets.get(title)
+            if ws is None:
+                ws = spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
+                worksheets[title] = ws
+            elif clear:
+                ws.clear()
+            return ws
+
+    def prepare_worksheets(self, spreadsheet, specs: List[WorksheetSpec],
+                           clear: bool = True) -> Dict[str, object]:
+        """
+        Get every tab of a model ready in at most three requests: clear all
+        existing tabs in one values batchClear, add all missing tabs in one
+        batchUpdate and re-read the metadata once. Specs are titles or
+        (title, rows, cols). Returns title -> worksheet.
+        """
+        specs = [(spec, 100, 20) if isinstance(spec, str) else spec for spec in specs]
+        titles = list(dict.fromkeys(title for title, _, _ in specs))
+
+        with self._lock:
+            worksheets = self.worksheet_map(spreadsheet)
+            existing = [title for title in titles if title in worksheets]
+            missing = {title: (rows, cols) for title, rows, cols in specs if title not in worksheets}
+
+            if clear and existing:
+                spreadsheet.values_batch_clear(body={'ranges': [_a1_sheet_range(t) for t in existing]})
+                self.stats['batch_clears'] += 1
+
+            if missing:
+                requests = [{'addSheet': {'properties': {
+                    'title': title,
+                    'gridProperties': {'rowCount': int(rows), 'columnCount': int(cols)}
+                }}} for title, (rows, cols) in missing.items()]
+                try:
+                    spreadsheet.batch_update({'requests': requests})
+                    self.stats['batch_creates'] += 1
+                    worksheets = self.worksheet_map(spreadsheet, refresh=True)
+                except Exception as e:
+                    # e.g. a tab was added by someone else since the metadata was cached
+                    print(f"⚠️  Batched worksheet creation failed ({e}), creating tabs one by one")
+                    worksheets = self.worksheet_map(spreadsheet, refresh=True)
+                    for title, (rows, cols) in missing.items():
+                        self.worksheet(spreadsheet, title, rows, cols, clear=clear)
+
+            return {title: worksheets[title] for title in titles}
+
+
+_default: Optional[GoogleClientManager] = None
+_default_lock = threading.Lock()
+
+
+def get_google_clients() -> GoogleClientManager:
+    """Process-wide GoogleClientManager shared by the Sheets builders."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = GoogleClientManager()
+        return _default
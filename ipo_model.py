@@ -10,13 +10,13 @@ Creates a clean, presentation-ready IPO workbook in Google Sheets with:
 
 Run:  python ipo_model.py "My IPO Sheet"
 """
-import os
 import gspread
-from google.oauth2.service_account import Credentials
 from gspread_formatting import (
     format_cell_range, CellFormat, Color, TextFormat, set_frozen
 )
 
+from google_client_manager import get_google_clients
+
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
@@ -32,16 +32,19 @@ def _bold(cf: CellFormat) -> CellFormat:  # convenience
     return cf
 
 
+TABS = [
+    "IPO Assumptions",
+    "Sources & Uses",
+    "Pre/Post Ownership",
+    "Proceeds Allocation",
+    "Valuation Summary",
+    "Sensitivity",
+]
+
+
 def open_sheet(sheet_name: str):
-    creds_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS") or "credentials/google_sheets_credentials.json"
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
     try:
-        sh = gc.open(sheet_name)
+        sh = get_google_clients().open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(
             f"Google Sheet '{sheet_name}' not found. Create it and share with your service-account email."
@@ -50,12 +53,7 @@ def open_sheet(sheet_name: str):
 
 
 def get_ws(sh, title: str, rows: int = 200, cols: int = 20):
-    try:
-        ws = sh.worksheet(title)
-        ws.clear()
-    except gspread.WorksheetNotFound:
-        ws = sh.add_worksheet(title=title, rows=str(rows), cols=str(cols))
-    return ws
+    return get_google_clients().worksheet(sh, title, rows, cols)
 
 
 # ---------------------------------------------------------------------
@@ -154,12 +152,14 @@ def build_sensitivity(ws):
 
 def build_ipo_model(sheet_name="IPO Model Demo"):
     sh = open_sheet(sheet_name)
-    build_assumptions_tab(get_ws(sh, "IPO Assumptions"))
-    build_sources_uses(get_ws(sh, "Sources & Uses"))
-    build_ownership_tab(get_ws(sh, "Pre/Post Ownership"))
-    build_proceeds_alloc(get_ws(sh, "Proceeds Allocation"))
-    build_valuation(get_ws(sh, "Valuation Summary"))
-    build_sensitivity(get_ws(sh, "Sensitivity"))
+    # Clear existing tabs and create missing ones in one batch
+    tabs = get_google_clients().prepare_worksheets(sh, [(title, 200, 20) for title in TABS])
+    build_assumptions_tab(tabs["IPO Assumptions"])
+    build_sources_uses(tabs["Sources & Uses"])
+    build_ownership_tab(tabs["Pre/Post Ownership"])
+    build_proceeds_alloc(tabs["Proceeds Allocation"])
+    build_valuation(tabs["Valuation Summary"])
+    build_sensitivity(tabs["Sensitivity"])
     print(f"✅ IPO model created / updated in sheet: {sh.url}")
 
 
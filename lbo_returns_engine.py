@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Vectorized LBO Returns Engine
+Runs the full LBO cash flow path for a whole grid of deal structures at once
+
+Features:
+- Operating forecast shared by every grid cell
+- Tranche-by-tranche debt schedule (Senior, Mezzanine) per cell
+- Mandatory amortization, optional prepayments and an optional excess cash sweep
+- Exit waterfall (EV less remaining debt)
+- IRRs for every cell from the shared finance kernel
+
+Grid axes are (entry multiple, exit multiple, leverage, rate). Leverage is the
+debt/equity ratio used by ProfessionalLBOModel's sensitivity tables and the
+rate axis is the senior rate, with the mezzanine spread over senior held at
+the base-case spread.
+
+The base cell reproduces ProfessionalLBOModel exactly: the same debt schedule
+(_create_debt_schedule: prepayments follow the schedule, not available cash),
+exit debt after forecast_years - 1 paydowns, a forecast_years holding period
+and no cash netted at exit (_create_exit_analysis / _calculate_returns).
+"""
+
+import numpy as np
+
+from finance_kernel import IRR_LOWER_BOUND, irr
+
+
+def build_operating_forecast(assumptions):
+    """Build the (grid-independent) operating forecast as NumPy arrays"""
+
+    forecast_years = assumptions['forecast_years']
+    growth = list(assumptions['revenue_growth'])
+
+    # Same growth convention as ProfessionalLBOModel._create_operating_forecast
+    rates = np.array([growth[i - 1] if i - 1 < len(growth) else growth[-1]
+                      for i in range(1, forecast_years)], dtype=float)
+
+    entry_revenue = assumptions['entry_ebitda'] / assumptions['ebitda_margin']
+    revenue = entry_revenue * np.concatenate(([1.0], np.cumprod(1.0 + rates)))
+
+    ebitda = revenue * assumptions['ebitda_margin']
+    da = revenue * assumptions['da_pct']
+    capex = revenue * assumptions['capex_pct']
+    nwc_change = np.concatenate(([revenue[0]], np.diff(revenue))) * assumptions['nwc_pct']
+
+    return {
+        'revenue': revenue,
+        'ebitda': ebitda,
+        'da': da,
+        'ebit': ebitda - da,
+        'capex': capex,
+        'nwc_change': nwc_change
+    }
+
+
+def run_lbo_grid(assumptions, entry_multiples=None, exit_multiples=None,
+                 leverage_ratios=None, senior_rates=None, cash_sweep_pct=0.0):
+    """
+    Run the full LBO for every combination of the grid axes.
+
+    Any axis left as None collapses to the base-case value from assumptions
+    (the dict produced by ProfessionalLBOModel._create_transaction_assumptions).
+    cash_sweep_pct sweeps that share of accumulated excess cash into the debt
+    each year (senior first); ProfessionalLBOModel has no sweep, so its tables
+    use 0. Returns a dict of arrays shaped (entry, exit, leverage, rate) plus
+    the per-year schedules shaped (entry, 1, leverage, rate, years).
+    """
+
+    base_debt_pct = assumptions['senior_debt_pct'] + assumptions['mezzanine_pct']
+    base_leverage = base_debt_pct / assumptions['equity_pct']
+
+    entry = np.atleast_1d(np.asarray(
+        entry_multiples if entry_multiples is not None else assumptions['entry_multiple'], dtype=float))
+    exit_ = np.atleast_1d(np.asarray(
+        exit_multiples if exit_multiples is not None else assumptions['exit_multiple_base'], dtype=float))
+    leverage = np.atleast_1d(np.asarray(
+        leverage_ratios if leverage_ratios is not None else base_leverage, dtype=float))
+    senior_rate = np.atleast_1d(np.asarray(
+        senior_rates if senior_rates is not None else assumptions['senior_rate'], dtype=float))
+
+    # Axis layout: (entry, exit, leverage, rate); the debt path does not depend on exit
+    entry_g = entry[:, None, None, None]
+    exit_g = exit_[None, :, None, None]
+    lev_g = leverage[None, None, :, None]
+    rate_g = senior_rate[None, None, None, :]
+
+    forecast = build_operating_forecast(assumptions)
+    tax_rate = assumptions['tax_rate']
+
+    # Sources per cell: the base-case funding (debt + equity as % of purchase
+    # price) split by leverage, so the base leverage gives the model's amounts.
+    # Fees are not equity-funded, as in _create_transaction_assumptions.
+    purchase_price = assumptions['entry_ebitda'] * entry_g
+    funded = purchase_price * (base_debt_pct + assumptions['equity_pct'])
+    total_debt = funded * lev_g / (1.0 + lev_g)
+    senior_share = assumptions['senior_debt_pct'] / base_debt_pct if base_debt_pct else 1.0
+    senior_debt = total_debt * senior_share
+    mezz_debt = total_debt * (1.0 - senior_share)
+    equity_investment = funded / (1.0 + lev_g)
+
+    mezz_rate = rate_g + (assumptions['mezz_rate'] - assumptions['senior_rate'])
+    senior_mandatory_amt = senior_debt * assumptions['senior_amort_pct']
+    mezz_mandatory_amt = mezz_debt * assumptions['mezz_amort_pct']
+
+    schedule_shape = np.broadcast(entry_g, lev_g, rate_g).shape
+    senior_bal = np.broadcast_to(senior_debt, schedule_shape).copy()
+    mezz_bal = np.broadcast_to(mezz_debt, schedule_shape).copy()
+    cash = np.zeros(schedule_shape)
+
+    # Paydown years 1..N-1 (year 0 is the entry year); the exit is at year N
+    schedule_years = len(forecast['revenue']) - 1
+    hold_years = assumptions['forecast_years']
+    history = {key: np.zeros(schedule_shape + (schedule_years,)) for key in (
+        'senior_balance', 'mezz_balance', 'interest', 'taxes', 'levered_fcf',
+        'mandatory', 'optional', 'sweep', 'cash_balance')}
+
+    for t in range(schedule_years):
+        year = t + 1
+        interest = senior_bal * rate_g + mezz_bal * mezz_rate
+
+        ebt = forecast['ebit'][year] - interest
+        taxes = ebt * tax_rate
+        levered_fcf = (ebt - taxes + forecast['da'][year]
+                       - forecast['capex'][year] - forecast['nwc_change'][year])
+
+        # Mandatory amortization then scheduled prepayments, tranche by tranche
+        mand_senior = np.minimum(senior_mandatory_amt, senior_bal)
+        opt_senior = np.minimum(assumptions['optional_prepay_senior'], senior_bal - mand_senior)
+        mand_mezz = np.minimum(mezz_mandatory_amt, mezz_bal)
+        opt_mezz = np.minimum(assumptions['optional_prepay_mezz'], mezz_bal - mand_mezz)
+        senior_bal = senior_bal - mand_senior - opt_senior
+        mezz_bal = mezz_bal - mand_mezz - opt_mezz
+        cash = cash + levered_fcf - mand_senior - opt_senior - mand_mezz - opt_mezz
+
+        # Excess cash sweep: senior first, then mezzanine
+        sweep_cash = np.maximum(cash, 0.0) * cash_sweep_pct
+        sweep_senior = np.minimum(sweep_cash, senior_bal)
+        sweep_mezz = np.minimum(sweep_cash - sweep_senior, mezz_bal)
+        senior_bal = senior_bal - sweep_senior
+        mezz_bal = mezz_bal - sweep_mezz
+        cash = cash - sweep_senior - sweep_mezz
+
+        history['senior_balance'][..., t] = senior_bal
+        history['mezz_balance'][..., t] = mezz_bal
+        history['interest'][..., t] = interest
+        history['taxes'][..., t] = taxes
+        history['levered_fcf'][..., t] = levered_fcf
+        history['mandatory'][..., t] = mand_senior + mand_mezz
+        history['optional'][..., t] = opt_senior + opt_mezz
+        history['sweep'][..., t] = sweep_senior + sweep_mezz
+        history['cash_balance'][..., t] = cash
+
+    # Exit waterfall
+    exit_ebitda = forecast['ebitda'][-1]
+    exit_ev = exit_ebitda * exit_g
+    exit_debt = senior_bal + mezz_bal
+    exit_equity = exit_ev - exit_debt
+
+    full_shape = np.broadcast(exit_ev, exit_debt).shape
+    equity_investment = np.broadcast_to(equity_investment, full_shape)
+    cash_flows = np.zeros(full_shape + (hold_years + 1,))
+    cash_flows[..., 0] = -equity_investment
+    cash_flows[..., -1] = exit_equity
+
+    # Wiped-out equity has no IRR root; floor at -99% like _calculate_returns
+    returns = irr(cash_flows)
+    returns = np.where(np.isnan(returns), IRR_LOWER_BOUND, np.maximum(returns, IRR_LOWER_BOUND))
+
+    return {
+        'entry_multiples': entry,
+        'exit_multiples': exit_,
+        'leverage_ratios': leverage,
+        'senior_rates': senior_rate,
+        'hold_years': hold_years,
+        'equity_investment': equity_investment,
+        'exit_ev': np.broadcast_to(exit_ev, full_shape),
+        'exit_debt': np.broadcast_to(exit_debt, full_shape),
+        'exit_equity': exit_equity,
+        'cash_flows': cash_flows,
+        'irr': returns,
+        'moic': exit_equity / equity_investment,
+        'schedule': history
+    }
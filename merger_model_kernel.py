@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Merger Model Kernel
+Vectorized ProfessionalMergerModel math for many acquirer/target pairs at once
+
+Features:
+- Columnar company table in (pandas DataFrame or dict of columns)
+- Acquirers x targets evaluated in one broadcast pass
+- Same purchase accounting, pro forma and accretion/dilution as run_merger_model
+- Pair ranking by EPS accretion for top-K workbook generation (acquirers
+  without positive standalone EPS are left out: their % is inf or sign-flipped)
+
+Required company columns: ticker, share_price, shares_outstanding, eps,
+net_debt, revenue, ebitda, depreciation (name is optional). Combined
+financials for a pair are the sum of acquirer and target.
+"""
+
+import numpy as np
+import pandas as pd
+
+COMPANY_COLUMNS = ['ticker', 'share_price', 'shares_outstanding', 'eps',
+                   'net_debt', 'revenue', 'ebitda', 'depreciation']
+
+# Deal terms shared by every pair (defaults match run_merger_model)
+DEFAULT_DEAL_TERMS = {
+    'premium_pct': 0.30,
+    'cash_pct': 0.60,
+    'stock_pct': 0.40,
+    'debt_pct': 0.00,
+    'revenue_synergies': 100.0,
+    'cost_synergies_pct': 0.05,
+    'one_time_costs': 50.0,
+    'new_debt_interest_rate': 0.05,
+    'foregone_cash_yield': 0.03,
+    'transaction_fees_pct': 0.015,
+    'intangible_amortization_years': 10,
+    'tax_rate': 0.25
+}
+
+
+def load_company_table(companies):
+    """Validate a company table and return it as a DataFrame"""
+
+    table = pd.DataFrame(companies).reset_index(drop=True)
+    missing = [col for col in COMPANY_COLUMNS if col not in table.columns]
+    if missing:
+        raise ValueError(f"Company table is missing columns: {missing}")
+    if 'name' not in table.columns:
+        table['name'] = table['ticker']
+    return table
+
+
+def evaluate_merger_pairs(companies, acquirers=None, targets=None, **deal_terms):
+    """
+    Evaluate every acquirer x target pair in one vectorized pass.
+
+    acquirers/targets are optional lists of tickers (default: every company).
+    Returns a dict of (acquirer, target) arrays; self-pairs are NaN.
+    """
+
+    table = load_company_table(companies)
+    terms = dict(DEFAULT_DEAL_TERMS, **deal_terms)
+
+    acq = table if acquirers is None else table[table['ticker'].isin(acquirers)]
+    tgt = table if targets is None else table[table['ticker'].isin(targets)]
+
+    def column(frame, name, axis):
+        values = frame[name].to_numpy(dtype=float)
+        return values[:, None] if axis == 0 else values[None, :]
+
+    acq_price = column(acq, 'share_price', 0)
+    acq_shares = column(acq, 'shares_outstanding', 0)
+    acq_eps = column(acq, 'eps', 0)
+    tgt_price = column(tgt, 'share_price', 1)
+    tgt_shares = column(tgt, 'shares_outstanding', 1)
+
+    combined_revenue = column(acq, 'revenue', 0) + column(tgt, 'revenue', 1)
+    combined_ebitda = column(acq, 'ebitda', 0) + column(tgt, 'ebitda', 1)
+    combined_depreciation = column(acq, 'depreciation', 0) + column(tgt, 'depreciation', 1)
+
+    # Transaction (ProfessionalMergerModel._create_assumptions)
+    offer_price = tgt_price * (1 + terms['premium_pct'])
+    equity_purchase_price = offer_price * tgt_shares
+    enterprise_value = equity_purchase_price + column(tgt, 'net_debt', 1)
+    stock_portion = equity_purchase_price * terms['stock_pct']
+    debt_portion = enterprise_value * terms['debt_pct']
+    new_shares_issued = np.where(stock_portion > 0, stock_portion / acq_price, 0.0)
+    pro_forma_shares = acq_shares + new_shares_issued
+
+    goodwill = enterprise_value - combined_revenue * 0.5
+    intangible_amortization = goodwill * 0.3 / terms['intangible_amortization_years']
+
+    # Pro forma (_create_pro_forma_adjustments / _build_pro_forma_financials)
+    cost_savings = combined_ebitda * terms['cost_synergies_pct']
+    new_debt_interest = debt_portion * terms['new_debt_interest_rate']
+    pro_forma_ebit = combined_ebitda + cost_savings - combined_depreciation - intangible_amortization
+    pro_forma_ebt = pro_forma_ebit - new_debt_interest
+    pro_forma_net_income = pro_forma_ebt * (1 - terms['tax_rate']) - terms['one_time_costs']
+    pro_forma_eps = pro_forma_net_income / pro_forma_shares
+
+    # Accretion/dilution (_calculate_accretion_dilution)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accretion_dilution_pct = np.where(
+            acq_eps != 0, pro_forma_eps / acq_eps - 1,
+            np.where(pro_forma_eps > 0, np.inf, 0.0))
+
+    same_company = acq['ticker'].to_numpy()[:, None] == tgt['ticker'].to_numpy()[None, :]
+    accretion_dilution_pct = np.where(same_company, np.nan, accretion_dilution_pct)
+
+    shape = accretion_dilution_pct.shape
+    return {
+        'acquirers': acq['ticker'].tolist(),
+        'targets': tgt['ticker'].tolist(),
+        'acquirer_names': acq['name'].tolist(),
+        'target_names': tgt['name'].tolist(),
+        'offer_price_per_share': np.broadcast_to(offer_price, shape),
+        'equity_purchase_price': np.broadcast_to(equity_purchase_price, shape),
+        'enterprise_value': np.broadcast_to(enterprise_value, shape),
+        'new_shares_issued': np.broadcast_to(new_shares_issued, shape),
+        'pro_forma_net_income': pro_forma_net_income,
+        'pro_forma_eps': pro_forma_eps,
+        'standalone_eps': np.broadcast_to(acq_eps, shape),
+        'accretion_dilution_pct': accretion_dilution_pct,
+        'deal_terms': terms
+    }
+
+
+def rank_merger_pairs(pair_results, top_k=None):
+    """
+    Flatten pair results into a DataFrame ranked by EPS accretion.
+
+    Pairs whose acquirer has zero or negative standalone EPS are dropped:
+    accretion % against such a base is inf or has its sign flipped, and
+    would otherwise rank above every real deal.
+    """
+
+    acquirers = np.asarray(pair_results['acquirers'], dtype=object)
+    targets = np.asarray(pair_results['targets'], dtype=object)
+    acq_idx, tgt_idx = np.indices(pair_results['accretion_dilution_pct'].shape)
+
+    ranked = pd.DataFrame({
+        'acquirer': acquirers[acq_idx.ravel()],
+        'target': targets[tgt_idx.ravel()],
+        'offer_price_per_share': pair_results['offer_price_per_share'].ravel(),
+        'equity_purchase_price': pair_results['equity_purchase_price'].ravel(),
+        'enterprise_value': pair_results['enterprise_value'].ravel(),
+        'new_shares_issued': pair_results['new_shares_issued'].ravel(),
+        'standalone_eps': pair_results['standalone_eps'].ravel(),
+        'pro_forma_eps': pair_results['pro_forma_eps'].ravel(),
+        'accretion_dilution_pct': pair_results['accretion_dilution_pct'].ravel()
+    })
+    ranked = ranked.dropna(subset=['accretion_dilution_pct'])
+    ranked = ranked[ranked['standalone_eps'] > 0]
+    ranked['is_accretive'] = ranked['accretion_dilution_pct'] > 0
+    ranked = ranked.sort_values('accretion_dilution_pct', ascending=False).reset_index(drop=True)
+
+    return ranked.head(top_k) if top_k else ranked
@@ -1,13 +1,11 @@
 import json
 import uuid
 from datetime import datetime, timedelta
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
-import io
 import os
 import re
 import threading
@@ -20,14 +18,17 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import openai
 import anthropic
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 
-# Import yfinance directly for historical data
-import yfinance as yf
+import yfinance_gateway
+from streaming_downloads import content_etag, etag_matches, generated_response
+from serialization import install_json_provider
+from valuation_precompute import HEADLINE_MODELS, PrecomputeService, is_serving_process
 
 # Create Flask app
 app = Flask(__name__)
 app.secret_key = 'finmodai_secret_key_2024'
+install_json_provider(app)  # jsonify() through the fast JSON codec
 
 # Simple storage for models
 MODEL_STORAGE = {}
@@ -92,16 +93,20 @@ session_manager = SessionManager()
 def get_historical_assumptions(ticker):
     """Get historical financial assumptions from yfinance"""
     try:
-        stock = yf.Ticker(ticker)
+        # Info and statements fetched concurrently (memoized for the day)
+        statements = yfinance_gateway.get_gateway().statements(ticker)
         
         # Get company info
-        info = stock.info
+        info = statements['info'] or {}
         company_name = info.get('longName', ticker)
         
         # Get financial statements
-        financials = stock.financials
-        balance_sheet = stock.balance_sheet
-        cash_flow = stock.cashflow
+        financials = statements['financials']
+        balance_sheet = statements['balance_sheet']
+        cash_flow = statements['cashflow']
+        
+        if financials is None:
+            financials = pd.DataFrame()
         
         if financials.empty:
             return {
@@ -234,8 +239,8 @@ def generate_dcf_model(ticker, climate):
         
         # Get current price from yfinance
         try:
-            stock = yf.Ticker(ticker)
-            current_price = stock.history(period="1d")['Close'].iloc[-1] if not stock.history(period="1d").empty else 25.00
+            price_history = yfinance_gateway.ticker(ticker).history(period="1d")
+            current_price = price_history['Close'].iloc[-1] if not price_history.empty else 25.00
         except:
             current_price = 25.00
         
@@ -279,6 +284,18 @@ def generate_dcf_model(ticker, climate):
             'insufficient_data': True
         }
 
+# Precomputed DCF results for watchlist tickers: the refresher runs the same
+# generate_dcf_model ahead of time, and only when the DCF's inputs changed.
+# Its own table: its model set differs from the backend's, so a shared
+# source_data schedule would let either refresher skip the other's models.
+MINIMAL_APP_PRECOMPUTE_DB_PATH = os.getenv(
+    'MINIMAL_APP_PRECOMPUTE_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'minimal_app_precompute.db'))
+PRECOMPUTE = PrecomputeService(db_path=MINIMAL_APP_PRECOMPUTE_DB_PATH, models={
+    'web_dcf': {'build': lambda ticker, inputs: generate_dcf_model(ticker, 'base'),
+                'fields': HEADLINE_MODELS['dcf']['fields']}
+})
+
 # Routes
 @app.route('/')
 def index():
@@ -307,7 +324,12 @@ def generate_model():
             
             # Generate DCF model with company-specific assumptions
             if model_type == 'dcf':
-                result = generate_dcf_model(ticker, climate)
+                # Watchlist tickers come straight from the precomputed table; cold ones take the live path
+                cached = PRECOMPUTE.lookup(ticker, 'web_dcf')
+                if cached:
+                    result = dict(cached['outputs'], precomputed=True, as_of=cached['refreshed_at'])
+                else:
+                    result = generate_dcf_model(ticker, climate)
                 MODEL_STORAGE[model_id]['result'] = result
             else:
                 # For other model types, use default values
@@ -381,6 +403,7 @@ def model_results(model_id):
     company_name = result.get('company_name', ticker)
     provenance = result.get('provenance', {})
     historicals = result.get('historicals', {})
+    freshness = f"Precomputed {result['as_of'][:16].replace('T', ' ')}" if result.get('precomputed') else "Live"
     
     # Get detailed assumptions from financial data engine if available
     raw_assumptions = result.get('raw_assumptions', {})
@@ -421,6 +444,7 @@ def model_results(model_id):
                 <div class="text-right">
                     <div class="text-xs text-blue-600">Built from</div>
                     <div class="text-sm font-medium text-blue-800">Historical Financials</div>
+                    <div class="text-xs text-blue-600">{freshness}</div>
                 </div>
             </div>
         </div>
@@ -578,6 +602,11 @@ def download_excel():
     model = MODEL_STORAGE.get(last_model_id, {})
     result = model.get('result', {})
     
+    # The workbook is a pure function of the model result: unchanged -> 304
+    etag = content_etag(result)
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return '', 304, {'ETag': etag}
+    
     # Get assumptions
     assumptions = result.get('assumptions', {})
     revenue_growth = assumptions.get('revenue_growth', [0.08, 0.07, 0.06, 0.05, 0.04])
@@ -599,7 +628,6 @@ def download_excel():
     upside_downside = result.get('upside_downside', 25.0)
     
     # Create Excel file
-    output = io.BytesIO()
     workbook = openpyxl.Workbook()
     
     # Create Assumptions worksheet
@@ -756,19 +784,13 @@ def download_excel():
             adjusted_width = (max_length + 2)
             sheet.column_dimensions[column[0].column_letter].width = adjusted_width
     
-    # Save to buffer
-    workbook.save(output)
-    output.seek(0)
-    
-    return send_file(
-        output,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        as_attachment=True,
-        download_name="historical_assumptions_model.xlsx"
-    )
+    # Stream the saved workbook to the client in chunks
+    return generated_response(workbook.save, "historical_assumptions_model.xlsx", etag)
 
 if __name__ == '__main__':
     # Use a different port to avoid conflict
     port = 10001
+    if is_serving_process(app.debug):  # not the reloader's watcher when FLASK_DEBUG is set
+        PRECOMPUTE.start()
     print(f"Starting app on port {port}")
     app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Model Computation Graph
+Dependency-tracked, incremental recalculation for the professional models
+
+Features:
+- Input nodes (raw assumptions) and computed nodes (forecasts, schedules, outputs)
+- Key-level dependencies on dict-valued nodes (e.g. only 'tax_rate' of assumptions)
+- Early cutoff: a node whose recomputed value is unchanged does not dirty dependents
+- Sheet mapping so only workbook tabs fed by changed nodes are re-emitted
+
+Typical use:
+    graph = ComputationGraph()
+    graph.add_input('tax_rate', 0.25)
+    graph.add_node('assumptions', build_assumptions, ['tax_rate', ...])
+    graph.add_node('forecast', build_forecast, ['assumptions'],
+                   keys={'assumptions': ['tax_rate', 'ebitda_margin']})
+    graph.set_input('tax_rate', 0.21)
+    changed = graph.recompute()   # -> {'tax_rate', 'assumptions', 'forecast', ...}
+"""
+
+import numpy as np
+
+ALL_KEYS = None  # Sentinel: every key of a node changed (or the node is not a dict)
+
+
+def values_equal(old, new):
+    """Structural equality that understands NumPy arrays, lists and dicts"""
+
+    if old is new:
+        return True
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        try:
+            return np.array_equal(np.asarray(old), np.asarray(new), equal_nan=True)
+        except TypeError:
+            return np.array_equal(np.asarray(old), np.asarray(new))
+    if isinstance(old, dict) and isinstance(new, dict):
+        return old.keys() == new.keys() and all(values_equal(old[k], new[k]) for k in old)
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        return len(old) == len(new) and all(values_equal(a, b) for a, b in zip(old, new))
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        return False
+
+
+def changed_keys(old, new):
+    """Keys of a dict-valued node that changed, ALL_KEYS for non-dicts, empty set if unchanged"""
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        keys = set(old) | set(new)
+        return {k for k in keys if k not in old or k not in new or not values_equal(old[k], new[k])}
+    return set() if values_equal(old, new) else ALL_KEYS
+
+
+class GraphNode:
+    """A single input or computed value in the graph"""
+
+    def __init__(self, name, func=None, deps=None, keys=None):
+        self.name = name
+        self.func = func
+        self.deps = list(deps or [])
+        self.keys = {dep: set(watched) for dep, watched in (keys or {}).items()}
+        self.value = None
+        self.computed = False
+
+    @property
+    def is_input(self):
+        return self.func is None
+
+
+class ComputationGraph:
+    """Directed acyclic graph of model calculations with incremental recompute"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.order = []
+        self.sheets = {}
+        self._pending = {}
+        self.stats = {'recomputed': 0, 'skipped': 0}
+
+    def add_input(self, name, value):
+        """Register an input (assumption) node"""
+        node = GraphNode(name)
+        node.value = value
+        node.computed = True
+        self.nodes[name] = node
+        self.order.append(name)
+        return node
+
+    def add_node(self, name, func, deps, keys=None):
+        """
+        Register a computed node. func receives the dependency values in the
+        order given by deps. keys optionally restricts, per dict-valued
+        dependency, which keys this node actually reads.
+        """
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"Node '{name}' depends on unknown nodes: {missing}")
+        self.nodes[name] = GraphNode(name, func, deps, keys)
+        self.order.append(name)
+        return self.nodes[name]
+
+    def add_sheet(self, sheet_name, deps):
+        """Map a workbook tab to the nodes it is rendered from"""
+        self.sheets[sheet_name] = list(deps)
+
+    def set_input(self, name, value):
+        """Change an input; dependents are recomputed on the next recompute()"""
+        node = self.nodes[name]
+        if not node.is_input:
+            raise ValueError(f"'{name}' is a computed node, not an input")
+        delta = changed_keys(node.value, value)
+        if delta == set():
+            return False
+        node.value = value
+        self._merge_pending(name, delta)
+        return True
+
+    def get(self, name):
+        """Value of a node, computing it (and its dependencies) if needed"""
+        self.recompute()
+        node = self.nodes[name]
+        if not node.computed:
+            self._evaluate(node)
+        return node.value
+
+    def recompute(self):
+        """
+        Recompute every node affected by pending input changes.
+        Returns the set of node names whose values changed.
+        """
+        if not self._pending and all(node.computed for node in self.nodes.values()):
+            return set()
+
+        changed = dict(self._pending)
+        self._pending = {}
+
+        for name in self.order:
+            node = self.nodes[name]
+            if node.is_input:
+                continue
+            if node.computed and not self._is_affected(node, changed):
+                self.stats['skipped'] += 1
+                continue
+            old_value, was_computed = node.value, node.computed
+            self._evaluate(node)
+            delta = changed_keys(old_value, node.value) if was_computed else ALL_KEYS
+            if delta != set():
+                changed[name] = delta
+
+        return set(changed)
+
+    def affected_sheets(self, changed_nodes):
+        """Workbook tabs that need to be re-emitted for a set of changed nodes"""
+        return [sheet for sheet, deps in self.sheets.items()
+                if any(dep in changed_nodes for dep in deps)]
+
+    def _evaluate(self, node):
+        args = []
+        for dep in node.deps:
+            dep_node = self.nodes[dep]
+            if not dep_node.computed:
+                self._evaluate(dep_node)
+            args.append(dep_node.value)
+        node.value = node.func(*args)
+        node.computed = True
+        self.stats['recomputed'] += 1
+
+    def _is_affected(self, node, changed):
+        for dep in node.deps:
+            if dep not in changed:
+                continue
+            delta = changed[dep]
+            watched = node.keys.get(dep)
+            if watched is None or delta is ALL_KEYS or watched & delta:
+                return True
+        return False
+
+    def _merge_pending(self, name, delta):
+        if name in self._pending:
+            previous = self._pending[name]
+            delta = ALL_KEYS if previous is ALL_KEYS or delta is ALL_KEYS else previous | delta
+        self._pending[name] = delta
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Model Manifest - Metadata index of generated model artifacts
+
+Every generated workbook gets a sidecar (`<file>.meta.json`) and an entry in
+one manifest file recording what it was built from.
+
+Features:
+- Entries hold ticker, company name, model type, generator, the SHA-256 hash
+  of the exact inputs the model was built from, generation time and the key
+  output values
+- Stale detection: compare each model's stored input hash with the hash of
+  today's upstream inputs; only models whose data changed need rebuilding
+- Output deltas between a model and the version it replaced, from the stored
+  outputs (no workbook parsing)
+- Sidecars travel with the artifact; rebuild() recreates the manifest from them
+- Safe to share between processes (the web app and the nightly updater):
+  writes re-read and merge the file under an exclusive file lock, reads pick
+  up entries other processes saved
+- Atomic writes through the shared serializers
+
+Usage:
+    record_artifact(path, ticker='MSFT', model_type='professional_dcf', inputs=inputs, outputs=outputs)
+    stale = get_manifest().stale({('MSFT', 'professional_dcf'): input_hash(new_inputs)})
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from serialization import SerializationError, read_file, register_schema, to_builtin, write_file
+from single_flight import FileLock
+
+MANIFEST_PATH = os.getenv('MODEL_MANIFEST_PATH', 'model_manifest.json')
+SIDECAR_SUFFIX = '.meta.json'
+
+register_schema('model_manifest', 1)
+register_schema('model_metadata', 1)
+
+
+def input_hash(inputs: Any) -> str:
+    """Stable SHA-256 of model inputs (key order and container types do not matter)."""
+    canonical = json.dumps(inputs, sort_keys=True, default=to_builtin, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _key(path: Union[str, Path]) -> str:
+    return os.path.normpath(os.path.abspath(str(path)))
+
+
+def sidecar_path(artifact: Union[str, Path]) -> Path:
+    return Path(f"{artifact}{SIDECAR_SUFFIX}")
+
+
+def write_sidecar(artifact: Union[str, Path], metadata: Dict[str, Any]) -> Path:
+    return write_file(sidecar_path(artifact), metadata, schema='model_metadata')
+
+
+def read_sidecar(artifact: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    try:
+        return read_file(sidecar_path(artifact), schema='model_metadata')
+    except (OSError, SerializationError):
+        return None
+
+
+def artifact_metadata(artifact: Union[str, Path], ticker: Optional[str], model_type: str, inputs: Any,
+                      outputs: Optional[Dict[str, Any]] = None, company_name: Optional[str] = None,
+                      generator: Optional[str] = None) -> Dict[str, Any]:
+    """Metadata record for a freshly generated artifact."""
+    return {
+        'path': _key(artifact),
+        'filename': os.path.basename(str(artifact)),
+        'ticker': (ticker or '').upper() or None,
+        'company_name': company_name,
+        'model_type': model_type,
+        'generator': generator or model_type,
+        'input_hash': input_hash(inputs),
+        'generated_at': datetime.now().isoformat(),
+        'outputs': json.loads(json.dumps(outputs or {}, default=to_builtin))
+    }
+
+
+def compare_outputs(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-output change between two stored output dicts (numeric outputs get abs/pct deltas)."""
+    old, new = old or {}, new or {}
+    deltas = {}
+    for name in sorted(set(old) | set(new)):
+        before, after = old.get(name), new.get(name)
+        delta = {'old': before, 'new': after}
+        numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (before, after))
+        if numeric:
+            delta['change'] = after - before
+            delta['pct_change'] = (after - before) / abs(before) if before else None
+        elif before == after:
+            continue
+        deltas[name] = delta
+    return deltas
+
+
+class ModelManifest:
+    """Manifest of generated artifacts, keyed by absolute artifact path."""
+
+    def __init__(self, path: Union[str, Path] = MANIFEST_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._signature = None
+        self.load()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return read_file(self.path, schema='model_manifest').get('artifacts', {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, SerializationError) as e:
+            print(f"⚠️ Could not read model manifest {self.path} ({e}); starting empty")
+            return {}
+
+    def load(self):
+        with self._lock:
+            self._signature = self._file_signature()
+            self._entries = self._read_entries()
+
+    def _refresh(self):
+        """Reload when another process (or manifest object) saved since our last read."""
+        if self._file_signature() != self._signature:
+            self.load()
+
+    def _update(self, change):
+        """Apply change(entries) to the file's current entries and save, under the file lock."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, FileLock(f"{self.path}.lock"):
+            entries = self._read_entries()
+            change(entries)
+            write_file(self.path, {'artifacts': entries}, schema='model_manifest')
+            self._entries = entries
+            self._signature = self._file_signature()
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._entries)
+
+    def record(self, metadata: Dict[str, Any]):
+        self.record_many([metadata])
+
+    def record_many(self, records: Iterable[Dict[str, Any]]):
+        """Add or replace entries and save once."""
+        records = list(records)
+
+        def change(entries):
+            for metadata in records:
+                entries[_key(metadata['path'])] = metadata
+        self._update(change)
+
+    def remove(self, paths: Iterable[Union[str, Path]]):
+        keys = [_key(path) for path in paths]
+
+        def change(entries):
+            for key in keys:
+                entries.pop(key, None)
+        self._update(change)
+
+    def get(self, artifact: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        return self._entries.get(_key(artifact))
+
+    def entries(self, ticker: Optional[str] = None, model_type: Optional[str] = None,
+                existing_only: bool = True) -> List[Dict[str, Any]]:
+        """Entries oldest first, optionally filtered; artifacts deleted from disk are skipped."""
+        self._refresh()
+        selected = [
+            entry for entry in self._entries.values()
+            if (ticker is None or entry.get('ticker') == ticker.upper())
+            and (model_type is None or entry.get('model_type') == model_type)
+            and (not existing_only or os.path.exists(entry['path']))
+        ]
+        return sorted(selected, key=lambda entry: entry.get('generated_at', ''))
+
+    def latest(self, ticker: Optional[str] = None, model_type: Optional[str] = None) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Newest entry per (ticker, model type)."""
+        latest = {}
+        for entry in self.entries(ticker, model_type):
+            latest[(entry.get('ticker'), entry.get('model_type'))] = entry
+        return latest
+
+    def previous(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The entry for the same ticker and model type generated just before this one."""
+        history = [e for e in self.entries(entry.get('ticker'), entry.get('model_type'), existing_only=False)
+                   if e.get('generated_at', '') < entry.get('generated_at', '')]
+        return history[-1] if history else None
+
+    def stale(self, current_hashes: Dict[Tuple[str, str], str]) -> List[Dict[str, Any]]:
+        """
+        Latest entries whose stored input hash differs from the current one.
+        Keys missing from current_hashes (upstream data unavailable) are not
+        reported as stale.
+        """
+        return [entry for key, entry in self.latest().items()
+                if key in current_hashes and current_hashes[key] != entry.get('input_hash')]
+
+    def rebuild(self, root: Union[str, Path] = '.') -> int:
+        """Recreate the manifest from the sidecars under root; returns the number of entries."""
+        entries = {}
+        for sidecar in Path(root).glob(f'**/*{SIDECAR_SUFFIX}'):
+            artifact = str(sidecar)[:-len(SIDECAR_SUFFIX)]
+            metadata = read_sidecar(artifact)
+            if metadata and os.path.exists(artifact):
+                metadata['path'] = _key(artifact)
+                entries[metadata['path']] = metadata
+        def change(current):
+            current.clear()
+            current.update(entries)
+        self._update(change)
+        return len(entries)
+
+
+def record_artifact(artifact: Union[str, Path], ticker: Optional[str], model_type: str, inputs: Any,
+                    outputs: Optional[Dict[str, Any]] = None, company_name: Optional[str] = None,
+                    generator: Optional[str] = None, manifest: Optional[ModelManifest] = None) -> Dict[str, Any]:
+    """Write the artifact's sidecar and add it to the manifest (the shared one by default)."""
+    metadata = artifact_metadata(artifact, ticker, model_type, inputs, outputs, company_name, generator)
+    write_sidecar(artifact, metadata)
+    (manifest if manifest is not None else get_manifest()).record(metadata)
+    return metadata
+
+
+_manifest: Optional[ModelManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest() -> ModelManifest:
+    """Process-wide manifest at MANIFEST_PATH."""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = ModelManifest(MANIFEST_PATH)
+        return _manifest
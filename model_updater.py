@@ -1,189 +1,192 @@
 #!/usr/bin/env python3
 """
 Model Updater
-Updates existing DCF models to follow the new professional template structure
+Regenerates DCF models whose upstream data changed, following the professional template structure
+
+Every generated model has an entry in the model manifest (model_manifest.py)
+with its ticker, model type, input-data hash and key outputs. The updater
+re-fetches the upstream data, rebuilds only the models whose input hash
+changed (in a process pool) and reports output deltas from the stored values.
 """
 
 import os
 import sys
-import shutil
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # Import the new professional template
-from professional_dcf_template import ProfessionalDCFTemplate
+from professional_dcf_template import MODEL_DATA_SOURCES, ProfessionalDCFTemplate
 from data_integrator import ComprehensiveDataIntegrator
+from model_manifest import compare_outputs, get_manifest, input_hash, read_sidecar
+
+# Generators the updater knows how to rebuild
+REGENERATABLE = {'professional_dcf_template'}
+DEFAULT_FETCH_WORKERS = 8
+
+
+def _build_professional_dcf(job):
+    """Worker-process entry point: build one model and return its metadata (the parent records it)."""
+    company_name, ticker, financial_data, output_dir = job
+    template = ProfessionalDCFTemplate()
+    path = template.build_professional_dcf(company_name, ticker, financial_data=financial_data,
+                                           output_dir=output_dir, record=False)
+    return template.last_metadata if path else None
+
 
 class ModelUpdater:
-    """Updates existing models to follow the new template structure"""
+    """Updates existing models whose upstream data has changed"""
 
-    def __init__(self):
+    def __init__(self, manifest=None, max_workers=None, fetch_workers=DEFAULT_FETCH_WORKERS, output_dir=None):
         self.template = ProfessionalDCFTemplate()
         self.integrator = ComprehensiveDataIntegrator()
-
-    def update_existing_models(self):
-        """Update all existing models to follow the new template"""
-        print("🔄 Updating existing models to follow professional template")
+        self.manifest = manifest if manifest is not None else get_manifest()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.fetch_workers = fetch_workers
+        self.output_dir = output_dir
+
+    def update_existing_models(self, force=False):
+        """Regenerate the models whose input data changed (every model with force=True)"""
+        print("🔄 Updating models with changed upstream data")
         print("=" * 60)
 
-        # Find existing DCF models
+        # Latest model per (ticker, model type) from the manifest
         existing_models = self._find_existing_models()
 
         if not existing_models:
-            print("❌ No existing models found to update")
-            return
+            print("❌ No generated models in the manifest to update")
+            return []
 
-        print(f"📁 Found {len(existing_models)} existing models:")
-        for model in existing_models:
-            print(f"   • {model}")
+        print(f"📁 Found {len(existing_models)} models in the manifest")
 
-        print("\n🚀 Starting model updates...")
-        updated_models = []
-
-        for model_path in existing_models:
-            try:
-                print(f"\n📝 Updating: {os.path.basename(model_path)}")
+        jobs = self.find_stale_models(existing_models, force=force)
+        print(f"🔍 {len(jobs)} of {len(existing_models)} models need regenerating")
 
-                # Extract company info from model
-                company_info = self._extract_company_info(model_path)
+        if not jobs:
+            print("✅ All models are up to date")
+            return []
 
-                if company_info:
-                    # Create new model using template
-                    new_model_path = self._create_updated_model(company_info)
-
-                    if new_model_path:
-                        updated_models.append(new_model_path)
-                        print(f"   ✅ Updated: {os.path.basename(new_model_path)}")
-                    else:
-                        print(f"   ❌ Failed to update: {os.path.basename(model_path)}")
-                else:
-                    print(f"   ⚠️ Could not extract company info from: {os.path.basename(model_path)}")
+        for job in jobs:
+            print(f"   • {job['company_info']['company_name']} ({os.path.basename(job['entry']['path'])})")
 
-            except Exception as e:
-                print(f"   ❌ Error updating {os.path.basename(model_path)}: {e}")
-                continue
+        print("\n🚀 Starting model updates...")
+        updated_models = self.regenerate(jobs)
 
         print("\n" + "=" * 60)
         print(f"✅ Model update complete!")
-        print(f"   Updated models: {len(updated_models)}")
+        print(f"   Updated models: {len(updated_models)} (unchanged: {len(existing_models) - len(jobs)})")
         print("=" * 60)
 
         return updated_models
 
     def _find_existing_models(self):
-        """Find existing DCF model files"""
-        model_patterns = [
-            "*dcf*.py",
-            "*DCF*.py",
-            "*model*.py",
-            "*valuation*.py",
-            "*financial*.py"
-        ]
-
-        existing_models = []
-
-        # Search in current directory and subdirectories
-        for pattern in model_patterns:
-            for file_path in Path(".").glob(f"**/{pattern}"):
-                if file_path.is_file():
-                    existing_models.append(str(file_path))
-
-        # Filter out the new template files we just created
-        exclude_files = [
-            "professional_dcf_template.py",
-            "data_integrator.py",
-            "model_updater.py"
-        ]
-
-        filtered_models = []
-        for model in existing_models:
-            if not any(exclude in os.path.basename(model) for exclude in exclude_files):
-                filtered_models.append(model)
-
-        return filtered_models
-
-    def _extract_company_info(self, model_path):
-        """Extract company information from existing model"""
-        try:
-            with open(model_path, 'r') as f:
-                content = f.read()
-
-            # Try to extract company name from content
-            company_indicators = [
-                r"company_name\s*=\s*['\"]([^'\"]*)['\"]",
-                r"company\s*=\s*['\"]([^'\"]*)['\"]",
-                r"Company:\s*([^\n\r]*)",
-                r"#\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-            ]
-
-            company_name = None
-            for pattern in company_indicators:
-                import re
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    company_name = match.group(1).strip()
-                    break
-
-            # Try to extract ticker
-            ticker_indicators = [
-                r"ticker\s*=\s*['\"]([^'\"]*)['\"]",
-                r"ticker:\s*([A-Z]{1,5})",
-                r"([A-Z]{1,5})\s*ticker",
-            ]
-
-            ticker = None
-            for pattern in ticker_indicators:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    ticker = match.group(1).strip().upper()
-                    break
-
-            if company_name or ticker:
-                return {
-                    'company_name': company_name or ticker or "Unknown Company",
-                    'ticker': ticker,
-                    'source_file': model_path
-                }
-
-        except Exception as e:
-            print(f"   ⚠️ Error extracting info from {model_path}: {e}")
-
-        return None
-
-    def _create_updated_model(self, company_info):
-        """Create updated model using the professional template"""
-        try:
-            company_name = company_info['company_name']
-            ticker = company_info.get('ticker')
-
-            # Build new model using template
-            new_model_path = self.template.build_professional_dcf(company_name, ticker)
-
-            if new_model_path and os.path.exists(new_model_path):
-                return new_model_path
-
-        except Exception as e:
-            print(f"   ❌ Error creating updated model: {e}")
-
-        return None
+        """Latest manifest entry per ticker and model type, for generators the updater can rebuild"""
+        return [entry for entry in self.manifest.latest().values()
+                if entry.get('generator') in REGENERATABLE]
+
+    def _extract_company_info(self, model):
+        """Company information for a model, from its manifest entry or sidecar"""
+        metadata = model if isinstance(model, dict) else (self.manifest.get(model) or read_sidecar(model))
+        if not metadata:
+            return None
+
+        return {
+            'company_name': metadata.get('company_name') or metadata.get('ticker') or "Unknown Company",
+            'ticker': metadata.get('ticker'),
+            'model_type': metadata.get('model_type'),
+            'source_file': metadata['path']
+        }
+
+    def _fetch_current_inputs(self, entry):
+        """Re-fetch the data a model is built from and hash it the way the build does"""
+        company_info = self._extract_company_info(entry)
+        ticker = company_info['ticker']
+
+        financial_data = {}
+        if ticker:
+            financial_data = self.template.collect_financial_data(ticker, sources=MODEL_DATA_SOURCES)
+            if not financial_data:
+                return company_info, None, None  # Upstream unavailable: keep the existing model
+
+        inputs = self.template.model_inputs(company_info['company_name'], ticker, financial_data)
+        return company_info, financial_data, input_hash(inputs)
+
+    def find_stale_models(self, entries, force=False):
+        """
+        Entries whose upstream data changed, each with the freshly fetched
+        data so the rebuild does not fetch it again. Fetches run on a thread
+        pool (they are network-bound).
+        """
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            fetched = list(pool.map(self._fetch_current_inputs, entries))
+
+        current_hashes, candidates = {}, {}
+        for entry, (company_info, financial_data, new_hash) in zip(entries, fetched):
+            if new_hash is None:
+                print(f"   ⚠️ No upstream data for {company_info['company_name']}, keeping existing model")
+                continue
+            key = (entry.get('ticker'), entry.get('model_type'))
+            current_hashes[key] = new_hash
+            candidates[key] = {'entry': entry, 'company_info': company_info,
+                               'financial_data': financial_data, 'input_hash': new_hash}
+
+        if force:
+            return list(candidates.values())
+        stale_keys = {(e.get('ticker'), e.get('model_type')) for e in self.manifest.stale(current_hashes)}
+        return [job for key, job in candidates.items() if key in stale_keys]
+
+    def regenerate(self, jobs):
+        """Rebuild models in a process pool; returns the new manifest entries"""
+        work = [(job['company_info']['company_name'], job['company_info']['ticker'],
+                 job['financial_data'], self.output_dir) for job in jobs]
+        updated_models = []
+
+        def collect(company_name, result):
+            if result:
+                updated_models.append(result)
+                print(f"   ✅ Updated: {company_name} -> {result['filename']}")
+            else:
+                print(f"   ❌ Failed to update: {company_name}")
+
+        if self.max_workers <= 1 or len(work) <= 1:
+            for item in work:
+                try:
+                    collect(item[0], _build_professional_dcf(item))
+                except Exception as e:
+                    print(f"   ❌ Error updating {item[0]}: {e}")
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(work))) as pool:
+                futures = {pool.submit(_build_professional_dcf, item): item[0] for item in work}
+                for future in as_completed(futures):
+                    try:
+                        collect(futures[future], future.result())
+                    except Exception as e:
+                        print(f"   ❌ Error updating {futures[future]}: {e}")
+
+        # Workers only write sidecars; the manifest has a single writer
+        if updated_models:
+            self.manifest.record_many(updated_models)
+        return updated_models
 
     def create_model_comparison(self, updated_models):
-        """Create a comparison report of updated models"""
+        """Create a comparison report of updated models with output deltas vs the models they replace"""
         print("\n📊 Creating model comparison report...")
 
         comparison_data = []
 
-        for model_path in updated_models:
-            try:
-                model_info = {
-                    'filename': os.path.basename(model_path),
-                    'path': model_path,
-                    'created_date': datetime.fromtimestamp(os.path.getctime(model_path)).isoformat(),
-                    'size_kb': round(os.path.getsize(model_path) / 1024, 2)
-                }
-                comparison_data.append(model_info)
-            except Exception as e:
-                print(f"   ⚠️ Error getting info for {model_path}: {e}")
+        for model in updated_models:
+            entry = model if isinstance(model, dict) else (self.manifest.get(model) or read_sidecar(model))
+            if not entry:
+                print(f"   ⚠️ No metadata for {model}")
+                continue
+            previous = self.manifest.previous(entry)
+            comparison_data.append({
+                'filename': entry['filename'],
+                'path': entry['path'],
+                'company_name': entry.get('company_name'),
+                'created_date': entry.get('generated_at'),
+                'replaces': previous['filename'] if previous else None,
+                'deltas': compare_outputs(previous.get('outputs') if previous else None, entry.get('outputs'))
+            })
 
         # Create comparison report
         report_path = f"model_comparison_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
@@ -194,19 +197,16 @@ class ModelUpdater:
             f.write(f"Total models updated: {len(comparison_data)}\n\n")
 
             for i, model in enumerate(comparison_data, 1):
-                f.write(f"{i}. {model['filename']}\n")
+                f.write(f"{i}. {model['filename']} ({model['company_name']})\n")
                 f.write(f"   Path: {model['path']}\n")
                 f.write(f"   Created: {model['created_date']}\n")
-                f.write(f"   Size: {model['size_kb']} KB\n")
-                f.write(f"   Features: 6-tab professional structure, integrated data sources\n\n")
-
-            f.write("Key Improvements:\n")
-            f.write("• 6-tab professional structure (Assumptions, Forecast, DCF, Sensitivity, Output, Summary)\n")
-            f.write("• Blue input cells for assumptions with proper formatting\n")
-            f.write("• Integrated data from Yahoo Finance, Finviz, SEC, MacroTrends, and web scrapers\n")
-            f.write("• Professional valuation calculations with WACC and terminal value\n")
-            f.write("• Sensitivity analysis tables\n")
-            f.write("• Client-ready output formatting\n")
+                f.write(f"   Replaces: {model['replaces'] or 'nothing (first version)'}\n")
+                for name, delta in model['deltas'].items():
+                    if delta.get('pct_change') is not None:
+                        f.write(f"   {name}: {delta['old']:,.4f} -> {delta['new']:,.4f} ({delta['pct_change']:+.2%})\n")
+                    else:
+                        f.write(f"   {name}: {delta['old']} -> {delta['new']}\n")
+                f.write("\n")
 
         print(f"   📄 Comparison report saved: {report_path}")
         return report_path
@@ -217,15 +217,18 @@ def main():
 
     print("🔄 DCF Model Updater")
     print("=" * 60)
-    print("This tool updates existing DCF models to follow the new professional template:")
-    print("• 6-tab investment banking structure")
-    print("• Professional formatting and formulas")
-    print("• Integrated data sources")
-    print("• Client-ready outputs")
+    print("This tool regenerates DCF models whose upstream data changed:")
+    print("• Models are found through the model manifest (no file scanning)")
+    print("• Only models with a changed input-data hash are rebuilt, in parallel")
+    print("• The report shows how each model's outputs moved")
+    print("• Pass --force to rebuild every model, --rebuild-manifest to re-index sidecars")
     print()
 
+    if '--rebuild-manifest' in sys.argv:
+        print(f"📇 Re-indexed {updater.manifest.rebuild('.')} models from sidecars")
+
     # Update existing models
-    updated_models = updater.update_existing_models()
+    updated_models = updater.update_existing_models(force='--force' in sys.argv)
 
     if updated_models:
         # Create comparison report
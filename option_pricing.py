@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Option Pricing Engine
+Vectorized option values for option books, grant tables and the options sheet
+
+Features:
+- Black-Scholes-Merton prices and Greeks over arrays of spots, strikes,
+  maturities, rates, volatilities and dividend yields (NumPy broadcasting)
+- Cox-Ross-Rubinstein binomial pricer with American early exercise, priced
+  for a whole batch of options at once
+- Monte Carlo valuation of employee stock options and warrants: vesting,
+  employee exits, suboptimal early exercise (Hull-White exercise multiple)
+  and warrant dilution
+- price_option_book() values a table of grants / warrants in one call
+- Benchmark against plain scalar loops (run this file directly)
+
+Conventions follow the options sheet: vega and rho per 1 percentage point,
+theta per year (theta_daily per calendar day).
+"""
+
+import math
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.special import ndtr as _ndtr
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+DAYS_PER_YEAR = 365.0
+DEFAULT_BINOMIAL_STEPS = 200
+DEFAULT_MC_PATHS = 10000
+DEFAULT_MC_STEPS_PER_YEAR = 52
+
+_SQRT2 = math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+def _erfc(x):
+    """Complementary error function (Chebyshev fit, relative error < 1.2e-7)."""
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = (-z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277)))))))))
+    ans = t * np.exp(poly)
+    return np.where(x >= 0, ans, 2.0 - ans)
+
+
+def norm_cdf(x):
+    """Standard normal CDF (scipy's ndtr when installed)."""
+    x = np.asarray(x, dtype=float)
+    if SCIPY_AVAILABLE:
+        return _ndtr(x)
+    return 0.5 * _erfc(-x / _SQRT2)
+
+
+def norm_pdf(x):
+    x = np.asarray(x, dtype=float)
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def _is_call(option_type):
+    """Boolean array from 'call'/'put' labels (or booleans)."""
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+    return np.char.lower(option_type.astype(str)) == 'call'
+
+
+def black_scholes(spot, strike, maturity, rate, volatility, dividend_yield=0.0,
+                  option_type='call') -> Dict[str, np.ndarray]:
+    """
+    Black-Scholes-Merton price and Greeks.
+
+    Every argument may be a scalar or an array; results broadcast to a common
+    shape. Expired options (maturity <= 0) or zero volatility fall back to
+    discounted intrinsic value with the corresponding limiting delta.
+    """
+    S, K, T, r, sigma, q, call = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (spot, strike, maturity, rate, volatility, dividend_yield)),
+        _is_call(option_type))
+
+    T_pos = np.maximum(T, 0.0)
+    sqrt_T = np.sqrt(T_pos)
+    vol_sqrt_T = sigma * sqrt_T
+    degenerate = vol_sqrt_T <= 0
+    safe_vol_sqrt_T = np.where(degenerate, 1.0, vol_sqrt_T)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T_pos) / safe_vol_sqrt_T
+    d2 = d1 - vol_sqrt_T
+
+    # Degenerate cases: the option is exercised iff the forward is in the money
+    forward_itm = S * np.exp(-q * T_pos) > K * np.exp(-r * T_pos)
+    big = np.where(forward_itm, np.inf, -np.inf)
+    d1 = np.where(degenerate, big, d1)
+    d2 = np.where(degenerate, big, d2)
+
+    disc_q = np.exp(-q * T_pos)
+    disc_r = np.exp(-r * T_pos)
+    sign = np.where(call, 1.0, -1.0)
+    Nd1 = norm_cdf(sign * d1)
+    Nd2 = norm_cdf(sign * d2)
+    pdf_d1 = np.where(degenerate, 0.0, norm_pdf(np.where(np.isfinite(d1), d1, 0.0)))
+
+    price = sign * (S * disc_q * Nd1 - K * disc_r * Nd2)
+    delta = sign * disc_q * Nd1
+    gamma = np.where(degenerate, 0.0, disc_q * pdf_d1 / (S * safe_vol_sqrt_T))
+    vega = S * disc_q * pdf_d1 * sqrt_T / 100.0
+    theta = (-S * disc_q * pdf_d1 * sigma / (2.0 * np.where(sqrt_T > 0, sqrt_T, 1.0))
+             - sign * r * K * disc_r * Nd2 + sign * q * S * disc_q * Nd1)
+    rho = sign * K * T_pos * disc_r * Nd2 / 100.0
+
+    return {
+        'price': price,
+        'delta': delta,
+        'gamma': gamma,
+        'vega': vega,
+        'theta': theta,
+        'theta_daily': theta / DAYS_PER_YEAR,
+        'rho': rho,
+        'd1': d1,
+        'd2': d2
+    }
+
+
+def binomial_price(spot, strike, maturity, rate, volatility, dividend_yield=0.0,
+                   option_type='call', steps: int = DEFAULT_BINOMIAL_STEPS,
+                   american: bool = True) -> np.ndarray:
+    """
+    Cox-Ross-Rubinstein binomial tree price for a batch of options.
+
+    Inputs broadcast like black_scholes; the backward induction runs once
+    over all options (arrays of shape (options, nodes)), so a book of
+    thousands of contracts costs `steps` vectorized passes.
+    """
+    S, K, T, r, sigma, q, call = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (spot, strike, maturity, rate, volatility, dividend_yield)),
+        _is_call(option_type))
+    shape = S.shape
+    S, K, T, r, sigma, q = (a.reshape(-1, 1) for a in (S, K, T, r, sigma, q))
+    sign = np.where(call.reshape(-1, 1), 1.0, -1.0)
+
+    dt = np.maximum(T, 1e-12) / steps
+    u = np.exp(np.maximum(sigma, 1e-12) * np.sqrt(dt))
+    d = 1.0 / u
+    growth = np.exp((r - q) * dt)
+    p = np.clip((growth - d) / (u - d), 0.0, 1.0)
+    disc_up, disc_down = np.exp(-r * dt) * p, np.exp(-r * dt) * (1.0 - p)
+
+    # Terminal nodes j = 0..steps (j up-moves); node prices at the previous
+    # step are the next step's lower nodes times u
+    nodes = S * u ** (2 * np.arange(steps + 1) - steps)
+    values = np.maximum(sign * (nodes - K), 0.0)
+    for step in range(steps - 1, -1, -1):
+        values = disc_up * values[:, 1:step + 2] + disc_down * values[:, :step + 1]
+        if american:
+            nodes = nodes[:, :step + 1] * u
+            np.maximum(values, sign * (nodes - K), out=values)
+    return values[:, 0].reshape(shape)
+
+
+def monte_carlo_option(spot, strike, maturity, rate, volatility, dividend_yield=0.0,
+                       vesting=0.0, exit_rate=0.0, exercise_multiple=None,
+                       shares_outstanding=None, new_shares=None,
+                       paths: int = DEFAULT_MC_PATHS, steps_per_year: int = DEFAULT_MC_STEPS_PER_YEAR,
+                       seed: Optional[int] = 42) -> Dict[str, np.ndarray]:
+    """
+    Monte Carlo value of employee stock options / warrants (call payoff).
+
+    - vesting: years before the option can be exercised
+    - exit_rate: annual intensity of the holder leaving; unvested options are
+      forfeited, vested in-the-money options are exercised on exit
+    - exercise_multiple: vested options are exercised once the stock reaches
+      multiple x strike (Hull-White suboptimal exercise); None = hold to expiry
+    - shares_outstanding / new_shares: warrant dilution factor N / (N + M)
+
+    All grants share one set of random numbers on a weekly (steps_per_year)
+    grid. Price paths are simulated once per distinct (spot, volatility,
+    rate, dividend yield) and exit times once per distinct exit rate, so a
+    grant table of one company costs one first-passage search per grant. Returns per-grant
+    value, standard error, expected life (years) and exercised fraction.
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in
+                                   (spot, strike, maturity, rate, volatility, dividend_yield,
+                                    vesting, exit_rate,
+                                    np.inf if exercise_multiple is None else exercise_multiple)))
+    shape = arrays[0].shape
+    S0, K, T, r, sigma, q, vest, exit_lambda, multiple = (a.ravel() for a in arrays)
+    n_grants = S0.size
+
+    dilution = np.ones(n_grants)
+    if shares_outstanding is not None and new_shares is not None:
+        N = np.broadcast_to(np.asarray(shares_outstanding, dtype=float), shape).ravel()
+        M = np.broadcast_to(np.asarray(new_shares, dtype=float), shape).ravel()
+        dilution = N / (N + M)
+
+    dt = 1.0 / steps_per_year
+    maturity_step = np.maximum(np.round(T / dt).astype(int), 1)
+    vest_step = np.maximum(np.ceil(vest / dt - 1e-9).astype(int), 1)
+    n_steps = int(maturity_step.max()) if n_grants else 0
+
+    rng = np.random.default_rng(seed)
+    cumulative_shocks = np.cumsum(rng.standard_normal((paths, n_steps)), axis=1)
+    leave_draws = rng.random((paths, n_steps))
+    step_times = dt * np.arange(1, n_steps + 1)
+
+    exit_steps = {}
+    never = np.iinfo(np.int64).max
+    rows = np.arange(paths)
+
+    value = np.zeros(n_grants)
+    std_error = np.zeros(n_grants)
+    expected_life = np.zeros(n_grants)
+    exercised_fraction = np.zeros(n_grants)
+
+    # Grants sorted by path parameters: one price matrix in memory at a time
+    order = np.lexsort((q, r, sigma, S0))
+    key, prices = None, None
+    for i in order:
+        if key != (S0[i], sigma[i], r[i], q[i]):
+            key = (S0[i], sigma[i], r[i], q[i])
+            log_drift = (r[i] - q[i] - 0.5 * sigma[i] ** 2) * step_times
+            prices = S0[i] * np.exp(log_drift + sigma[i] * math.sqrt(dt) * cumulative_shocks)
+
+        if exit_lambda[i] not in exit_steps:
+            leaves = leave_draws < 1.0 - math.exp(-exit_lambda[i] * dt)
+            exit_steps[exit_lambda[i]] = np.where(leaves.any(axis=1), leaves.argmax(axis=1) + 1, never)
+        exit_step = exit_steps[exit_lambda[i]]
+
+        m, v = maturity_step[i], vest_step[i]
+        stop = np.minimum(exit_step, m)             # Step the holding period ends
+        if np.isfinite(multiple[i]) and v <= m:
+            window = prices[:, v - 1:m] >= multiple[i] * K[i]
+            first = window.argmax(axis=1)
+            hit = np.where(window[rows, first], first + v, never)
+            stop = np.minimum(stop, hit)
+
+        forfeited = stop < v                        # Left before vesting (or vests after expiry)
+        payoff = np.maximum(prices[rows, stop - 1] - K[i], 0.0) * np.exp(-r[i] * stop * dt)
+        payoff[forfeited] = 0.0
+
+        value[i] = payoff.mean()
+        std_error[i] = payoff.std(ddof=1) / math.sqrt(paths) if paths > 1 else 0.0
+        expected_life[i] = stop.mean() * dt
+        exercised_fraction[i] = (payoff > 0).mean()
+
+    return {
+        'value': (value * dilution).reshape(shape),
+        'std_error': (std_error * dilution).reshape(shape),
+        'expected_life': expected_life.reshape(shape),
+        'exercised_fraction': exercised_fraction.reshape(shape)
+    }
+
+
+BOOK_DEFAULTS = {
+    'dividend_yield': 0.0,
+    'option_type': 'call',
+    'style': 'european',
+    'quantity': 1.0,
+    'vesting': 0.0,
+    'exit_rate': 0.0,
+    'exercise_multiple': np.inf
+}
+
+
+def price_option_book(book: pd.DataFrame, binomial_steps: int = DEFAULT_BINOMIAL_STEPS,
+                      paths: int = DEFAULT_MC_PATHS, seed: Optional[int] = 42,
+                      shares_outstanding: Optional[float] = None) -> pd.DataFrame:
+    """
+    Value a book of options, grants and warrants.
+
+    Required columns: spot, strike, maturity, rate, volatility. Optional:
+    dividend_yield, option_type ('call'/'put'), style ('european',
+    'american', 'eso' or 'warrant'), quantity, vesting, exit_rate,
+    exercise_multiple. Returns the book with unit_value, total_value and the
+    Black-Scholes Greeks (for reference on every row). Warrants are diluted
+    against shares_outstanding using the book's total warrant quantity.
+    ESO and warrant rows are calls; a put with either style raises ValueError.
+    """
+    book = book.copy()
+    for column, default in BOOK_DEFAULTS.items():
+        if column not in book:
+            book[column] = default
+        book[column] = book[column].fillna(default)
+    book['style'] = book['style'].str.lower()
+    book['option_type'] = book['option_type'].str.lower()
+
+    simulated_puts = book['style'].isin(['eso', 'warrant']) & (book['option_type'] == 'put')
+    if simulated_puts.any():
+        raise ValueError(f"ESO and warrant rows must be calls; puts at rows {list(book.index[simulated_puts])}")
+
+    args = [book[c].to_numpy(dtype=float) for c in ('spot', 'strike', 'maturity', 'rate', 'volatility', 'dividend_yield')]
+    option_type = book['option_type'].to_numpy(dtype=str)
+
+    greeks = black_scholes(*args, option_type=option_type)
+    unit_value = greeks['price'].copy()
+
+    american = (book['style'] == 'american').to_numpy()
+    if american.any():
+        unit_value[american] = binomial_price(*(a[american] for a in args), option_type=option_type[american],
+                                              steps=binomial_steps, american=True)
+
+    simulated = book['style'].isin(['eso', 'warrant']).to_numpy()
+    if simulated.any():
+        warrants = (book['style'] == 'warrant').to_numpy()
+        new_shares = None
+        if shares_outstanding and warrants.any():
+            new_shares = np.where(warrants[simulated], book.loc[warrants, 'quantity'].sum(), 0.0)
+        result = monte_carlo_option(
+            *(a[simulated] for a in args),
+            vesting=book.loc[simulated, 'vesting'].to_numpy(dtype=float),
+            exit_rate=book.loc[simulated, 'exit_rate'].to_numpy(dtype=float),
+            exercise_multiple=book.loc[simulated, 'exercise_multiple'].to_numpy(dtype=float),
+            shares_outstanding=shares_outstanding if new_shares is not None else None,
+            new_shares=new_shares, paths=paths, seed=seed)
+        unit_value[simulated] = result['value']
+        book.loc[simulated, 'std_error'] = result['std_error']
+        book.loc[simulated, 'expected_life'] = result['expected_life']
+
+    book['unit_value'] = unit_value
+    book['total_value'] = unit_value * book['quantity'].to_numpy(dtype=float)
+    for greek in ('delta', 'gamma', 'vega', 'theta', 'rho'):
+        book[greek] = greeks[greek]
+    return book
+
+
+def _norm_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / _SQRT2)
+
+
+def _scalar_black_scholes_call(S, K, T, r, sigma, q):
+    d1 = (math.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    return S * math.exp(-q * T) * _norm_cdf(d1) - K * math.exp(-r * T) * _norm_cdf(d2)
+
+
+if __name__ == "__main__":
+    print("⚙️  Option Pricing Engine Benchmark")
+    print("=" * 50)
+    rng = np.random.default_rng(0)
+    n = 100_000
+    S = rng.uniform(50, 150, n)
+    K = rng.uniform(50, 150, n)
+    T = rng.uniform(0.1, 5, n)
+    sigma = rng.uniform(0.1, 0.8, n)
+
+    started = time.perf_counter()
+    vectorized = black_scholes(S, K, T, 0.04, sigma, 0.01)['price']
+    vector_time = time.perf_counter() - started
+    started = time.perf_counter()
+    scalar = [_scalar_black_scholes_call(*args, 0.04, sig, 0.01) for *args, sig in zip(S, K, T, sigma)]
+    scalar_time = time.perf_counter() - started
+    print(f"Black-Scholes x{n:,}: {vector_time * 1000:.1f}ms vectorized vs {scalar_time * 1000:.1f}ms scalar "
+          f"(max diff {np.max(np.abs(vectorized - scalar)):.2e})")
+
+    started = time.perf_counter()
+    binomial_price(S[:2000], K[:2000], T[:2000], 0.04, sigma[:2000], 0.01, 'put', steps=200)
+    print(f"American CRR x2,000 (200 steps): {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    # Grant table: one stock, a few volatility assumptions, varied strikes/terms
+    grants = 2000
+    started = time.perf_counter()
+    monte_carlo_option(100.0, K[:grants], np.round(T[:grants] * 2) / 2 + 1, 0.04,
+                       rng.choice([0.3, 0.35, 0.4, 0.45], grants), 0.0,
+                       vesting=1.0, exit_rate=0.08, exercise_multiple=2.5, paths=10000)
+    print(f"ESO Monte Carlo x{grants:,} grants (10,000 paths): {(time.perf_counter() - started) * 1000:.1f}ms")
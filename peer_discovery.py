@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Peer Discovery - Nearest-neighbour comparable company search
+
+Replaces hand-picked peer lists with a similarity index over a company universe.
+
+Features:
+- Normalized feature vectors per company: sector (one-hot), log market cap,
+  log revenue, revenue growth, EBITDA and net margins, leverage, beta
+- Robust scaling (median / IQR) fitted on the universe, missing values at the
+  universe median, per-feature weights
+- Top-K queries in milliseconds: scipy's cKDTree when available, otherwise a
+  vectorized exact scan over a contiguous float matrix
+- Incremental updates: upsert/remove rewrite single rows; the scaler is only
+  refitted when a large share of the universe has changed
+- Universe profiles built from Yahoo Finance `info` through the shared gateway
+
+Usage:
+    discovery = PeerDiscovery.from_tickers(DEFAULT_UNIVERSE)
+    peers = discovery.find_peers('CRM', k=5)
+"""
+
+import math
+import threading
+import warnings
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+NUMERIC_FEATURES = ['log_market_cap', 'log_revenue', 'revenue_growth', 'ebitda_margin',
+                    'net_margin', 'leverage', 'beta']
+
+DEFAULT_FEATURE_WEIGHTS = {
+    'log_market_cap': 1.5,
+    'log_revenue': 1.5,
+    'revenue_growth': 1.0,
+    'ebitda_margin': 1.0,
+    'net_margin': 0.75,
+    'leverage': 0.75,
+    'beta': 0.5
+}
+DEFAULT_SECTOR_WEIGHT = 2.0   # Distance added between companies in different sectors
+REFIT_FRACTION = 0.2          # Refit scaling once 20% of the universe has changed
+TREE_MIN_SIZE = 256           # Below this a vectorized scan beats building a tree
+
+# Clip ranges keep one bad data point from dominating a distance
+FEATURE_CLIPS = {
+    'revenue_growth': (-1.0, 2.0),
+    'ebitda_margin': (-1.0, 1.0),
+    'net_margin': (-2.0, 1.0),
+    'leverage': (0.0, 10.0),
+    'beta': (-1.0, 4.0)
+}
+
+# Broad, liquid default universe across sectors
+DEFAULT_UNIVERSE = [
+    'MSFT', 'AAPL', 'GOOGL', 'AMZN', 'META', 'NVDA', 'ORCL', 'CRM', 'ADBE', 'NOW', 'INTU', 'PLTR',
+    'SNOW', 'DDOG', 'CRWD', 'SHOP', 'SOFI', 'PYPL', 'SQ', 'COIN', 'AFRM', 'JPM', 'BAC', 'WFC', 'GS',
+    'MS', 'BLK', 'SCHW', 'JNJ', 'PFE', 'ABBV', 'MRK', 'LLY', 'UNH', 'TMO', 'DHR', 'XOM', 'CVX', 'COP',
+    'SLB', 'PG', 'KO', 'PEP', 'WMT', 'COST', 'TGT', 'HD', 'LOW', 'NKE', 'DIS', 'NFLX', 'TSLA', 'F',
+    'GM', 'RIVN', 'BA', 'CAT', 'DE', 'GE', 'HON', 'MMM', 'UPS', 'T', 'VZ', 'TMUS', 'NEE', 'DUK'
+]
+
+
+def _number(value: Any) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return value if math.isfinite(value) else math.nan
+
+
+def _log10(value: Any) -> float:
+    value = _number(value)
+    return math.log10(value) if value > 0 else math.nan
+
+
+def company_features(profile: Dict[str, Any]) -> Dict[str, float]:
+    """Raw (unscaled) numeric features for a company profile."""
+    revenue = _number(profile.get('revenue'))
+    ebitda = _number(profile.get('ebitda'))
+    net_income = _number(profile.get('net_income'))
+    total_debt = _number(profile.get('total_debt'))
+
+    ebitda_margin = _number(profile.get('ebitda_margin'))
+    if math.isnan(ebitda_margin) and revenue > 0 and not math.isnan(ebitda):
+        ebitda_margin = ebitda / revenue
+    net_margin = _number(profile.get('net_margin'))
+    if math.isnan(net_margin) and revenue > 0 and not math.isnan(net_income):
+        net_margin = net_income / revenue
+
+    leverage = _number(profile.get('leverage'))
+    if math.isnan(leverage) and ebitda > 0 and not math.isnan(total_debt):
+        leverage = total_debt / ebitda
+
+    features = {
+        'log_market_cap': _log10(profile.get('market_cap')),
+        'log_revenue': _log10(revenue),
+        'revenue_growth': _number(profile.get('revenue_growth')),
+        'ebitda_margin': ebitda_margin,
+        'net_margin': net_margin,
+        'leverage': leverage,
+        'beta': _number(profile.get('beta'))
+    }
+    for name, (low, high) in FEATURE_CLIPS.items():
+        if not math.isnan(features[name]):
+            features[name] = min(max(features[name], low), high)
+    return features
+
+
+def profile_from_info(ticker: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Company profile from a Yahoo Finance `info` dict."""
+    info = info or {}
+    return {
+        'ticker': ticker.upper(),
+        'name': info.get('longName') or info.get('shortName') or ticker.upper(),
+        'sector': info.get('sector') or 'Unknown',
+        'industry': info.get('industry') or 'Unknown',
+        'market_cap': info.get('marketCap'),
+        'revenue': info.get('totalRevenue'),
+        'revenue_growth': info.get('revenueGrowth'),
+        'ebitda': info.get('ebitda'),
+        'ebitda_margin': info.get('ebitdaMargins'),
+        'net_margin': info.get('profitMargins'),
+        'total_debt': info.get('totalDebt'),
+        'beta': info.get('beta'),
+        # Carried along for comps and benchmarking, not used in the distance
+        'total_cash': info.get('totalCash'),
+        'net_income': info.get('netIncomeToCommon'),
+        'operating_margin': info.get('operatingMargins'),
+        'shares_outstanding': info.get('sharesOutstanding'),
+        'current_price': info.get('currentPrice') or info.get('regularMarketPrice'),
+        'trailing_eps': info.get('trailingEps'),
+        'pe_ratio': info.get('trailingPE'),
+        'ev_ebitda': info.get('enterpriseToEbitda'),
+        'ev_revenue': info.get('enterpriseToRevenue'),
+        'roe': info.get('returnOnEquity'),
+        'roa': info.get('returnOnAssets')
+    }
+
+
+class PeerIndex:
+    """Nearest-neighbour index over normalized company feature vectors."""
+
+    def __init__(self, feature_weights: Optional[Dict[str, float]] = None,
+                 sector_weight: float = DEFAULT_SECTOR_WEIGHT, refit_fraction: float = REFIT_FRACTION):
+        self.feature_weights = {**DEFAULT_FEATURE_WEIGHTS, **(feature_weights or {})}
+        self.sector_weight = sector_weight
+        self.refit_fraction = refit_fraction
+
+        self._weights = np.array([self.feature_weights[name] for name in NUMERIC_FEATURES])
+        self._raw = np.empty((0, len(NUMERIC_FEATURES)))
+        self._sector_codes = np.empty(0, dtype=int)
+        self._valid = np.empty(0, dtype=bool)
+        self._vectors = np.empty((0, len(NUMERIC_FEATURES)))
+        self._size = 0
+
+        self.profiles: List[Optional[Dict[str, Any]]] = []
+        self.rows: Dict[str, int] = {}
+        self.sectors: Dict[str, int] = {}
+        self._center = np.zeros(len(NUMERIC_FEATURES))
+        self._scale = np.ones(len(NUMERIC_FEATURES))
+        self._changes_since_fit = 0
+        self._tree = None
+        self._tree_dirty = True
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self.rows
+
+    # --------------------------------------------------------------- build
+
+    def build(self, profiles: Iterable[Dict[str, Any]]) -> 'PeerIndex':
+        """(Re)build the index from a full universe of company profiles."""
+        with self._lock:
+            self._raw = np.empty((0, len(NUMERIC_FEATURES)))
+            self._sector_codes = np.empty(0, dtype=int)
+            self._valid = np.empty(0, dtype=bool)
+            self._size = 0
+            self.profiles, self.rows, self.sectors = [], {}, {}
+            for profile in profiles:
+                self._write_row(profile)
+            self._refit()
+        return self
+
+    def upsert(self, profiles: Iterable[Dict[str, Any]]):
+        """Add or refresh companies; only the affected rows are recomputed."""
+        with self._lock:
+            changed = []
+            known_sectors = len(self.sectors)
+            for profile in profiles:
+                changed.append(self._write_row(profile))
+            self._changes_since_fit += len(changed)
+
+            if (len(self.sectors) != known_sectors or
+                    self._changes_since_fit > self.refit_fraction * max(len(self), 1)):
+                self._refit()
+            else:
+                self._vectors = self._grow(self._vectors, self._size)
+                rows = np.array(changed, dtype=int)
+                self._vectors[rows] = self._transform(self._raw[rows], self._sector_codes[rows])
+            self._tree_dirty = True
+
+    def remove(self, tickers: Iterable[str]):
+        """Drop companies from the index (their rows become tombstones)."""
+        with self._lock:
+            for ticker in tickers:
+                row = self.rows.pop(ticker.upper(), None)
+                if row is not None:
+                    self._valid[row] = False
+                    self.profiles[row] = None
+                    self._changes_since_fit += 1
+            self._tree_dirty = True
+
+    @staticmethod
+    def _grow(array: np.ndarray, size: int) -> np.ndarray:
+        if size <= len(array):
+            return array
+        capacity = max(size, 2 * len(array), 16)
+        grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def _write_row(self, profile: Dict[str, Any]) -> int:
+        ticker = str(profile['ticker']).upper()
+        sector = profile.get('sector') or 'Unknown'
+        code = self.sectors.setdefault(sector, len(self.sectors))
+        features = company_features(profile)
+
+        row = self.rows.get(ticker)
+        if row is None:
+            row = self._size
+            self._size += 1
+            self._raw = self._grow(self._raw, self._size)
+            self._sector_codes = self._grow(self._sector_codes, self._size)
+            self._valid = self._grow(self._valid, self._size)
+            self.profiles.append(None)
+            self.rows[ticker] = row
+
+        self._raw[row] = [features[name] for name in NUMERIC_FEATURES]
+        self._sector_codes[row] = code
+        self._valid[row] = True
+        self.profiles[row] = {**profile, 'ticker': ticker, 'sector': sector}
+        return row
+
+    # ----------------------------------------------------------- vectors
+
+    def _refit(self):
+        """Refit median/IQR scaling on the live universe and re-transform every row."""
+        live = self._raw[:self._size][self._valid[:self._size]]
+        if len(live):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # Features missing for every company
+                center = np.nanmedian(live, axis=0)
+                q75, q25 = np.nanpercentile(live, [75, 25], axis=0)
+            scale = (q75 - q25) / 1.349  # IQR -> standard deviation for normal data
+            self._center = np.where(np.isnan(center), 0.0, center)
+            self._scale = np.where(np.isnan(scale) | (scale <= 1e-12), 1.0, scale)
+        self._vectors = self._transform(self._raw[:self._size], self._sector_codes[:self._size])
+        self._changes_since_fit = 0
+        self._tree_dirty = True
+
+    def _transform(self, raw: np.ndarray, sector_codes: np.ndarray) -> np.ndarray:
+        scaled = (raw - self._center) / self._scale
+        scaled = np.where(np.isnan(scaled), 0.0, scaled) * self._weights
+        # One-hot sectors scaled so two different sectors are sector_weight apart
+        one_hot = np.zeros((len(raw), max(len(self.sectors), 1)))
+        one_hot[np.arange(len(raw)), sector_codes] = self.sector_weight / math.sqrt(2)
+        return np.hstack([scaled, one_hot])
+
+    def vector(self, profile: Dict[str, Any]) -> np.ndarray:
+        """Feature vector for a profile (in the index or not)."""
+        ticker = str(profile.get('ticker', '')).upper()
+        if ticker in self.rows:
+            return self._vectors[self.rows[ticker]]
+        features = company_features(profile)
+        raw = np.array([[features[name] for name in NUMERIC_FEATURES]])
+        code = self.sectors.get(profile.get('sector') or 'Unknown')
+        vector = self._transform(raw, np.array([code if code is not None else 0]))[0]
+        if code is None:
+            vector[len(NUMERIC_FEATURES):] = 0.0  # Unknown sector: equally far from all
+        return vector
+
+    # ------------------------------------------------------------- query
+
+    def _ensure_tree(self):
+        if cKDTree is None or self._size < TREE_MIN_SIZE:
+            self._tree = None
+        elif self._tree_dirty or self._tree is None:
+            self._tree = cKDTree(self._vectors[:self._size])
+        self._tree_dirty = False
+
+    def query(self, target: Any, k: int = 10, same_sector: bool = False,
+              exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Top-k most similar companies to a ticker in the index or a profile dict.
+        Returns profiles with 'distance' and 'similarity' (1 / (1 + distance)).
+        """
+        with self._lock:
+            profile = self.profiles[self.rows[target.upper()]] if isinstance(target, str) else target
+            if profile is None:
+                raise KeyError(target)
+            query = self.vector(profile)
+            excluded = {t.upper() for t in exclude} | {str(profile.get('ticker', '')).upper()}
+
+            mask = self._valid[:self._size].copy()
+            for ticker in excluded:
+                if ticker in self.rows:
+                    mask[self.rows[ticker]] = False
+            if same_sector:
+                code = self.sectors.get(profile.get('sector') or 'Unknown', -1)
+                mask &= self._sector_codes[:self._size] == code
+
+            candidates = int(mask.sum())
+            if candidates == 0:
+                return []
+            k = min(k, candidates)
+
+            self._ensure_tree()
+            if self._tree is not None and not same_sector:
+                rows, distances = self._tree_query(query, k, mask)
+            else:
+                rows, distances = self._scan(query, k, mask)
+
+            return [{**self.profiles[row], 'distance': float(distance),
+                     'similarity': round(1.0 / (1.0 + float(distance)), 4)}
+                    for row, distance in zip(rows, distances)]
+
+    def _scan(self, query: np.ndarray, k: int, mask: np.ndarray):
+        candidates = np.flatnonzero(mask)
+        diff = self._vectors[candidates] - query
+        squared = np.einsum('ij,ij->i', diff, diff)
+        top = np.argpartition(squared, k - 1)[:k] if k < len(squared) else np.arange(len(squared))
+        top = top[np.argsort(squared[top], kind='stable')]
+        return candidates[top], np.sqrt(squared[top])
+
+    def _tree_query(self, query: np.ndarray, k: int, mask: np.ndarray):
+        # Over-fetch to skip tombstones and exclusions; fall back to a scan if not enough
+        fetch = min(self._size, k + int((~mask).sum()))
+        distances, rows = self._tree.query(query, k=fetch)
+        distances, rows = np.atleast_1d(distances), np.atleast_1d(rows)
+        keep = mask[rows]
+        if keep.sum() < k:
+            return self._scan(query, k, mask)
+        return rows[keep][:k], distances[keep][:k]
+
+
+class PeerDiscovery:
+    """Peer index over a company universe, kept fresh from Yahoo Finance."""
+
+    def __init__(self, index: Optional[PeerIndex] = None, gateway=None):
+        self.index = index or PeerIndex()
+        self._gateway = gateway
+
+    @property
+    def gateway(self):
+        if self._gateway is None:
+            from yfinance_gateway import get_gateway
+            self._gateway = get_gateway()
+        return self._gateway
+
+    def fetch_profiles(self, tickers: Iterable[str]) -> List[Dict[str, Any]]:
+        """Company profiles for tickers (concurrent, memoized per day by the gateway)."""
+        infos = self.gateway.fetch_many(list(tickers), ['info'])
+        return [profile_from_info(ticker, data['info'])
+                for ticker, data in infos.items() if data.get('info')]
+
+    @classmethod
+    def from_tickers(cls, tickers: Iterable[str] = DEFAULT_UNIVERSE, gateway=None) -> 'PeerDiscovery':
+        discovery = cls(gateway=gateway)
+        discovery.index.build(discovery.fetch_profiles(tickers))
+        return discovery
+
+    def refresh(self, tickers: Iterable[str]):
+        """Re-pull profiles for some tickers and update their rows in place."""
+        self.index.upsert(self.fetch_profiles(tickers))
+
+    def find_peers(self, ticker: str, k: int = 5, same_sector: bool = False,
+                   exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """Top-k peers for a ticker, adding the ticker to the universe if needed."""
+        ticker = ticker.upper()
+        if ticker not in self.index:
+            self.index.upsert(self.fetch_profiles([ticker]))
+        if ticker not in self.index:
+            return []
+        return self.index.query(ticker, k=k, same_sector=same_sector, exclude=exclude)
+
+
+_discovery: Optional[PeerDiscovery] = None
+_discovery_lock = threading.Lock()
+
+
+def get_peer_discovery() -> PeerDiscovery:
+    """Process-wide peer discovery over DEFAULT_UNIVERSE, built on first use."""
+    global _discovery
+    with _discovery_lock:
+        if _discovery is None:
+            _discovery = PeerDiscovery.from_tickers(DEFAULT_UNIVERSE)
+        return _discovery
+
+
+def find_peers(ticker: str, k: int = 5, same_sector: bool = False) -> List[Dict[str, Any]]:
+    """Shortcut for get_peer_discovery().find_peers(...)."""
+    return get_peer_discovery().find_peers(ticker, k=k, same_sector=same_sector)
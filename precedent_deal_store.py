@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Precedent Deal Store - Indexed local database of historical M&A transactions
+
+Features:
+- SQLite deal table indexed on sector + announcement date, announcement date,
+  deal size (enterprise value) and buyer type, so date-window and size-band
+  comps come back in milliseconds over thousands of deals
+- Bulk CSV import (chunked) and Parquet import (needs pyarrow or fastparquet)
+- Deal multiples computed once at import and stored alongside each deal
+- Query API returning a ready multiples table, summary statistics in the
+  shape the precedent transactions model uses, or the model's deal inputs
+
+Usage:
+    store = PrecedentDealStore()
+    store.import_file('deals.csv')
+    comps = store.comparable_deals('Technology', target_size=1200.0, years=3)
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DB_PATH = 'precedent_deals.db'
+SAMPLE_DEALS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'precedent_transactions_sample.csv')
+
+# Stored deal fields; values in $M like the precedent transactions model
+DEAL_COLUMNS = ['announced', 'acquirer', 'target', 'sector', 'buyer_type',
+                'equity_value', 'enterprise_value', 'revenue', 'ebitda', 'net_income']
+VALUE_COLUMNS = ['equity_value', 'enterprise_value', 'revenue', 'ebitda', 'net_income']
+MULTIPLE_COLUMNS = ['ev_revenue', 'ev_ebitda', 'equity_value_net_income']
+
+# Common header spellings in deal exports
+COLUMN_ALIASES = {
+    'date': 'announced',
+    'deal_date': 'announced',
+    'announcement_date': 'announced',
+    'announced_date': 'announced',
+    'buyer': 'acquirer',
+    'acquiror': 'acquirer',
+    'industry': 'sector',
+    'ev': 'enterprise_value',
+    'deal_value': 'enterprise_value',
+    'transaction_value': 'enterprise_value',
+    'equity': 'equity_value',
+    'deal_revenue': 'revenue',
+    'ltm_revenue': 'revenue',
+    'deal_ebitda': 'ebitda',
+    'ltm_ebitda': 'ebitda',
+    'deal_net_income': 'net_income',
+    'ltm_net_income': 'net_income'
+}
+
+BUYER_TYPE_ALIASES = {
+    'strategic': 'strategic',
+    'corporate': 'strategic',
+    'financial': 'financial',
+    'sponsor': 'financial',
+    'financial sponsor': 'financial',
+    'private equity': 'financial',
+    'pe': 'financial'
+}
+DEFAULT_BUYER_TYPE = 'strategic'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deals (
+    deal_id INTEGER PRIMARY KEY,
+    announced TEXT NOT NULL,
+    acquirer TEXT NOT NULL,
+    target TEXT NOT NULL,
+    sector TEXT NOT NULL COLLATE NOCASE,
+    buyer_type TEXT NOT NULL,
+    equity_value REAL,
+    enterprise_value REAL,
+    revenue REAL,
+    ebitda REAL,
+    net_income REAL,
+    ev_revenue REAL,
+    ev_ebitda REAL,
+    equity_value_net_income REAL,
+    UNIQUE (announced, acquirer, target)
+);
+CREATE INDEX IF NOT EXISTS idx_deals_sector_date ON deals (sector, announced);
+CREATE INDEX IF NOT EXISTS idx_deals_date ON deals (announced);
+CREATE INDEX IF NOT EXISTS idx_deals_size ON deals (enterprise_value);
+CREATE INDEX IF NOT EXISTS idx_deals_buyer_date ON deals (buyer_type, announced);
+"""
+
+_STORED_COLUMNS = DEAL_COLUMNS + MULTIPLE_COLUMNS
+
+
+def _iso_date(value) -> str:
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    # Same rule as the model: a multiple only exists for a positive denominator
+    return (numerator / denominator.where(denominator > 0)).replace([np.inf, -np.inf], np.nan)
+
+
+def normalize_deals(frame: pd.DataFrame) -> pd.DataFrame:
+    """Map a raw deal export onto the stored columns and compute the multiples."""
+    deals = frame.rename(columns=lambda c: str(c).strip().lower().replace(' ', '_').replace('/', '_'))
+    deals = deals.rename(columns=COLUMN_ALIASES)
+
+    missing = [c for c in ('announced', 'acquirer', 'target', 'sector', 'enterprise_value') if c not in deals]
+    if missing:
+        raise ValueError(f"Deal data is missing required columns: {', '.join(missing)}")
+
+    deals = deals.reindex(columns=DEAL_COLUMNS).copy()
+    deals['announced'] = pd.to_datetime(deals['announced'], errors='coerce').dt.strftime('%Y-%m-%d')
+    for column in ('acquirer', 'target', 'sector'):
+        deals[column] = deals[column].astype('string').str.strip()
+    buyer_type = deals['buyer_type'].astype('string').str.strip().str.lower()
+    deals['buyer_type'] = buyer_type.map(BUYER_TYPE_ALIASES).fillna(buyer_type).fillna(DEFAULT_BUYER_TYPE)
+    for column in VALUE_COLUMNS:
+        deals[column] = pd.to_numeric(deals[column], errors='coerce')
+
+    deals = deals.dropna(subset=['announced', 'acquirer', 'target', 'sector'])
+
+    deals['ev_revenue'] = _ratio(deals['enterprise_value'], deals['revenue'])
+    deals['ev_ebitda'] = _ratio(deals['enterprise_value'], deals['ebitda'])
+    deals['equity_value_net_income'] = _ratio(deals['equity_value'], deals['net_income'])
+    return deals
+
+
+def multiple_statistics(table: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Mean/median/quartiles/min/max per multiple, in the same shape as
+    ProfessionalPrecedentTransactionsModel summary_stats (zeros when no deal
+    has a positive multiple).
+    """
+    stats = {}
+    for column in MULTIPLE_COLUMNS:
+        values = table[column].to_numpy(dtype=float) if column in table else np.array([])
+        values = values[~np.isnan(values) & (values > 0)]
+        if values.size == 0:
+            stats[column] = {'mean': 0, 'median': 0, 'p25': 0, 'p75': 0, 'min': 0, 'max': 0, 'count': 0}
+            continue
+        stats[column] = {
+            'mean': float(values.mean()),
+            'median': float(np.median(values)),
+            'p25': float(np.percentile(values, 25)),
+            'p75': float(np.percentile(values, 75)),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'count': int(values.size)
+        }
+    return stats
+
+
+class PrecedentDealStore:
+    """SQLite store of precedent transactions with indexed filtered queries."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------- import
+
+    def import_frame(self, frame: pd.DataFrame) -> int:
+        """Insert or replace deals from a DataFrame; returns the number stored."""
+        deals = normalize_deals(frame)
+        if deals.empty:
+            return 0
+        rows = deals[_STORED_COLUMNS].astype(object).where(deals[_STORED_COLUMNS].notna(), None)
+        placeholders = ', '.join('?' * len(_STORED_COLUMNS))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO deals ({', '.join(_STORED_COLUMNS)}) VALUES ({placeholders})",
+                rows.itertuples(index=False, name=None))
+        return len(deals)
+
+    def import_csv(self, path: str, chunksize: int = 50_000) -> int:
+        """Bulk-load a CSV export in chunks."""
+        return sum(self.import_frame(chunk) for chunk in pd.read_csv(path, chunksize=chunksize))
+
+    def import_parquet(self, path: str) -> int:
+        """Bulk-load a Parquet file (requires pyarrow or fastparquet)."""
+        return self.import_frame(pd.read_parquet(path))
+
+    def import_file(self, path: str) -> int:
+        """Import a .csv or .parquet file, chosen by extension."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.parquet', '.pq'):
+            count = self.import_parquet(path)
+        elif extension in ('.csv', '.txt'):
+            count = self.import_csv(path)
+        else:
+            raise ValueError(f"Unsupported deal file type: {extension}")
+        print(f"📥 Imported {count} precedent deals from {os.path.basename(path)}")
+        return count
+
+    # ------------------------------------------------------------- queries
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM deals').fetchone()[0]
+
+    def sectors(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT DISTINCT sector FROM deals ORDER BY sector')]
+
+    def deals(self, sector: Optional[str] = None, start=None, end=None,
+              min_size: Optional[float] = None, max_size: Optional[float] = None,
+              buyer_type: Optional[str] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Deals matching every given filter, oldest first (limit keeps the most recent).
+
+        start/end bound the announcement date (inclusive); min_size/max_size
+        bound enterprise value in $M.
+        """
+        clauses, params = [], []
+        if sector:
+            clauses.append('sector = ?')
+            params.append(sector.strip())
+        if start is not None:
+            clauses.append('announced >= ?')
+            params.append(_iso_date(start))
+        if end is not None:
+            clauses.append('announced <= ?')
+            params.append(_iso_date(end))
+        if min_size is not None:
+            clauses.append('enterprise_value >= ?')
+            params.append(float(min_size))
+        if max_size is not None:
+            clauses.append('enterprise_value <= ?')
+            params.append(float(max_size))
+        if buyer_type:
+            key = buyer_type.strip().lower()
+            clauses.append('buyer_type = ?')
+            params.append(BUYER_TYPE_ALIASES.get(key, key))
+
+        query = f"SELECT {', '.join(_STORED_COLUMNS)} FROM deals"
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        # Newest first so a limit keeps the most recent deals; returned oldest first
+        query += ' ORDER BY announced DESC, deal_id DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        table = pd.DataFrame.from_records(rows[::-1], columns=_STORED_COLUMNS)
+        for column in VALUE_COLUMNS + MULTIPLE_COLUMNS:
+            table[column] = pd.to_numeric(table[column], errors='coerce')
+        return table
+
+    def multiples_table(self, **filters) -> pd.DataFrame:
+        """Deal-by-deal multiples table for the matching deals."""
+        table = self.deals(**filters)
+        return table[['announced', 'acquirer', 'target', 'sector', 'buyer_type',
+                      'enterprise_value'] + MULTIPLE_COLUMNS]
+
+    def comparable_deals(self, sector: Optional[str] = None, as_of=None, years: float = 3.0,
+                         target_size: Optional[float] = None, size_band: tuple = (0.5, 2.0),
+                         buyer_type: Optional[str] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Comps from the `years` before `as_of` (default today) and, when
+        target_size is given, with enterprise value within size_band times it.
+        """
+        end = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.today()
+        start = end - pd.DateOffset(days=int(round(years * 365.25)))
+        min_size = max_size = None
+        if target_size:
+            min_size, max_size = target_size * size_band[0], target_size * size_band[1]
+        return self.deals(sector=sector, start=start, end=end, min_size=min_size,
+                          max_size=max_size, buyer_type=buyer_type, limit=limit)
+
+    def summary(self, **filters) -> Dict[str, Dict[str, float]]:
+        """Summary statistics of the multiples of the matching deals."""
+        return multiple_statistics(self.deals(**filters))
+
+    def model_inputs(self, **filters) -> Dict[str, list]:
+        """
+        Matching deals as the deal_* keyword arguments of
+        ProfessionalPrecedentTransactionsModel.run_precedent_transactions_model.
+        """
+        table = self.deals(**filters).fillna({column: 0.0 for column in VALUE_COLUMNS})
+        return {
+            'deal_dates': table['announced'].tolist(),
+            'acquirers': table['acquirer'].tolist(),
+            'targets': table['target'].tolist(),
+            'equity_values': table['equity_value'].tolist(),
+            'enterprise_values': table['enterprise_value'].tolist(),
+            'deal_revenues': table['revenue'].tolist(),
+            'deal_ebitdas': table['ebitda'].tolist(),
+            'deal_net_incomes': table['net_income'].tolist()
+        }
+
+    def close(self):
+        self._conn.close()
+
+
+def load_sample_store(db_path: str = ':memory:') -> PrecedentDealStore:
+    """Deal store seeded with the bundled sample transactions."""
+    store = PrecedentDealStore(db_path)
+    store.import_csv(SAMPLE_DEALS_CSV)
+    return store
@@ -23,6 +23,7 @@ from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
+from accretion_dilution_engine import accretion_dilution_grid, breakeven_cost_synergies
 try:
     import matplotlib.pyplot as plt
     HAS_MATPLOTLIB = True
@@ -415,6 +416,7 @@ class ProfessionalAccretionDilutionModel:
         net_financing_impact = net_interest_expense - foregone_interest_income
 
         financing_calc = {
+            'tax_rate': tax_rate,
             'new_debt_amount': debt_consideration,
             'annual_interest_expense': annual_interest_expense,
             'tax_shield': tax_shield,
@@ -524,55 +526,51 @@ class ProfessionalAccretionDilutionModel:
 
         """Generate sensitivity analysis for key variables"""
 
-        sensitivity_analysis = {}
-
-        # Premium sensitivity
-        premium_sensitivity = []
-        for premium in premium_range:
-            # Recalculate with different premium
-            temp_deal = deal_structure.copy()
-            temp_deal['purchase_premium_pct'] = premium
-
-            temp_purchase = self._calculate_purchase_price(financial_inputs, temp_deal)
-            temp_financing = self._calculate_financing(temp_purchase, temp_deal, synergies)
-            temp_proforma = self._calculate_proforma_financials(financial_inputs, temp_purchase, temp_financing, synergies)
-            temp_accretion = self._calculate_accretion_dilution(financial_inputs, temp_proforma)
-
-            premium_sensitivity.append({
-                'premium_pct': premium,
-                'purchase_price': temp_purchase['equity_purchase_price'],
-                'proforma_eps': temp_proforma['proforma_eps'],
-                'accretion_dilution_pct': temp_accretion['accretion_dilution_pct'],
-                'is_accretive': temp_accretion['is_accretive']
-            })
-
-        # Synergies sensitivity
-        synergies_sensitivity = []
-        for synergy_amount in synergies_range:
-            # Recalculate with different synergies
-            temp_synergies = synergies.copy()
-            temp_synergies['cost_synergies'] = synergy_amount
-            temp_synergies['total_annual_synergies'] = temp_synergies['revenue_synergies'] + synergy_amount
-
-            temp_financing = self._calculate_financing(self._calculate_purchase_price(financial_inputs, deal_structure), deal_structure, temp_synergies)
-            temp_proforma = self._calculate_proforma_financials(financial_inputs, self._calculate_purchase_price(financial_inputs, deal_structure), temp_financing, temp_synergies)
-            temp_accretion = self._calculate_accretion_dilution(financial_inputs, temp_proforma)
-
-            synergies_sensitivity.append({
-                'synergies_amount': synergy_amount,
-                'proforma_eps': temp_proforma['proforma_eps'],
-                'accretion_dilution_pct': temp_accretion['accretion_dilution_pct'],
-                'is_accretive': temp_accretion['is_accretive']
-            })
+        # One vectorized pass over the premium x synergies surface
+        grid = accretion_dilution_grid(financial_inputs, deal_structure, synergies,
+                                       premiums=premium_range, cost_synergies=synergies_range)
+        surface = grid['accretion_dilution_pct'][:, :, 0, 0]
+
+        # Premium sensitivity (base synergies)
+        base = accretion_dilution_grid(financial_inputs, deal_structure, synergies, premiums=premium_range)
+        premium_sensitivity = [{
+            'premium_pct': premium,
+            'purchase_price': float(base['purchase_price'][i, 0, 0, 0]),
+            'proforma_eps': float(base['proforma_eps'][i, 0, 0, 0]),
+            'accretion_dilution_pct': float(base['accretion_dilution_pct'][i, 0, 0, 0]),
+            'is_accretive': bool(base['is_accretive'][i, 0, 0, 0])
+        } for i, premium in enumerate(premium_range)]
+
+        # Synergies sensitivity (base premium)
+        base = accretion_dilution_grid(financial_inputs, deal_structure, synergies, cost_synergies=synergies_range)
+        synergies_sensitivity = [{
+            'synergies_amount': synergy_amount,
+            'proforma_eps': float(base['proforma_eps'][0, j, 0, 0]),
+            'accretion_dilution_pct': float(base['accretion_dilution_pct'][0, j, 0, 0]),
+            'is_accretive': bool(base['is_accretive'][0, j, 0, 0])
+        } for j, synergy_amount in enumerate(synergies_range)]
+
+        # Breakeven cost synergies for each premium
+        breakeven = breakeven_cost_synergies(financial_inputs, deal_structure, synergies, premiums=premium_range)
 
         sensitivity_analysis = {
             'premium_sensitivity': premium_sensitivity,
-            'synergies_sensitivity': synergies_sensitivity
+            'synergies_sensitivity': synergies_sensitivity,
+            'accretion_surface': {
+                'premiums': list(premium_range),
+                'synergies': list(synergies_range),
+                'accretion_dilution_pct': surface.tolist()
+            },
+            'breakeven_synergies': [
+                {'premium_pct': premium, 'breakeven_cost_synergies': float(breakeven[i, 0, 0])}
+                for i, premium in enumerate(premium_range)
+            ]
         }
 
         print("📈 Sensitivity Analysis Generated:")
         print(f"   • Premium Scenarios: {len(premium_range)} cases")
         print(f"   • Synergies Scenarios: {len(synergies_range)} cases")
+        print(f"   • Premium x Synergies Surface: {surface.shape[0]}x{surface.shape[1]} grid")
 
         return sensitivity_analysis
 
@@ -1049,6 +1047,46 @@ class ProfessionalAccretionDilutionModel:
                 ws.cell(row=current_row, column=4, value="ACCRETIVE" if item['is_accretive'] else "DILUTIVE").style = 'accretion' if item['is_accretive'] else 'dilution'
                 current_row += 1
 
+        current_row += 2
+
+        # Premium x Synergies Surface
+        surface = sensitivity_analysis.get('accretion_surface')
+        if surface:
+            ws[f'A{current_row}'] = "ACCRETION/(DILUTION): PREMIUM vs COST SYNERGIES"
+            ws[f'A{current_row}'].style = 'company_header'
+            ws.merge_cells(f'A{current_row}:H{current_row}')
+            current_row += 2
+
+            ws.cell(row=current_row, column=1, value="Premium\\Synergies ($M)").style = 'header'
+            for col, synergy_amount in enumerate(surface['synergies'], 2):
+                ws.cell(row=current_row, column=col, value=synergy_amount).style = 'header'
+            current_row += 1
+
+            for premium, row_values in zip(surface['premiums'], surface['accretion_dilution_pct']):
+                ws.cell(row=current_row, column=1, value=premium).style = 'calculation'
+                for col, value in enumerate(row_values, 2):
+                    ws.cell(row=current_row, column=col, value=value).style = 'accretion' if value > 0 else 'dilution'
+                current_row += 1
+
+            current_row += 2
+
+        # Breakeven Synergies
+        if sensitivity_analysis.get('breakeven_synergies'):
+            ws[f'A{current_row}'] = "BREAKEVEN COST SYNERGIES"
+            ws[f'A{current_row}'].style = 'company_header'
+            ws.merge_cells(f'A{current_row}:H{current_row}')
+            current_row += 2
+
+            headers = ['Premium (%)', 'Breakeven Cost Synergies ($M)']
+            for col, header in enumerate(headers, 1):
+                ws.cell(row=current_row, column=col, value=header).style = 'header'
+            current_row += 1
+
+            for item in sensitivity_analysis['breakeven_synergies']:
+                ws.cell(row=current_row, column=1, value=item['premium_pct']).style = 'calculation'
+                ws.cell(row=current_row, column=2, value=item['breakeven_cost_synergies']).style = 'calculation'
+                current_row += 1
+
         # Set column widths
         for col in range(1, 9):
             ws.column_dimensions[get_column_letter(col)].width = 15
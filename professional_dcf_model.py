@@ -24,6 +24,8 @@ import traceback
 import time
 import numpy as np
 
+import finance_kernel
+
 # Microsoft brand colors
 MSFT_ORANGE = "F25022"
 MSFT_GREEN = "7FBA00"
@@ -66,6 +68,10 @@ except ImportError:
     print("Warning: yfinance is not installed. Yahoo Finance data will not be available.")
     yf = None
 
+import yfinance_gateway
+from google_client_manager import get_google_clients
+from option_pricing import binomial_price, black_scholes
+
 # Default Configuration
 DEFAULT_YEARS = 5
 TERMINAL_GROWTH = 0.025  # 2.5% perpetual growth
@@ -150,8 +156,7 @@ def validate_ticker_and_get_info(ticker):
         return None, False
 
     try:
-        ticker_obj = yf.Ticker(ticker)
-        info = ticker_obj.info
+        info = yfinance_gateway.ticker(ticker).info
 
         # Check if we got meaningful data
         has_data = (
@@ -173,15 +178,16 @@ def get_comprehensive_financials(ticker, years):
     try:
         print(f"📊 Retrieving financial data for {ticker} from multiple sources...")
         print("   🔍 Searching Yahoo Finance, SEC filings, and market data...")
-        ticker_obj = yf.Ticker(ticker)
-        
-        # Get financial statements
-        fin = ticker_obj.financials.T
-        bal = ticker_obj.balance_sheet.T
-        cf = ticker_obj.cashflow.T
-        
-        # Get market data
-        info = ticker_obj.info
+        # Statements and market data fetched concurrently (memoized for the day)
+        statements = yfinance_gateway.get_gateway().statements(ticker)
+        failed = [name for name, value in statements.items() if value is None]
+        if failed:
+            raise ValueError(f"Yahoo Finance returned no {', '.join(failed)}")
+
+        fin = statements['financials'].T
+        bal = statements['balance_sheet'].T
+        cf = statements['cashflow'].T
+        info = statements['info']
         
         print("   ✅ Retrieved data from Yahoo Finance")
         print("   📈 Cross-checking data accuracy and consistency...")
@@ -292,7 +298,7 @@ def get_comprehensive_financials(ticker, years):
             # Try to calculate EBITDA from EBIT + Depreciation
             if ebit_val:
                 try:
-                    cashflow = stock.cashflow
+                    cashflow = yfinance_gateway.ticker(ticker).cashflow
                     if not cashflow.empty:
                         for idx in cashflow.index:
                             idx_str = str(idx).lower()
@@ -479,8 +485,7 @@ def get_comprehensive_financials(ticker, years):
             }
 
             # Try to get basic financials from info
-            ticker_obj = yf.Ticker(ticker)
-            info = ticker_obj.info
+            info = yfinance_gateway.ticker(ticker).info
 
             if info:
                 fallback_data.update({
@@ -1654,7 +1659,7 @@ def format_percentage(value, decimals=1, color=True):
 def get_financial_data_with_fallbacks(ticker, data_type='revenue'):
     """Enhanced financial data extraction with multiple fallbacks"""
     try:
-        stock = yf.Ticker(ticker)
+        stock = yfinance_gateway.ticker(ticker)
 
         if data_type == 'revenue':
             # Method 1: Try info endpoint (most reliable)
@@ -1905,17 +1910,12 @@ def calculate_terminal_value(final_fcf, wacc, growth_rate=TERMINAL_GROWTH):
     """Calculate terminal value using Gordon Growth Model."""
     return final_fcf * (1 + growth_rate) / (wacc - growth_rate)
 
-def discount_cash_flows(fcfs, terminal_value, wacc):
+def discount_cash_flows(fcfs, terminal_value, wacc, mid_year=False, stub=1.0):
     """Discount cash flows to present value."""
-    discounted_fcfs = []
-    for i, fcf in enumerate(fcfs):
-        pv = fcf / ((1 + wacc) ** (i + 1))
-        discounted_fcfs.append(round(pv, 2))
-    
-    # Discount terminal value
-    pv_terminal = terminal_value / ((1 + wacc) ** len(fcfs))
+    pv_fcfs, pv_terminal = finance_kernel.discount_cash_flows(fcfs, terminal_value, wacc, mid_year=mid_year, stub=stub)
+    discounted_fcfs = [round(pv, 2) for pv in pv_fcfs.tolist()]
     
-    return discounted_fcfs, round(pv_terminal, 2)
+    return discounted_fcfs, round(float(pv_terminal), 2)
 
 def calculate_enterprise_value(pv_fcfs, pv_terminal):
     """Calculate Enterprise Value (EV)."""
@@ -2184,16 +2184,11 @@ def write_professional_gsheets(company, years, ebit, tax_paid, depreciation, cap
         return False
     
     try:
-        scopes = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-        gc = gspread.authorize(creds)
+        clients = get_google_clients()
         
         # Open or create sheet
         try:
-            sh = gc.open(sheet_name)
+            sh = clients.open(sheet_name)
         except gspread.SpreadsheetNotFound:
             raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share the sheet with the service account.")
         
@@ -2281,22 +2276,15 @@ def write_professional_gsheets(company, years, ebit, tax_paid, depreciation, cap
 def write_wall_street_dcf_gsheet(sheet_name="Wall Street DCF Model"):
     """Create a multi-sheet, fully formatted, dynamic DCF model in Google Sheets as specified in the latest prompt."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, set_row_height, format_cell_range, CellFormat, Color, TextFormat, Borders, Border, NumberFormat
     )
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     # Create or open the sheet
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share the sheet with the service account.")
 
@@ -2485,26 +2473,19 @@ def write_wall_street_dcf_gsheet(sheet_name="Wall Street DCF Model"):
 def write_single_tab_dcf_gsheet(sheet_id, tab_name, revenue, ebitda, depreciation, ebit, taxes, nopat, da, capex, nwc_change, fcf, years, company_name, ticker=None, net_debt=0, shares_outstanding=0):
     """Open and edit the 'microsoft DCF' tab in the provided Google Sheet. All content, formatting, and formulas are written to this one tab. Never create new tabs."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, set_row_height, format_cell_range, CellFormat, Color, TextFormat, Borders, Border, NumberFormat
     )
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     # Open the existing Google Sheet by file ID
     if sheet_id:
-        sh = gc.open_by_key(sheet_id)
+        sh = clients.open_by_key(sheet_id)
     else:
         # Use default sheet name
         try:
-            sh = gc.open("Financial Models")
+            sh = clients.open("Financial Models")
         except gspread.SpreadsheetNotFound:
             raise RuntimeError("Sheet 'Financial Models' not found. Please create it manually and share the sheet with the service account.")
 
@@ -2662,7 +2643,6 @@ def write_professional_dcf_model(sheet_name, company_name, ticker, financials,
                                sensitivity_table, industry_assumptions, mapped_sector, years):
     """Write a comprehensive, audit-ready DCF model with professional formatting and multiple tabs."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, set_row_height, format_cell_range, CellFormat, Color, TextFormat, Borders, Border, NumberFormat
     )
@@ -2677,27 +2657,25 @@ def write_professional_dcf_model(sheet_name, company_name, ticker, financials,
     YELLOW_HIGHLIGHT = Color(1.0, 0.95, 0.4) # Yellow for highlights
     WHITE_FORMULA = Color(1.0, 1.0, 1.0)    # White for formulas
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share the sheet with the service account.")
 
-    # Helper function to create/clear worksheets
+    # Clear or create all of the model's tabs in one batch
+    tabs = clients.prepare_worksheets(sh, [
+        (f"{company_name} - Executive Summary", 30, 10),
+        (f"{company_name} - Assumptions", 40, 10),
+        (f"{company_name} - DCF Valuation", 60, 15),
+        (f"{company_name} - Sensitivity", 30, 15),
+        (f"{company_name} - 3-Statement", 40, 12)
+    ])
+
+    # Helper function to get a prepared worksheet
     def create_worksheet(title, rows=50, cols=15):
-        try:
-            ws = sh.worksheet(title)
-            ws.clear()
-        except gspread.WorksheetNotFound:
-            ws = sh.add_worksheet(title=title, rows=rows, cols=cols)
-        return ws
+        return tabs.get(title) or clients.worksheet(sh, title, rows, cols)
 
     # Create all required worksheets
     print("   📊 Creating Executive Summary...")
@@ -3070,7 +3048,6 @@ def write_professional_dcf_model(sheet_name, company_name, ticker, financials,
 def build_three_statement_model(company_name, sheet_name="Financial Models", ticker=None, use_custom_data=False):
     """Create a comprehensive 3-Statement Model with Income Statement, Balance Sheet, and Cash Flow Statement."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, set_row_height, format_cell_range, CellFormat, Color, TextFormat, Borders, Border, NumberFormat
     )
@@ -3118,27 +3095,25 @@ def build_three_statement_model(company_name, sheet_name="Financial Models", tic
     sector = financials.get('Sector', 'Unknown')
     industry_assumptions, mapped_sector = get_industry_assumptions(sector)
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share it with the service account.")
 
-    # Helper function to create/clear worksheets
+    # Clear or create all of the model's tabs in one batch
+    tabs = clients.prepare_worksheets(sh, [
+        (f"{company_name} - 3S Assumptions", 40, 10),
+        (f"{company_name} - Income Statement", 50, 12),
+        (f"{company_name} - Balance Sheet", 60, 12),
+        (f"{company_name} - Cash Flow", 50, 12),
+        (f"{company_name} - Dashboard", 40, 12)
+    ])
+
+    # Helper function to get a prepared worksheet
     def create_worksheet(title, rows=60, cols=15):
-        try:
-            ws = sh.worksheet(title)
-            ws.clear()
-        except gspread.WorksheetNotFound:
-            ws = sh.add_worksheet(title=title, rows=rows, cols=cols)
-        return ws
+        return tabs.get(title) or clients.worksheet(sh, title, rows, cols)
 
     # Create worksheets
     print("   🎯 Creating Model Assumptions...")
@@ -3553,7 +3528,6 @@ def build_three_statement_model(company_name, sheet_name="Financial Models", tic
 def build_scenario_stress_model(company_name, sheet_name="Financial Models", ticker=None):
     """Create a comprehensive Scenario & Stress Testing Model with dynamic toggles and interconnected tabs."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, set_row_height, format_cell_range, CellFormat, Color, TextFormat, Borders, Border, NumberFormat
     )
@@ -3605,27 +3579,25 @@ def build_scenario_stress_model(company_name, sheet_name="Financial Models", tic
     base_ebit = base_ebitda * 0.8  # Assuming 20% of EBITDA is D&A
     base_net_income = base_ebit * 0.7  # After taxes and interest
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share it with the service account.")
 
-    # Helper function to create/clear worksheets
+    # Clear or create all of the model's tabs in one batch
+    tabs = clients.prepare_worksheets(sh, [
+        (f"{company_name} - Assumptions", 50, 10),
+        (f"{company_name} - Scenario Logic", 40, 10),
+        (f"{company_name} - Forecast", 40, 12),
+        (f"{company_name} - Output Summary", 30, 10),
+        (f"{company_name} - Charts", 30, 12)
+    ])
+
+    # Helper function to get a prepared worksheet
     def create_worksheet(title, rows=50, cols=15):
-        try:
-            ws = sh.worksheet(title)
-            ws.clear()
-        except gspread.WorksheetNotFound:
-            ws = sh.add_worksheet(title=title, rows=rows, cols=cols)
-        return ws
+        return tabs.get(title) or clients.worksheet(sh, title, rows, cols)
 
     # Create worksheets in the right order
     print("   🎯 Creating Assumptions Tab...")
@@ -4249,33 +4221,29 @@ def build_professional_dcf_model(company_name, ticker=None, years=DEFAULT_YEARS,
 def build_lbo_model(sheet_name="Financial Models", company_name=None, ticker=None, is_private=False, use_custom_data=False):
     """Create a fully-formatted, dynamic LBO model (four tabs) in the given Google Sheet."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, format_cell_range, CellFormat, Color,
         TextFormat, Borders, Border
     )
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share it with the service account.")
 
-    # Helper to get/clear or create a worksheet
+    # Clear or create all of the model's tabs in one batch
+    tabs = clients.prepare_worksheets(sh, [
+        ('Company Database', 50, 10),
+        ('Company Selector', 10, 5),
+        ('Assumptions', 20, 4),
+        ('LBO Model', 50, 15)
+    ])
+
+    # Helper to get a prepared worksheet
     def _get_ws(name: str, rows: int = 100, cols: int = 20):
-        try:
-            ws_tmp = sh.worksheet(name)
-            ws_tmp.clear()
-        except gspread.WorksheetNotFound:
-            ws_tmp = sh.add_worksheet(title=name, rows=rows, cols=cols)
-        return ws_tmp
+        return tabs.get(name) or clients.worksheet(sh, name, rows, cols)
 
     # Get financial data with smart validation if ticker provided
     financials = {}
@@ -4389,33 +4357,33 @@ def build_lbo_model(sheet_name="Financial Models", company_name=None, ticker=Non
 def build_mna_model(company_name, sheet_name="Financial Models", ticker=None, is_private=False):
     """Create a fully-formatted M&A model in Google Sheets for a specific company."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, format_cell_range, CellFormat, Color,
         TextFormat, Borders, Border, NumberFormat
     )
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share it with the service account.")
 
-    # Helper to get/clear or create a worksheet
+    # Company-specific M&A model tabs
+    assumptions_tab = f"{company_name} - M&A Assumptions"
+    proforma_tab = f"{company_name} - Pro Forma"
+    accretion_tab = f"{company_name} - Accretion Analysis"
+
+    # Clear or create all of the model's tabs in one batch
+    tabs = clients.prepare_worksheets(sh, [
+        (assumptions_tab, 50, 10),
+        (proforma_tab, 40, 15),
+        (accretion_tab, 30, 10)
+    ])
+
+    # Helper to get a prepared worksheet
     def _get_ws(name: str, rows: int = 100, cols: int = 20):
-        try:
-            ws_tmp = sh.worksheet(name)
-            ws_tmp.clear()
-        except gspread.WorksheetNotFound:
-            ws_tmp = sh.add_worksheet(title=name, rows=rows, cols=cols)
-        return ws_tmp
+        return tabs.get(name) or clients.worksheet(sh, name, rows, cols)
 
     # Get financial data with smart validation if ticker provided
     financials = {}
@@ -4439,11 +4407,6 @@ def build_mna_model(company_name, sheet_name="Financial Models", ticker=None, is
         print("📊 Using M&A model with default assumptions (provide ticker for real data)...")
         financials = extract_financials_with_llm(company_name)
 
-    # Create company-specific M&A model tabs
-    assumptions_tab = f"{company_name} - M&A Assumptions"
-    proforma_tab = f"{company_name} - Pro Forma"
-    accretion_tab = f"{company_name} - Accretion Analysis"
-    
     ws_assumptions = _get_ws(assumptions_tab, 50, 10)
     ws_proforma = _get_ws(proforma_tab, 40, 15)
     ws_accretion = _get_ws(accretion_tab, 30, 10)
@@ -4642,7 +4605,6 @@ def build_mna_model(company_name, sheet_name="Financial Models", ticker=None, is
 def build_ipo_model(company_name, sheet_name="Financial Models", ticker=None, is_private=False):
     """Create a comprehensive IPO model in Google Sheets with support for private companies."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, format_cell_range, CellFormat, Color,
         TextFormat, Borders, Border, NumberFormat
@@ -4699,30 +4661,32 @@ def build_ipo_model(company_name, sheet_name="Financial Models", ticker=None, is
         employee_pct = 0.15
         other_pct = 0.10
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share it with the service account.")
 
-    # Helper to get/clear or create a worksheet
+    # Company-specific IPO model tabs
+    assumptions_tab = f"{company_name} - IPO Assumptions"
+    sources_uses_tab = f"{company_name} - Sources & Uses"
+
+    # Clear or create all of the model's tabs in one batch
+    tabs = clients.prepare_worksheets(sh, [
+        (assumptions_tab, 50, 10),
+        (sources_uses_tab, 25, 10),
+        ('Pre Post Ownership', 30, 10),
+        ('Proceeds Allocation', 20, 10),
+        ('Valuation Summary', 25, 10),
+        ('Sensitivity Analysis', 30, 15)
+    ])
+
+    # Helper to get a prepared worksheet
     def _get_ws(name: str, rows: int = 100, cols: int = 20):
-        try:
-            ws_tmp = sh.worksheet(name)
-            ws_tmp.clear()
-        except gspread.WorksheetNotFound:
-            ws_tmp = sh.add_worksheet(title=name, rows=rows, cols=cols)
-        return ws_tmp
+        return tabs.get(name) or clients.worksheet(sh, name, rows, cols)
 
     # 1. IPO Assumptions Sheet
-    assumptions_tab = f"{company_name} - IPO Assumptions"
     ws_assumptions = _get_ws(assumptions_tab, 50, 10)
     
     # Use collected financial data
@@ -4782,7 +4746,6 @@ def build_ipo_model(company_name, sheet_name="Financial Models", ticker=None, is
     set_frozen(ws_assumptions, rows=1)
 
     # 2. Sources & Uses Sheet
-    sources_uses_tab = f"{company_name} - Sources & Uses"
     ws_sources_uses = _get_ws(sources_uses_tab, 25, 10)
     
     sources_uses_data = [
@@ -5010,36 +4973,33 @@ def build_ipo_model(company_name, sheet_name="Financial Models", ticker=None, is
     print(f"✅ Complete IPO model created in sheet: {sh.url}")
     print("   📊 Includes: Assumptions, Sources & Uses, Ownership Analysis, Proceeds, Valuation, Sensitivity")
 
-def build_options_model(sheet_name="Financial Models"):
+def build_options_model(sheet_name="Financial Models", spot=100.00, strike=105.00, maturity=0.25,
+                        rate=0.05, volatility=0.20, dividend_yield=0.02, binomial_steps=50):
     """Create a fully-formatted Options Pricing model in Google Sheets."""
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, format_cell_range, CellFormat, Color,
         TextFormat, Borders, Border, NumberFormat
     )
 
-    creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-    gc = gspread.authorize(creds)
+    clients = get_google_clients()
 
     try:
-        sh = gc.open(sheet_name)
+        sh = clients.open(sheet_name)
     except gspread.SpreadsheetNotFound:
         raise RuntimeError(f"Sheet '{sheet_name}' not found. Please create it manually and share it with the service account.")
 
-    # Helper to get/clear or create a worksheet
+    # Clear or create all of the model's tabs in one batch
+    tabs = clients.prepare_worksheets(sh, [
+        ('Inputs & Assumptions', 25, 10),
+        ('Greeks Output', 30, 10),
+        ('Sensitivity Analysis', 40, 15),
+        ('Binomial Model', 30, 10)
+    ])
+
+    # Helper to get a prepared worksheet
     def _get_ws(name: str, rows: int = 100, cols: int = 20):
-        try:
-            ws_tmp = sh.worksheet(name)
-            ws_tmp.clear()
-        except gspread.WorksheetNotFound:
-            ws_tmp = sh.add_worksheet(title=name, rows=rows, cols=cols)
-        return ws_tmp
+        return tabs.get(name) or clients.worksheet(sh, name, rows, cols)
 
     # 1. Inputs & Assumptions Sheet
     ws_inputs = _get_ws('Inputs & Assumptions', 25, 10)
@@ -5047,15 +5007,15 @@ def build_options_model(sheet_name="Financial Models"):
     inputs_data = [
         ["BLACK-SCHOLES OPTIONS PRICING MODEL"],
         ["This model uses the Black-Scholes formula for European-style options."],
-        ["For American options, consider binomial trees or finite difference methods."],
+        ["American prices (Cox-Ross-Rubinstein tree) are on the Binomial Model tab."],
         [""],
         ["INPUT PARAMETERS"],
-        ["Stock Price (S)", 100.00],
-        ["Strike Price (K)", 105.00],
-        ["Time to Maturity (T, years)", 0.25],
-        ["Risk-Free Rate (r)", 0.05],
-        ["Volatility (σ, annualized)", 0.20],
-        ["Dividend Yield (q)", 0.02],
+        ["Stock Price (S)", spot],
+        ["Strike Price (K)", strike],
+        ["Time to Maturity (T, years)", maturity],
+        ["Risk-Free Rate (r)", rate],
+        ["Volatility (σ, annualized)", volatility],
+        ["Dividend Yield (q)", dividend_yield],
         ["Option Type", "Call"],
         [""],
         ["CALCULATED INTERMEDIATE VALUES"],
@@ -5156,35 +5116,36 @@ def build_options_model(sheet_name="Financial Models"):
     ws_sensitivity = _get_ws('Sensitivity Analysis', 40, 15)
     
     # Create sensitivity tables
+    # Grids priced by the option engine (the sheet has no Black-Scholes grid function)
+    sens_vols = np.arange(0.10, 0.501, 0.05)
+    sens_times = np.array([0.1, 0.25, 0.5, 1.0, 2.0])
+    sens_spots = np.arange(80, 121, 5)
+    call_grid = black_scholes(spot, strike, sens_times[:, None], rate, sens_vols[None, :], dividend_yield, 'call')['price']
+    put_grid = black_scholes(spot, strike, sens_times[:, None], rate, sens_vols[None, :], dividend_yield, 'put')['price']
+    delta_grid = black_scholes(sens_spots[None, :], strike, sens_times[:, None], rate, volatility, dividend_yield, 'call')['delta']
+
+    def _grid_rows(grid):
+        return [[f"{t} years", float(t)] + [round(float(v), 6) for v in row] for t, row in zip(sens_times, grid)]
+
+    vol_header = ["Volatility →", ""] + [f"{v:.0%}" for v in sens_vols]
+    blank_row = ["Time ↓"] + [""] * (len(sens_vols) + 1)
     sensitivity_data = [
         ["OPTION PRICE SENSITIVITY ANALYSIS"],
-        [""],
+        [f"Values computed by the option pricing engine for S={spot:g}, K={strike:g}, r={rate:.2%}, q={dividend_yield:.2%}"],
         ["CALL OPTION PRICE - VOLATILITY vs TIME TO MATURITY"],
-        ["Volatility →", "", "10%", "15%", "20%", "25%", "30%", "35%", "40%", "45%", "50%"],
-        ["Time ↓", "", "", "", "", "", "", "", "", "", ""],
-        ["0.1 years", "=A6", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,C4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,D4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,E4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,F4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,G4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,H4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,I4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,J4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A6,K4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["0.25 years", "=A7", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23", "='Inputs & Assumptions'!B23"],
-        ["0.5 years", "=A8", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,C4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,D4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,E4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,F4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,G4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,H4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,I4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,J4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A8,K4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["1.0 years", "=A9", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,C4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,D4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,E4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,F4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,G4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,H4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,I4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,J4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A9,K4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["2.0 years", "=A10", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,C4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,D4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,E4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,F4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,G4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,H4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,I4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,J4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A10,K4,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
+        vol_header,
+        blank_row,
+        *_grid_rows(call_grid),
         [""],
         ["PUT OPTION PRICE - VOLATILITY vs TIME TO MATURITY"],
-        ["Volatility →", "", "10%", "15%", "20%", "25%", "30%", "35%", "40%", "45%", "50%"],
-        ["Time ↓", "", "", "", "", "", "", "", "", "", ""],
-        ["0.1 years", "=A15", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,C13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,D13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,E13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,F13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,G13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,H13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,I13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,J13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A15,K13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["0.25 years", "=A16", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24", "='Inputs & Assumptions'!B24"],
-        ["0.5 years", "=A17", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,C13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,D13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,E13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,F13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,G13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,H13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,I13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,J13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A17,K13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["1.0 years", "=A18", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,C13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,D13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,E13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,F13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,G13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,H13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,I13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,J13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A18,K13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["2.0 years", "=A19", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,C13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,D13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,E13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,F13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,G13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,H13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,I13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,J13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,A19,K13,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
+        vol_header,
+        blank_row,
+        *_grid_rows(put_grid),
         [""],
         ["DELTA SENSITIVITY - STOCK PRICE vs TIME"],
-        ["Stock Price →", "", 80, 85, 90, 95, 100, 105, 110, 115, 120],
-        ["Time ↓", "", "", "", "", "", "", "", "", "", ""],
-        ["0.1 years", "=A24", "=BS_DELTA(C23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(D23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(E23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(F23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(G23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(H23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(I23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(J23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(K23,'Inputs & Assumptions'!B7,A24,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["0.25 years", "=A25", "='Greeks Output'!B4", "='Greeks Output'!B4", "='Greeks Output'!B4", "='Greeks Output'!B4", "='Greeks Output'!B4", "='Greeks Output'!B4", "='Greeks Output'!B4", "='Greeks Output'!B4", "='Greeks Output'!B4"],
-        ["0.5 years", "=A26", "=BS_DELTA(C23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(D23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(E23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(F23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(G23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(H23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(I23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(J23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(K23,'Inputs & Assumptions'!B7,A26,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["1.0 years", "=A27", "=BS_DELTA(C23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(D23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(E23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(F23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(G23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(H23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(I23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(J23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(K23,'Inputs & Assumptions'!B7,A27,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"],
-        ["2.0 years", "=A28", "=BS_DELTA(C23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(D23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(E23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(F23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(G23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(H23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(I23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(J23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)", "=BS_DELTA(K23,'Inputs & Assumptions'!B7,A28,'Inputs & Assumptions'!B10,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B11)"]
+        ["Stock Price →", ""] + [int(x) for x in sens_spots],
+        blank_row,
+        *_grid_rows(delta_grid)
     ]
     
     ws_sensitivity.update(range_name='A1', values=sensitivity_data)
@@ -5230,19 +5191,29 @@ def build_options_model(sheet_name="Financial Models"):
     # 4. Binomial Model Comparison Sheet
     ws_binomial = _get_ws('Binomial Model', 30, 10)
     
+    # Tree prices from the option engine (European and American exercise)
+    convergence_steps = [10, 25, 50, 100, 250]
+    tree = {
+        (option_type, american, steps): float(binomial_price(spot, strike, maturity, rate, volatility, dividend_yield,
+                                                             option_type, steps=steps, american=american))
+        for option_type in ('call', 'put')
+        for american in (False, True)
+        for steps in set(convergence_steps + [binomial_steps])
+    }
+
     binomial_data = [
         ["BINOMIAL MODEL COMPARISON"],
         ["Cox-Ross-Rubinstein Binomial Tree Method"],
         [""],
         ["BINOMIAL PARAMETERS"],
-        ["Number of Steps (N)", 50],
+        ["Number of Steps (N)", binomial_steps],
         ["Up Factor (u)", "=EXP('Inputs & Assumptions'!B10*SQRT('Inputs & Assumptions'!B8/B5))"],
         ["Down Factor (d)", "=1/B6"],
         ["Risk-Neutral Probability (p)", "=(EXP(('Inputs & Assumptions'!B9-'Inputs & Assumptions'!B11)*'Inputs & Assumptions'!B8/B5)-B7)/(B6-B7)"],
         [""],
-        ["BINOMIAL RESULTS"],
-        ["Call Option Price (Binomial)", "=BINOMIAL_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,B5)"],
-        ["Put Option Price (Binomial)", "=BINOMIAL_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,B5)"],
+        ["BINOMIAL RESULTS", "European", "American", "Early Exercise Premium"],
+        ["Call Option Price (Binomial)", tree[('call', False, binomial_steps)], tree[('call', True, binomial_steps)], "=C11-B11"],
+        ["Put Option Price (Binomial)", tree[('put', False, binomial_steps)], tree[('put', True, binomial_steps)], "=C12-B12"],
         [""],
         ["COMPARISON WITH BLACK-SCHOLES"],
         ["Call Price Difference", "=B11-'Inputs & Assumptions'!B23"],
@@ -5252,11 +5223,9 @@ def build_options_model(sheet_name="Financial Models"):
         [""],
         ["CONVERGENCE ANALYSIS"],
         ["Steps", "Call Price", "Put Price", "Call Diff vs BS", "Put Diff vs BS"],
-        ["10", "=BINOMIAL_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,10)", "=BINOMIAL_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,10)", "=B22-'Inputs & Assumptions'!B23", "=C22-'Inputs & Assumptions'!B24"],
-        ["25", "=BINOMIAL_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,25)", "=BINOMIAL_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,25)", "=B23-'Inputs & Assumptions'!B23", "=C23-'Inputs & Assumptions'!B24"],
-        ["50", "=BINOMIAL_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,50)", "=BINOMIAL_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,50)", "=B24-'Inputs & Assumptions'!B23", "=C24-'Inputs & Assumptions'!B24"],
-        ["100", "=BINOMIAL_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,100)", "=BINOMIAL_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,100)", "=B25-'Inputs & Assumptions'!B23", "=C25-'Inputs & Assumptions'!B24"],
-        ["250", "=BINOMIAL_CALL('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,250)", "=BINOMIAL_PUT('Inputs & Assumptions'!B6,'Inputs & Assumptions'!B7,'Inputs & Assumptions'!B8,'Inputs & Assumptions'!B9,'Inputs & Assumptions'!B10,250)", "=B26-'Inputs & Assumptions'!B23", "=C26-'Inputs & Assumptions'!B24"]
+        *[[str(n), tree[('call', False, n)], tree[('put', False, n)],
+           f"=B{row}-'Inputs & Assumptions'!B23", f"=C{row}-'Inputs & Assumptions'!B24"]
+          for row, n in enumerate(convergence_steps, start=22)]
     ]
     
     ws_binomial.update(range_name='A1', values=binomial_data)
@@ -5296,7 +5265,6 @@ def build_options_model(sheet_name="Financial Models"):
 
     print(f"✅ Complete Options Pricing model created in sheet: {sh.url}")
     print("   📊 Includes: Black-Scholes Calculator, Greeks, Sensitivity Analysis, Binomial Comparison")
-    print("   ⚠️  Note: Some advanced formulas may need manual adjustment in Google Sheets")
 
 def main_menu():
     try:
@@ -5571,9 +5539,35 @@ def main_menu():
         traceback.print_exc()
         raise
 
+def discover_comps_data(ticker, k=5):
+    """Comps input rows for the k companies most similar to the target (empty list on failure)."""
+    if not yf:
+        return []
+    try:
+        from peer_discovery import find_peers
+        peers = find_peers(ticker, k=k)
+    except Exception as e:
+        print(f"⚠️  Peer discovery failed for {ticker}: {e}")
+        return []
+
+    def value(peer, key):
+        return float(peer.get(key) or 0)
+
+    rows = []
+    for row, peer in enumerate(peers, start=2):
+        revenue = value(peer, 'revenue')
+        rows.append([
+            peer['name'], peer['ticker'], value(peer, 'market_cap'),
+            value(peer, 'total_debt') - value(peer, 'total_cash'), f"=C{row}+D{row}",
+            revenue, value(peer, 'ebitda'), revenue * value(peer, 'operating_margin'),
+            value(peer, 'net_income'), value(peer, 'current_price'), value(peer, 'shares_outstanding')
+        ])
+    if rows:
+        print(f"🔍 Discovered peers for {ticker}: {', '.join(p['ticker'] for p in peers)}")
+    return rows
+
 def comps_workflow():
     import gspread
-    from google.oauth2.service_account import Credentials
     from gspread_formatting import (
         set_frozen, set_column_width, set_row_height, format_cell_range, CellFormat, Color, TextFormat, Borders, Border, NumberFormat
     )
@@ -5611,8 +5605,8 @@ def comps_workflow():
     valuation_summary_tab = f"{company_name} - Valuation Summary"
     multiples_overview_tab = f"{company_name} - Multiples Overview"
     
-    # For demo, use sample comps data
-    comps_data = [
+    # Nearest-neighbour peers for the target; sample mega-cap data if discovery is unavailable
+    comps_data = discover_comps_data(ticker) or [
         ["Microsoft", "MSFT", 3000000000000, 50000000000, "=C2+D2", 211915000000, 97000000000, 83000000000, 72000000000, 400, 7500000000],
         ["Apple", "AAPL", 2800000000000, 10000000000, "=C3+D3", 383285000000, 130000000000, 119000000000, 100000000000, 600, 17000000000],
         ["Google", "GOOGL", 1800000000000, 14000000000, "=C4+D4", 282836000000, 92000000000, 78000000000, 60000000000, 280, 13000000000],
@@ -5683,13 +5677,8 @@ def comps_workflow():
         try:
             print("[DEBUG] Starting Google Sheets output block...")
             # Connect to Google Sheets
-            creds_path = os.getenv('GOOGLE_SHEETS_CREDENTIALS') or 'credentials/google_sheets_credentials.json'
-            scopes = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-            gc = gspread.authorize(creds)
+            clients = get_google_clients()
+            gc = clients.gspread_client()
             # Ask user for sheet name
             try:
                 sheet_name = input("Enter the name of your Google Sheet (must already exist): ").strip()
@@ -5701,7 +5690,7 @@ def comps_workflow():
             print(f"[DEBUG] Sheet name: {sheet_name}")
             # Try to open existing sheet, create if it doesn't exist
             try:
-                sh = gc.open(sheet_name)
+                sh = clients.open(sheet_name)
                 print(f"✅ Opened existing Google Sheet: {sheet_name}")
             except gspread.SpreadsheetNotFound:
                 print(f"📝 Creating new Google Sheet: {sheet_name}")
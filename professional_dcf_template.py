@@ -14,11 +14,17 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
-import yfinance as yf
+import yfinance_gateway
 
 # Import existing scrapers and data sources
 from improve_finviz_scraping import improved_scrape_finviz_data
 from scraper import GrantScraper
+from model_manifest import artifact_metadata, get_manifest, write_sidecar
+
+MODEL_TYPE = 'professional_dcf'
+DATA_SOURCES = ('yfinance', 'finviz', 'grants')
+# Sources the workbook is actually built from (grant data is collected but not used in the model)
+MODEL_DATA_SOURCES = ('yfinance', 'finviz')
 
 class ProfessionalDCFTemplate:
     """Professional DCF Model following investment banking standards"""
@@ -119,47 +125,50 @@ class ProfessionalDCFTemplate:
 
         return styles
 
-    def collect_financial_data(self, ticker):
+    def collect_financial_data(self, ticker, sources=DATA_SOURCES):
         """Collect financial data from multiple sources"""
         print(f"Collecting financial data for {ticker}...")
 
         data_sources = {}
 
         # 1. Yahoo Finance
-        try:
-            ticker_obj = yf.Ticker(ticker)
-            info = ticker_obj.info
-            financials = ticker_obj.financials.T
-            balance_sheet = ticker_obj.balance_sheet.T
-
-            data_sources['yfinance'] = {
-                'info': info,
-                'financials': financials,
-                'balance_sheet': balance_sheet
-            }
-            print("   ✅ Yahoo Finance data collected")
-        except Exception as e:
-            print(f"   ⚠️ Yahoo Finance error: {e}")
+        if 'yfinance' in sources:
+            try:
+                ticker_obj = yfinance_gateway.ticker(ticker)
+                info = ticker_obj.info
+                financials = ticker_obj.financials.T
+                balance_sheet = ticker_obj.balance_sheet.T
+
+                data_sources['yfinance'] = {
+                    'info': info,
+                    'financials': financials,
+                    'balance_sheet': balance_sheet
+                }
+                print("   ✅ Yahoo Finance data collected")
+            except Exception as e:
+                print(f"   ⚠️ Yahoo Finance error: {e}")
 
         # 2. Finviz
-        try:
-            finviz_data = improved_scrape_finviz_data(ticker)
-            if finviz_data:
-                data_sources['finviz'] = finviz_data
-                print("   ✅ Finviz data collected")
-        except Exception as e:
-            print(f"   ⚠️ Finviz error: {e}")
+        if 'finviz' in sources:
+            try:
+                finviz_data = improved_scrape_finviz_data(ticker)
+                if finviz_data:
+                    data_sources['finviz'] = finviz_data
+                    print("   ✅ Finviz data collected")
+            except Exception as e:
+                print(f"   ⚠️ Finviz error: {e}")
 
         # 3. Company-specific data (grants, news, etc.)
-        try:
-            if self.grant_scraper is None:
-                self.grant_scraper = GrantScraper()
-            grant_data = self.grant_scraper.run_search(max_results=50)
-            if grant_data:
-                data_sources['grants'] = grant_data
-                print("   ✅ Grant/investment data collected")
-        except Exception as e:
-            print(f"   ⚠️ Grant data error: {e}")
+        if 'grants' in sources:
+            try:
+                if self.grant_scraper is None:
+                    self.grant_scraper = GrantScraper()
+                grant_data = self.grant_scraper.run_search(max_results=50)
+                if grant_data:
+                    data_sources['grants'] = grant_data
+                    print("   ✅ Grant/investment data collected")
+            except Exception as e:
+                print(f"   ⚠️ Grant data error: {e}")
 
         return data_sources
 
@@ -672,18 +681,54 @@ class ProfessionalDCFTemplate:
         # This should be calculated based on actual row placement
         return 20  # Placeholder
 
-    def build_professional_dcf(self, company_name, ticker=None):
-        """Build complete professional DCF model"""
+    def model_inputs(self, company_name, ticker, financial_data):
+        """
+        The values the workbook is built from; their hash decides whether a model is stale.
+        Market cap is not listed on its own: it only reaches the workbook through the
+        Finviz fallback for base_revenue, which is hashed as the derived value.
+        """
+        return {
+            'company_name': company_name,
+            'ticker': (ticker or '').upper(),
+            'forecast_years': self.forecast_years,
+            'assumptions': dict(self.assumptions),
+            'base_revenue': float(self._get_base_revenue(financial_data))
+        }
+
+    def model_outputs(self, financial_data):
+        """Key values of the model, stored in its sidecar for version-to-version comparisons."""
+        base_revenue = float(self._get_base_revenue(financial_data))
+        revenue = base_revenue
+        for year in range(1, self.forecast_years + 1):
+            revenue *= 1 + self.assumptions.get(f'revenue_growth_y{year}', 0.0)
+        return {
+            'base_revenue': base_revenue,
+            'final_year_revenue': revenue,
+            'final_year_ebitda': revenue * self.assumptions['ebitda_margin'],
+            'wacc': self._calculate_wacc(),
+            'terminal_growth_rate': self.assumptions['terminal_growth_rate']
+        }
+
+    def build_professional_dcf(self, company_name, ticker=None, financial_data=None,
+                               output_dir=None, record=True):
+        """
+        Build complete professional DCF model.
+
+        financial_data skips collection (the model updater passes the data it
+        already fetched to check staleness). Every workbook gets a metadata
+        sidecar; record=False leaves the shared manifest to the caller (used
+        by worker processes). The metadata is kept on self.last_metadata.
+        """
         self.company_name = company_name
         self.ticker = ticker or ""
+        self.last_metadata = None
 
         print(f"🏗️ Building professional DCF model for {company_name}")
         print("=" * 60)
 
         # Collect financial data
-        financial_data = {}
-        if ticker:
-            financial_data = self.collect_financial_data(ticker)
+        if financial_data is None:
+            financial_data = self.collect_financial_data(ticker) if ticker else {}
 
         # Create workbook
         workbook = Workbook()
@@ -701,9 +746,20 @@ class ProfessionalDCFTemplate:
 
         # Save file
         filename = f"professional_dcf_{company_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            filename = os.path.join(output_dir, filename)
 
         try:
             workbook.save(filename)
+
+            self.last_metadata = artifact_metadata(
+                filename, ticker, MODEL_TYPE, self.model_inputs(company_name, ticker, financial_data),
+                outputs=self.model_outputs(financial_data), company_name=company_name,
+                generator='professional_dcf_template')
+            write_sidecar(filename, self.last_metadata)
+            if record:
+                get_manifest().record(self.last_metadata)
             print(f"✅ Professional DCF model saved: {filename}")
             print("=" * 60)
             print("📊 Model includes:")
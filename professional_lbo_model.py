@@ -21,10 +21,13 @@ Features:
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.chart import LineChart, Reference, ScatterChart, Series
+from finance_kernel import irr
+from lbo_returns_engine import run_lbo_grid
+from model_graph import ComputationGraph
 # Optional matplotlib import for charting
 try:
     import matplotlib.pyplot as plt
@@ -32,6 +35,7 @@ try:
 except ImportError:
     HAS_MATPLOTLIB = False
 # from scipy.optimize import newton  # Not currently used
+import inspect
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -47,6 +51,36 @@ LBO_COLORS = {
     'text_white': 'FFFFFF'
 }
 
+# Assumption keys each calculation step reads (drives incremental recalculation)
+LBO_NODE_KEYS = {
+    'sources_uses': ['senior_debt', 'mezzanine_debt', 'equity_investment', 'purchase_price',
+                     'transaction_fees'],
+    'operating_forecast': ['entry_ebitda', 'ebitda_margin', 'revenue_growth', 'forecast_years', 'years',
+                           'da_pct', 'capex_pct', 'nwc_pct', 'tax_rate'],
+    'debt_schedule': ['forecast_years', 'senior_debt', 'senior_rate', 'senior_amort_pct',
+                      'optional_prepay_senior', 'mezzanine_debt', 'mezz_rate', 'mezz_amort_pct',
+                      'optional_prepay_mezz'],
+    'cash_flow_waterfall': ['tax_rate'],
+    'exit_analysis': ['forecast_years', 'exit_multiple_base', 'exit_multiple_bull', 'exit_multiple_bear'],
+    'returns_analysis': ['equity_investment', 'forecast_years'],
+    'sensitivity_analysis': ['entry_ebitda', 'entry_multiple', 'senior_debt_pct', 'mezzanine_pct', 'equity_pct',
+                             'fees_pct', 'senior_rate', 'senior_amort_pct', 'mezz_rate', 'mezz_amort_pct',
+                             'revenue_growth', 'ebitda_margin', 'capex_pct', 'nwc_pct', 'tax_rate', 'da_pct',
+                             'optional_prepay_senior', 'optional_prepay_mezz', 'forecast_years']
+}
+
+# Workbook tabs and the results they are rendered from
+LBO_SHEETS = [
+    ("Assumptions", '_create_assumptions_tab', ['assumptions']),
+    ("Sources & Uses", '_create_sources_uses_tab', ['sources_uses']),
+    ("Operating Forecast", '_create_forecast_tab', ['operating_forecast']),
+    ("Debt Schedule", '_create_debt_tab', ['debt_schedule']),
+    ("Cash Flow Waterfall", '_create_waterfall_tab', ['cash_flow_waterfall']),
+    ("Exit & Returns", '_create_exit_tab', ['exit_analysis', 'returns_analysis']),
+    ("Sensitivity", '_create_sensitivity_tab', ['sensitivity_analysis']),
+    ("Summary", '_create_summary_tab', ['assumptions', 'returns_analysis', 'sources_uses']),
+]
+
 class ProfessionalLBOModel:
     """
     Comprehensive LBO Model with Professional Formatting
@@ -210,6 +244,87 @@ class ProfessionalLBOModel:
 
         return lbo_results, excel_file
 
+    def build_computation_graph(self, **inputs):
+        """
+        Build a dependency-tracked graph of the LBO calculation steps.
+        Accepts the same keyword arguments as run_lbo_model.
+        """
+
+        parameters = inspect.signature(self.run_lbo_model).parameters
+        unknown = set(inputs) - set(parameters)
+        if unknown:
+            raise TypeError(f"Unknown LBO inputs: {sorted(unknown)}")
+
+        graph = ComputationGraph()
+        input_names = list(parameters)
+        for name in input_names:
+            graph.add_input(name, inputs.get(name, parameters[name].default))
+
+        graph.add_node('assumptions', lambda *values: self._create_transaction_assumptions(*values), input_names)
+        graph.add_node('sources_uses', self._create_sources_uses, ['assumptions'],
+                       keys={'assumptions': LBO_NODE_KEYS['sources_uses']})
+        graph.add_node('operating_forecast', self._create_operating_forecast, ['assumptions'],
+                       keys={'assumptions': LBO_NODE_KEYS['operating_forecast']})
+        graph.add_node('debt_schedule', self._create_debt_schedule, ['assumptions', 'operating_forecast'],
+                       keys={'assumptions': LBO_NODE_KEYS['debt_schedule'], 'operating_forecast': ['years']})
+        graph.add_node('cash_flow_waterfall', self._create_cash_flow_waterfall,
+                       ['assumptions', 'operating_forecast', 'debt_schedule'],
+                       keys={'assumptions': LBO_NODE_KEYS['cash_flow_waterfall']})
+        graph.add_node('exit_analysis', self._create_exit_analysis,
+                       ['assumptions', 'operating_forecast', 'debt_schedule'],
+                       keys={'assumptions': LBO_NODE_KEYS['exit_analysis'],
+                             'operating_forecast': ['ebitda'],
+                             'debt_schedule': ['total_debt_balance']})
+        graph.add_node('returns_analysis', self._calculate_returns, ['assumptions', 'exit_analysis'],
+                       keys={'assumptions': LBO_NODE_KEYS['returns_analysis']})
+        graph.add_node('sensitivity_analysis', self._create_sensitivity_analysis, ['assumptions'],
+                       keys={'assumptions': LBO_NODE_KEYS['sensitivity_analysis']})
+
+        for sheet_name, _, deps in LBO_SHEETS:
+            graph.add_sheet(sheet_name, deps)
+
+        return graph
+
+    def recalculate(self, graph, changes, excel_file=None):
+        """
+        Apply assumption changes to a graph from build_computation_graph and
+        recompute only the affected steps. If excel_file is given, only the
+        tabs fed by changed results are rewritten in place.
+
+        Returns (lbo_results, rewritten_sheets).
+        """
+
+        for name, value in changes.items():
+            graph.set_input(name, value)
+        changed_nodes = graph.recompute()
+
+        lbo_results = {name: graph.get(name) for name in ['assumptions'] + list(LBO_NODE_KEYS)}
+
+        rewritten_sheets = graph.affected_sheets(changed_nodes)
+        if excel_file and rewritten_sheets:
+            self._rewrite_excel_sheets(excel_file, lbo_results, rewritten_sheets)
+
+        return lbo_results, rewritten_sheets
+
+    def _rewrite_excel_sheets(self, excel_file, lbo_results, sheet_names):
+        """Re-emit selected tabs of an existing LBO workbook"""
+
+        wb = load_workbook(excel_file)
+        for style_name, style in self.styles.items():
+            if style_name not in wb.named_styles:
+                wb.add_named_style(style)
+
+        for sheet_name, method_name, _ in LBO_SHEETS:
+            if sheet_name not in sheet_names:
+                continue
+            index = wb.sheetnames.index(sheet_name) if sheet_name in wb.sheetnames else len(wb.sheetnames)
+            if sheet_name in wb.sheetnames:
+                wb.remove(wb[sheet_name])
+            ws = wb.create_sheet(sheet_name, index)
+            getattr(self, method_name)(ws, lbo_results)
+
+        wb.save(excel_file)
+
     def _create_transaction_assumptions(self, entry_ebitda, entry_multiple, exit_multiple_base,
                                        exit_multiple_bull, exit_multiple_bear, senior_debt_pct,
                                        mezzanine_pct, equity_pct, fees_pct, senior_rate,
@@ -556,28 +671,13 @@ class ProfessionalLBOModel:
         # Calculate IRR using cash flows
         def calculate_irr(exit_value, years):
             # Create cash flow stream: -investment + annual cash flows + exit value
-            cash_flows = [-equity_investment]  # Initial investment
-
-            # Add annual excess cash flows (distributions to equity)
-            annual_cf = 0  # Assuming no annual distributions for conservative case
-
-            for year in range(1, years):
-                cash_flows.append(annual_cf)
-
-            # Add exit value
-            cash_flows.append(exit_value)
-
-            # Calculate IRR
-            try:
-                # Use numpy's irr function
-                irr = np.irr(cash_flows)
-                return max(irr, -0.99)  # Cap at -99%
-            except (Exception,):
-                # Fallback calculation
-                if exit_value > equity_investment:
-                    return (exit_value / equity_investment) ** (1/years) - 1
-                else:
-                    return -0.5
+            # (no annual distributions to equity for conservative case)
+            cash_flows = [-equity_investment] + [0.0] * (years - 1) + [exit_value]
+
+            result = irr(cash_flows)
+            if np.isnan(result):
+                return -0.99  # Equity wiped out
+            return max(float(result), -0.99)  # Cap at -99%
 
         # Base Case
         irr_base = calculate_irr(exit_analysis['exit_equity_base'], forecast_years)
@@ -612,48 +712,20 @@ class ProfessionalLBOModel:
     def _create_sensitivity_analysis(self, assumptions):
         """Create sensitivity analysis for key variables"""
 
-        base_entry_multiple = assumptions['entry_multiple']
-        base_exit_multiple = assumptions['exit_multiple_base']
-        base_leverage = (assumptions['senior_debt_pct'] + assumptions['mezzanine_pct']) / assumptions['equity_pct']
-
         # Sensitivity ranges
         entry_multiples = np.arange(8.0, 13.0, 0.5)
         exit_multiples = np.arange(9.0, 14.0, 0.5)
         leverage_ratios = np.arange(2.0, 6.0, 0.5)
 
-        # IRR sensitivity to entry vs exit multiple
-        irr_sensitivity = []
-        for entry_mult in entry_multiples:
-            row = []
-            for exit_mult in exit_multiples:
-                # Recalculate with new multiples
-                purchase_price = assumptions['entry_ebitda'] * entry_mult
-                equity_investment = purchase_price * assumptions['equity_pct']
-                exit_ebitda = assumptions['entry_ebitda'] * (1 + sum(assumptions['revenue_growth'][:assumptions['forecast_years']-1])/assumptions['forecast_years']) ** (assumptions['forecast_years']-1)
-                exit_value = exit_ebitda * exit_mult
-
-                # Simple IRR calculation
-                irr = (exit_value / equity_investment) ** (1/assumptions['forecast_years']) - 1
-                row.append(irr)
-            irr_sensitivity.append(row)
-
-        # MOIC sensitivity to leverage
-        moic_sensitivity = []
-        for lev_ratio in leverage_ratios:
-            row = []
-            for exit_mult in exit_multiples:
-                # Recalculate with new leverage
-                debt_pct = lev_ratio / (1 + lev_ratio)
-                equity_pct = 1 / (1 + lev_ratio)
-
-                purchase_price = assumptions['entry_ebitda'] * base_entry_multiple
-                equity_investment = purchase_price * equity_pct
-                exit_ebitda = assumptions['entry_ebitda'] * (1 + sum(assumptions['revenue_growth'][:assumptions['forecast_years']-1])/assumptions['forecast_years']) ** (assumptions['forecast_years']-1)
-                exit_value = exit_ebitda * exit_mult
-
-                moic = exit_value / equity_investment
-                row.append(moic)
-            moic_sensitivity.append(row)
+        # IRR sensitivity to entry vs exit multiple (full debt schedule per cell)
+        entry_grid = run_lbo_grid(assumptions, entry_multiples=entry_multiples,
+                                  exit_multiples=exit_multiples, cash_sweep_pct=0.0)
+        irr_sensitivity = entry_grid['irr'][:, :, 0, 0].tolist()
+
+        # MOIC sensitivity to leverage vs exit multiple
+        leverage_grid = run_lbo_grid(assumptions, exit_multiples=exit_multiples,
+                                     leverage_ratios=leverage_ratios, cash_sweep_pct=0.0)
+        moic_sensitivity = leverage_grid['moic'][0, :, :, 0].T.tolist()
 
         sensitivity_analysis = {
             'entry_multiples': entry_multiples,
@@ -22,6 +22,7 @@ from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
+from merger_model_kernel import evaluate_merger_pairs, load_company_table, rank_merger_pairs
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -1152,6 +1153,64 @@ def run_sample_merger_model():
     return results, excel_file
 
 
+def run_batch_merger_screen(companies, top_k=10, acquirers=None, targets=None, **deal_terms):
+    """
+    Screen every acquirer x target pair from a columnar company table in one
+    vectorized pass, rank by EPS accretion and build workbooks for the top-K.
+    Acquirers without positive EPS are not ranked (see rank_merger_pairs).
+    """
+
+    print("🤝 Running Batch M&A Merger Screen")
+    print("=" * 70)
+
+    table = load_company_table(companies).set_index('ticker', drop=False)
+    pair_results = evaluate_merger_pairs(table, acquirers=acquirers, targets=targets, **deal_terms)
+    ranked = rank_merger_pairs(pair_results)
+    terms = pair_results['deal_terms']
+
+    print(f"📊 Screened {len(pair_results['acquirers'])} acquirers x {len(pair_results['targets'])} targets")
+    print(f"   • Ranked pairs: {len(ranked):,} (acquirers with positive EPS)")
+    print(f"   • Accretive pairs: {int(ranked['is_accretive'].sum()):,}")
+
+    excel_files = []
+    for _, pair in ranked.head(top_k).iterrows():
+        acquirer = table.loc[pair['acquirer']]
+        target = table.loc[pair['target']]
+
+        merger_model = ProfessionalMergerModel(acquirer['name'], acquirer['ticker'], target['name'], target['ticker'])
+        _, excel_file = merger_model.run_merger_model(
+            acquirer_share_price=acquirer['share_price'],
+            acquirer_shares_outstanding=acquirer['shares_outstanding'],
+            acquirer_eps=acquirer['eps'],
+            target_share_price=target['share_price'],
+            target_shares_outstanding=target['shares_outstanding'],
+            target_net_debt=target['net_debt'],
+            target_eps=target['eps'],
+            offer_price_per_share=pair['offer_price_per_share'],
+            premium_pct=terms['premium_pct'],
+            cash_pct=terms['cash_pct'],
+            stock_pct=terms['stock_pct'],
+            debt_pct=terms['debt_pct'],
+            revenue_synergies=terms['revenue_synergies'],
+            cost_synergies_pct=terms['cost_synergies_pct'],
+            one_time_costs=terms['one_time_costs'],
+            new_debt_interest_rate=terms['new_debt_interest_rate'],
+            foregone_cash_yield=terms['foregone_cash_yield'],
+            transaction_fees_pct=terms['transaction_fees_pct'],
+            intangible_amortization_years=terms['intangible_amortization_years'],
+            tax_rate=terms['tax_rate'],
+            combined_revenue=acquirer['revenue'] + target['revenue'],
+            combined_ebitda=acquirer['ebitda'] + target['ebitda'],
+            combined_depreciation=acquirer['depreciation'] + target['depreciation'],
+            combined_tax_rate=terms['tax_rate']
+        )
+        excel_files.append(excel_file)
+
+    print(f"\n✅ Batch screen complete: {len(excel_files)} workbooks written")
+
+    return ranked, excel_files
+
+
 if __name__ == "__main__":
     # Run sample merger model
     results, excel_file = run_sample_merger_model()
@@ -144,15 +144,39 @@ class ProfessionalPrecedentTransactionsModel:
                                         enterprise_values=None,     # $M
                                         deal_revenues=None,         # $M
                                         deal_ebitdas=None,          # $M
-                                        deal_net_incomes=None):     # $M
+                                        deal_net_incomes=None,      # $M
+
+                                        # Or pull the deals from a PrecedentDealStore
+                                        deal_store=None,
+                                        deal_filters=None):
 
         """
         Run complete precedent transactions model with deal analysis
+
+        When deal lists are not passed and deal_store is given, the deals are
+        queried from the store with deal_filters (PrecedentDealStore.deals
+        keyword arguments, e.g. sector, start, end, min_size, max_size).
         """
 
         print(f"🤝 Building Professional Precedent Transactions Model for {self.target_company} ({self.target_ticker})")
         print("=" * 90)
 
+        # Query precedent deals from the deal store if provided
+        if deal_dates is None and deal_store is not None:
+            store_inputs = deal_store.model_inputs(**(deal_filters or {}))
+            if store_inputs['deal_dates']:
+                print(f"🗄️  Loaded {len(store_inputs['deal_dates'])} precedent deals from deal store")
+                deal_dates = store_inputs['deal_dates']
+                acquirers = store_inputs['acquirers']
+                targets = store_inputs['targets']
+                equity_values = store_inputs['equity_values']
+                enterprise_values = store_inputs['enterprise_values']
+                deal_revenues = store_inputs['deal_revenues']
+                deal_ebitdas = store_inputs['deal_ebitdas']
+                deal_net_incomes = store_inputs['deal_net_incomes']
+            else:
+                print(f"⚠️  No precedent deals match {deal_filters}, using sample deals")
+
         # Set default precedent deals if not provided
         if deal_dates is None:
             deal_dates = ["2023-01-15", "2023-03-22", "2023-06-10", "2023-09-05", "2023-11-28"]
@@ -145,15 +145,32 @@ class ProfessionalTradingCompsModel:
                                peer_epss=None,             # $
                                peer_net_debts=None,        # $M
                                peer_shares_outstanding=None,  # Million shares
-                               peer_share_prices=None):    # $
+                               peer_share_prices=None,     # $
+                               discover_peers=False,
+                               peer_count=5):
 
         """
-        Run complete trading comparables model with peer group analysis
+        Run complete trading comparables model with peer group analysis.
+        With discover_peers=True and no peers supplied, the peer group is the
+        peer_count most similar companies to the target ticker.
         """
 
         print(f"📊 Building Professional Trading Comps Model for {self.target_company} ({self.target_ticker})")
         print("=" * 90)
 
+        if peer_names is None and discover_peers:
+            discovered = self.discover_peer_group(peer_count)
+            if discovered:
+                peer_names = discovered['peer_names']
+                peer_tickers = discovered['peer_tickers']
+                peer_revenues = discovered['peer_revenues']
+                peer_ebitdas = discovered['peer_ebitdas']
+                peer_net_incomes = discovered['peer_net_incomes']
+                peer_epss = discovered['peer_epss']
+                peer_net_debts = discovered['peer_net_debts']
+                peer_shares_outstanding = discovered['peer_shares_outstanding']
+                peer_share_prices = discovered['peer_share_prices']
+
         # Set default peer group if not provided
         if peer_names is None:
             peer_names = ["Peer A Corp", "Peer B Inc", "Peer C Ltd", "Peer D Corp", "Peer E LLC"]
@@ -212,6 +229,36 @@ class ProfessionalTradingCompsModel:
 
         return comps_results, excel_file
 
+    def discover_peer_group(self, k=5):
+        """
+        Peer inputs ($M, million shares, $) for the k companies most similar to
+        the target ticker, or None if peer discovery is unavailable.
+        """
+        try:
+            from peer_discovery import find_peers
+            peers = find_peers(self.target_ticker, k=k)
+        except Exception as e:
+            print(f"⚠️ Peer discovery unavailable ({e}); using sample peer group")
+            return None
+        if not peers:
+            return None
+
+        def millions(peer, key):
+            return float(peer.get(key) or 0) / 1e6
+
+        print(f"🔍 Discovered peers: {', '.join(peer['ticker'] for peer in peers)}")
+        return {
+            'peer_names': [peer['name'] for peer in peers],
+            'peer_tickers': [peer['ticker'] for peer in peers],
+            'peer_revenues': [millions(peer, 'revenue') for peer in peers],
+            'peer_ebitdas': [millions(peer, 'ebitda') for peer in peers],
+            'peer_net_incomes': [millions(peer, 'net_income') for peer in peers],
+            'peer_epss': [float(peer.get('trailing_eps') or 0) for peer in peers],
+            'peer_net_debts': [millions(peer, 'total_debt') - millions(peer, 'total_cash') for peer in peers],
+            'peer_shares_outstanding': [millions(peer, 'shares_outstanding') for peer in peers],
+            'peer_share_prices': [float(peer.get('current_price') or 0) for peer in peers]
+        }
+
     def _create_assumptions(self, target_revenue, target_ebitda, target_net_income, target_eps,
                            target_net_debt, target_shares_outstanding,
                            peer_names, peer_tickers, peer_revenues, peer_ebitdas,
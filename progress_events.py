@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Progress Events - Event bus for live progress of long model builds
+
+Pipeline stages publish what they are doing (data source tried, cache hit,
+calculation stage, sheet written); the web layer streams the events to the
+browser over Server-Sent Events while the build runs.
+
+Features:
+- Jobs with an ordered, bounded event history: late subscribers and
+  reconnecting browsers (Last-Event-ID) replay what they missed
+- emit() publishes to the job bound to the current context, so pipeline code
+  needs no job id plumbing, and does nothing outside a job
+- Blocking subscriptions (Flask / WSGI) and asyncio subscriptions (ASGI)
+  on the same bus
+- Terminal 'complete' / 'failed' events carry the job result, so clients read
+  it from the stream instead of holding a request open until it times out
+- SSE framing with keep-alive comments so proxies do not drop idle streams
+- JobGroup: work shared by several jobs (one fetch, many waiting requests)
+  reports to all of them, and jobs that join late replay what they missed
+
+Jobs live in this process's memory, so a server that streams them must run a
+single worker process: an events request routed to another worker would not
+find the job. claim_worker() enforces that at server startup.
+
+Usage:
+    bus = get_bus()
+    job_id = bus.create_job(ticker='AAPL', model_type='dcf')
+    with bind(job_id):
+        emit('data', 'Fetching Yahoo Finance data', source='yahoo_finance', status='started')
+    bus.complete(job_id, result)
+
+    return Response(bus.sse_stream(job_id, last_event_id), mimetype=SSE_MIMETYPE)
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from serialization import get_serializer
+
+try:
+    import fcntl
+except ImportError:  # Windows: the worker check falls back to WEB_CONCURRENCY only
+    fcntl = None
+
+SSE_MIMETYPE = 'text/event-stream'
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+TERMINAL_STAGES = ('complete', 'failed')
+HISTORY_LIMIT = 500
+JOB_TTL_SECONDS = 15 * 60
+HEARTBEAT_SECONDS = 15.0
+RETRY_MS = 3000
+
+_json_codec = get_serializer('fast_json')
+_current_job: ContextVar[Optional[Union[str, 'JobGroup']]] = ContextVar('progress_job', default=None)
+
+
+class _Job:
+    def __init__(self, job_id: str, meta: Dict[str, Any], history_limit: int):
+        self.id = job_id
+        self.meta = meta
+        self.events = deque(maxlen=history_limit)
+        self.subscribers: List[Callable[[dict], Any]] = []
+        self.status = 'running'
+        self.result = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.next_id = 1
+
+
+class ProgressBus:
+    """Per-job progress events with replay and live fan-out to subscribers."""
+
+    def __init__(self, history_limit: int = HISTORY_LIMIT, job_ttl: float = JOB_TTL_SECONDS):
+        self.history_limit = history_limit
+        self.job_ttl = job_ttl
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+
+    # ---- jobs ----
+
+    def create_job(self, job_id: Optional[str] = None, **meta) -> str:
+        """Register a job; finished jobs older than job_ttl are dropped on the way."""
+        job_id = job_id or uuid.uuid4().hex
+        with self._lock:
+            cutoff = time.time() - self.job_ttl
+            for stale in [j for j, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+                del self._jobs[stale]
+            self._jobs[job_id] = _Job(job_id, meta, self.history_limit)
+        self.publish(job_id, 'queued', 'Job queued', status='queued', **meta)
+        return job_id
+
+    def complete(self, job_id: str, result: Any = None) -> Optional[dict]:
+        return self.publish(job_id, 'complete', 'Model ready', status='complete', result=result)
+
+    def fail(self, job_id: str, error: Any) -> Optional[dict]:
+        return self.publish(job_id, 'failed', str(error), status='failed', error=str(error))
+
+    def run_in_thread(self, job_id: str, fn: Callable[..., Any], *args, **kwargs) -> threading.Thread:
+        """Run fn(*args) bound to the job on a daemon thread; its return value completes the job."""
+        def target():
+            with bind(job_id):
+                try:
+                    self.complete(job_id, fn(*args, **kwargs))
+                except Exception as e:
+                    self.fail(job_id, e)
+
+        thread = threading.Thread(target=target, name=f'progress-job-{job_id[:8]}', daemon=True)
+        thread.start()
+        return thread
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status, metadata, retained events and result of a job (None if unknown)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {'job_id': job.id, 'status': job.status, 'meta': dict(job.meta),
+                    'events': list(job.events), 'result': job.result}
+
+    # ---- publishing ----
+
+    def publish(self, job_id: str, stage: str, message: str, status: str = 'info', **details) -> Optional[dict]:
+        """Append an event to the job and hand it to every live subscriber."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != 'running':
+                return None
+            event = {'id': job.next_id, 'job_id': job_id, 'stage': stage, 'status': status,
+                     'message': message, 'timestamp': datetime.now().isoformat(), **details}
+            job.next_id += 1
+            job.events.append(event)
+            if stage in TERMINAL_STAGES:
+                job.status = stage
+                job.result = details.get('result')
+                job.finished_at = time.time()
+            subscribers = list(job.subscribers)
+        for deliver in subscribers:
+            try:
+                deliver(event)
+            except RuntimeError:
+                pass  # subscriber's event loop already closed
+        return event
+
+    # ---- subscribing ----
+
+    def _attach(self, job_id: str, deliver: Callable[[dict], Any], last_event_id: int):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return [], True
+            backlog = [event for event in job.events if event['id'] > last_event_id]
+            if job.status != 'running':
+                return backlog, True  # nothing more will be published
+            job.subscribers.append(deliver)
+            return backlog, False
+
+    def _detach(self, job_id: str, deliver: Callable[[dict], Any]):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and deliver in job.subscribers:
+                job.subscribers.remove(deliver)
+
+    def subscribe(self, job_id: str, last_event_id: int = 0,
+                  heartbeat: float = HEARTBEAT_SECONDS) -> Iterator[Optional[dict]]:
+        """
+        Blocking iterator over a job's events: missed ones first, then live.
+        Yields None after each idle heartbeat interval; ends after the terminal event.
+        """
+        inbox: queue.Queue = queue.Queue()
+        backlog, finished = self._attach(job_id, inbox.put, last_event_id)
+        try:
+            last_seen = last_event_id
+            for event in backlog:
+                last_seen = event['id']
+                yield event
+                if event['stage'] in TERMINAL_STAGES:
+                    return
+            while not finished:
+                try:
+                    event = inbox.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield None
+                    continue
+                if event['id'] <= last_seen:
+                    continue
+                last_seen = event['id']
+                yield event
+                if event['stage'] in TERMINAL_STAGES:
+                    return
+        finally:
+            self._detach(job_id, inbox.put)
+
+    async def asubscribe(self, job_id: str, last_event_id: int = 0,
+                         heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[Optional[dict]]:
+        """subscribe() for the event loop: publishers on other threads wake it thread-safely."""
+        loop = asyncio.get_running_loop()
+        inbox: asyncio.Queue = asyncio.Queue()
+
+        def deliver(event):
+            loop.call_soon_threadsafe(inbox.put_nowait, event)
+
+        backlog, finished = self._attach(job_id, deliver, last_event_id)
+        try:
+            last_seen = last_event_id
+            for event in backlog:
+                last_seen = event['id']
+                yield event
+                if event['stage'] in TERMINAL_STAGES:
+                    return
+            while not finished:
+                try:
+                    event = await asyncio.wait_for(inbox.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event['id'] <= last_seen:
+                    continue
+                last_seen = event['id']
+                yield event
+                if event['stage'] in TERMINAL_STAGES:
+                    return
+        finally:
+            self._detach(job_id, deliver)
+
+    def sse_stream(self, job_id: str, last_event_id: int = 0,
+                   heartbeat: float = HEARTBEAT_SECONDS) -> Iterator[str]:
+        """Server-Sent Events body for a WSGI response."""
+        yield f'retry: {RETRY_MS}\n\n'
+        for event in self.subscribe(job_id, last_event_id, heartbeat):
+            yield sse_format(event)
+
+    async def asse_stream(self, job_id: str, last_event_id: int = 0,
+                          heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+        """Server-Sent Events body for an ASGI streaming response."""
+        yield f'retry: {RETRY_MS}\n\n'
+        async for event in self.asubscribe(job_id, last_event_id, heartbeat):
+            yield sse_format(event)
+
+
+class JobGroup:
+    """
+    Jobs waiting on one shared piece of work. emit() under bind(group)
+    publishes to every member; join() adds a job and replays the group's
+    events so far to it.
+    """
+
+    def __init__(self, job_ids: Iterable[Optional[str]] = ()):
+        self.job_ids: List[str] = [job_id for job_id in job_ids if job_id is not None]
+        self.events: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def join(self, job_id: Optional[str]):
+        if job_id is None:
+            return
+        with self._lock:
+            if job_id in self.job_ids:
+                return
+            self.job_ids.append(job_id)
+            missed = list(self.events)
+        bus = get_bus()
+        for stage, message, status, details in missed:
+            bus.publish(job_id, stage, message, status=status, **details)
+
+    def publish(self, stage: str, message: str, status: str = 'info', **details) -> Optional[dict]:
+        # Recorded and addressed under one lock, so a concurrent join() sees each event exactly once
+        with self._lock:
+            self.events.append((stage, message, status, details))
+            job_ids = list(self.job_ids)
+        bus = get_bus()
+        events = [bus.publish(job_id, stage, message, status=status, **details) for job_id in job_ids]
+        return events[0] if events else None
+
+
+def claim_worker(lock_path: str):
+    """
+    Claim job streaming for this process, or raise RuntimeError when the
+    server runs several workers (WEB_CONCURRENCY > 1, or another process
+    holding lock_path). Returns the lock file; close it to release.
+    """
+    workers = os.getenv('WEB_CONCURRENCY', '1')
+    if workers.isdigit() and int(workers) > 1:
+        raise RuntimeError(f"Progress jobs need a single worker process (WEB_CONCURRENCY={workers})")
+    if fcntl is None:
+        return None
+    handle = open(lock_path, 'a')
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        raise RuntimeError(f"Another worker already serves progress jobs ({lock_path}); "
+                           f"run a single worker process")
+    return handle
+
+
+def sse_format(event: Optional[dict]) -> str:
+    """One SSE frame; None becomes a keep-alive comment."""
+    if event is None:
+        return ': keep-alive\n\n'
+    return f"id: {event['id']}\ndata: {_json_codec.dumps(event).decode('utf-8')}\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    """Last-Event-ID header (or ?last_event_id=) of a reconnecting EventSource."""
+    try:
+        return max(int(value), 0) if value else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+@contextmanager
+def bind(job_id: Optional[Union[str, JobGroup]]):
+    """Route emit() calls in this context (and tasks / copied contexts started from it) to job_id (or a group)."""
+    token = _current_job.set(job_id)
+    try:
+        yield job_id
+    finally:
+        _current_job.reset(token)
+
+
+def current_job() -> Optional[str]:
+    job = _current_job.get()
+    return None if isinstance(job, JobGroup) else job
+
+
+def emit(stage: str, message: str, status: str = 'info', **details) -> Optional[dict]:
+    """Publish a progress event for the current job; a no-op when no job is bound."""
+    job_id = _current_job.get()
+    if job_id is None:
+        return None
+    if isinstance(job_id, JobGroup):
+        return job_id.publish(stage, message, status=status, **details)
+    return get_bus().publish(job_id, stage, message, status=status, **details)
+
+
+_bus: Optional[ProgressBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_bus() -> ProgressBus:
+    """Process-wide progress bus shared by the pipeline and the web layer."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = ProgressBus()
+        return _bus
@@ -3,7 +3,7 @@
 Quick check of company data coverage
 """
 
-import yfinance as yf
+import yfinance_gateway
 import pandas as pd
 
 def quick_coverage_check():
@@ -84,7 +84,7 @@ def quick_coverage_check():
         
         try:
             # Quick test with yfinance
-            stock = yf.Ticker(ticker)
+            stock = yfinance_gateway.ticker(ticker)
             info = stock.info
             
             if info and len(info) > 5:  # Valid data
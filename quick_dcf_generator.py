@@ -6,7 +6,7 @@ Simple version that takes a company ticker and generates a DCF model with real f
 
 import sys
 import os
-import yfinance as yf
+import yfinance_gateway
 from datetime import datetime
 from expert_dcf_model import ExpertDCFModel
 
@@ -14,7 +14,7 @@ def get_company_data(ticker: str):
     """Get basic financial data for a company using yfinance."""
     try:
         print(f"🔍 Fetching data for {ticker}...")
-        stock = yf.Ticker(ticker)
+        stock = yfinance_gateway.ticker(ticker)
 
         # Get basic info
         info = stock.info
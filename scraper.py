@@ -28,7 +28,6 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 from urllib.parse import quote_plus, urlparse
 from datetime import datetime
 import os
@@ -36,19 +35,18 @@ import time
 import logging
 from typing import List, Dict, Optional, Any
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-import dateparser
 import requests
 from bs4 import BeautifulSoup, Tag
 import feedparser
 import trafilatura
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from google.oauth2.service_account import Credentials as ServiceAccountCredentials
-from googleapiclient.discovery import build
+
+from browser_pool import BrowserPool, create_chrome_driver
+from crawl_state import CrawlStateDB, content_hash
+import grant_extraction
+from sheet_sync import GrantsSheetSync
+from google_client_manager import GoogleClientManager
 
 # Configure logging
 logging.basicConfig(
@@ -66,6 +64,20 @@ USER_AGENT = (
     "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 )
 
+# Browser pool limits for dynamic sources
+BROWSER_POOL_SIZE = int(os.getenv('SCRAPER_BROWSER_POOL_SIZE', '3'))
+BROWSER_MAX_PAGES = int(os.getenv('SCRAPER_BROWSER_MAX_PAGES', '50'))
+
+# Crawl state (conditional GET validators, content hashes, extraction results)
+CRAWL_STATE_DB = os.getenv('SCRAPER_CRAWL_DB', 'crawl_state.db')
+CRAWL_RECHECK_SECONDS = int(os.getenv('SCRAPER_CRAWL_RECHECK_SECONDS', '3600'))
+
+# Article extraction batches of at least grant_extraction's min_batch run in a process pool
+EXTRACTION_WORKERS = int(os.getenv('SCRAPER_EXTRACTION_WORKERS', '0')) or None
+
+# Credentials and Sheets services are reused across runs in this process
+GOOGLE_CLIENTS = GoogleClientManager(os.path.join('credentials', 'google_sheets_credentials.json'))
+
 # Expanded search queries
 SEARCH_QUERIES = [
     "bitcoin grant awarded",
@@ -155,17 +167,13 @@ class GrantScraper:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': USER_AGENT})
-        self.executor = ThreadPoolExecutor(max_workers=10)
-        self.setup_selenium()
-        
-    def setup_selenium(self):
-        """Set up Selenium WebDriver for dynamic content."""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument(f'user-agent={USER_AGENT}')
-        self.driver = webdriver.Chrome(options=chrome_options)
+        # Browsers are only launched when a dynamic page actually needs rendering
+        self.browser_pool = BrowserPool(
+            partial(create_chrome_driver, USER_AGENT),
+            max_size=BROWSER_POOL_SIZE,
+            max_pages_per_driver=BROWSER_MAX_PAGES
+        )
+        self.crawl_state = CrawlStateDB(CRAWL_STATE_DB)
         
     def search_google_custom(self, query: str, max_results: int = 100) -> List[Dict]:
         """Search using Google Custom Search API."""
@@ -203,71 +211,133 @@ class GrantScraper:
             return []
             
     def scrape_dynamic_content(self, url: str) -> str:
-        """Scrape content from dynamic websites using Selenium."""
+        """Scrape content from dynamic websites using a pooled Selenium browser."""
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            return self.driver.page_source
+            return self.browser_pool.fetch(url)
         except Exception as e:
             logging.error(f"Error scraping dynamic content from {url}: {e}")
             return ""
-            
-    def extract_text_with_trafilatura(self, url: str) -> str:
-        """Extract clean text from webpage using trafilatura."""
+
+    def fetch_dynamic_source(self, url: str) -> List[Dict]:
+        """Extract grant links from a dynamic source, rendering it only if needed.
+
+        A plain HTTP fetch is tried first; the browser is used only when the
+        static HTML yields no grant links (i.e. the page is rendered client-side).
+        """
         try:
-            downloaded = trafilatura.fetch_url(url)
-            text = trafilatura.extract(downloaded, include_comments=False)
-            return text or ""
-        except Exception as e:
-            logging.error(f"Error extracting text from {url}: {e}")
-            return ""
+            static_results = self.fetch_source_links(url)
+            if static_results:
+                logging.info(f"Static fetch sufficient for {url}")
+                return static_results
+        except requests.RequestException as e:
+            logging.debug(f"Static fetch failed for {url}: {e}")
+
+        html = self.scrape_dynamic_content(url)
+        soup = BeautifulSoup(html, 'html.parser')
+        return self.extract_grant_info(soup, url)
+
+    def fetch_source_links(self, url: str) -> List[Dict]:
+        """Extract grant links from a static page, reusing the last result if unchanged."""
+        response, state = self.crawl_state.conditional_get(
+            self.session, url, allow_redirects=True, timeout=15
+        )
+        if response is None:
+            return state['result'] or []
+        if not response.ok:
+            # Transient upstream error (5xx / 429): keep the stored state for the next run
+            logging.warning(f"Source {url} returned HTTP {response.status_code}")
+            return (state['result'] or []) if state else []
+
+        digest = content_hash(response.content)
+        if state and state['content_hash'] == digest:
+            self.crawl_state.stats['unchanged'] += 1
+            self.crawl_state.touch(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return state['result'] or []
+
+        soup = BeautifulSoup(response.text, 'html.parser')
+        links = self.extract_grant_info(soup, response.url)  # final URL after redirects
+        self.crawl_state.record(url, 'source', links, response.headers.get('ETag'),
+                                response.headers.get('Last-Modified'), digest)
+        self.crawl_state.stats['changed'] += 1
+        return links
             
     def parse_rss_feed(self, url: str) -> List[Dict]:
         """Parse RSS feed for grant information."""
         try:
-            feed = feedparser.parse(url)
+            state = self.crawl_state.get(url)
+            feed = feedparser.parse(
+                url,
+                etag=state['etag'] if state else None,
+                modified=state['last_modified'] if state else None,
+                agent=USER_AGENT
+            )
             results = []
-            
-            # Skip if no entries
-            if not hasattr(feed, 'entries'):
-                return []
-            
-            for entry in feed.entries:
-                title = entry.get('title', '')
-                description = entry.get('description', '')
-                
-                # Handle content field safely
-                content = ''
-                content_list = entry.get('content', [])
-                if content_list and isinstance(content_list, list) and len(content_list) > 0:
-                    content = content_list[0].get('value', '')
-                    
-                link = entry.get('link', '')
-                
-                if not link:  # Skip entries without links
-                    continue
-                    
-                # Combine all text fields for better keyword matching
-                full_text = f"{title} {description} {content}".lower()
-                
-                # Check for grant-related keywords in the full text
-                if any(keyword in full_text for keyword in GRANT_KEYWORDS):
-                    # Get the actual article content
-                    article_data = self.process_article(str(link))
-                    if article_data:
-                        results.append(article_data)
+
+            if getattr(feed, 'status', None) == 304 and state:
+                # Feed not modified: reuse the grant links found last time
+                self.crawl_state.stats['not_modified'] += 1
+                self.crawl_state.touch(url)
+                links = state['result'] or []
+            else:
+                links = self._grant_links_from_feed(feed)
+                self.crawl_state.record(url, 'feed', links, feed.get('etag'),
+                                        feed.get('modified'), content_hash(links))
+                self.crawl_state.stats['changed'] += 1
+
+            # Get the actual article content
+            for article_data in self.process_articles(links).values():
+                if article_data:
+                    results.append(article_data)
                     
             return results
         except Exception as e:
             logging.error(f"Error parsing RSS feed {url}: {e}")
             return []
+
+    def _grant_links_from_feed(self, feed) -> List[str]:
+        """Links of feed entries that mention grant keywords."""
+        links = []
+
+        # Skip if no entries
+        if not hasattr(feed, 'entries'):
+            return links
+
+        for entry in feed.entries:
+            title = entry.get('title', '')
+            description = entry.get('description', '')
+            
+            # Handle content field safely
+            content = ''
+            content_list = entry.get('content', [])
+            if content_list and isinstance(content_list, list) and len(content_list) > 0:
+                content = content_list[0].get('value', '')
+                
+            link = entry.get('link', '')
+            
+            if not link:  # Skip entries without links
+                continue
+                
+            # Combine all text fields for better keyword matching
+            full_text = f"{title} {description} {content}".lower()
+            
+            # Check for grant-related keywords in the full text
+            if any(keyword in full_text for keyword in GRANT_KEYWORDS):
+                links.append(str(link))
+
+        return links
             
     def search_grant_sources(self, max_results: int = 100) -> List[Dict]:
         """Search known grant sources for information."""
         results = []
         seen_urls = set()
+
+        # Dynamic sources are rendered in parallel (bounded by the browser pool)
+        # while the static and RSS sources are processed below.
+        dynamic_sources = {name: info['url'] for name, info in GRANT_SOURCES.items()
+                           if info['type'] == 'dynamic'}
+        executor = ThreadPoolExecutor(max_workers=BROWSER_POOL_SIZE) if dynamic_sources else None
+        dynamic_futures = {name: executor.submit(self.fetch_dynamic_source, url)
+                           for name, url in dynamic_sources.items()} if executor else {}
         
         for source_name, source_info in GRANT_SOURCES.items():
             try:
@@ -278,28 +348,27 @@ class GrantScraper:
                 if source_type == 'rss':
                     source_results = self.parse_rss_feed(url)
                 elif source_type == 'dynamic':
-                    html = self.scrape_dynamic_content(url)
-                    soup = BeautifulSoup(html, 'html.parser')
-                    source_results = self.extract_grant_info(soup, url)
+                    source_results = dynamic_futures[source_name].result()
                 else:
-                    response = self.session.get(url, allow_redirects=True)
-                    final_url = response.url  # Get the final URL after redirects
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    source_results = self.extract_grant_info(soup, final_url)
+                    source_results = self.fetch_source_links(url)
                 
-                # Process each result and deduplicate
+                # Deduplicate, then get full article data for the new links as one batch
+                new_urls = []
                 for result in source_results:
                     result_url = result.get('url', '')
                     if result_url and result_url not in seen_urls:
                         seen_urls.add(result_url)
-                        # Try to get full article data
-                        article_data = self.process_article(result_url)
-                        if article_data:
-                            results.append(article_data)
+                        new_urls.append(result_url)
+                for article_data in self.process_articles(new_urls).values():
+                    if article_data:
+                        results.append(article_data)
                     
             except Exception as e:
                 logging.error(f"Error processing source {source_name}: {e}")
                 continue
+
+        if executor:
+            executor.shutdown()
                 
         return results[:max_results]
         
@@ -348,202 +417,69 @@ class GrantScraper:
         return results
         
     def process_article(self, url: str) -> Optional[Dict]:
-        """Process an article to extract grant information."""
+        """Process an article, re-extracting only if it changed since the last crawl."""
+        return self.process_articles([url])[url]
+
+    def process_articles(self, urls: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Process a batch of articles: fetch each one conditionally, then run
+        extraction for the changed ones together (in a process pool for large
+        batches) and store the results. Returns {url: data} in input order.
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            done, value = self._fetch_article(url)
+            if done:
+                results[url] = value
+            else:
+                pending.append(value)
+                results[url] = None
+
+        extracted = grant_extraction.extract_many([(url, text) for url, text, *_ in pending],
+                                                  workers=EXTRACTION_WORKERS)
+        for (url, _, etag, last_modified, digest), data in zip(pending, extracted):
+            self.crawl_state.record(url, 'article', data, etag, last_modified, digest)
+            self.crawl_state.stats['changed'] += 1
+            results[url] = data
+        return results
+
+    def _fetch_article(self, url: str):
+        """
+        (True, result) when the stored result still holds (or the fetch failed),
+        else (False, (url, text, etag, last_modified, digest)) to extract.
+        """
+        # Already checked recently (e.g. earlier in this run)
+        if self.crawl_state.is_fresh(url, CRAWL_RECHECK_SECONDS):
+            self.crawl_state.stats['fresh'] += 1
+            return True, self.crawl_state.get(url)['result']
+
         try:
-            # Get clean text content
-            text = self.extract_text_with_trafilatura(url)
-            if not text:
-                return None
-                
-            # Extract grant information
-            data = {
-                'url': url,
-                'title': None,
-                'date': None,
-                'amount': None,
-                'sector': None,
-                'company': None,
-                'investors': [],
-                'stage': 'grant',
-                'description': None,
-                'status': 'active'  # Default to active
-            }
-
-            # Clean the text
-            text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-            text = text.replace('\n', ' ').strip()
-            
-            # Only process if it looks like a Bitcoin grant announcement
-            bitcoin_keywords = ['bitcoin', 'btc', 'lightning', 'satoshi']
-            grant_keywords = ['grant', 'awarded', 'funding', 'investment', 'donation', 'fellowship']
-            
-            if not (any(kw in text.lower() for kw in bitcoin_keywords) and 
-                    any(kw in text.lower() for kw in grant_keywords)):
-                return None
-
-            # Try to extract title
-            title_patterns = [
-                r'(?:announces?|awards?|receives?|grants?)\s+\$?\d+(?:,\d{3})*(?:\.\d{2})?\s*(?:USD|BTC)?\s+(?:grant|funding|investment)',
-                r'(?:grant|funding|investment)\s+of\s+\$?\d+(?:,\d{3})*(?:\.\d{2})?\s*(?:USD|BTC)?',
-                r'[^.!?]*(?:grant|funding|investment)[^.!?]*(?:awarded|announced|received)[^.!?]*'
-            ]
-            
-            for pattern in title_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    data['title'] = match.group(0).strip().capitalize()
-                    break
-                    
-            # If no grant-specific title found, use first sentence if it contains keywords
-            if not data['title']:
-                first_sentence = text.split('.')[0].strip()
-                if (any(kw in first_sentence.lower() for kw in bitcoin_keywords) and
-                    any(kw in first_sentence.lower() for kw in grant_keywords)):
-                    data['title'] = first_sentence
-            
-            # Find date - expanded patterns
-            date_patterns = [
-                r'\b\d{1,2}[\s./-]\w{3,9}[\s./-]\d{2,4}\b',
-                r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*[\s./-]\d{1,2}(?:st|nd|rd|th)?[\s./-]\d{2,4}\b',
-                r'\b\d{4}[\s./-]\d{1,2}[\s./-]\d{1,2}\b',
-                r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b'
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    parsed_date = dateparser.parse(match.group())
-                    if parsed_date:
-                        data['date'] = parsed_date
-                        break
-                
-            # Find amount - expanded patterns with BTC support
-            amount_patterns = [
-                r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?(?:\s*[kKmMbB](?:illion)?)?)',
-                r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:USD|BTC)',
-                r'(?:grant|funding|investment)\s+of\s+\$?\s*(\d+(?:,\d{3})*(?:\.\d{2})?(?:\s*[kKmMbB](?:illion)?)?)',
-                r'(\d+(?:\.\d{1,8})?)\s*(?:₿|BTC|bitcoin)',
-                r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:sats|satoshis)'
-            ]
-            
-            for pattern in amount_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    amount_str = match.group(1).replace(',', '')
-                    multiplier = 1
-                    
-                    # Handle different units
-                    if any(unit in amount_str.lower() for unit in ['k', 'thousand']):
-                        multiplier = 1_000
-                    elif any(unit in amount_str.lower() for unit in ['m', 'million']):
-                        multiplier = 1_000_000
-                    elif any(unit in amount_str.lower() for unit in ['b', 'billion']):
-                        multiplier = 1_000_000_000
-                        
-                    # Convert BTC/sats to USD (approximate)
-                    if 'btc' in text.lower() or '₿' in text or 'bitcoin' in text.lower():
-                        btc_price = 65000  # Approximate BTC price - should be fetched from API
-                        multiplier *= btc_price
-                    elif 'sats' in text.lower() or 'satoshis' in text.lower():
-                        btc_price = 65000  # Approximate BTC price
-                        multiplier *= btc_price / 100_000_000  # Convert sats to BTC
-                        
-                    amount = float(re.sub(r'[kKmMbB].*$', '', amount_str))
-                    data['amount'] = amount * multiplier
-                    break
-                    
-            # Find sector - expanded list
-            sectors = {
-                'development': ['development', 'software', 'programming', 'coding', 'protocol', 'implementation'],
-                'research': ['research', 'study', 'investigation', 'analysis', 'academic'],
-                'infrastructure': ['infrastructure', 'protocol', 'network', 'scaling', 'node'],
-                'education': ['education', 'learning', 'teaching', 'training', 'workshop'],
-                'privacy': ['privacy', 'security', 'encryption', 'confidential', 'anonymous'],
-                'scaling': ['scaling', 'layer2', 'lightning', 'performance', 'throughput'],
-                'tooling': ['tools', 'libraries', 'frameworks', 'sdk', 'api'],
-                'community': ['community', 'ecosystem', 'adoption', 'outreach', 'advocacy']
-            }
-            
-            for sector, keywords in sectors.items():
-                if any(keyword in text.lower() for keyword in keywords):
-                    data['sector'] = sector
-                    break
-                    
-            # Find company/recipient - improved patterns
-            company_patterns = [
-                r'awarded to\s+([^.!?\n,]+(?:Inc\.|LLC|Ltd\.)?)',
-                r'recipient\s+(?:is|was)?\s+([^.!?\n,]+(?:Inc\.|LLC|Ltd\.)?)',
-                r'granted to\s+([^.!?\n,]+(?:Inc\.|LLC|Ltd\.)?)',
-                r'received by\s+([^.!?\n,]+(?:Inc\.|LLC|Ltd\.)?)',
-                r'([^.!?\n,]+(?:Inc\.|LLC|Ltd\.)?)\s+(?:has|have)\s+(?:been\s+)?(?:awarded|received|granted)'
-            ]
-            
-            for pattern in company_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    company = match.group(1).strip()
-                    # Clean up common suffixes
-                    company = re.sub(r'\s+(?:Inc\.|LLC|Ltd\.|Corporation|Corp\.|Limited)$', '', company, flags=re.IGNORECASE)
-                    data['company'] = company
-                    break
-                    
-            # Find investors/grantors - improved patterns
-            investor_patterns = [
-                r'(?:from|by|through)\s+(?:the)?\s*([^.!?\n,]+(?:Foundation|Fund|Initiative|Program))',
-                r'funded by\s+(?:the)?\s*([^.!?\n,]+(?:Foundation|Fund|Initiative|Program))',
-                r'(?:grant|funding)\s+(?:provided|offered|given)\s+by\s+(?:the)?\s*([^.!?\n,]+(?:Foundation|Fund|Initiative|Program))',
-                r'([^.!?\n,]+(?:Foundation|Fund|Initiative|Program))\s+(?:has|have)\s+(?:awarded|granted|provided)'
-            ]
-            
-            for pattern in investor_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    investor = match.group(1).strip()
-                    # Clean up and validate investor
-                    if (len(investor) > 3 and  # Reasonable length
-                        not any(x in investor.lower() for x in ['click', 'link', 'here', 'learn', 'visit']) and  # Not navigation text
-                        investor not in data['investors']):  # Not duplicate
-                        data['investors'].append(investor)
-
-            # Extract description
-            if data['title']:
-                # Get the paragraph containing the title
-                paragraphs = text.split('\n\n')
-                for para in paragraphs:
-                    if data['title'].lower() in para.lower():
-                        data['description'] = para.strip()
-                        break
-                
-                # If no paragraph found with title, use first non-empty paragraph
-                if not data['description']:
-                    for para in paragraphs:
-                        if para.strip():
-                            data['description'] = para.strip()
-                            break
-
-            # Generate a fallback title if none was found
-            if not data['title']:
-                title_parts = []
-                if data['amount']:
-                    title_parts.append(f"${data['amount']:,.0f}")
-                if data['sector']:
-                    title_parts.append(data['sector'].title())
-                title_parts.append("Bitcoin Grant")
-                if data['company']:
-                    title_parts.append(f"to {data['company']}")
-                data['title'] = " ".join(title_parts)
-
-            # Only return if we have at least some meaningful data
-            if (data['title'] and 
-                (data['amount'] or data['company'] or 
-                 (data['investors'] and len(data['investors']) > 0))):
-                return data
-            return None
-            
-        except Exception as e:
-            logging.error(f"Error processing article {url}: {e}")
-            return None
-            
+            response, state = self.crawl_state.conditional_get(
+                self.session, url, allow_redirects=True, timeout=15
+            )
+        except requests.RequestException as e:
+            logging.error(f"Error fetching article {url}: {e}")
+            return True, None
+
+        if response is None:
+            return True, state['result']
+        if not response.ok:
+            # Transient upstream error (5xx / 429): do not cache it as "not a grant"
+            logging.warning(f"Article {url} returned HTTP {response.status_code}")
+            return True, None
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        digest = content_hash(response.content)
+        if state and state['content_hash'] == digest:
+            self.crawl_state.stats['unchanged'] += 1
+            self.crawl_state.touch(url, etag, last_modified)
+            return True, state['result']
+
+        text = trafilatura.extract(response.text, include_comments=False) or ""
+        return False, (url, text, etag, last_modified, digest)
+
     def run_search(self, max_results: int = 100) -> List[Dict]:
         """Run comprehensive search for grant information."""
         all_results = []
@@ -557,29 +493,20 @@ class GrantScraper:
         grant_source_results = self.search_grant_sources(max_results)
         all_results.extend(grant_source_results)
         
-        # Process results
-        processed_results = []
-        seen_urls = set()
-        
-        for result in all_results:
-            if result['url'] in seen_urls:
-                continue
-                
-            try:
-                article_data = self.process_article(result['url'])
-                if article_data:
-                    processed_results.append(article_data)
-                    seen_urls.add(result['url'])
-            except Exception as e:
-                logging.error(f"Error processing result: {e}")
-                continue
-                
-        return processed_results
+        # Process results (duplicates are fetched and extracted once)
+        try:
+            articles = self.process_articles([result['url'] for result in all_results])
+        except Exception as e:
+            logging.error(f"Error processing results: {e}")
+            return []
+
+        return [article_data for article_data in articles.values() if article_data]
         
     def close(self):
         """Clean up resources."""
-        self.executor.shutdown()
-        self.driver.quit()
+        self.browser_pool.close()
+        self.session.close()
+        self.crawl_state.close()
 
 def get_google_sheets_service():
     """Get Google Sheets service with proper error handling."""
@@ -594,14 +521,8 @@ def get_google_sheets_service():
         if not spreadsheet_id:
             raise ValueError("Please set GOOGLE_SHEETS_ID environment variable")
 
-        # Set up credentials
-        scopes = ['https://www.googleapis.com/auth/spreadsheets']
-        creds = ServiceAccountCredentials.from_service_account_file(
-            creds_path, scopes=scopes
-        )
-
-        # Build service
-        service = build('sheets', 'v4', credentials=creds)
+        # Cached credentials and a reused Sheets service for this thread
+        service = GOOGLE_CLIENTS.sheets_service()
         return service, spreadsheet_id
 
     except Exception as e:
@@ -609,98 +530,20 @@ def get_google_sheets_service():
         return None, None
 
 def get_existing_grants(service, spreadsheet_id):
-    """Get existing grants from the Google Spreadsheet."""
+    """Get URLs of existing grants (from the local sheet mirror, reconciled periodically)."""
     try:
-        # Get values from row 493 onwards
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range='Grants!A493:G'  # Start from row 493
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
-            return set()
-            
-        # Get URLs (last column)
-        existing_urls = {row[-1] for row in values if len(row) > 0}
-        return existing_urls
-        
+        return GrantsSheetSync(service, spreadsheet_id).existing_urls()
     except Exception as e:
         logging.error(f"Error getting existing grants: {e}")
         return set()
 
 def update_google_sheet(service, spreadsheet_id: str, deals: List[Dict[str, Any]]) -> None:
-    """Update Google Spreadsheet with new deals."""
+    """Update Google Spreadsheet with new and changed deals in one batched request."""
     try:
-        # Get existing deals from sheet to avoid duplicates
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range='Grants!A493:Z'  # Start from row 493 in Grants tab
-        ).execute()
-        
-        existing_deals = result.get('values', [])
-        existing_urls = {row[0] for row in existing_deals if row} if existing_deals else set()
-        
-        # Format new deals for sheet
-        new_deals = []
-        for deal in deals:
-            # Skip if URL already exists
-            if deal.get('url') in existing_urls:
-                continue
-                
-            # Format date
-            date_str = ''
-            if deal.get('date'):
-                if isinstance(deal['date'], str):
-                    date_str = deal['date']
-                else:
-                    date_str = deal['date'].strftime('%Y-%m-%d')
-                    
-            # Format amount
-            amount_str = ''
-            if deal.get('amount'):
-                amount = float(deal['amount'])
-                if amount >= 1_000_000:
-                    amount_str = f"${amount/1_000_000:.1f}M"
-                elif amount >= 1_000:
-                    amount_str = f"${amount/1_000:.1f}K"
-                else:
-                    amount_str = f"${amount:,.0f}"
-                    
-            # Format investors
-            investors_str = ', '.join(deal.get('investors', []))
-            
-            # Prepare row data
-            row = [
-                deal.get('url', ''),                    # URL
-                deal.get('title', ''),                  # Title
-                date_str,                               # Date
-                amount_str,                             # Amount
-                deal.get('sector', ''),                 # Sector
-                deal.get('company', ''),                # Company
-                investors_str,                          # Investors
-                deal.get('stage', 'grant'),             # Stage
-                deal.get('status', 'active'),           # Status
-                deal.get('description', '')             # Description
-            ]
-            
-            new_deals.append(row)
-            
-        if new_deals:
-            # Append new deals to sheet
-            body = {
-                'values': new_deals
-            }
-            
-            result = service.spreadsheets().values().append(
-                spreadsheetId=spreadsheet_id,
-                range='Grants!A493',  # Start appending from row 493 in Grants tab
-                valueInputOption='USER_ENTERED',
-                insertDataOption='INSERT_ROWS',
-                body=body
-            ).execute()
-            
-            logging.info(f"Added {len(new_deals)} new grants to spreadsheet")
+        summary = GrantsSheetSync(service, spreadsheet_id).sync(deals)
+        if summary['inserted'] or summary['updated']:
+            logging.info(f"Added {summary['inserted']} new grants and updated "
+                         f"{summary['updated']} in spreadsheet")
         else:
             logging.info("No new grants to add to spreadsheet")
             
@@ -730,12 +573,19 @@ def run_daily_update():
             # Save backup to JSON
             with open('results.json', 'w', encoding='utf-8') as f:
                 json.dump(results, f, indent=2)
+
+            # Don't keep idle browsers alive through the 24 hour sleep
+            scraper.browser_pool.close()
+            logging.info(f"Browser pool stats: {scraper.browser_pool.stats}")
+            logging.info(f"Crawl stats: {scraper.crawl_state.stats}")
+            scraper.crawl_state.stats = dict.fromkeys(scraper.crawl_state.stats, 0)
                 
             logging.info("Waiting 24 hours before next update...")
             time.sleep(24 * 60 * 60)  # Wait 24 hours
             
         except Exception as e:
             logging.error(f"Error in daily update: {e}")
+            scraper.browser_pool.close()
             logging.info("Retrying in 1 hour...")
             time.sleep(60 * 60)  # Wait 1 hour before retrying
 
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Serialization - Pluggable codecs for caches, model specs and API payloads
+
+Features:
+- One bytes-in/bytes-out interface over several formats:
+  'json' (stdlib, indented, for files people read),
+  'fast_json' (orjson when installed, compact stdlib json otherwise) for API responses,
+  'msgpack' (compact binary, needs msgpack) for hot caches and model specs,
+  'arrow' (Arrow IPC stream, needs pyarrow) for DataFrames
+- NumPy arrays and pandas objects are written as whole buffers: msgpack stores
+  dtype, shape and the raw bytes in one extension record, orjson writes arrays
+  natively and the stdlib fallback converts with ndarray.tolist() (a C loop)
+- Versioned envelopes: pack()/unpack() tag payloads with a schema name and
+  version and run registered migrations when an older payload is read
+- Format chosen from file extensions, atomic file writes, and a Flask JSON
+  provider that routes jsonify() through the fast codec
+
+Usage:
+    codec = get_serializer('msgpack')
+    blob = codec.dumps({'sensitivity': np.zeros((9, 9)), 'as_of': datetime.now()})
+    write_file('model_spec.msgpack', spec_dict, schema='model_spec')
+    spec = read_file('model_spec.msgpack', schema='model_spec')
+"""
+
+import dataclasses
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+DEFAULT_CACHE_FORMAT = 'msgpack' if MSGPACK_AVAILABLE else 'fast_json'
+
+# msgpack extension type codes
+EXT_NDARRAY = 1
+EXT_DATETIME = 2
+EXT_DATE = 3
+EXT_DATAFRAME = 4
+EXT_SERIES = 5
+
+
+class SerializationError(ValueError):
+    """A payload could not be encoded or decoded."""
+
+
+def to_builtin(obj: Any) -> Any:
+    """
+    Fallback conversion for objects a codec has no native encoding for
+    (the `default=str` of the old json.dump calls, minus the information loss).
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, date, pd.Timestamp)):
+        return obj.isoformat()
+    if isinstance(obj, pd.DataFrame):
+        return {str(column): obj[column].to_numpy() for column in obj.columns}
+    if isinstance(obj, pd.Series):
+        return dict(zip(map(str, obj.index), obj.to_numpy().tolist()))
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
+class Serializer:
+    """Base codec: dumps() returns bytes, loads() accepts bytes."""
+
+    name = ''
+    extension = ''
+    content_type = 'application/octet-stream'
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonSerializer(Serializer):
+    """Standard-library JSON; indented by default for exports people open."""
+
+    name = 'json'
+    extension = '.json'
+    content_type = 'application/json'
+
+    def dumps(self, obj: Any, pretty: bool = True) -> bytes:
+        return json.dumps(obj, indent=2 if pretty else None, default=to_builtin,
+                          separators=None if pretty else (',', ':')).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise SerializationError(f"Invalid JSON payload: {e}") from e
+
+
+class FastJsonSerializer(JsonSerializer):
+    """orjson with native NumPy/datetime support; compact stdlib JSON without it."""
+
+    name = 'fast_json'
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        if not ORJSON_AVAILABLE:
+            return super().dumps(obj, pretty=pretty)
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=to_builtin, option=options)
+        except TypeError as e:
+            raise SerializationError(f"Cannot encode payload as JSON: {e}") from e
+
+    def loads(self, data: bytes) -> Any:
+        if not ORJSON_AVAILABLE:
+            return super().loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise SerializationError(f"Invalid JSON payload: {e}") from e
+
+
+def _pack_ndarray(array: np.ndarray) -> bytes:
+    array = np.ascontiguousarray(array)
+    return msgpack.packb([array.dtype.str, list(array.shape), array.tobytes()], use_bin_type=True)
+
+
+def _unpack_ndarray(data: bytes) -> np.ndarray:
+    dtype, shape, buffer = msgpack.unpackb(data, raw=False)
+    return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape).copy()
+
+
+class MsgpackSerializer(Serializer):
+    """
+    msgpack with extension records for arrays, datetimes and pandas objects,
+    so numeric payloads round-trip with their dtypes.
+    """
+
+    name = 'msgpack'
+    extension = '.msgpack'
+    content_type = 'application/msgpack'
+
+    def _default(self, obj: Any):
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.hasobject:
+                return obj.tolist()
+            return msgpack.ExtType(EXT_NDARRAY, _pack_ndarray(obj))
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, (datetime, pd.Timestamp)):
+            return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode())
+        if isinstance(obj, date):
+            return msgpack.ExtType(EXT_DATE, obj.isoformat().encode())
+        if isinstance(obj, pd.DataFrame):
+            body = {'columns': [to_builtin(c) if not isinstance(c, (str, int)) else c for c in obj.columns],
+                    'index': obj.index.to_numpy(),
+                    'data': [obj[c].to_numpy() for c in obj.columns]}
+            return msgpack.ExtType(EXT_DATAFRAME, self.dumps(body))
+        if isinstance(obj, pd.Series):
+            body = {'name': obj.name, 'index': obj.index.to_numpy(), 'values': obj.to_numpy()}
+            return msgpack.ExtType(EXT_SERIES, self.dumps(body))
+        return to_builtin(obj)
+
+    def _ext_hook(self, code: int, data: bytes):
+        if code == EXT_NDARRAY:
+            return _unpack_ndarray(data)
+        if code == EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        if code == EXT_DATE:
+            return date.fromisoformat(data.decode())
+        if code == EXT_DATAFRAME:
+            body = self.loads(data)
+            return pd.DataFrame(dict(zip(body['columns'], body['data'])), index=body['index'],
+                                columns=body['columns'])
+        if code == EXT_SERIES:
+            body = self.loads(data)
+            return pd.Series(body['values'], index=body['index'], name=body['name'])
+        return msgpack.ExtType(code, data)
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        try:
+            return msgpack.packb(obj, default=self._default, use_bin_type=True, datetime=False)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise SerializationError(f"Cannot encode payload as msgpack: {e}") from e
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as e:
+            raise SerializationError(f"Invalid msgpack payload: {e}") from e
+
+
+class ArrowSerializer(Serializer):
+    """Arrow IPC stream for tabular payloads (DataFrames or dicts of equal-length columns)."""
+
+    name = 'arrow'
+    extension = '.arrow'
+    content_type = 'application/vnd.apache.arrow.stream'
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        if isinstance(obj, dict):
+            obj = pd.DataFrame(obj)
+        if not isinstance(obj, pd.DataFrame):
+            raise SerializationError(f"Arrow payloads must be tables, got {type(obj).__name__}")
+        table = pa.Table.from_pandas(obj)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def loads(self, data: bytes) -> pd.DataFrame:
+        try:
+            return pa.ipc.open_stream(data).read_all().to_pandas()
+        except pa.ArrowInvalid as e:
+            raise SerializationError(f"Invalid Arrow payload: {e}") from e
+
+
+SERIALIZERS: Dict[str, Serializer] = {}
+REQUIREMENTS = {'msgpack': (MSGPACK_AVAILABLE, 'msgpack'), 'arrow': (ARROW_AVAILABLE, 'pyarrow')}
+
+
+def register_serializer(serializer: Serializer):
+    SERIALIZERS[serializer.name] = serializer
+
+
+for _serializer in (JsonSerializer(), FastJsonSerializer(), MsgpackSerializer(), ArrowSerializer()):
+    register_serializer(_serializer)
+
+
+def available_formats() -> List[str]:
+    return [name for name in SERIALIZERS if REQUIREMENTS.get(name, (True,))[0]]
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """Codec by name (default: DEFAULT_CACHE_FORMAT); raises if its library is not installed."""
+    name = (name or DEFAULT_CACHE_FORMAT).lower()
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serialization format '{name}' (available: {', '.join(available_formats())})")
+    installed, package = REQUIREMENTS.get(name, (True, None))
+    if not installed:
+        raise RuntimeError(f"The '{name}' format requires {package} (pip install {package})")
+    return SERIALIZERS[name]
+
+
+def serializer_for_path(path: Union[str, Path]) -> Serializer:
+    """Codec matching a file extension (.json files get the indented stdlib codec)."""
+    suffix = Path(path).suffix.lower()
+    for serializer in SERIALIZERS.values():
+        if serializer.extension == suffix:
+            return get_serializer(serializer.name)
+    raise ValueError(f"No serializer for '{suffix}' files")
+
+
+# ------------------------------------------------------------------ schemas
+
+SCHEMA_VERSIONS: Dict[str, int] = {}
+_MIGRATIONS: Dict[tuple, Callable[[Any], Any]] = {}
+ENVELOPE_KEYS = ('__schema__', '__version__', '__data__')
+
+
+def register_schema(name: str, version: int,
+                    migrations: Optional[Dict[int, Callable[[Any], Any]]] = None):
+    """
+    Declare the current version of a payload schema. migrations maps an old
+    version to a function upgrading its data to version + 1.
+    """
+    SCHEMA_VERSIONS[name] = version
+    for from_version, migrate in (migrations or {}).items():
+        _MIGRATIONS[(name, from_version)] = migrate
+
+
+def envelope(schema: str, data: Any) -> Dict[str, Any]:
+    if schema not in SCHEMA_VERSIONS:
+        raise ValueError(f"Schema '{schema}' is not registered")
+    return {'__schema__': schema, '__version__': SCHEMA_VERSIONS[schema], '__data__': data}
+
+
+def open_envelope(payload: Any, schema: Optional[str] = None) -> Any:
+    """
+    Data of a versioned payload, migrated to the current schema version.
+    Payloads written before envelopes existed are treated as version 1.
+    """
+    if not (isinstance(payload, dict) and all(k in payload for k in ENVELOPE_KEYS)):
+        found, version, data = schema, 1, payload
+    else:
+        found, version, data = (payload[k] for k in ENVELOPE_KEYS)
+    if schema is None:
+        return data
+    if found != schema:
+        raise SerializationError(f"Expected a '{schema}' payload, got '{found}'")
+
+    current = SCHEMA_VERSIONS.get(schema, 1)
+    if version > current:
+        raise SerializationError(f"'{schema}' payload version {version} is newer than supported ({current})")
+    while version < current:
+        migrate = _MIGRATIONS.get((schema, version))
+        if migrate is None:
+            raise SerializationError(f"No migration for '{schema}' from version {version}")
+        data = migrate(data)
+        version += 1
+    return data
+
+
+def pack(schema: str, data: Any, format: Optional[str] = None, pretty: bool = False) -> bytes:
+    """Encode data in a versioned envelope."""
+    return get_serializer(format).dumps(envelope(schema, data), pretty=pretty)
+
+
+def unpack(blob: bytes, schema: Optional[str] = None, format: Optional[str] = None) -> Any:
+    """Decode a payload written by pack() (or a bare legacy payload) and migrate it."""
+    return open_envelope(get_serializer(format).loads(blob), schema)
+
+
+# -------------------------------------------------------------------- files
+
+def write_file(path: Union[str, Path], data: Any, schema: Optional[str] = None,
+               format: Optional[str] = None, pretty: Optional[bool] = None) -> Path:
+    """
+    Write data atomically (temp file + rename). The format defaults to the
+    file extension; JSON files stay indented unless pretty=False.
+    """
+    path = Path(path)
+    serializer = get_serializer(format) if format else serializer_for_path(path)
+    payload = envelope(schema, data) if schema else data
+    blob = serializer.dumps(payload) if pretty is None else serializer.dumps(payload, pretty=pretty)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+def read_file(path: Union[str, Path], schema: Optional[str] = None, format: Optional[str] = None) -> Any:
+    path = Path(path)
+    serializer = get_serializer(format) if format else serializer_for_path(path)
+    return open_envelope(serializer.loads(path.read_bytes()), schema)
+
+
+# -------------------------------------------------------------------- flask
+
+def install_json_provider(app) -> bool:
+    """Route Flask's jsonify()/request.get_json() through the fast JSON codec (Flask 2.2+)."""
+    try:
+        from flask.json.provider import DefaultJSONProvider
+    except ImportError:
+        return False
+
+    codec = get_serializer('fast_json')
+
+    class FastJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return codec.dumps(obj, pretty=bool(kwargs.get('indent'))).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return codec.loads(s)
+
+    app.json = FastJSONProvider(app)
+    return True
+
+
+# Payload schemas shared across the app
+register_schema('company_financials', 1)
+register_schema('financial_data', 1)
+register_schema('model_spec', 1)
+register_schema('integrated_data', 1)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("🚀 Serialization benchmark")
+    payload = {
+        'ticker': 'AAPL',
+        'generated_at': datetime.now(),
+        'projections': np.random.default_rng(0).normal(size=(10, 1000)),
+        'sensitivity': np.random.default_rng(1).normal(size=(25, 25, 25)),
+        'assumptions': {f'assumption_{i}': i * 0.01 for i in range(200)}
+    }
+    for name in available_formats():
+        if name == 'arrow':
+            continue
+        codec = get_serializer(name)
+        start = time.perf_counter()
+        for _ in range(20):
+            blob = codec.dumps(payload)
+        encode_ms = (time.perf_counter() - start) / 20 * 1000
+        start = time.perf_counter()
+        for _ in range(20):
+            codec.loads(blob)
+        decode_ms = (time.perf_counter() - start) / 20 * 1000
+        print(f"   {name:10s} {len(blob) / 1024:8.1f} KB  encode {encode_ms:7.2f} ms  decode {decode_ms:7.2f} ms")
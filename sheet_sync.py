@@ -0,0 +1,379 @@
+"""
+Delta-sync writer for the Grants Google Sheet.
+
+A local mirror index (URL -> sheet row, row hash) replaces the full
+``Grants!A493:Z`` read that used to precede every update. Each sync computes
+the inserts (new URLs) and in-place updates (rows whose content changed).
+Updates go out in a single ``values.batchUpdate`` request; inserts are
+appended with ``values.append`` (``INSERT_ROWS``) so rows someone else added
+since the last read are never overwritten, and their row numbers are taken
+from the append response. The sheet is only read in full when the mirror is
+reconciled, which happens on first use and then periodically (or on demand),
+so steady-state cost scales with the number of new or changed grants rather
+than the size of the sheet.
+
+Rows are read back unformatted (dates as strings) and hashed after
+normalising numbers and booleans, so values the sheet parsed on entry
+(``USER_ENTERED``) hash the same as the strings that were written.
+
+``FakeSheetsService`` implements the small part of the Sheets API used here
+so the sync can be exercised without network access.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SHEET_NAME = 'Grants'
+START_ROW = 493  # Scraped grants start at row 493 of the Grants tab
+LAST_COLUMN = 'J'
+RECONCILE_INTERVAL = 7 * 24 * 60 * 60  # Full re-read of the sheet at most weekly
+MIRROR_PATH = 'sheet_mirror.db'
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
+
+MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    spreadsheet_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    row_hash TEXT NOT NULL,
+    PRIMARY KEY (spreadsheet_id, url)
+);
+CREATE TABLE IF NOT EXISTS sheet_meta (
+    spreadsheet_id TEXT PRIMARY KEY,
+    next_row INTEGER NOT NULL,
+    reconciled_at REAL NOT NULL
+);
+"""
+
+
+def format_grant_row(deal: Dict[str, Any]) -> List[str]:
+    """Format a scraped grant as a Grants sheet row (columns A-J)."""
+    # Format date
+    date_str = ''
+    if deal.get('date'):
+        if isinstance(deal['date'], str):
+            date_str = deal['date']
+        else:
+            date_str = deal['date'].strftime('%Y-%m-%d')
+
+    # Format amount
+    amount_str = ''
+    if deal.get('amount'):
+        amount = float(deal['amount'])
+        if amount >= 1_000_000:
+            amount_str = f"${amount/1_000_000:.1f}M"
+        elif amount >= 1_000:
+            amount_str = f"${amount/1_000:.1f}K"
+        else:
+            amount_str = f"${amount:,.0f}"
+
+    return [
+        deal.get('url', ''),                    # URL
+        deal.get('title', ''),                  # Title
+        date_str,                               # Date
+        amount_str,                             # Amount
+        deal.get('sector', ''),                 # Sector
+        deal.get('company', ''),                # Company
+        ', '.join(deal.get('investors', [])),   # Investors
+        deal.get('stage', 'grant'),             # Stage
+        deal.get('status', 'active'),           # Status
+        deal.get('description', '')             # Description
+    ]
+
+
+def _normalise_cell(cell: Any) -> str:
+    """A cell as text, with the conversions USER_ENTERED applies undone ('1.50' == 1.5, 'true' == True)."""
+    if cell is None:
+        return ''
+    if isinstance(cell, bool):
+        return 'TRUE' if cell else 'FALSE'
+    if isinstance(cell, (int, float)):
+        return f'{float(cell):.15g}'
+    text = str(cell)
+    if text.upper() in ('TRUE', 'FALSE'):
+        return text.upper()
+    if NUMBER_PATTERN.fullmatch(text.strip()):
+        return f'{float(text):.15g}'
+    return text
+
+
+def row_hash(row: List[Any]) -> str:
+    """Hash of a row as the sheet stores it (None and '' are equivalent)."""
+    cells = [_normalise_cell(cell) for cell in row]
+    while cells and cells[-1] == '':
+        cells.pop()
+    return hashlib.sha256(json.dumps(cells).encode('utf-8')).hexdigest()
+
+
+class SheetMirror:
+    """SQLite index of which URL lives in which sheet row, with its content hash."""
+
+    def __init__(self, path: str = MIRROR_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(MIRROR_SCHEMA)
+        self._conn.commit()
+
+    def rows(self, spreadsheet_id: str) -> Dict[str, Tuple[int, str]]:
+        """URL -> (row number, row hash) for a spreadsheet."""
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT url, row, row_hash FROM sheet_rows WHERE spreadsheet_id = ?', (spreadsheet_id,))
+            return {url: (row, digest) for url, row, digest in cursor}
+
+    def meta(self, spreadsheet_id: str) -> Optional[Tuple[int, float]]:
+        """(next free row, last reconciliation time), or None if never reconciled."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT next_row, reconciled_at FROM sheet_meta WHERE spreadsheet_id = ?', (spreadsheet_id,)
+            ).fetchone()
+
+    def replace(self, spreadsheet_id: str, rows: Dict[str, Tuple[int, str]], next_row: int) -> None:
+        """Replace the whole index for a spreadsheet (after a reconciliation)."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM sheet_rows WHERE spreadsheet_id = ?', (spreadsheet_id,))
+            self._conn.executemany(
+                'INSERT INTO sheet_rows (spreadsheet_id, url, row, row_hash) VALUES (?, ?, ?, ?)',
+                [(spreadsheet_id, url, row, digest) for url, (row, digest) in rows.items()])
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sheet_meta (spreadsheet_id, next_row, reconciled_at) VALUES (?, ?, ?)',
+                (spreadsheet_id, next_row, time.time()))
+
+    def apply(self, spreadsheet_id: str, changes: Dict[str, Tuple[int, str]], next_row: int) -> None:
+        """Record rows written by a sync."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO sheet_rows (spreadsheet_id, url, row, row_hash) VALUES (?, ?, ?, ?)',
+                [(spreadsheet_id, url, row, digest) for url, (row, digest) in changes.items()])
+            self._conn.execute(
+                'UPDATE sheet_meta SET next_row = ? WHERE spreadsheet_id = ?', (next_row, spreadsheet_id))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_mirrors: Dict[str, SheetMirror] = {}
+_mirrors_lock = threading.Lock()
+
+
+def get_mirror(path: str = MIRROR_PATH) -> SheetMirror:
+    """Process-wide mirror for a database path (one SQLite connection per process)."""
+    with _mirrors_lock:
+        if path not in _mirrors:
+            _mirrors[path] = SheetMirror(path)
+        return _mirrors[path]
+
+
+class GrantsSheetSync:
+    """Push scraped grants to the Grants sheet as batched inserts and updates."""
+
+    def __init__(self, service, spreadsheet_id: str, mirror: Optional[SheetMirror] = None,
+                 sheet_name: str = SHEET_NAME, start_row: int = START_ROW,
+                 reconcile_interval: float = RECONCILE_INTERVAL):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.mirror = mirror or get_mirror()
+        self.sheet_name = sheet_name
+        self.start_row = start_row
+        self.reconcile_interval = reconcile_interval
+
+    def needs_reconcile(self) -> bool:
+        meta = self.mirror.meta(self.spreadsheet_id)
+        return meta is None or time.time() - meta[1] >= self.reconcile_interval
+
+    def reconcile(self) -> Dict[str, Tuple[int, str]]:
+        """Rebuild the mirror from a full read of the sheet."""
+        result = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f'{self.sheet_name}!A{self.start_row}:{LAST_COLUMN}',
+            valueRenderOption='UNFORMATTED_VALUE',
+            dateTimeRenderOption='FORMATTED_STRING'
+        ).execute()
+        values = result.get('values', [])
+
+        rows = {}
+        for offset, row in enumerate(values):
+            if row and row[0]:
+                rows[row[0]] = (self.start_row + offset, row_hash(row))
+        self.mirror.replace(self.spreadsheet_id, rows, self.start_row + len(values))
+        logging.info(f"Reconciled sheet mirror: {len(rows)} grants")
+        return rows
+
+    def existing_urls(self) -> set:
+        """URLs already in the sheet, from the mirror."""
+        if self.needs_reconcile():
+            return set(self.reconcile())
+        return set(self.mirror.rows(self.spreadsheet_id))
+
+    def sync(self, deals: List[Dict[str, Any]], force_reconcile: bool = False) -> Dict[str, int]:
+        """Write changed grants in one batched update and append new ones after the last sheet row."""
+        rows = self.reconcile() if force_reconcile or self.needs_reconcile() else self.mirror.rows(self.spreadsheet_id)
+        next_row = self.mirror.meta(self.spreadsheet_id)[0]
+
+        inserts, updates, changes = [], [], {}
+        unchanged, seen = 0, set()
+        for deal in deals:
+            url = deal.get('url')
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            values = format_grant_row(deal)
+            digest = row_hash(values)
+
+            if url not in rows:
+                inserts.append(values)
+            elif rows[url][1] != digest:
+                updates.append((rows[url][0], values))
+                changes[url] = (rows[url][0], digest)
+            else:
+                unchanged += 1
+
+        if updates:
+            data = [{'range': f'{self.sheet_name}!A{row}:{LAST_COLUMN}{row}', 'values': [values]}
+                    for row, values in updates]
+            self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': 'USER_ENTERED', 'data': data}
+            ).execute()
+
+        if inserts:
+            # Appended after the last non-empty row of the table, wherever it is now
+            response = self.service.spreadsheets().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f'{self.sheet_name}!A{self.start_row}:{LAST_COLUMN}',
+                valueInputOption='USER_ENTERED',
+                insertDataOption='INSERT_ROWS',
+                body={'values': inserts}
+            ).execute()
+            first_row = _parse_range(response['updates']['updatedRange'])[1]
+            for offset, values in enumerate(inserts):
+                changes[values[0]] = (first_row + offset, row_hash(values))
+            next_row = first_row + len(inserts)
+
+        if changes:
+            self.mirror.apply(self.spreadsheet_id, changes, next_row)
+
+        summary = {'inserted': len(inserts), 'updated': len(updates), 'unchanged': unchanged}
+        logging.info(f"Grants sheet sync: {summary}")
+        return summary
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index - 1
+
+
+def _parse_range(a1_range: str) -> Tuple[str, int, Optional[int], int, Optional[int]]:
+    """Parse 'Sheet!A493:Z' / 'Sheet!A1:J3' into (sheet, row, last_row, col, last_col)."""
+    sheet, cells = a1_range.split('!')
+    match = re.fullmatch(r'([A-Z]+)(\d+)(?::([A-Z]+)(\d+)?)?', cells)
+    start_col, start_row, end_col, end_row = match.groups()
+    return (sheet, int(start_row), int(end_row) if end_row else None,
+            _column_index(start_col), _column_index(end_col) if end_col else None)
+
+
+class _Request:
+    def __init__(self, func):
+        self._func = func
+
+    def execute(self):
+        return self._func()
+
+
+def _column_letters(index: int) -> str:
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+class FakeSheetsService:
+    """
+    In-memory stand-in for the Sheets v4 service (values.get/append/batchUpdate).
+    USER_ENTERED numbers are stored as numbers and FORMATTED_VALUE reads render
+    them back with a display format, like the real API.
+    """
+
+    def __init__(self):
+        self.sheets: Dict[str, Dict[int, List[Any]]] = {}
+        self.calls = {'get': 0, 'append': 0, 'batchUpdate': 0, 'cells_read': 0, 'cells_written': 0}
+
+    def spreadsheets(self):
+        return self
+
+    @staticmethod
+    def _enter(cell: Any, value_input_option: str) -> Any:
+        if value_input_option == 'USER_ENTERED' and isinstance(cell, str) and NUMBER_PATTERN.fullmatch(cell):
+            return float(cell) if '.' in cell or 'e' in cell.lower() else int(cell)
+        return cell
+
+    @staticmethod
+    def _render(cell: Any, value_render_option: str) -> Any:
+        if value_render_option == 'FORMATTED_VALUE' and isinstance(cell, (int, float)):
+            return f'{cell:,.2f}'
+        return cell
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, valueRenderOption='FORMATTED_VALUE', dateTimeRenderOption=None, **kwargs):
+        a1_range = kwargs['range']  # 'range' is the API's keyword name
+
+        def run():
+            self.calls['get'] += 1
+            sheet, first, last, col, last_col = _parse_range(a1_range)
+            grid = self.sheets.get(sheet, {})
+            end = last or max(grid, default=first - 1)
+            values = [[self._render(cell, valueRenderOption)
+                       for cell in grid.get(row, [])[col:None if last_col is None else last_col + 1]]
+                      for row in range(first, end + 1)]
+            while values and not values[-1]:
+                values.pop()
+            self.calls['cells_read'] += sum(len(row) for row in values)
+            return {'range': a1_range, 'values': values} if values else {'range': a1_range}
+        return _Request(run)
+
+    def append(self, spreadsheetId, valueInputOption, body, insertDataOption=None, **kwargs):
+        a1_range = kwargs['range']
+
+        def run():
+            self.calls['append'] += 1
+            sheet, first, _, _, _ = _parse_range(a1_range)
+            grid = self.sheets.setdefault(sheet, {})
+            row = max([first - 1] + [r for r in grid if r >= first]) + 1
+            for offset, values in enumerate(body['values']):
+                grid[row + offset] = [self._enter(cell, valueInputOption) for cell in values]
+                self.calls['cells_written'] += len(values)
+            last = row + len(body['values']) - 1
+            width = max((len(values) for values in body['values']), default=1)
+            updated_range = f"{sheet}!A{row}:{_column_letters(width - 1)}{last}"
+            return {'updates': {'updatedRange': updated_range, 'updatedRows': len(body['values'])}}
+        return _Request(run)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def run():
+            self.calls['batchUpdate'] += 1
+            for entry in body['data']:
+                sheet, first, _, col, _ = _parse_range(entry['range'])
+                grid = self.sheets.setdefault(sheet, {})
+                for offset, values in enumerate(entry['values']):
+                    row = grid.setdefault(first + offset, [])
+                    row.extend([''] * max(0, col + len(values) - len(row)))
+                    row[col:col + len(values)] = [self._enter(cell, body['valueInputOption']) for cell in values]
+                    self.calls['cells_written'] += len(values)
+            return {'totalUpdatedRows': sum(len(entry['values']) for entry in body['data'])}
+        return _Request(run)
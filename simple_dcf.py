@@ -46,6 +46,7 @@ try:
     import yfinance as yf
 except ImportError:
     yf = None
+import yfinance_gateway
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -65,7 +66,7 @@ def get_yfinance_financials(ticker):
         print("yfinance not available")
         return {}
     try:
-        ticker_obj = yf.Ticker(ticker)
+        ticker_obj = yfinance_gateway.ticker(ticker)
         fin = ticker_obj.financials.T
         years = fin.index[-YEARS:]
         data = {}
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Request Coalescing
+
+When many callers ask for the same ticker at the same time (market open,
+batch jobs, several users on the same mega-cap), only one of them performs
+the upstream fetch; the rest wait for it and share the result.
+
+Features:
+- Keyed by (ticker, dataset, freshness window): results are shared by every
+  call that lands in the same window, then the next window fetches again
+- In-process coalescing: concurrent threads wait on one in-flight call
+- Cross-process coordination: a per-key lock file serializes processes, and
+  the leader's result is stored in SQLite so the processes that waited on
+  the lock read it instead of fetching again
+- Exceptions propagate to every in-process waiter (and are not stored)
+- stored() / store() / file_lock() let callers that cannot block on do()
+  (the async server) reuse, coordinate and publish results under the same keys
+- refresh() always fetches (forced refreshes) and replaces the stored
+  result, so later callers in the window see the fresh data
+
+Usage:
+    flights = SingleFlight()
+    data = flights.do('AAPL', 'financials', fetch_financials, 'AAPL')
+"""
+
+import copy
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process coalescing only
+    fcntl = None
+
+DEFAULT_WINDOW_SECONDS = 60
+# Anchored to this module, not the working directory, so every process shares one store
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.single_flight', 'results.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flight_results (
+    key TEXT PRIMARY KEY,
+    result BLOB NOT NULL,
+    completed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_flight_completed ON flight_results (completed_at);
+"""
+
+
+class _Call:
+    """One in-flight fetch that other threads can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent fetches of the same (ticker, dataset) within a freshness window."""
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH,
+                 window_seconds: float = DEFAULT_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self.db_path = db_path
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {'fetched': 0, 'shared': 0, 'cross_process': 0}
+
+        self.lock_dir = None
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            self.lock_dir = os.path.join(directory, 'locks')
+            os.makedirs(self.lock_dir, exist_ok=True)
+            with self._connect() as conn:
+                conn.executescript(SCHEMA)
+
+    def key(self, ticker: str, dataset: str, now: Optional[float] = None) -> str:
+        """Flight key: ticker, dataset and the freshness window the call falls in."""
+        window = int((time.time() if now is None else now) // self.window_seconds)
+        return f"{dataset}:{ticker.upper()}:{window}"
+
+    def do(self, ticker: str, dataset: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Return fn(*args, **kwargs), sharing one execution among concurrent callers."""
+        key = self.key(ticker, dataset)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            with self._lock:
+                self.stats['shared'] += 1
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = self._fetch(key, fn, args, kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def refresh(self, ticker: str, dataset: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Return a fresh fn(*args, **kwargs), ignoring stored results, and store it for the window."""
+        key = self.key(ticker, dataset)
+        if not self.db_path:
+            return self._run(fn, args, kwargs)
+
+        with self.file_lock(key):
+            result = self._run(fn, args, kwargs)
+            self.store(key, result)
+            return result
+
+    def _fetch(self, key: str, fn: Callable[..., Any], args, kwargs) -> Any:
+        if not self.db_path:
+            return self._run(fn, args, kwargs)
+
+        with self.file_lock(key):
+            found, result = self.stored(key)
+            if found:
+                with self._lock:
+                    self.stats['cross_process'] += 1
+                return result
+
+            result = self._run(fn, args, kwargs)
+            self.store(key, result)
+            return result
+
+    def _run(self, fn: Callable[..., Any], args, kwargs) -> Any:
+        result = fn(*args, **kwargs)
+        with self._lock:
+            self.stats['fetched'] += 1
+        return result
+
+    # ------------------------------------------------------ cross-process
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def file_lock(self, key: str) -> 'FileLock':
+        """The cross-process lock that serializes fetches of key (callers that cannot use do())."""
+        return FileLock(os.path.join(self.lock_dir, hashlib.sha1(key.encode()).hexdigest() + '.lock'))
+
+    def stored(self, key: str):
+        """(True, result) when any process already stored a result for key, else (False, None)."""
+        if not self.db_path:
+            return False, None
+        row = self._connect().execute('SELECT result FROM flight_results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def store(self, key: str, result: Any):
+        """Share a result with every later caller of key in this window (any process)."""
+        if not self.db_path:
+            return
+        try:
+            payload = pickle.dumps(result)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # Unpicklable results are only shared in-process
+        conn = self._connect()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO flight_results (key, result, completed_at) VALUES (?, ?, ?)',
+                         (key, payload, time.time()))
+            # Results outside the current and previous window can no longer be used
+            conn.execute('DELETE FROM flight_results WHERE completed_at < ?',
+                         (time.time() - 2 * self.window_seconds,))
+        self._prune_lock_files()
+
+    def _prune_lock_files(self):
+        # Lock files belong to one window; once it has passed no caller opens them again
+        cutoff = time.time() - 2 * self.window_seconds
+        for name in os.listdir(self.lock_dir):
+            path = os.path.join(self.lock_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+class FileLock:
+    """Exclusive advisory lock on a file (no-op where fcntl is unavailable)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        return False
+
+
+_default: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide SingleFlight shared by the data managers."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SingleFlight(
+                db_path=os.getenv('SINGLE_FLIGHT_DB', DEFAULT_DB_PATH),
+                window_seconds=float(os.getenv('SINGLE_FLIGHT_WINDOW_SECONDS', DEFAULT_WINDOW_SECONDS))
+            )
+        return _default
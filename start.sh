@@ -7,7 +7,7 @@
 #  2) Creates & activates a Python virtual-env (./venv) if it does not exist
 #  3) Installs / upgrades all required packages (silent if already satisfied)
 #  4) Kills any process already listening on ports 5001 (backend) or 8080 (UI)
-#  5) Launches the Flask backend on :5001
+#  5) Launches the async API backend (asgi_app.py, same routes as app.py) on :5001
 #  6) Launches a lightweight HTTP server for the static frontend on :8080
 #  7) Opens your default browser at http://localhost:8080
 #  8) Streams logs so you can quit with CTRL-C
@@ -58,9 +58,9 @@ done
 sleep 1
 
 # -------- 5.  Launch backend -----------------------------------------------------
-echo "🚀 Starting Flask backend on http://localhost:5001 …"
+echo "🚀 Starting async API backend on http://localhost:5001 …"
 cd "$BACKEND_DIR"
-python3 app.py &
+python3 asgi_app.py &
 BACKEND_PID=$!
 cd "$PROJECT_ROOT"
 
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Streaming Downloads - Chunked Excel and zip responses with bounded buffers
+
+Features:
+- Workbooks and zip bundles are written straight into the HTTP response in
+  fixed-size chunks through a bounded queue, so memory per download stays
+  constant and the first bytes go out before the whole file exists
+- Strong ETags (file size + mtime, or a hash of the generating inputs) with
+  If-None-Match -> 304, so repeat downloads hit the client cache
+- Single-range HTTP Range requests (206 / 416, If-Range) for files on disk;
+  zip bundles are cached on disk as they stream, so resumed or repeated
+  bundle downloads are served from the cached file with Range support
+
+The chunking, ETag and Range helpers are framework-independent; the
+*_response functions wrap them in Flask responses.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import zipfile
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+ZIP_MIMETYPE = 'application/zip'
+
+CHUNK_SIZE = 64 * 1024
+MAX_BUFFERED_CHUNKS = 8          # At most ~512 KB in flight per download
+BUNDLE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'finmodai_bundles')
+MAX_CACHED_BUNDLES = 4
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# ---------------------------------------------------------------- ETags
+
+def file_etag(path: str) -> str:
+    """Strong ETag from a file's size and modification time."""
+    stat = os.stat(path)
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def bundle_etag(paths: Iterable[str]) -> str:
+    """ETag for a zip of files: changes when any member is added, removed or modified."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f'{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def content_etag(*inputs: Any) -> str:
+    """ETag for generated content, from the inputs that determine it."""
+    payload = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header matches the ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith('W/') else tag) == etag:
+            return True
+    return False
+
+
+# ---------------------------------------------------------------- Ranges
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single 'bytes=start-end' Range header into an inclusive (start, end).
+
+    Returns None when there is no usable range (serve the full body) and
+    raises ValueError when the range cannot be satisfied (416).
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None  # Multi-range or malformed: full response is allowed
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:  # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('empty suffix range')
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(f'range {header} not satisfiable for {size} bytes')
+    return start, end
+
+
+def iter_file(path: str, start: int = 0, end: Optional[int] = None,
+              chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield bytes start..end (inclusive) of a file in chunks."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = (os.path.getsize(path) - start) if end is None else end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+# ------------------------------------------------------ streamed writers
+
+class _Cancelled(Exception):
+    """The consumer went away (client disconnected)."""
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+class _QueueWriter:
+    """Write-only, non-seekable file object that hands fixed-size chunks to a bounded queue."""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event, chunk_size: int):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    def put(self, item):
+        while True:
+            if self._cancelled.is_set():
+                raise _Cancelled()
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._chunk_size:
+            self.put(bytes(self._buffer[:self._chunk_size]))
+            del self._buffer[:self._chunk_size]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+        self.put(_DONE)
+
+
+def iter_written(write_fn: Callable[[Any], None], chunk_size: int = CHUNK_SIZE,
+                 max_buffered: int = MAX_BUFFERED_CHUNKS) -> Iterator[bytes]:
+    """
+    Run write_fn(fileobj) in a background thread and yield what it writes.
+
+    The queue between writer and consumer is bounded, so a slow client
+    throttles the writer instead of letting output pile up in memory.
+    Closing the iterator early (client disconnect) stops the writer.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=max_buffered)
+    cancelled = threading.Event()
+    writer = _QueueWriter(chunks, cancelled, chunk_size)
+
+    def run():
+        try:
+            write_fn(writer)
+            writer.finish()
+        except _Cancelled:
+            pass
+        except BaseException as e:
+            try:
+                writer.put(_Failure(e))
+            except _Cancelled:
+                pass
+
+    thread = threading.Thread(target=run, daemon=True, name='stream-writer')
+    thread.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        cancelled.set()
+
+
+def write_zip(members: List[Tuple[str, str]], fileobj) -> None:
+    """Write (path, archive name) members into a zip on a non-seekable stream."""
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path, name in members:
+            archive.write(path, name)
+
+
+def iter_zip(paths: List[str], cache_path: Optional[str] = None,
+             chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Stream a zip of the given files. With cache_path, the bytes are also
+    written to disk and the file is kept once the stream completes.
+    """
+    members = [(path, os.path.basename(path)) for path in paths]
+    chunks = iter_written(lambda fileobj: write_zip(members, fileobj), chunk_size)
+    if cache_path is None:
+        yield from chunks
+        return
+
+    partial = f'{cache_path}.{os.getpid()}.{threading.get_ident()}.part'
+    complete = False
+    try:
+        with open(partial, 'wb') as cache:
+            for chunk in chunks:
+                cache.write(chunk)
+                yield chunk
+        os.replace(partial, cache_path)
+        complete = True
+    finally:
+        if not complete and os.path.exists(partial):
+            os.remove(partial)
+
+
+def _prune_bundle_cache(cache_dir: str, keep: int = MAX_CACHED_BUNDLES):
+    bundles = sorted((entry for entry in os.scandir(cache_dir) if entry.name.endswith('.zip')),
+                     key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in bundles[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------- Flask
+
+def _attachment_headers(download_name: str, etag: str) -> dict:
+    return {
+        'Content-Disposition': f'attachment; filename="{download_name}"',
+        'ETag': etag,
+        'Cache-Control': 'private, no-cache'  # Always revalidate; 304 when unchanged
+    }
+
+
+def file_response(path: str, download_name: Optional[str] = None, mimetype: str = XLSX_MIMETYPE,
+                  etag: Optional[str] = None):
+    """Flask response for a file on disk with ETag, Range and chunked body."""
+    from flask import Response, request
+
+    download_name = download_name or os.path.basename(path)
+    etag = etag or file_etag(path)
+    headers = _attachment_headers(download_name, etag)
+    headers['Accept-Ranges'] = 'bytes'
+
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers=headers)
+
+    size = os.path.getsize(path)
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range.strip() != etag:
+        range_header = None  # File changed since the client's partial copy
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        headers['Content-Range'] = f'bytes */{size}'
+        return Response(status=416, headers=headers)
+
+    if byte_range is None:
+        headers['Content-Length'] = str(size)
+        return Response(iter_file(path), status=200, mimetype=mimetype, headers=headers,
+                        direct_passthrough=True)
+
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    headers['Content-Length'] = str(end - start + 1)
+    return Response(iter_file(path, start, end), status=206, mimetype=mimetype, headers=headers,
+                    direct_passthrough=True)
+
+
+def generated_response(write_fn: Callable[[Any], None], download_name: str, etag: str,
+                       mimetype: str = XLSX_MIMETYPE):
+    """
+    Flask response that streams whatever write_fn writes (e.g. workbook.save).
+    The length is unknown up front, so the body is chunked and Range is not offered.
+    """
+    from flask import Response, request
+
+    headers = _attachment_headers(download_name, etag)
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers=headers)
+    return Response(iter_written(write_fn), status=200, mimetype=mimetype, headers=headers,
+                    direct_passthrough=True)
+
+
+def bundle_response(paths: List[str], download_name: str, cache_dir: str = BUNDLE_CACHE_DIR):
+    """
+    Flask response zipping the given files on the fly. The first download
+    streams while it is cached; later (or resumed, Range) downloads of the same
+    bundle are served from the cached zip.
+    """
+    from flask import Response, request
+
+    etag = bundle_etag(paths)
+    headers = _attachment_headers(download_name, etag)
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers=headers)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, f'{etag.strip(chr(34))}.zip')
+    if os.path.exists(cache_path):
+        return file_response(cache_path, download_name, ZIP_MIMETYPE, etag=etag)
+
+    _prune_bundle_cache(cache_dir)
+    return Response(iter_zip(paths, cache_path), status=200, mimetype=ZIP_MIMETYPE, headers=headers,
+                    direct_passthrough=True)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized accretion/dilution engine against the scalar deal math
+"""
+
+import io
+import contextlib
+
+import numpy as np
+
+from accretion_dilution_engine import accretion_dilution_grid, breakeven_cost_synergies
+from professional_accretion_dilution_model import ProfessionalAccretionDilutionModel
+
+
+def _scalar_accretion(model, financial_inputs, premium, mix, rate, cost_synergies):
+    deal = model._create_deal_structure(premium, *mix, rate, 0.21)
+    synergies = model._create_synergies(75.0, cost_synergies, 25.0)
+    purchase = model._calculate_purchase_price(financial_inputs, deal)
+    financing = model._calculate_financing(purchase, deal, synergies)
+    proforma = model._calculate_proforma_financials(financial_inputs, purchase, financing, synergies)
+    return model._calculate_accretion_dilution(financial_inputs, proforma)['accretion_dilution_pct']
+
+
+def test_grid_matches_scalar_path():
+    """Every grid cell equals the per-point scalar calculation"""
+    print("🔍 Testing accretion/dilution grid...")
+
+    model = ProfessionalAccretionDilutionModel("TechCorp Inc.", "StartUp Ltd.", "TECHCORP", "STARTUP")
+    premiums, synergy_amounts = [0.10, 0.30], [50.0, 200.0]
+    mixes, rates = [[0.6, 0.3, 0.1], [0.0, 1.0, 0.0]], [0.03, 0.07]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        financial_inputs = model._create_financial_inputs(1500.0, 4.50, 333.3, 20.0, 50.0, 20.0, 25.0)
+        deal = model._create_deal_structure(0.25, 0.6, 0.3, 0.1, 0.05, 0.21)
+        synergies = model._create_synergies(75.0, 125.0, 25.0)
+        grid = accretion_dilution_grid(financial_inputs, deal, synergies, premiums, synergy_amounts, mixes, rates)
+
+        for i, premium in enumerate(premiums):
+            for j, amount in enumerate(synergy_amounts):
+                for k, mix in enumerate(mixes):
+                    for m, rate in enumerate(rates):
+                        expected = _scalar_accretion(model, financial_inputs, premium, mix, rate, amount)
+                        assert abs(grid['accretion_dilution_pct'][i, j, k, m] - expected) < 1e-12
+
+        # Breakeven synergies bring the deal to exactly 0% accretion
+        breakeven = breakeven_cost_synergies(financial_inputs, deal, synergies, premiums=premiums)
+        for i, premium in enumerate(premiums):
+            result = _scalar_accretion(model, financial_inputs, premium, [0.6, 0.3, 0.1], 0.05, breakeven[i, 0, 0])
+            assert abs(result) < 1e-12
+
+    assert np.shape(grid['accretion_dilution_pct']) == (2, 2, 2, 2)
+    print("   ✅ Grid matches scalar deal math")
+
+
+if __name__ == "__main__":
+    test_grid_matches_scalar_path()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test the async backend server: /api/generate validation, job event streams and shared company-data reuse
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip('starlette')
+pytest.importorskip('httpx')
+pytest.importorskip('flask')
+
+from starlette.testclient import TestClient  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'financial-models-app', 'backend'))
+import asgi_app  # noqa: E402
+from asgi_app import backend  # noqa: E402
+from progress_events import claim_worker  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+
+
+@contextmanager
+def patched(target, **attributes):
+    saved = {name: getattr(target, name) for name in attributes}
+    for name, value in attributes.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+
+class FakePipeline:
+    """Scrapers, the merge and the workbook build without touching the network or disk"""
+
+    def __init__(self):
+        self.merges = 0
+        self.scrape_delay = 0.0
+
+    def scrapers(self):
+        async def scrape(ticker, http):
+            await asyncio.sleep(self.scrape_delay)
+            return {'ticker': ticker}
+        return {name: (None, scrape) for name in backend.SCRAPERS}
+
+    def merge(self, ticker, company_name, scraped):
+        self.merges += 1
+        return {'ticker': ticker.upper(), 'company_name': company_name, 'data_quality': 'high',
+                'sources': sorted(scraped)}
+
+    @staticmethod
+    async def run_cpu(fn, *args):
+        return 'ACME_DCF.xlsx', 'ACME_DCF.xlsx'
+
+
+@contextmanager
+def fake_backend():
+    pipeline = FakePipeline()
+    with tempfile.TemporaryDirectory() as tmp:
+        flights = SingleFlight(db_path=os.path.join(tmp, 'flights.db'), window_seconds=3600)
+        with patched(backend, SCRAPERS=pipeline.scrapers(), fetch_comprehensive_company_data=pipeline.merge,
+                     single_flight=flights, get_precompute_service=None), \
+                patched(asgi_app, run_cpu=pipeline.run_cpu, WORKER_LOCK_PATH=os.path.join(tmp, 'worker.lock')), \
+                TestClient(asgi_app.app) as client:
+            yield client, pipeline, flights
+
+
+def _events(body):
+    return [json.loads(line[len('data: '):]) for line in body.splitlines() if line.startswith('data: ')]
+
+
+def test_generate_validation_and_job_stream():
+    """Bad bodies get a 400; a job streams its stages over SSE and ends with the result"""
+    print("🔍 Testing async /api/generate and /api/jobs...")
+    with fake_backend() as (client, pipeline, _):
+        assert client.get('/api/health').json()['status'] == 'healthy'
+        response = client.post('/api/generate', json={'company_name': 'Acme', 'ticker': 'ACME'})
+        assert response.status_code == 400 and response.json() == {'error': 'Missing required fields'}
+        response = client.post('/api/generate', content=b'not json', headers={'content-type': 'application/json'})
+        assert response.status_code == 400
+        assert client.post('/api/jobs', json={}).status_code == 400
+        print("   ✅ Missing fields and bad JSON rejected")
+
+        accepted = client.post('/api/jobs', json={'company_name': 'Acme', 'ticker': 'acme', 'models': ['dcf']})
+        assert accepted.status_code == 202
+        job = accepted.json()
+        stream = client.get(job['events_url'])
+        assert stream.headers['content-type'].startswith('text/event-stream')
+        events = _events(stream.text)
+        stages = [event['stage'] for event in events]
+        assert stages[0] == 'queued' and stages[-1] == 'complete'
+        assert stages.count('data') == len(backend.SCRAPERS) and 'excel' in stages
+        result = events[-1]['result']
+        assert result['ticker'] == 'ACME' and result['results'][0]['download_url'] == '/api/download/ACME_DCF.xlsx'
+        assert client.get(job['status_url']).json()['status'] == 'complete'
+        assert client.get('/api/jobs/unknown/events').status_code == 404
+
+        # Reconnecting with Last-Event-ID replays only what was missed
+        replay = _events(client.get(job['events_url'], headers={'Last-Event-ID': str(events[-2]['id'])}).text)
+        assert [event['stage'] for event in replay] == ['complete']
+        assert pipeline.merges == 1
+    print("   ✅ Job events streamed over SSE")
+
+
+def test_company_data_reused_through_single_flight():
+    """A fetch stored by the async path (or another process) is reused within its window"""
+    print("🔍 Testing shared company-data reuse...")
+    with fake_backend() as (client, pipeline, flights):
+        body = {'company_name': 'Acme', 'ticker': 'ACME', 'models': ['dcf']}
+        first = client.post('/api/generate', json=body)
+        assert first.status_code == 200 and first.json()['success']
+        assert pipeline.merges == 1
+
+        # The result sits in the cross-process store under the Flask path's key
+        found, data = flights.stored(flights.key('ACME', backend.company_data_dataset('Acme')))
+        assert found and data['company_name'] == 'Acme'
+
+        job = client.post('/api/jobs', json=body).json()
+        events = _events(client.get(job['events_url']).text)
+        assert pipeline.merges == 1
+        assert any(event['stage'] == 'cache' and event['status'] == 'hit' for event in events)
+    print("   ✅ Second request served from the shared store")
+
+
+def test_miss_waits_for_a_fetch_in_another_process():
+    """While another process holds the key's lock, a miss waits and reuses what it stores"""
+    print("🔍 Testing cross-process lock on company data...")
+    with fake_backend() as (client, pipeline, flights):
+        key = flights.key('ACME', backend.company_data_dataset('Acme'))
+        responses = []
+        with flights.file_lock(key):  # a separate open file: contends like another process
+            request = threading.Thread(target=lambda: responses.append(client.post(
+                '/api/generate', json={'company_name': 'Acme', 'ticker': 'ACME', 'models': ['dcf']})))
+            request.start()
+            time.sleep(0.3)
+            assert not responses  # still waiting on the lock
+            flights.store(key, {'ticker': 'ACME', 'company_name': 'Acme', 'data_quality': 'high'})
+        request.join(timeout=10)
+        assert responses and responses[0].json()['success']
+        assert pipeline.merges == 0
+    print("   ✅ Waited for the other process and reused its fetch")
+
+
+def test_shared_fetch_progress_reaches_every_job():
+    """A job that joins a running fetch sees its progress, not just a 'joined' note"""
+    print("🔍 Testing progress fan-out of a shared fetch...")
+    with fake_backend() as (client, pipeline, _):
+        pipeline.scrape_delay = 0.5
+        body = {'company_name': 'Acme', 'ticker': 'ACME', 'models': ['dcf']}
+        leader = client.post('/api/jobs', json=body).json()
+        follower = client.post('/api/jobs', json=body).json()
+        leader_events = _events(client.get(leader['events_url']).text)
+        follower_events = _events(client.get(follower['events_url']).text)
+        assert pipeline.merges == 1
+        assert any(event['stage'] == 'cache' and 'Joined' in event['message'] for event in follower_events)
+        for events in (leader_events, follower_events):
+            assert [event['stage'] for event in events].count('data') == len(backend.SCRAPERS)
+            assert events[-1]['stage'] == 'complete'
+        assert asgi_app.company_data_groups == {}
+    print("   ✅ Both jobs streamed the shared fetch")
+
+
+def test_second_worker_refused():
+    """Job events live in one process, so a second worker (or WEB_CONCURRENCY > 1) cannot start"""
+    with fake_backend():
+        with pytest.raises(RuntimeError):
+            claim_worker(asgi_app.WORKER_LOCK_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = os.environ.get('WEB_CONCURRENCY')
+        os.environ['WEB_CONCURRENCY'] = '4'
+        try:
+            with pytest.raises(RuntimeError):
+                claim_worker(os.path.join(tmp, 'worker.lock'))
+        finally:
+            if saved is None:
+                del os.environ['WEB_CONCURRENCY']
+            else:
+                os.environ['WEB_CONCURRENCY'] = saved
+        claim_worker(os.path.join(tmp, 'worker.lock')).close()
+
+
+if __name__ == "__main__":
+    test_generate_validation_and_job_stream()
+    test_company_data_reused_through_single_flight()
+    test_miss_waits_for_a_fetch_in_another_process()
+    test_shared_fetch_progress_reaches_every_job()
+    test_second_worker_refused()
+    print("🎉 Async server tests passed")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the async HTTP layer: per-host limits, many requests in flight, offloading and single flight
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from async_http import AsyncHTTP, AsyncSingleFlight, run_blocking, shutdown_executors
+
+
+def test_requests_in_flight_respect_host_limits():
+    """Hundreds of concurrent GETs overlap on the loop but never exceed the per-host cap"""
+    httpx = pytest.importorskip('httpx')
+    print("🔍 Testing async HTTP client...")
+    active, peak = {}, {}
+
+    async def handler(request):
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return httpx.Response(200, json={'host': host})
+
+    async def main():
+        http = AsyncHTTP(per_host=8, transport=httpx.MockTransport(handler))
+        urls = [f'https://{host}/quote?t={i}' for i in range(100) for host in ('finviz.com', 'www.sec.gov')]
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(http.get(url) for url in urls))
+        elapsed = time.perf_counter() - start
+        await http.aclose()
+        return responses, elapsed
+
+    responses, elapsed = asyncio.run(main())
+    assert len(responses) == 200 and all(r.status_code == 200 for r in responses)
+    assert responses[1].json() == {'host': 'www.sec.gov'}
+    assert peak == {'finviz.com': 8, 'www.sec.gov': 8}
+    # 100 requests per host, 8 at a time, 20 ms each: ~0.26 s, not 4 s sequentially
+    assert elapsed < 1.5
+    print(f"✅ 200 requests in {elapsed:.2f}s, peak {peak['finviz.com']} per host")
+
+
+def test_blocking_offload_and_single_flight():
+    """Blocking calls leave the loop free; concurrent awaits of one key share a single fetch"""
+    print("🔍 Testing executors and single flight...")
+    calls, lock = [], threading.Lock()
+
+    def slow_fetch(ticker):
+        with lock:
+            calls.append(ticker)
+        time.sleep(0.05)
+        return {'ticker': ticker}
+
+    async def fetch(ticker):
+        return await run_blocking(slow_fetch, ticker)
+
+    async def main():
+        flights = AsyncSingleFlight()
+        start = time.perf_counter()
+        shared = await asyncio.gather(*(flights.do('AAPL', fetch, 'AAPL') for _ in range(50)))
+        distinct = await asyncio.gather(*(fetch(f'T{i}') for i in range(40)))
+        return flights, shared, distinct, time.perf_counter() - start
+
+    flights, shared, distinct, elapsed = asyncio.run(main())
+    assert all(result == {'ticker': 'AAPL'} for result in shared)
+    assert calls.count('AAPL') == 1 and flights.stats == {'leaders': 1, 'followers': 49}
+    assert len(distinct) == 40 and elapsed < 1.0   # 40 x 50 ms overlapped on the thread pool
+    shutdown_executors()
+    print(f"✅ 50 callers shared one fetch; 40 blocking calls overlapped in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    test_requests_in_flight_respect_host_limits()
+    test_blocking_offload_and_single_flight()
+    print("🎉 Async HTTP tests passed")
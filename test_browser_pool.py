@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test browser pool lifecycle (lazy launch, bounded size, recycling)
+"""
+
+import threading
+
+import browser_pool
+from browser_pool import BrowserPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.page_source = "<html><body>grant</body></html>"
+
+    def get(self, url):
+        if 'crash' in url:
+            raise browser_pool.WebDriverException("tab crashed")
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_is_lazy_bounded_and_recycles():
+    """Drivers start on demand, never exceed max_size and are recycled"""
+    print("🔍 Testing browser pool...")
+
+    launched = []
+    has_selenium = browser_pool.HAS_SELENIUM
+    browser_pool.HAS_SELENIUM = False  # skip WebDriverWait for fake drivers
+    try:
+        pool = BrowserPool(lambda: launched.append(FakeDriver()) or launched[-1],
+                           max_size=2, max_pages_per_driver=3)
+        assert pool.size == 0 and not launched
+
+        threads = [threading.Thread(target=pool.fetch, args=(f"https://example.com/{i}",)) for i in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert pool.size <= 2
+        assert pool.stats['pages'] == 12
+        assert pool.stats['recycled'] >= 12 // 3 - 2
+        assert all(driver.quit_called for driver in launched[:-2])
+
+        # A crashed driver is discarded and the page retried on a fresh one
+        assert pool.fetch("https://example.com/crash", retries=1) == ""
+        assert pool.stats['crashed'] == 2
+
+        pool.close()
+        assert pool.size == 0
+        assert all(driver.quit_called for driver in launched)
+    finally:
+        browser_pool.HAS_SELENIUM = has_selenium
+    print("   ✅ Browser pool working")
+
+
+if __name__ == "__main__":
+    test_pool_is_lazy_bounded_and_recycles()
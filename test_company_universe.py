@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test the array-backed company universe: round trips, views, (ticker, year) lookups and screens
+"""
+
+import dataclasses
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from company_universe import CompanyUniverse
+
+
+# Same field shapes as financial_data_manager.DataQualityMetrics / CompanyFinancials
+@dataclass
+class QualityMetrics:
+    overall_score: float = 0.0
+    sources_used: List[str] = None
+    confidence_level: str = "LOW"
+    last_updated: datetime = None
+    error_count: int = 0
+
+
+@dataclass
+class Financials:
+    ticker: str = ""
+    company_name: str = ""
+    sector: str = ""
+    currency: str = "USD"
+    market_cap: float = 0.0
+    beta: float = 1.1
+    revenue: List[float] = None
+    ebitda: List[float] = None
+    eps: List[float] = None
+    revenue_growth: float = 0.0
+    data_quality: QualityMetrics = None
+
+    def __post_init__(self):
+        for field in ('revenue', 'ebitda', 'eps'):
+            if getattr(self, field) is None:
+                setattr(self, field, [])
+
+
+# Same field shapes as finmodai.data_ingestion.FinancialData
+@dataclass
+class FlatFinancials:
+    company_name: str
+    ticker: str
+    corrected_ticker: Optional[str] = None
+    sector: str = ""
+    market_cap: float = 0.0
+    revenue: float = 0.0
+    last_updated: str = ""
+    data_quality_score: int = 0
+
+
+def _companies(n, seed=3):
+    rng = np.random.default_rng(seed)
+    sectors = ['Technology', 'Energy', 'Healthcare', 'Industrials']
+    companies = []
+    for i in range(n):
+        history = int(rng.integers(3, 6))
+        companies.append(Financials(
+            ticker=f'C{i:05d}', company_name=f'Company {i} Holdings Inc', sector=str(rng.choice(sectors)),
+            market_cap=float(rng.uniform(1e8, 1e12)), beta=float(rng.uniform(0.5, 2.0)),
+            revenue=list(rng.uniform(1e7, 1e10, history)), ebitda=list(rng.uniform(1e6, 1e9, history)),
+            eps=list(rng.uniform(0.1, 9.0, history - 1)) if i % 7 else [],
+            revenue_growth=float(rng.uniform(-20, 40)),
+            data_quality=QualityMetrics(overall_score=float(rng.uniform(0, 100)), sources_used=['yahoo_finance'],
+                                        confidence_level='HIGH', last_updated=datetime(2025, 1, 2, 3, 4, 5))))
+    return companies
+
+
+def test_round_trip_views_and_year_index():
+    """Records survive the round trip; views read the arrays; (ticker, year) lookups line up"""
+    print("🔍 Testing company universe storage...")
+
+    companies = _companies(500)
+    universe = CompanyUniverse.from_records(companies, last_years={'C00001': 2023}, default_last_year=2024)
+    assert len(universe) == 500 and 'c00042' in universe
+
+    for i in (0, 1, 7, 499):
+        assert dataclasses.asdict(universe.record(companies[i].ticker)) == dataclasses.asdict(companies[i])
+    print("✅ Records round-trip through the columns")
+
+    view = universe['C00003']
+    revenue = view.revenue
+    assert list(revenue) == companies[3].revenue
+    assert np.shares_memory(revenue, universe.series('revenue'))
+    assert view.sector == companies[3].sector and view.data_quality.confidence_level == 'HIGH'
+    assert list(view.years('revenue'))[-1] == 2024
+
+    view.market_cap = 123.0
+    assert universe.column('market_cap')[universe.row('C00003')] == 123.0
+    assert list(universe['C00007'].eps) == [] and universe.valid('eps')[7] == False
+
+    # C00001's history ends in 2023; everyone else's in 2024
+    assert universe.value('revenue', 'C00001', 2023) == companies[1].revenue[-1]
+    assert np.isnan(universe.value('revenue', 'C00001', 2024))
+    assert universe.value('revenue', 'C00002', 2024) == companies[2].revenue[-1]
+    latest = universe.latest('revenue')
+    assert latest[1] == companies[1].revenue[-1] and latest[2] == companies[2].revenue[-1]
+    cross = universe.cross_section('revenue', 2024)
+    assert np.isnan(cross[1]) and cross[2] == companies[2].revenue[-1]
+    expected = companies[2].revenue[-1] / companies[2].revenue[-2] - 1
+    assert abs(universe.growth('revenue')[2] - expected) < 1e-12
+    print("✅ Views, validity bits and (ticker, year) indexing agree with the records")
+
+    # FinancialData-style records: required name, optional corrected ticker, int score
+    flat = CompanyUniverse.from_records([FlatFinancials('Apple Inc.', 'AAPL', sector='Technology', revenue=3.9e11),
+                                         FlatFinancials('Microsoft', 'MSFT', corrected_ticker='MSFT',
+                                                        revenue=float('nan'), data_quality_score=90),
+                                         FlatFinancials('Shell Co', 'shel', sector='Technology')])
+    apple = flat.record('AAPL')
+    assert (apple.company_name, apple.sector, apple.revenue) == ('Apple Inc.', 'Technology', 3.9e11)
+    assert flat['MSFT'].corrected_ticker == 'MSFT' and flat['AAPL'].corrected_ticker is None
+    assert list(flat.valid('revenue')) == [True, False, False]
+    assert np.isnan(flat['MSFT'].revenue)
+
+    # NaN marks a missing number, and so does a float left at its dataclass default (0.0)
+    assert not flat.valid('market_cap').any() and np.isnan(apple.market_cap)
+    assert list(flat.screen(revenue=(None, 1e12)).tickers) == ['AAPL']
+    tech = flat.screen(sector='Technology')
+    assert tech['SHEL'].company_name == 'Shell Co' and np.isnan(tech['shel'].revenue) and 'SHEL' in tech
+
+    # A reported zero away from the default still counts and passes range screens
+    betas = CompanyUniverse.from_records([Financials(ticker='CASH', beta=0.0), Financials(ticker='UNSET')])
+    assert list(betas.valid('beta')) == [True, False]
+    assert list(betas.screen(beta=(None, 1.0)).tickers) == ['CASH']
+
+
+def test_vectorized_screens_and_memory():
+    """Screens match a Python loop, and columns use far less memory than objects"""
+    print("🔍 Testing vectorized screens and memory footprint...")
+
+    tracemalloc.start()
+    companies = _companies(5000)
+    objects_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    universe = CompanyUniverse.from_records(companies, default_last_year=2024)
+    universe_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"✅ {objects_size / 1e6:.1f} MB as objects vs {universe_size / 1e6:.1f} MB as columns")
+    assert universe_size * 3 < objects_size
+
+    start = time.perf_counter()
+    screened = universe.screen(sector=['Technology', 'Healthcare'], market_cap=(5e10, None),
+                               revenue_growth=(0, 25), eps=(1.0, None))
+    elapsed = time.perf_counter() - start
+    expected = [c.ticker for c in companies
+                if c.sector in ('Technology', 'Healthcare') and c.market_cap >= 5e10
+                and 0 <= c.revenue_growth <= 25 and c.eps and c.eps[-1] >= 1.0]
+    assert list(screened.tickers) == expected
+    assert dataclasses.asdict(screened.record(expected[0])) == \
+        dataclasses.asdict(next(c for c in companies if c.ticker == expected[0]))
+    print(f"✅ Screen matched {len(screened)} companies in {elapsed * 1000:.1f} ms")
+
+    frame = universe.to_frame()
+    assert frame.loc['C00010', 'revenue'] == companies[10].revenue[-1]
+    assert frame.loc['C00010', 'data_quality.overall_score'] == companies[10].data_quality.overall_score
+
+    with pytest.raises(KeyError):
+        universe.mask(not_a_field=1)
+
+
+if __name__ == "__main__":
+    test_round_trip_views_and_year_index()
+    test_vectorized_screens_and_memory()
+    print("🎉 Company universe tests passed")
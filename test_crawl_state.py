@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test conditional-GET crawl state (validators, content hashes, cached results)
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+from crawl_state import CrawlStateDB, content_hash
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Serves one page with an ETag and honours If-None-Match."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return FakeResponse(304, headers={'ETag': '"v1"'})
+        return FakeResponse(200, b'<html>grant</html>', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+
+
+def test_conditional_get_reuses_stored_result():
+    """Second fetch is a 304 and returns the stored extraction result"""
+    print("🔍 Testing crawl state...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CrawlStateDB(os.path.join(tmp, 'crawl.db'))
+        session = FakeSession()
+        url = 'https://example.com/grant'
+
+        response, state = db.conditional_get(session, url)
+        assert response.status_code == 200 and state is None
+        result = {'title': 'Grant', 'date': datetime(2024, 1, 1), 'investors': ['HRF']}
+        db.record(url, 'article', result, response.headers['ETag'],
+                  response.headers['Last-Modified'], content_hash(response.content))
+
+        response, state = db.conditional_get(session, url)
+        assert response is None
+        assert session.requests[-1]['If-None-Match'] == '"v1"'
+        assert state['result'] == result
+        assert db.stats['not_modified'] == 1
+        assert db.is_fresh(url, 60) and not db.is_fresh(url, -1)
+        assert db.counts() == {'article': 1}
+        db.close()
+    print("   ✅ Crawl state working")
+
+
+if __name__ == "__main__":
+    test_conditional_get_reuses_stored_result()
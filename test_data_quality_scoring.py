@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test batch data quality scoring and the incremental quality store
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+from data_quality_scoring import QualityStore, financials_table, score_incremental, score_quality_table
+
+
+def _company(ticker, revenue, ebitda, sources, roe=0.0):
+    return SimpleNamespace(
+        ticker=ticker, company_name=f"{ticker} Corp", revenue=revenue, ebitda=ebitda,
+        net_income=[50.0], total_assets=[1000.0], total_debt=[300.0], operating_cash_flow=[80.0],
+        market_cap=2000.0, beta=1.1, pe_ratio=20.0, roe=roe,
+        data_quality=SimpleNamespace(sources_used=sources, data_freshness_hours=2.0,
+                                     confidence_level='HIGH', cross_validation_score=0.9))
+
+
+def test_batch_scores_and_incremental_store():
+    """Scores follow the dashboard rules and unchanged tickers are not re-scored"""
+    print("🔍 Testing batch quality scoring...")
+
+    companies = [
+        _company('AAA', [1000.0, 900.0], [200.0, 180.0], ['alpha_vantage', 'yahoo_finance']),
+        _company('BBB', [1000.0], [800.0], []),
+    ]
+    scored = score_quality_table(financials_table(companies)).set_index('ticker')
+
+    # AAA: 9/9 metrics + 20 history bonus (capped), both checks pass
+    assert scored.loc['AAA', 'completeness_score'] == 100
+    assert scored.loc['AAA', 'consistency_score'] == 100
+    assert scored.loc['AAA', 'overall_quality_score'] == round(40 + 30 + 87.5 * 0.2 + 10 * 0.1, 1)
+    # BBB: 80% EBITDA margin gets partial credit, no sources
+    assert scored.loc['BBB', 'consistency_score'] == 75
+    assert 'Use multiple data sources for better validation' in scored.loc['BBB', 'recommendations']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = QualityStore(os.path.join(tmp, 'quality.db'))
+        first = score_incremental(companies, store)
+        companies[1].revenue = [1000.0, 950.0]
+        second = score_incremental(companies, store)
+
+        assert second[0]['analysis_date'] == first[0]['analysis_date']  # reused
+        assert second[1]['analysis_date'] > first[1]['analysis_date']   # re-scored
+        assert len(store.history('BBB')) == 2 and len(store.history('AAA')) == 1
+        store.close()
+    print("   ✅ Batch quality scoring working")
+
+
+if __name__ == "__main__":
+    test_batch_scores_and_incremental_store()
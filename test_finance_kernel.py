@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test the batched NPV/IRR finance kernel against scalar loops
+"""
+
+import numpy as np
+
+import finance_kernel
+
+
+def test_npv_matches_scalar_loop():
+    """Batched NPV equals the per-stream loop used by the DCF builders"""
+    print("🔍 Testing batched NPV...")
+
+    flows = np.array([[100.0, 110.0, 121.0], [50.0, -20.0, 80.0]])
+    rates = np.array([0.10, 0.08])
+    expected = [sum(cf / (1 + r) ** (i + 1) for i, cf in enumerate(stream))
+                for stream, r in zip(flows, rates)]
+
+    assert np.allclose(finance_kernel.npv(rates, flows), expected)
+    print("   ✅ NPV working")
+
+
+def test_mid_year_and_stub_periods():
+    """Mid-year convention and stub periods shift discounting times"""
+    print("🔍 Testing period conventions...")
+
+    assert np.allclose(finance_kernel.period_times(3), [1.0, 2.0, 3.0])
+    assert np.allclose(finance_kernel.period_times(3, mid_year=True), [0.5, 1.5, 2.5])
+    assert np.allclose(finance_kernel.period_times(3, stub=0.5), [0.5, 1.5, 2.5])
+    assert np.allclose(finance_kernel.period_times(3, mid_year=True, stub=0.5), [0.25, 1.0, 2.0])
+
+    pv_fcfs, pv_terminal = finance_kernel.discount_cash_flows([100.0, 100.0], 1000.0, 0.10)
+    assert np.allclose(pv_fcfs, [100 / 1.1, 100 / 1.21])
+    assert abs(pv_terminal - 1000 / 1.21) < 1e-9
+    print("   ✅ Period conventions working")
+
+
+def test_irr_and_xirr():
+    """IRR and XIRR solve batches, including Newton-unfriendly streams"""
+    print("🔍 Testing IRR / XIRR...")
+
+    flows = [
+        [-100.0, 10.0, 10.0, 110.0],
+        [-100.0, 0.0, 0.0, 0.0],
+        [-1.0] + [0.0] * 9 + [1e9],
+    ]
+    assert abs(finance_kernel.irr(flows[0]) - 0.10) < 1e-9
+    assert np.isnan(finance_kernel.irr(flows[1]))
+    high = finance_kernel.irr(flows[2])
+    assert abs(-1.0 + 1e9 / (1 + high) ** 10) < 1e-3
+
+    dates = ['2024-01-01', '2025-01-01']
+    assert abs(finance_kernel.xirr([-100.0, 110.0], dates) - (1.1 ** (365 / 366) - 1)) < 1e-9
+    assert abs(finance_kernel.xnpv(0.0, [-100.0, 110.0], dates) - 10.0) < 1e-9
+    print("   ✅ IRR / XIRR working")
+
+
+def test_benchmark_agrees_with_scalar():
+    """Batched IRR agrees with the scalar reference solver"""
+    results = finance_kernel.benchmark(n_streams=500)
+    assert results['max_irr_diff'] < 1e-8
+
+
+if __name__ == "__main__":
+    test_npv_matches_scalar_loop()
+    test_mid_year_and_stub_periods()
+    test_irr_and_xirr()
+    test_benchmark_agrees_with_scalar()
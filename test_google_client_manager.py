@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the shared Google client manager: cached auth, spreadsheets and batched tab setup
+"""
+
+from collections import Counter
+
+from google_client_manager import GoogleClientManager
+
+
+class _FakeWorksheet:
+    def __init__(self, spreadsheet, title, rows, cols):
+        self.spreadsheet, self.title, self.rows, self.cols = spreadsheet, title, rows, cols
+
+    def clear(self):
+        self.spreadsheet.calls['clear'] += 1
+        self.spreadsheet.cleared.append(self.title)
+
+
+class _FakeSpreadsheet:
+    def __init__(self, name, titles=()):
+        self.id = f'id-{name}'
+        self.calls = Counter()
+        self.cleared = []
+        self.tabs = {title: _FakeWorksheet(self, title, 100, 20) for title in titles}
+
+    def worksheets(self):
+        self.calls['metadata'] += 1
+        return list(self.tabs.values())
+
+    def add_worksheet(self, title, rows, cols):
+        self.calls['add_worksheet'] += 1
+        self.tabs[title] = _FakeWorksheet(self, title, rows, cols)
+        return self.tabs[title]
+
+    def values_batch_clear(self, body):
+        self.calls['batch_clear'] += 1
+        self.cleared.extend(r.strip("'").replace("''", "'") for r in body['ranges'])
+
+    def batch_update(self, body):
+        self.calls['batch_update'] += 1
+        for request in body['requests']:
+            props = request['addSheet']['properties']
+            grid = props['gridProperties']
+            self.tabs[props['title']] = _FakeWorksheet(self, props['title'], grid['rowCount'], grid['columnCount'])
+
+
+class _FakeClient:
+    def __init__(self):
+        self.opens = 0
+        self.sheets = {'Financial Models': _FakeSpreadsheet('fm', ['Assumptions', "Bob's Tab"])}
+
+    def open(self, name):
+        self.opens += 1
+        return self.sheets[name]
+
+
+def test_cached_clients_and_batched_worksheets():
+    """Auth and open happen once; a multi-tab model needs one clear and one create batch"""
+    print("🔍 Testing Google client manager...")
+
+    loads, client = [], _FakeClient()
+    manager = GoogleClientManager('creds.json',
+                                  credentials_loader=lambda path, scopes: loads.append((path, scopes)) or object(),
+                                  authorize=lambda credentials: client)
+
+    for _ in range(3):
+        sh = manager.open('Financial Models')
+    assert len(loads) == 1 and client.opens == 1
+
+    tabs = manager.prepare_worksheets(sh, [('Assumptions', 20, 4), "Bob's Tab", ('LBO Model', 50, 15),
+                                           ('Company Selector', 10, 5)])
+    assert list(tabs) == ['Assumptions', "Bob's Tab", 'LBO Model', 'Company Selector']
+    assert sorted(sh.cleared) == ['Assumptions', "Bob's Tab"]
+    assert (tabs['LBO Model'].rows, tabs['LBO Model'].cols) == (50, 15)
+    assert sh.calls == Counter({'metadata': 2, 'batch_clear': 1, 'batch_update': 1})
+
+    # Later lookups reuse the cached metadata: one clear, no metadata fetch
+    ws = manager.worksheet(sh, 'LBO Model')
+    assert ws is tabs['LBO Model'] and sh.calls['metadata'] == 2 and sh.calls['clear'] == 1
+    manager.worksheet(sh, 'New Tab', 30, 10)
+    assert sh.calls['add_worksheet'] == 1 and sh.calls['metadata'] == 2
+
+    # A second model build on the same sheet: nothing to create, one batched clear
+    manager.prepare_worksheets(sh, ['Assumptions', 'New Tab'])
+    assert sh.calls['batch_update'] == 1 and sh.calls['batch_clear'] == 2 and sh.calls['metadata'] == 2
+    print("   ✅ Google client manager working")
+
+
+if __name__ == "__main__":
+    test_cached_clients_and_batched_worksheets()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized LBO returns engine against the scalar LBO model
+"""
+
+import io
+import time
+import contextlib
+
+import numpy as np
+
+from finance_kernel import irr
+from lbo_returns_engine import run_lbo_grid
+from professional_lbo_model import ProfessionalLBOModel
+
+
+def _sample_assumptions():
+    model = ProfessionalLBOModel("TechCorp Inc.", "TECH")
+    with contextlib.redirect_stdout(io.StringIO()):
+        return model._create_transaction_assumptions(
+            300.0, 12.0, 13.0, 14.5, 11.5, 0.55, 0.10, 0.35, 0.015,
+            0.06, 7, 0.08, 0.11, 8, 0.05,
+            [0.12, 0.10, 0.08, 0.06, 0.04, 0.03], 0.32, 0.055, 0.025, 0.24, 0.075,
+            10.0, 5.0, 6
+        )
+
+
+def test_vectorized_irr():
+    """IRR solver matches known answers and flags streams without a root"""
+    print("🔍 Testing vectorized IRR...")
+
+    result = irr([[-100, 10, 10, 110], [-100, 0, 0, 0], [-100, 0, 0, 133.1]])
+
+    assert abs(result[0] - 0.10) < 1e-9
+    assert np.isnan(result[1])
+    assert abs(result[2] - 0.10) < 1e-9
+    print("   ✅ IRR solver working")
+
+
+def test_grid_matches_scalar_debt_schedule():
+    """Base cell reproduces the scalar debt schedule, prepayments included"""
+    print("🔍 Testing grid debt schedule...")
+
+    model = ProfessionalLBOModel("TechCorp Inc.", "TECH")
+    assumptions = _sample_assumptions()
+    with contextlib.redirect_stdout(io.StringIO()):
+        debt = model._create_debt_schedule(assumptions, model._create_operating_forecast(assumptions))
+    grid = run_lbo_grid(assumptions)
+    schedule = grid['schedule']
+
+    # The scalar schedule lists opening balances; the grid records closing ones
+    assert np.allclose(schedule['senior_balance'][0, 0, 0, 0], debt['senior_balance'][1:])
+    assert np.allclose(schedule['mezz_balance'][0, 0, 0, 0], debt['mezz_balance'][1:])
+    assert np.allclose(schedule['interest'][0, 0, 0, 0], debt['total_interest'][:-1])
+    assert np.allclose(schedule['mandatory'][0, 0, 0, 0] + schedule['optional'][0, 0, 0, 0],
+                       debt['total_debt_paydown'][:-1])
+    assert np.isclose(grid['exit_debt'][0, 0, 0, 0], debt['total_debt_balance'][-1])
+
+    print("   ✅ Debt schedule matches")
+
+
+def test_base_cell_matches_model_returns():
+    """The Sensitivity sheet's base cell equals the model's own base-case IRR and MOIC"""
+    print("🔍 Testing base cell against _calculate_returns...")
+
+    model = ProfessionalLBOModel("TechCorp Inc.", "TECH")
+    for prepay in ({}, {'optional_prepay_senior': 0.0, 'optional_prepay_mezz': 0.0}):
+        assumptions = dict(_sample_assumptions(), **prepay)
+        with contextlib.redirect_stdout(io.StringIO()):
+            forecast = model._create_operating_forecast(assumptions)
+            exit_analysis = model._create_exit_analysis(
+                assumptions, forecast, model._create_debt_schedule(assumptions, forecast))
+            returns = model._calculate_returns(assumptions, exit_analysis)
+            sensitivity = model._create_sensitivity_analysis(assumptions)
+
+        grid = run_lbo_grid(assumptions)
+        assert np.isclose(grid['equity_investment'][0, 0, 0, 0], returns['equity_investment'])
+        assert np.isclose(grid['exit_equity'][0, 0, 0, 0], exit_analysis['exit_equity_base'])
+        assert np.isclose(grid['irr'][0, 0, 0, 0], returns['irr_base'])
+        assert np.isclose(grid['moic'][0, 0, 0, 0], returns['moic_base'])
+        assert grid['hold_years'] == returns['investment_period']
+
+        # The same cell as it lands in the IRR table (entry 12.0x, exit 13.0x)
+        row = list(sensitivity['entry_multiples']).index(assumptions['entry_multiple'])
+        col = list(sensitivity['exit_multiples']).index(assumptions['exit_multiple_base'])
+        assert np.isclose(sensitivity['irr_sensitivity'][row][col], returns['irr_base'])
+
+    # With no scheduled paydown the excess cash accumulates, and a sweep puts it into the debt
+    bullet = dict(assumptions, senior_amort_pct=0.0, mezz_amort_pct=0.0)
+    swept = run_lbo_grid(bullet, cash_sweep_pct=1.0)
+    assert np.isclose(run_lbo_grid(bullet)['exit_debt'][0, 0, 0, 0], bullet['total_debt'])
+    assert swept['exit_debt'][0, 0, 0, 0] < bullet['total_debt']
+    assert swept['moic'][0, 0, 0, 0] > run_lbo_grid(bullet)['moic'][0, 0, 0, 0]
+    print(f"   ✅ Base cell: {returns['irr_base']:.1%} IRR | {returns['moic_base']:.2f}x MOIC")
+
+
+def test_grid_speed_and_consistency():
+    """A 20x20x10 grid runs in under a second with consistent returns"""
+    print("🔍 Testing 20x20x10 grid...")
+
+    assumptions = _sample_assumptions()
+    start = time.perf_counter()
+    grid = run_lbo_grid(
+        assumptions,
+        entry_multiples=np.linspace(8.0, 13.0, 20),
+        exit_multiples=np.linspace(9.0, 14.0, 20),
+        leverage_ratios=np.linspace(1.0, 6.0, 10),
+        cash_sweep_pct=1.0
+    )
+    elapsed = time.perf_counter() - start
+
+    assert grid['irr'].shape == (20, 20, 10, 1)
+    assert elapsed < 1.0
+
+    # No interim distributions, so IRR must equal the MOIC-implied CAGR
+    implied = grid['moic'] ** (1.0 / grid['hold_years']) - 1
+    assert np.allclose(grid['irr'], implied, equal_nan=True)
+
+    # Higher exit multiples never lower returns
+    assert np.all(np.diff(grid['moic'], axis=1) >= -1e-12)
+    print(f"   ✅ Grid solved in {elapsed*1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_vectorized_irr()
+    test_grid_matches_scalar_debt_schedule()
+    test_base_cell_matches_model_returns()
+    test_grid_speed_and_consistency()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized merger kernel against the scalar ProfessionalMergerModel math
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from merger_model_kernel import evaluate_merger_pairs, rank_merger_pairs
+from professional_merger_model import ProfessionalMergerModel
+
+DEAL_GRIDS = [
+    {},
+    {'premium_pct': 0.15, 'cash_pct': 0.0, 'stock_pct': 1.0},
+    {'premium_pct': 0.45, 'cash_pct': 0.5, 'stock_pct': 0.2, 'debt_pct': 0.3, 'new_debt_interest_rate': 0.07},
+    {'cost_synergies_pct': 0.10, 'one_time_costs': 0.0, 'tax_rate': 0.21, 'intangible_amortization_years': 5},
+]
+
+
+def company_table(n=6, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'ticker': [f'C{i}' for i in range(n)],
+        'share_price': rng.uniform(10, 200, n),
+        'shares_outstanding': rng.uniform(50, 2000, n),
+        'eps': np.append(rng.uniform(-1, 8, n - 1), 0.0),  # one company with zero EPS
+        'net_debt': rng.uniform(-500, 3000, n),
+        'revenue': rng.uniform(500, 20000, n),
+        'ebitda': rng.uniform(50, 5000, n),
+        'depreciation': rng.uniform(10, 800, n),
+    })
+
+
+def scalar_pair(acquirer, target, terms, offer_price):
+    """One pair through the model's own step methods (no workbook)"""
+    model = ProfessionalMergerModel()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assumptions = model._create_assumptions(
+            acquirer['share_price'], acquirer['shares_outstanding'], acquirer['eps'],
+            target['share_price'], target['shares_outstanding'], target['net_debt'], target['eps'],
+            offer_price, terms['premium_pct'], terms['cash_pct'], terms['stock_pct'], terms['debt_pct'],
+            terms['revenue_synergies'], terms['cost_synergies_pct'], terms['one_time_costs'],
+            terms['new_debt_interest_rate'], terms['foregone_cash_yield'], terms['transaction_fees_pct'],
+            terms['intangible_amortization_years'], terms['tax_rate'],
+            acquirer['revenue'] + target['revenue'], acquirer['ebitda'] + target['ebitda'],
+            acquirer['depreciation'] + target['depreciation'], terms['tax_rate'])
+        adjustments = model._create_pro_forma_adjustments(assumptions)
+        financials = model._build_pro_forma_financials(assumptions, adjustments)
+        accretion = model._calculate_accretion_dilution(assumptions, financials)
+    return assumptions, financials, accretion
+
+
+def test_kernel_matches_scalar_model():
+    """Every pair of every deal grid matches the scalar model"""
+    print("🔍 Testing merger kernel against the scalar model...")
+    table = company_table()
+    checked = 0
+    for grid in DEAL_GRIDS:
+        results = evaluate_merger_pairs(table, **grid)
+        terms = results['deal_terms']
+        for i, acq_ticker in enumerate(results['acquirers']):
+            for j, tgt_ticker in enumerate(results['targets']):
+                if acq_ticker == tgt_ticker:
+                    assert np.isnan(results['accretion_dilution_pct'][i, j])
+                    continue
+                acquirer = table.set_index('ticker').loc[acq_ticker]
+                target = table.set_index('ticker').loc[tgt_ticker]
+                assumptions, financials, accretion = scalar_pair(
+                    acquirer, target, terms, results['offer_price_per_share'][i, j])
+
+                assert np.isclose(results['equity_purchase_price'][i, j], assumptions['equity_purchase_price'])
+                assert np.isclose(results['enterprise_value'][i, j], assumptions['enterprise_value'])
+                assert np.isclose(results['new_shares_issued'][i, j], assumptions['new_shares_issued'])
+                assert np.isclose(results['pro_forma_net_income'][i, j], financials['net_income'])
+                assert np.isclose(results['pro_forma_eps'][i, j], financials['eps'])
+                assert np.isclose(results['accretion_dilution_pct'][i, j], accretion['accretion_dilution_pct'])
+                checked += 1
+    assert checked == len(DEAL_GRIDS) * 6 * 5
+    print(f"✅ {checked} pairs match across {len(DEAL_GRIDS)} deal grids")
+
+
+def test_ranking_excludes_self_pairs():
+    """Ranked pairs are ordered by accretion and never pair a company with itself"""
+    print("🔍 Testing pair ranking...")
+    ranked = rank_merger_pairs(evaluate_merger_pairs(company_table(), acquirers=['C0', 'C1']))
+    assert (ranked['acquirer'] != ranked['target']).all()
+    assert set(ranked['acquirer']) == {'C0', 'C1'}
+    assert np.isfinite(ranked['accretion_dilution_pct']).all()
+    assert ranked['accretion_dilution_pct'].is_monotonic_decreasing
+    print(f"✅ {len(ranked)} pairs ranked")
+
+
+def test_ranking_drops_acquirers_without_positive_eps():
+    """Zero- and negative-EPS acquirers (inf or sign-flipped %) never reach the ranking"""
+    print("🔍 Testing ranking with zero and negative EPS acquirers...")
+    table = company_table()
+    table.loc[4, 'eps'] = -2.0   # C5 already has zero EPS
+    results = evaluate_merger_pairs(table)
+    assert np.isinf(results['accretion_dilution_pct'][5]).any()
+
+    ranked = rank_merger_pairs(results)
+    assert not set(ranked['acquirer']) & {'C4', 'C5'}
+    assert (ranked['standalone_eps'] > 0).all()
+    assert np.isfinite(ranked['accretion_dilution_pct']).all()
+    assert ranked['accretion_dilution_pct'].is_monotonic_decreasing
+    assert len(rank_merger_pairs(results, top_k=3)) == 3
+    print(f"✅ {len(ranked)} pairs ranked without degenerate acquirers")
+
+
+if __name__ == "__main__":
+    test_kernel_matches_scalar_model()
+    test_ranking_excludes_self_pairs()
+    test_ranking_drops_acquirers_without_positive_eps()
+    print("🎉 Merger kernel tests passed")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test incremental recalculation through the model computation graph
+"""
+
+import io
+import os
+import sys
+import contextlib
+import tempfile
+
+from openpyxl import load_workbook
+
+from model_graph import ComputationGraph
+from professional_lbo_model import ProfessionalLBOModel
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'financial-models-app', 'backend'))
+from custom_inputs_module import update_lbo_model  # noqa: E402
+
+
+def test_key_level_dependencies_and_early_cutoff():
+    """Only nodes reading a changed key are recomputed"""
+    print("🔍 Testing computation graph...")
+
+    calls = []
+    graph = ComputationGraph()
+    graph.add_input('margin', 0.30)
+    graph.add_input('tax_rate', 0.25)
+    graph.add_node('assumptions', lambda m, t: {'margin': m, 'tax_rate': t}, ['margin', 'tax_rate'])
+    graph.add_node('ebitda', lambda a: calls.append('ebitda') or 1000 * a['margin'], ['assumptions'],
+                   keys={'assumptions': ['margin']})
+    graph.add_node('taxes', lambda a, e: calls.append('taxes') or e * a['tax_rate'], ['assumptions', 'ebitda'])
+
+    assert graph.get('taxes') == 75.0
+    calls.clear()
+
+    graph.set_input('tax_rate', 0.20)
+    changed = graph.recompute()
+    assert calls == ['taxes']
+    assert 'ebitda' not in changed
+
+    # Setting the same value again is a no-op
+    graph.set_input('tax_rate', 0.20)
+    assert graph.recompute() == set()
+    print("   ✅ Graph working")
+
+
+def test_lbo_recalculate_rewrites_only_affected_sheets():
+    """Changing a bull-case exit multiple leaves the debt and forecast tabs alone"""
+    print("🔍 Testing LBO incremental recalculation...")
+
+    model = ProfessionalLBOModel("TechCorp Inc.", "TECH")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(tmp)
+        try:
+            graph = model.build_computation_graph()
+            results, excel_file = model.run_lbo_model()
+            model.recalculate(graph, {})
+
+            before = graph.stats['recomputed']
+            results, sheets = model.recalculate(graph, {'exit_multiple_bull': 14.0}, excel_file)
+
+            assert set(sheets) == {'Assumptions', 'Exit & Returns', 'Summary'}
+            assert graph.stats['recomputed'] - before == 3  # assumptions, exit, returns
+            assert results['exit_analysis']['exit_multiple_bull'] == 14.0
+            assert load_workbook(excel_file).sheetnames[5] == 'Exit & Returns'
+        finally:
+            os.chdir(cwd)
+    print("   ✅ Incremental recalculation working")
+
+
+def test_custom_inputs_recompute_only_dependents():
+    """A custom tax rate recomputes the steps that read it and rewrites only their tabs"""
+    print("🔍 Testing custom inputs through the LBO graph...")
+
+    model = ProfessionalLBOModel("TechCorp Inc.", "TECH")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(tmp)
+        try:
+            graph = model.build_computation_graph()
+            _, excel_file = model.run_lbo_model()
+            debt_schedule = graph.get('debt_schedule')
+            before = graph.stats['recomputed']
+
+            results, sheets = update_lbo_model(model, graph, {'Tax Rate': '20%', 'Gross Margin': '55%'},
+                                               excel_file)
+            assert graph.stats['recomputed'] - before == 4  # assumptions, forecast, waterfall, sensitivity
+            # Taxes do not move the returns grid, so its tab is left alone
+            assert set(sheets) == {'Assumptions', 'Operating Forecast', 'Cash Flow Waterfall', 'Summary'}
+            assert results['assumptions']['tax_rate'] == 0.20
+            assert graph.get('debt_schedule') is debt_schedule  # untouched
+
+            # A list input: only the overridden year changes
+            results, sheets = update_lbo_model(model, graph, {'Revenue Growth Year 2': 0.09})
+            assert results['assumptions']['revenue_growth'][:3] == [0.08, 0.09, 0.05]
+            assert 'Exit & Returns' in sheets
+
+            # The same inputs again change nothing
+            assert update_lbo_model(model, graph, {'Revenue Growth Year 2': '9%'})[1] == []
+        finally:
+            os.chdir(cwd)
+    print("   ✅ Custom inputs recalculated incrementally")
+
+
+if __name__ == "__main__":
+    test_key_level_dependencies_and_early_cutoff()
+    test_lbo_recalculate_rewrites_only_affected_sheets()
+    test_custom_inputs_recompute_only_dependents()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the model manifest: sidecars, stale detection, output deltas and re-indexing
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from model_manifest import (ModelManifest, compare_outputs, input_hash, read_sidecar, record_artifact,
+                            sidecar_path)
+
+
+def _artifact(directory, name):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(b'workbook')
+    return path
+
+
+def test_stale_detection_and_deltas():
+    """Only models whose inputs changed are stale; deltas come from stored outputs"""
+    print("🔍 Testing model manifest...")
+
+    assert input_hash({'a': 1, 'b': [1.0, 2.0]}) == input_hash({'b': (1.0, 2.0), 'a': 1})
+    assert input_hash({'a': 1}) != input_hash({'a': 2})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = ModelManifest(os.path.join(tmp, 'manifest.json'))
+        inputs = {ticker: {'ticker': ticker, 'base_revenue': 100.0 + i} for i, ticker in enumerate(['AAPL', 'MSFT', 'NVDA'])}
+        for ticker, data in inputs.items():
+            record_artifact(_artifact(tmp, f'{ticker}_v1.xlsx'), ticker, 'professional_dcf', data,
+                            outputs={'wacc': 0.08, 'base_revenue': data['base_revenue']},
+                            company_name=f'{ticker} Inc', generator='professional_dcf_template', manifest=manifest)
+
+        assert len(manifest) == 3
+        assert read_sidecar(os.path.join(tmp, 'MSFT_v1.xlsx'))['ticker'] == 'MSFT'
+
+        # MSFT's revenue changed upstream; NVDA's data is unavailable today
+        current = {('AAPL', 'professional_dcf'): input_hash(inputs['AAPL']),
+                   ('MSFT', 'professional_dcf'): input_hash({**inputs['MSFT'], 'base_revenue': 150.0})}
+        stale = manifest.stale(current)
+        assert [entry['ticker'] for entry in stale] == ['MSFT']
+        print("✅ Only the model with changed inputs is stale")
+
+        time.sleep(0.01)
+        new = record_artifact(_artifact(tmp, 'MSFT_v2.xlsx'), 'MSFT', 'professional_dcf',
+                              {**inputs['MSFT'], 'base_revenue': 150.0},
+                              outputs={'wacc': 0.08, 'base_revenue': 150.0}, company_name='MSFT Inc',
+                              generator='professional_dcf_template', manifest=manifest)
+        assert manifest.stale(current) == []
+        assert manifest.latest()[('MSFT', 'professional_dcf')]['filename'] == 'MSFT_v2.xlsx'
+
+        deltas = compare_outputs(manifest.previous(new)['outputs'], new['outputs'])
+        assert deltas['base_revenue']['change'] == 49.0
+        assert abs(deltas['base_revenue']['pct_change'] - 49.0 / 101.0) < 1e-12
+        assert deltas['wacc']['change'] == 0.0
+        print("✅ Output deltas come from the stored outputs")
+
+        # The manifest survives a reload and can be rebuilt from the sidecars alone
+        assert len(ModelManifest(manifest.path)) == 4
+        os.remove(os.path.join(tmp, 'AAPL_v1.xlsx'))
+        os.remove(manifest.path)
+        rebuilt = ModelManifest(manifest.path)
+        assert len(rebuilt) == 0
+        assert rebuilt.rebuild(tmp) == 3
+        assert sorted(e['filename'] for e in rebuilt.entries()) == ['MSFT_v1.xlsx', 'MSFT_v2.xlsx', 'NVDA_v1.xlsx']
+        assert os.path.exists(sidecar_path(os.path.join(tmp, 'NVDA_v1.xlsx')))
+        print("✅ Manifest rebuilt from sidecars")
+
+
+def test_writers_in_other_processes_are_merged():
+    """Two manifest objects on one file (the web app and the updater) keep each other's entries"""
+    print("🔍 Testing concurrent manifest writers...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'manifest.json')
+        web, updater = ModelManifest(path), ModelManifest(path)
+
+        record_artifact(_artifact(tmp, 'AAPL.xlsx'), 'AAPL', 'dcf', {'a': 1}, manifest=web)
+        record_artifact(_artifact(tmp, 'MSFT.xlsx'), 'MSFT', 'dcf', {'b': 2}, manifest=updater)
+        assert len(ModelManifest(path)) == 2
+        assert web.get(os.path.join(tmp, 'MSFT.xlsx'))['ticker'] == 'MSFT'  # read picks up the other writer
+
+        def write(manifest, prefix):
+            for i in range(20):
+                record_artifact(_artifact(tmp, f'{prefix}{i}.xlsx'), prefix, 'dcf', {'i': i}, manifest=manifest)
+
+        threads = [threading.Thread(target=write, args=(web, 'WEB')),
+                   threading.Thread(target=write, args=(updater, 'UPD'))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(ModelManifest(path)) == 42
+
+        updater.remove([os.path.join(tmp, 'AAPL.xlsx')])
+        assert web.get(os.path.join(tmp, 'AAPL.xlsx')) is None and len(web) == 41
+    print("✅ No entries lost between writers")
+
+
+if __name__ == "__main__":
+    test_stale_detection_and_deltas()
+    test_writers_in_other_processes_are_merged()
+    print("🎉 Model manifest tests passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized option pricing engine: Black-Scholes, binomial trees, Monte Carlo ESOs
+"""
+
+import numpy as np
+import pandas as pd
+
+from option_pricing import binomial_price, black_scholes, monte_carlo_option, price_option_book
+
+
+def test_black_scholes_and_binomial():
+    """Textbook prices, parity, Greeks vs finite differences and tree convergence"""
+    print("🔍 Testing Black-Scholes and binomial pricing...")
+
+    call = black_scholes(100, 100, 1.0, 0.05, 0.20, 0.0, 'call')
+    put = black_scholes(100, 100, 1.0, 0.05, 0.20, 0.0, 'put')
+    assert abs(float(call['price']) - 10.4506) < 1e-3
+    assert abs(float(put['price']) - 5.5735) < 1e-3
+    print(f"✅ Call {float(call['price']):.4f}, put {float(put['price']):.4f}")
+
+    # Put-call parity with a dividend yield, vectorized over strikes
+    strikes = np.linspace(60, 140, 41)
+    c = black_scholes(100, strikes, 0.75, 0.04, 0.3, 0.02, 'call')['price']
+    p = black_scholes(100, strikes, 0.75, 0.04, 0.3, 0.02, 'put')['price']
+    parity = 100 * np.exp(-0.02 * 0.75) - strikes * np.exp(-0.04 * 0.75)
+    assert np.allclose(c - p, parity, atol=1e-8)
+
+    h = 1e-4
+    base = black_scholes(105, 100, 0.5, 0.03, 0.25, 0.01, 'call')
+    up = black_scholes(105 + h, 100, 0.5, 0.03, 0.25, 0.01, 'call')['price']
+    down = black_scholes(105 - h, 100, 0.5, 0.03, 0.25, 0.01, 'call')['price']
+    assert abs((up - down) / (2 * h) - base['delta']) < 1e-5
+    assert abs((up - 2 * base['price'] + down) / h ** 2 - base['gamma']) < 1e-3
+    vega = (black_scholes(105, 100, 0.5, 0.03, 0.25 + h, 0.01, 'call')['price'] - base['price']) / h / 100
+    assert abs(vega - base['vega']) < 1e-4
+    print("✅ Parity and Greeks agree with finite differences")
+
+    european = binomial_price(100, 100, 1.0, 0.05, 0.20, 0.0, 'call', steps=500, american=False)
+    assert abs(float(european) - float(call['price'])) < 0.01
+    american_put = binomial_price(100, 100, 1.0, 0.05, 0.20, 0.0, 'put', steps=500, american=True)
+    assert float(american_put) > float(put['price'])
+    assert abs(float(american_put) - 6.09) < 0.01
+    american_call = binomial_price(100, 100, 1.0, 0.05, 0.20, 0.0, 'call', steps=500, american=True)
+    assert abs(float(american_call) - float(european)) < 1e-8
+
+    # Mixed option types broadcast across a batch
+    batch = binomial_price([90, 100, 110], 100, 1.0, 0.05, 0.2, 0.0, ['call', 'put', 'call'], steps=200)
+    assert batch.shape == (3,)
+    print(f"✅ American put {float(american_put):.4f} (early exercise premium "
+          f"{float(american_put) - float(put['price']):.4f})")
+
+
+def test_monte_carlo_and_option_book():
+    """Plain MC matches Black-Scholes; vesting, exits, early exercise and dilution lower value"""
+    print("🔍 Testing Monte Carlo ESO and warrant valuation...")
+
+    bs = float(black_scholes(50, 50, 2.0, 0.04, 0.35, 0.0, 'call')['price'])
+    plain = monte_carlo_option(50, 50, 2.0, 0.04, 0.35, paths=20000, seed=1)
+    assert abs(float(plain['value']) - bs) < 3 * float(plain['std_error'])
+    assert abs(float(plain['expected_life']) - 2.0) < 1e-9
+
+    eso = monte_carlo_option(50, 50, 5.0, 0.04, 0.35, vesting=1.0, exit_rate=0.1,
+                             exercise_multiple=2.0, paths=20000, seed=1)
+    assert float(eso['value']) < float(black_scholes(50, 50, 5.0, 0.04, 0.35)['price'])
+    assert float(eso['expected_life']) < 5.0
+
+    diluted = monte_carlo_option(50, 50, 2.0, 0.04, 0.35, shares_outstanding=900, new_shares=100,
+                                 paths=20000, seed=1)
+    assert abs(float(diluted['value']) - 0.9 * float(plain['value'])) < 1e-9
+    print(f"✅ BS {bs:.4f}, MC {float(plain['value']):.4f}, ESO {float(eso['value']):.4f}")
+
+    book = pd.DataFrame({
+        'spot': [100, 100, 100, 100],
+        'strike': [100, 100, 100, 120],
+        'maturity': [1.0, 1.0, 4.0, 3.0],
+        'rate': 0.05,
+        'volatility': 0.2,
+        'option_type': ['call', 'put', 'call', 'call'],
+        'style': ['european', 'American', 'eso', 'warrant'],
+        'quantity': [10, 10, 1000, 500],
+        'vesting': [None, None, 1.0, None],
+        'exit_rate': [None, None, 0.05, None]
+    })
+    priced = price_option_book(book, paths=5000, shares_outstanding=10000)
+    assert abs(priced.loc[0, 'unit_value'] - 10.4506) < 1e-3
+    assert priced.loc[1, 'unit_value'] > 5.5735
+    assert priced.loc[2, 'unit_value'] < priced.loc[2, 'spot']
+    assert np.allclose(priced['total_value'], priced['unit_value'] * priced['quantity'])
+    assert priced[['delta', 'gamma', 'vega', 'theta', 'rho']].notna().all().all()
+
+    try:
+        price_option_book(book.assign(option_type=['call', 'put', 'Put', 'call']), paths=100)
+        raise AssertionError('an ESO put should be rejected')
+    except ValueError as e:
+        assert 'rows [2]' in str(e)
+    print(f"✅ Option book total value {priced['total_value'].sum():,.2f}")
+
+
+if __name__ == "__main__":
+    test_black_scholes_and_binomial()
+    test_monte_carlo_and_option_book()
+    print("🎉 Option pricing tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test nearest-neighbour peer discovery
+"""
+
+import random
+import time
+
+from peer_discovery import PeerDiscovery, PeerIndex, profile_from_info
+
+
+def _universe(n=2000, seed=7):
+    rng = random.Random(seed)
+    sectors = ['Technology', 'Financial Services', 'Healthcare', 'Energy', 'Industrials']
+    companies = []
+    for i in range(n):
+        revenue = 10 ** rng.uniform(8, 11.5)
+        companies.append({
+            'ticker': f'C{i}', 'name': f'Company {i}', 'sector': rng.choice(sectors),
+            'market_cap': revenue * rng.uniform(1, 8), 'revenue': revenue,
+            'revenue_growth': rng.gauss(0.08, 0.1), 'ebitda': revenue * rng.uniform(0.05, 0.4),
+            'net_income': revenue * rng.uniform(-0.1, 0.25), 'total_debt': revenue * rng.uniform(0, 1),
+            'beta': rng.uniform(0.5, 2.0)
+        })
+    return companies
+
+
+def test_top_k_matches_brute_force():
+    """Query results are the exact k nearest by feature distance"""
+    print("🔍 Testing peer index...")
+    index = PeerIndex().build(_universe())
+
+    start = time.time()
+    peers = index.query('C0', k=10)
+    elapsed_ms = (time.time() - start) * 1000
+
+    target = index.vector({'ticker': 'C0'})
+    distances = sorted(
+        (float(((index.vector({'ticker': f'C{i}'}) - target) ** 2).sum() ** 0.5), f'C{i}')
+        for i in range(1, 2000))
+    assert [p['ticker'] for p in peers] == [ticker for _, ticker in distances[:10]]
+    assert peers == sorted(peers, key=lambda p: p['distance'])
+    assert elapsed_ms < 100
+    print(f"   ✅ Top-10 peers in {elapsed_ms:.1f} ms")
+
+
+def test_sector_and_size_drive_similarity():
+    """A same-sector company of similar size ranks above a different-sector twin"""
+    base = {'market_cap': 5e10, 'revenue': 1e10, 'revenue_growth': 0.1, 'ebitda': 2.5e9,
+            'net_income': 1.5e9, 'total_debt': 3e9, 'beta': 1.1}
+    index = PeerIndex().build(_universe(200) + [
+        {**base, 'ticker': 'TGT', 'sector': 'Technology'},
+        {**base, 'ticker': 'SAME', 'sector': 'Technology', 'market_cap': 6e10},
+        {**base, 'ticker': 'OTHER', 'sector': 'Energy'},
+        {**base, 'ticker': 'SMALL', 'sector': 'Technology', 'market_cap': 5e7, 'revenue': 1e7},
+    ])
+    ranked = [p['ticker'] for p in index.query('TGT', k=len(index) - 1)]
+    assert ranked[0] == 'SAME'
+    assert ranked.index('SAME') < ranked.index('OTHER')
+    assert all(p['sector'] == 'Technology' for p in index.query('TGT', k=20, same_sector=True))
+
+
+def test_incremental_updates():
+    """Upserts rewrite rows in place, removals drop out of results, new sectors refit"""
+    index = PeerIndex().build(_universe(500))
+    index.upsert([{'ticker': 'C1', 'sector': 'Technology', 'revenue': 1e9, 'market_cap': 4e9}])
+    assert len(index) == 500 and index.profiles[index.rows['C1']]['revenue'] == 1e9
+
+    index.remove(['C2'])
+    assert 'C2' not in index
+    assert all(p['ticker'] != 'C2' for p in index.query('C3', k=499))
+
+    index.upsert([{'ticker': 'NEW', 'sector': 'Utilities', 'revenue': 1e9, 'market_cap': 2e9}])
+    assert index.query('NEW', k=1)[0]['ticker'] != 'NEW'
+
+
+def test_discovery_builds_profiles_from_gateway():
+    """PeerDiscovery pulls Yahoo info through the gateway and adds unknown targets"""
+
+    class FakeGateway:
+        def fetch_many(self, tickers, statements):
+            return {t.upper(): {'info': {'longName': f'{t} Corp', 'sector': 'Technology',
+                                         'marketCap': 1e9 * (i + 1), 'totalRevenue': 2e8 * (i + 1),
+                                         'ebitdaMargins': 0.2, 'beta': 1.0}}
+                    for i, t in enumerate(tickers)}
+
+    discovery = PeerDiscovery.from_tickers(['AAA', 'BBB', 'CCC', 'DDD'], gateway=FakeGateway())
+    peers = discovery.find_peers('ZZZ', k=2)
+    assert len(peers) == 2 and 'ZZZ' in discovery.index
+    assert profile_from_info('x', {})['sector'] == 'Unknown'
+
+
+if __name__ == "__main__":
+    test_top_k_matches_brute_force()
+    test_sector_and_size_drive_similarity()
+    test_incremental_updates()
+    test_discovery_builds_profiles_from_gateway()
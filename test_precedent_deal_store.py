@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the indexed precedent deal store: import, filtered queries and model inputs
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from precedent_deal_store import PrecedentDealStore, load_sample_store
+
+
+def _synthetic_deals(n, seed=7):
+    rng = np.random.default_rng(seed)
+    ev = rng.uniform(50, 20000, n)
+    revenue = ev / rng.uniform(0.5, 6.0, n)
+    return pd.DataFrame({
+        'Announcement Date': pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.integers(0, 5000, n), unit='D'),
+        'Acquirer': [f'Buyer {i}' for i in range(n)],
+        'Target': [f'Target {i}' for i in range(n)],
+        'Industry': rng.choice(['Technology', 'Healthcare', 'Energy', 'Industrials'], n),
+        'Buyer Type': rng.choice(['Strategic', 'Private Equity'], n),
+        'Equity Value': ev * 0.8,
+        'EV': ev,
+        'Revenue': revenue,
+        'EBITDA': revenue * 0.2,
+        'Net Income': revenue * 0.1
+    })
+
+
+def test_import_and_filtered_queries():
+    """CSV import with aliased headers, indexed filters and summary statistics"""
+    print("🔍 Testing precedent deal store queries...")
+
+    deals = _synthetic_deals(5000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'deals.csv')
+        deals.to_csv(path, index=False)
+        store = PrecedentDealStore(os.path.join(tmp, 'deals.db'))
+        assert store.import_file(path) == 5000
+        assert store.import_file(path) == 5000 and store.count() == 5000  # re-import replaces
+
+        started = time.perf_counter()
+        comps = store.comparable_deals('technology', as_of='2020-06-30', years=3,
+                                       target_size=1000.0, buyer_type='sponsor')
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        expected = deals[(deals['Industry'] == 'Technology') & (deals['Buyer Type'] == 'Private Equity')
+                         & (deals['EV'] >= 500) & (deals['EV'] <= 2000)
+                         & (deals['Announcement Date'] >= pd.Timestamp('2017-07-01'))
+                         & (deals['Announcement Date'] <= pd.Timestamp('2020-06-30'))]
+        assert len(comps) == len(expected) > 0
+        assert comps['announced'].is_monotonic_increasing
+        assert set(comps['buyer_type']) == {'financial'}
+        np.testing.assert_allclose(comps['ev_revenue'].sort_values().to_numpy(),
+                                   (expected['EV'] / expected['Revenue']).sort_values().to_numpy())
+        assert elapsed_ms < 50, f"comparable_deals took {elapsed_ms:.1f}ms"
+
+        recent = store.deals(sector='Energy', limit=10)
+        assert len(recent) == 10
+        assert recent['announced'].iloc[-1] == store.deals(sector='Energy')['announced'].iloc[-1]
+
+        stats = store.summary(sector='Healthcare')
+        healthcare = deals[deals['Industry'] == 'Healthcare']
+        assert abs(stats['ev_ebitda']['median'] - np.median(healthcare['EV'] / healthcare['EBITDA'])) < 1e-6
+        store.close()
+    print(f"   ✅ Deal store queries working ({elapsed_ms:.2f}ms for a filtered comps query)")
+
+
+def test_sample_store_feeds_model_inputs():
+    """The bundled sample deals round-trip into the model's deal arguments"""
+    print("🔍 Testing deal store model inputs...")
+
+    store = load_sample_store()
+    inputs = store.model_inputs(sector='Technology')
+    assert inputs['deal_dates'] == ["2023-01-15", "2023-03-22", "2023-06-10", "2023-09-05", "2023-11-28"]
+    assert inputs['enterprise_values'] == [920.0, 1380.0, 690.0, 1725.0, 1035.0]
+    assert len(store.sectors()) == 6
+
+    table = store.multiples_table(sector='Energy', min_size=1000, max_size=2200)
+    assert list(table['enterprise_value']) == [1400.0, 2100.0, 1050.0, 1575.0]
+    assert list(table['ev_ebitda'].round(6)) == [round(1400 / 120, 6), round(2100 / 180, 6),
+                                                  round(1050 / 90, 6), round(1575 / 135, 6)]
+    store.close()
+    print("   ✅ Deal store model inputs working")
+
+
+if __name__ == "__main__":
+    test_import_and_filtered_queries()
+    test_sample_store_feeds_model_inputs()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test the progress event bus: context-bound emits, replay, blocking and async streams, SSE framing
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+from async_http import run_blocking, shutdown_executors
+from progress_events import ProgressBus, bind, emit, get_bus, parse_last_event_id, sse_format
+
+
+def fake_pipeline(ticker):
+    """Stands in for the backend pipeline: stages publish through emit() only"""
+    emit('data', 'Trying Yahoo Finance', status='started', source='yahoo_finance')
+    time.sleep(0.02)
+    emit('data', 'Yahoo Finance: data retrieved', status='ok', source='yahoo_finance')
+    emit('calculation', 'Calculating financial ratios', status='started')
+    emit('excel', 'Workbook saved', status='ok', filename=f'{ticker}_DCF.xlsx')
+    return {'success': True, 'ticker': ticker}
+
+
+def test_job_events_replay_and_stream():
+    """A background job streams live to one subscriber and replays to a late or reconnecting one"""
+    print("🔍 Testing progress bus...")
+    bus = ProgressBus()
+    assert emit('data', 'no job bound') is None
+
+    job_id = bus.create_job(ticker='ACME', model_type='dcf')
+    live = []
+    listener = threading.Thread(target=lambda: live.extend(bus.subscribe(job_id, heartbeat=0.01)))
+    listener.start()
+    time.sleep(0.05)   # idle: the subscriber gets heartbeats (None) meanwhile
+    bus.publish(job_id, 'data', 'Trying SEC EDGAR', status='started', source='sec_edgar')
+    bus.complete(job_id, {'success': True})
+    listener.join(timeout=2)
+    assert not listener.is_alive()
+
+    assert None in live
+    stages = [event['stage'] for event in live if event is not None]
+    assert stages == ['queued', 'data', 'complete']
+    print("✅ Live subscriber saw the job through to its terminal event")
+
+    # Pipeline emits reach the job bound to the thread that runs it
+    job_id = get_bus().create_job(ticker='ACME')
+    get_bus().run_in_thread(job_id, fake_pipeline, 'ACME').join(timeout=2)
+    events = list(get_bus().subscribe(job_id))
+    assert [event['stage'] for event in events] == ['queued', 'data', 'data', 'calculation', 'excel', 'complete']
+    assert [event['id'] for event in events] == [1, 2, 3, 4, 5, 6]
+    assert events[-1]['result'] == {'success': True, 'ticker': 'ACME'}
+    assert get_bus().snapshot(job_id)['status'] == 'complete'
+
+    # Reconnect with Last-Event-ID: only the missed events come back, the stream ends at the terminal one
+    resumed = list(get_bus().subscribe(job_id, last_event_id=parse_last_event_id('4')))
+    assert [event['id'] for event in resumed] == [5, 6]
+    assert list(get_bus().subscribe(job_id, last_event_id=6)) == []
+    assert get_bus().publish(job_id, 'data', 'late event') is None
+    print("✅ Late and reconnecting subscribers replay what they missed")
+
+    failing = get_bus().create_job()
+    get_bus().run_in_thread(failing, lambda: 1 / 0).join(timeout=2)
+    assert get_bus().snapshot(failing)['status'] == 'failed'
+    assert get_bus().snapshot('unknown') is None
+    assert list(get_bus().subscribe('unknown')) == []
+    print("✅ Failures end the stream with a 'failed' event")
+
+
+def test_async_stream_and_sse_framing():
+    """Async subscribers get events from pool threads; emits follow run_blocking into the pool"""
+    print("🔍 Testing async SSE stream...")
+    bus = get_bus()
+
+    async def main():
+        job_id = bus.create_job(ticker='ACME')
+
+        async def run():
+            with bind(job_id):
+                bus.complete(job_id, await run_blocking(fake_pipeline, 'ACME'))
+
+        frames = []
+        task = asyncio.create_task(run())
+        async for frame in bus.asse_stream(job_id, heartbeat=0.01):
+            frames.append(frame)
+        await task
+        return frames
+
+    frames = asyncio.run(main())
+    shutdown_executors()
+    assert frames[0].startswith('retry: ')
+    events = [json.loads(frame.split('data: ', 1)[1]) for frame in frames if frame.startswith('id: ')]
+    assert [event['stage'] for event in events] == ['queued', 'data', 'data', 'calculation', 'excel', 'complete']
+    assert events[-1]['result']['ticker'] == 'ACME'
+    assert all(frame.endswith('\n\n') for frame in frames)
+    assert sse_format(None) == ': keep-alive\n\n'
+    assert parse_last_event_id('abc') == 0 and parse_last_event_id(None) == 0
+    print(f"✅ {len(events)} events streamed as SSE frames")
+
+
+if __name__ == "__main__":
+    test_job_events_replay_and_stream()
+    test_async_stream_and_sse_framing()
+    print("🎉 Progress event tests passed")
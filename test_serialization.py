@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the pluggable serializers: codecs, array payloads, versioned envelopes and file helpers
+"""
+
+import os
+import tempfile
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import serialization
+from serialization import (SerializationError, get_serializer, open_envelope, pack, read_file,
+                           register_schema, unpack, write_file)
+
+
+def _payload():
+    return {
+        'ticker': 'AAPL',
+        'as_of': datetime(2025, 3, 31, 16, 0),
+        'projections': np.linspace(0, 1, 50).reshape(5, 10),
+        'sensitivity': np.arange(27, dtype=np.float32).reshape(3, 3, 3),
+        'wacc': np.float64(0.085),
+        'peers': ('MSFT', 'GOOGL')
+    }
+
+
+def test_json_codecs():
+    """Both JSON codecs handle arrays, numpy scalars and datetimes the old default=str choked on"""
+    print("🔍 Testing JSON codecs...")
+
+    for name in ('json', 'fast_json'):
+        codec = get_serializer(name)
+        decoded = codec.loads(codec.dumps(_payload()))
+        assert decoded['projections'] == np.linspace(0, 1, 50).reshape(5, 10).tolist()
+        assert decoded['sensitivity'][2][2][2] == 26.0
+        assert decoded['wacc'] == 0.085 and decoded['peers'] == ['MSFT', 'GOOGL']
+        assert decoded['as_of'].startswith('2025-03-31T16:00')
+        print(f"✅ {name}: {len(codec.dumps(_payload()))} bytes")
+
+    frame = pd.DataFrame({'year': [2024, 2025], 'revenue': [1.5, 2.5]})
+    assert get_serializer('fast_json').loads(get_serializer('fast_json').dumps({'table': frame})) == \
+        {'table': {'year': [2024, 2025], 'revenue': [1.5, 2.5]}}
+
+    with pytest.raises(SerializationError):
+        get_serializer('fast_json').loads(b'{not json')
+    with pytest.raises(ValueError):
+        get_serializer('yaml')
+
+
+def test_msgpack_round_trip():
+    """msgpack keeps dtypes, shapes, datetimes and DataFrames"""
+    pytest.importorskip('msgpack')
+    print("🔍 Testing msgpack codec...")
+
+    codec = get_serializer('msgpack')
+    frame = pd.DataFrame({'year': [2024, 2025], 'revenue': [1.5, 2.5]}, index=['a', 'b'])
+    decoded = codec.loads(codec.dumps({**_payload(), 'frame': frame, 'day': date(2025, 1, 2), 2025: 'int key'}))
+    assert decoded['sensitivity'].dtype == np.float32 and decoded['sensitivity'].shape == (3, 3, 3)
+    assert np.array_equal(decoded['projections'], np.linspace(0, 1, 50).reshape(5, 10))
+    assert decoded['as_of'] == datetime(2025, 3, 31, 16, 0) and decoded['day'] == date(2025, 1, 2)
+    assert decoded['frame'].equals(frame) and decoded[2025] == 'int key'
+
+    big = {'tensor': np.random.default_rng(0).normal(size=(50, 50, 50))}
+    assert len(codec.dumps(big)) < len(get_serializer('fast_json').dumps(big)) / 2
+    print("✅ msgpack round-trips arrays, datetimes and frames")
+
+
+def test_versioned_envelopes_and_files():
+    """Old payload versions are migrated on read; newer ones are rejected"""
+    print("🔍 Testing versioned schemas...")
+
+    register_schema('test_spec', 1)
+    v1 = pack('test_spec', {'growth': 5.0}, 'fast_json')
+
+    register_schema('test_spec', 3, migrations={
+        1: lambda data: {**data, 'growth': data['growth'] / 100},
+        2: lambda data: {**data, 'terminal_growth': 0.025}
+    })
+    assert unpack(v1, 'test_spec', 'fast_json') == {'growth': 0.05, 'terminal_growth': 0.025}
+    assert unpack(pack('test_spec', {'growth': 0.1}, 'json'), 'test_spec', 'json') == {'growth': 0.1}
+    # Bare payloads written before envelopes count as version 1
+    assert open_envelope({'growth': 2.0}, 'test_spec') == {'growth': 0.02, 'terminal_growth': 0.025}
+
+    future = serialization.envelope('test_spec', {})
+    future['__version__'] = 9
+    with pytest.raises(SerializationError):
+        open_envelope(future, 'test_spec')
+    with pytest.raises(SerializationError):
+        unpack(pack('model_spec', {}, 'json'), 'test_spec', 'json')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_file(os.path.join(tmp, 'out', 'spec.json'), {'growth': 0.1}, schema='test_spec')
+        assert path.read_text().startswith('{\n')
+        assert read_file(path, schema='test_spec') == {'growth': 0.1}
+        assert os.listdir(path.parent) == ['spec.json']
+    print("✅ Envelopes migrate across versions and files are written atomically")
+
+
+if __name__ == "__main__":
+    test_json_codecs()
+    test_msgpack_round_trip()
+    test_versioned_envelopes_and_files()
+    print("🎉 Serialization tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test delta sync of scraped grants against the fake Sheets backend
+"""
+
+import os
+import tempfile
+
+from sheet_sync import FakeSheetsService, GrantsSheetSync, SheetMirror, format_grant_row, get_mirror
+
+
+def _grant(i, amount=25000, **fields):
+    return dict({'url': f'https://example.com/grant-{i}', 'title': f'Grant {i}', 'amount': amount,
+                 'investors': ['HRF'], 'sector': 'development'}, **fields)
+
+
+def test_delta_sync_inserts_updates_and_reconciles():
+    """Only new and changed grants are written; the sheet is read only on reconcile"""
+    print("🔍 Testing sheet delta sync...")
+
+    service = FakeSheetsService()
+    service.sheets['Grants'] = {493: format_grant_row(_grant(0)), 494: format_grant_row(_grant(1))}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = SheetMirror(os.path.join(tmp, 'mirror.db'))
+        sync = GrantsSheetSync(service, 'sheet-id', mirror=mirror)
+
+        summary = sync.sync([_grant(0), _grant(1), _grant(2)])
+        assert summary == {'inserted': 1, 'updated': 0, 'unchanged': 2}
+        assert service.sheets['Grants'][495][0] == 'https://example.com/grant-2'
+        assert service.calls['get'] == 1 and service.calls['append'] == 1 and service.calls['batchUpdate'] == 0
+
+        # Steady state: no sheet read, one batched update plus one append of the delta only
+        summary = sync.sync([_grant(0), _grant(1, amount=50000), _grant(2), _grant(3), _grant(4)])
+        assert summary == {'inserted': 2, 'updated': 1, 'unchanged': 2}
+        assert service.calls['get'] == 1 and service.calls['batchUpdate'] == 1 and service.calls['append'] == 2
+        assert service.sheets['Grants'][494][3] == '$50.0K'
+        assert [service.sheets['Grants'][row][0][-1] for row in (496, 497)] == ['3', '4']
+
+        # Nothing changed: no request at all
+        sync.sync([_grant(3)])
+        assert service.calls['batchUpdate'] == 1 and service.calls['append'] == 2
+
+        # A row someone added since the last read is not overwritten by the next insert
+        service.sheets['Grants'][498] = format_grant_row(_grant(9))
+        sync.sync([_grant(5)])
+        assert service.sheets['Grants'][498][0] == 'https://example.com/grant-9'
+        assert service.sheets['Grants'][499][0] == 'https://example.com/grant-5'
+        assert mirror.rows('sheet-id')['https://example.com/grant-5'][0] == 499
+
+        # Reconciliation picks up rows added outside the scraper
+        sync.sync([], force_reconcile=True)
+        assert len(sync.existing_urls()) == 7
+        mirror.close()
+    print("   ✅ Sheet delta sync working")
+
+
+def test_values_parsed_by_the_sheet_do_not_look_changed():
+    """Numbers the sheet parsed on entry hash the same after an unformatted read"""
+    print("🔍 Testing round trip of USER_ENTERED values...")
+
+    service = FakeSheetsService()
+    deals = [_grant(0, description='1.5', stage='2024'), _grant(1, company='42')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = SheetMirror(os.path.join(tmp, 'mirror.db'))
+        sync = GrantsSheetSync(service, 'sheet-id', mirror=mirror)
+        sync.sync(deals)
+        assert service.sheets['Grants'][493][9] == 1.5  # stored as a number by the sheet
+
+        summary = sync.sync(deals, force_reconcile=True)
+        assert summary == {'inserted': 0, 'updated': 0, 'unchanged': 2}
+        assert service.calls['batchUpdate'] == 0
+        mirror.close()
+
+    path = os.path.join(tempfile.gettempdir(), 'sheet_sync_shared_mirror.db')
+    assert get_mirror(path) is get_mirror(path)
+    get_mirror(path).close()
+    os.remove(path)
+    print("   ✅ Reconciled rows stay unchanged")
+
+
+if __name__ == "__main__":
+    test_delta_sync_inserts_updates_and_reconciles()
+    test_values_parsed_by_the_sheet_do_not_look_changed()
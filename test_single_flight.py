@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test single-flight request coalescing (threads and processes)
+"""
+
+import os
+import tempfile
+import threading
+import time
+from multiprocessing import get_context
+
+from single_flight import SingleFlight
+
+
+def _slow_fetch(counter_path, ticker):
+    """Upstream stand-in: records every real fetch in a file."""
+    with open(counter_path, 'a') as f:
+        f.write(f"{ticker}\n")
+    time.sleep(0.3)
+    return {'ticker': ticker, 'revenue': [100.0, 90.0]}
+
+
+def _process_worker(db_path, counter_path, results):
+    flights = SingleFlight(db_path=db_path, window_seconds=3600)
+    results.put(flights.do('MSFT', 'financials', _slow_fetch, counter_path, 'MSFT'))
+
+
+def test_threads_share_one_fetch():
+    """Concurrent threads on one ticker trigger a single upstream call"""
+    print("🔍 Testing in-process coalescing...")
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = os.path.join(tmp, 'calls.txt')
+        flights = SingleFlight(db_path=os.path.join(tmp, 'flights.db'), window_seconds=3600)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            flights.do('aapl', 'financials', _slow_fetch, counter, 'AAPL'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with open(counter) as f:
+            assert f.read().split() == ['AAPL']
+        assert len(results) == 8 and all(r == results[0] for r in results)
+        assert flights.stats['fetched'] == 1 and flights.stats['shared'] == 7
+
+        # Followers get copies, so one caller's edits do not leak into another's result
+        results[1]['revenue'].append(0)
+        assert results[2]['revenue'] == [100.0, 90.0]
+
+        # A different dataset is a different flight
+        flights.do('AAPL', 'info', _slow_fetch, counter, 'AAPL')
+        assert flights.stats['fetched'] == 2
+    print("   ✅ In-process coalescing working")
+
+
+def test_errors_reach_every_waiter():
+    """An upstream failure is raised to all concurrent callers and not stored"""
+    flights = SingleFlight(db_path=None)
+    errors = []
+
+    def failing():
+        time.sleep(0.2)
+        raise ConnectionError('upstream down')
+
+    def call():
+        try:
+            flights.do('TSLA', 'quote', failing)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 4 and flights.stats['fetched'] == 0
+
+
+def test_refresh_bypasses_the_stored_result():
+    """A forced refresh fetches again and later callers in the window get the fresh result"""
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = os.path.join(tmp, 'calls.txt')
+        flights = SingleFlight(db_path=os.path.join(tmp, 'flights.db'), window_seconds=3600)
+        versions = iter([1, 2])
+
+        def fetch():
+            _slow_fetch(counter, 'AAPL')
+            return {'version': next(versions)}
+
+        assert flights.do('AAPL', 'financials', fetch) == {'version': 1}
+        assert flights.refresh('AAPL', 'financials', fetch) == {'version': 2}
+        other_process = SingleFlight(db_path=flights.db_path, window_seconds=3600)
+        assert other_process.do('AAPL', 'financials', fetch) == {'version': 2}
+        with open(counter) as f:
+            assert len(f.read().split()) == 2
+
+
+def test_processes_share_one_fetch():
+    """Separate processes coordinate through the lock file and result store"""
+    print("🔍 Testing cross-process coalescing...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, counter = os.path.join(tmp, 'flights.db'), os.path.join(tmp, 'calls.txt')
+        SingleFlight(db_path=db_path)  # create the schema once
+
+        ctx = get_context('spawn')
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_process_worker, args=(db_path, counter, results)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        values = [results.get(timeout=30) for _ in workers]
+        for worker in workers:
+            worker.join()
+
+        with open(counter) as f:
+            assert f.read().split() == ['MSFT']
+        assert all(value['ticker'] == 'MSFT' for value in values)
+    print("   ✅ Cross-process coalescing working")
+
+
+if __name__ == "__main__":
+    test_threads_share_one_fetch()
+    test_errors_reach_every_waiter()
+    test_refresh_bypasses_the_stored_result()
+    test_processes_share_one_fetch()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test streaming download helpers (chunked writers, zip bundles, ETag and Range)
+"""
+
+import io
+import os
+import tempfile
+import threading
+import time
+import zipfile
+
+import openpyxl
+
+from streaming_downloads import (bundle_etag, etag_matches, file_etag, iter_file, iter_written,
+                                 iter_zip, parse_range)
+
+
+def test_workbook_streams_in_bounded_chunks():
+    """workbook.save streams through the chunk queue and reassembles to a valid xlsx"""
+    print("🔍 Testing streamed workbook...")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in range(1, 2001):
+        sheet.append([row, f"=A{row}*2", f"label {row}"])
+
+    chunks = list(iter_written(workbook.save, chunk_size=4096))
+    assert len(chunks) > 1 and all(len(chunk) <= 4096 for chunk in chunks)
+
+    reloaded = openpyxl.load_workbook(io.BytesIO(b''.join(chunks)))
+    assert reloaded.active['B2000'].value == '=A2000*2'
+    print("   ✅ Streamed workbook is valid")
+
+
+def test_writer_stops_when_client_disconnects():
+    """Closing the stream early cancels the writer thread"""
+    finished = threading.Event()
+
+    def endless(fileobj):
+        try:
+            while True:
+                fileobj.write(b'x' * 1024)
+        finally:
+            finished.set()
+
+    stream = iter_written(endless, chunk_size=1024, max_buffered=2)
+    next(stream)
+    stream.close()
+    assert finished.wait(2)
+
+
+def test_errors_reach_the_consumer():
+    def broken(fileobj):
+        fileobj.write(b'partial')
+        raise RuntimeError('workbook failed')
+
+    try:
+        list(iter_written(broken))
+        assert False, "expected the writer error"
+    except RuntimeError as e:
+        assert 'workbook failed' in str(e)
+
+
+def test_zip_bundle_streams_and_caches():
+    """Bundles stream as valid zips, are cached, and their ETag tracks the members"""
+    print("🔍 Testing zip bundles...")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name in ('a.xlsx', 'b.xlsx'):
+            path = os.path.join(tmp, name)
+            with open(path, 'wb') as f:
+                f.write(os.urandom(200_000))
+            paths.append(path)
+
+        etag = bundle_etag(paths)
+        cache_path = os.path.join(tmp, 'bundle.zip')
+        body = b''.join(iter_zip(paths, cache_path, chunk_size=8192))
+
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            assert archive.namelist() == ['a.xlsx', 'b.xlsx']
+            with open(paths[1], 'rb') as f:
+                assert archive.read('b.xlsx') == f.read()
+        with open(cache_path, 'rb') as f:
+            assert f.read() == body
+
+        time.sleep(0.01)
+        with open(paths[0], 'ab') as f:
+            f.write(b'changed')
+        assert bundle_etag(paths) != etag
+    print("   ✅ Zip bundles working")
+
+
+def test_etag_and_range_helpers():
+    """If-None-Match and Range parsing follow RFC 7232/7233 semantics"""
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(bytes(range(256)) * 4)
+    try:
+        etag = file_etag(f.name)
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches('*', etag)
+        assert not etag_matches('"other"', etag) and not etag_matches(None, etag)
+
+        size = os.path.getsize(f.name)
+        assert parse_range(None, size) is None
+        assert parse_range('bytes=0-99', size) == (0, 99)
+        assert parse_range('bytes=1000-', size) == (1000, 1023)
+        assert parse_range('bytes=-24', size) == (1000, 1023)
+        assert parse_range('bytes=0-5000', size) == (0, 1023)
+        assert parse_range('bytes=0-1,5-9', size) is None   # multi-range: full body
+        try:
+            parse_range('bytes=2000-', size)
+            assert False, "expected an unsatisfiable range"
+        except ValueError:
+            pass
+
+        assert b''.join(iter_file(f.name, 10, 19, chunk_size=3)) == bytes(range(10, 20))
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    test_workbook_streams_in_bounded_chunks()
+    test_writer_stops_when_client_disconnects()
+    test_errors_reach_the_consumer()
+    test_zip_bundle_streams_and_caches()
+    test_etag_and_range_helpers()
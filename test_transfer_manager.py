@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Test S3 multipart resume / checksum skip and Drive session persistence against fake clients
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import types
+
+import transfer_manager
+from transfer_manager import MB, TransferManager, TransferState, drive_upload_key, file_sha256
+
+
+class FakeClientError(Exception):
+    """Shaped like botocore's ClientError: the code lives in response['Error']['Code']"""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class FakeS3:
+    """In-memory S3 with the multipart calls TransferManager uses"""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.calls = {'put_object': 0, 'upload_part': 0, 'create_multipart_upload': 0, 'list_parts': 0}
+        self.fail_after_parts = None
+        self._lock = threading.Lock()
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError('404')
+        return {'ContentLength': len(self.objects[Bucket, Key]['body']),
+                'Metadata': self.objects[Bucket, Key]['metadata']}
+
+    def put_object(self, Bucket, Key, Body, ContentType, Metadata):
+        self.calls['put_object'] += 1
+        self.objects[Bucket, Key] = {'body': Body.read(), 'metadata': Metadata}
+
+    def create_multipart_upload(self, Bucket, Key, ContentType, Metadata):
+        self.calls['create_multipart_upload'] += 1
+        upload_id = f'upload-{len(self.uploads) + 1}'
+        self.uploads[upload_id] = {'key': (Bucket, Key), 'metadata': Metadata, 'parts': {}}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:  # parts arrive from several threads
+            if self.fail_after_parts is not None and self.calls['upload_part'] >= self.fail_after_parts:
+                raise ConnectionError('connection reset')
+            self.calls['upload_part'] += 1
+        self.uploads[UploadId]['parts'][PartNumber] = Body
+        return {'ETag': f'"etag-{PartNumber}-{len(Body)}"'}
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0):
+        self.calls['list_parts'] += 1
+        if UploadId not in self.uploads:
+            raise FakeClientError('NoSuchUpload')
+        numbers = sorted(n for n in self.uploads[UploadId]['parts'] if n > PartNumberMarker)
+        page = numbers[:1]  # one part per page exercises the pagination
+        return {'Parts': [{'PartNumber': n, 'Size': len(self.uploads[UploadId]['parts'][n]),
+                           'ETag': f'"etag-{n}-{len(self.uploads[UploadId]["parts"][n])}"'} for n in page],
+                'IsTruncated': len(numbers) > 1, 'NextPartNumberMarker': page[-1] if page else 0}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part['PartNumber'] for part in MultipartUpload['Parts']]
+        assert numbers == sorted(upload['parts'])
+        body = b''.join(upload['parts'][n] for n in numbers)
+        self.objects[Bucket, Key] = {'body': body, 'metadata': upload['metadata']}
+
+
+def _manager(tmp, s3=None):
+    manager = TransferManager(config=None, state=TransferState(os.path.join(tmp, 'transfer_state.db')))
+    if s3 is not None:
+        manager._clients['aws_s3'] = s3
+    return manager
+
+
+def _write(path, size):
+    with open(path, 'wb') as f:
+        f.write(os.urandom(size))
+    return path
+
+
+def test_s3_multipart_resume_and_checksum_skip():
+    """Large files go up in parts, an interrupted upload resumes, an unchanged file is skipped"""
+    print("🔍 Testing S3 multipart upload, resume and checksum skip...")
+    s3 = FakeS3()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        small = _write(os.path.join(tmp, 'small.xlsx'), 100_000)
+        result = _manager(tmp, s3).upload_s3(small, 'models', 'small.xlsx')
+        assert result['parts'] == 1 and not result['skipped'] and s3.calls['put_object'] == 1
+        assert s3.objects['models', 'small.xlsx']['metadata'] == {'sha256': file_sha256(small)}
+
+        large = _write(os.path.join(tmp, 'large.xlsx'), 20 * MB + 12345)
+        manager = _manager(tmp, s3)
+        s3.fail_after_parts = 1
+        try:
+            manager.upload_s3(large, 'models', 'large.xlsx')
+            raise AssertionError('upload should have been interrupted')
+        except ConnectionError:
+            pass
+        assert ('models', 'large.xlsx') not in s3.objects
+        assert manager.s3_key_for(large, 'models') == 'large.xlsx'
+        manager.state.close()
+        print("   ✅ Interrupted upload left its upload ID in the state file")
+
+        # A fresh manager (as after a restart) resumes the same upload from the missing parts
+        s3.fail_after_parts = None
+        manager = _manager(tmp, s3)
+        result = manager.upload_s3(large, 'models', 'large.xlsx')
+        assert result['parts'] == 3 and result['resumed_parts'] == 1
+        assert s3.calls['create_multipart_upload'] == 1 and s3.calls['upload_part'] == 3
+        with open(large, 'rb') as f:
+            assert s3.objects['models', 'large.xlsx']['body'] == f.read()
+        assert s3.objects['models', 'large.xlsx']['metadata']['sha256'] == file_sha256(large)
+        print("   ✅ Resumed upload sent only the missing parts")
+
+        # Same content again: checksum matches, nothing is sent
+        result = manager.upload_s3(large, 'models', 'large.xlsx')
+        assert result['skipped'] and result['parts'] == 0 and s3.calls['upload_part'] == 3
+        print("   ✅ Unchanged file skipped by checksum")
+
+        # Changed content under the same key: a new upload, not a resume of the old one
+        _write(large, 9 * MB)
+        result = manager.upload_s3(large, 'models', 'large.xlsx')
+        assert not result['skipped'] and result['resumed_parts'] == 0
+        assert s3.calls['create_multipart_upload'] == 2
+        manager.state.close()
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.resp = types.SimpleNamespace(status=status)
+
+
+class FakeDriveRequest:
+    """Mimics googleapiclient's resumable HttpRequest: session URI after the first chunk"""
+
+    def __init__(self, drive, size):
+        self.drive = drive
+        self.size = size
+        self.resumable_uri = None
+        self.resumable_progress = 0
+
+    def next_chunk(self):
+        if self.resumable_uri is None:
+            self.drive.opened += 1
+            self.resumable_uri = f'https://upload.example/session-{self.drive.opened}'
+            self.drive.sessions[self.resumable_uri] = 0
+        if self.drive.fail_at == self.resumable_progress:
+            self.drive.fail_at = None
+            raise ConnectionError('connection reset')
+        self.drive.sent.append(self.resumable_progress)
+        self.resumable_progress = min(self.resumable_progress + self.drive.chunk, self.size)
+        self.drive.sessions[self.resumable_uri] = self.resumable_progress
+        if self.resumable_progress == self.size:
+            self.drive.completed.add(self.resumable_uri)
+            return None, self.drive.file
+        return None, None
+
+
+class FakeDriveHttp:
+    """Answers the resumable-session status query the way Drive does"""
+
+    def __init__(self, drive):
+        self.drive = drive
+
+    def put(self, uri, data, headers):
+        assert data == b'' and headers['Content-Range'].startswith('bytes */')
+        self.drive.status_queries.append(uri)
+        if uri not in self.drive.sessions:
+            return types.SimpleNamespace(status_code=404, headers={})
+        if uri in self.drive.completed:
+            return types.SimpleNamespace(status_code=200, headers={}, json=lambda: self.drive.file)
+        received = self.drive.sessions[uri]
+        headers = {'Range': f'bytes=0-{received - 1}'} if received else {}
+        return types.SimpleNamespace(status_code=308, headers=headers)
+
+
+class FakeDrive:
+    def __init__(self, size, chunk):
+        self.size = size
+        self.chunk = chunk
+        self.sessions = {}
+        self.opened = 0
+        self.completed = set()
+        self.sent = []
+        self.status_queries = []
+        self.fail_at = None
+        self.created = []
+        self.file = {'id': 'file-1', 'webViewLink': 'https://drive.example/file-1'}
+
+    def files(self):
+        def create(**kwargs):
+            self.created.append(kwargs['body'])
+            return FakeDriveRequest(self, self.size)
+        return types.SimpleNamespace(create=create)
+
+    def permissions(self):
+        return types.SimpleNamespace(create=lambda **kwargs: types.SimpleNamespace(execute=lambda: None))
+
+
+def _drive_manager(tmp, drive):
+    manager = _manager(tmp)
+    manager.drive_service = lambda credentials_path: drive
+    manager.drive_http = lambda credentials_path: FakeDriveHttp(drive)
+    return manager
+
+
+def test_drive_session_survives_restart():
+    """The Drive session URI is stored until the upload completes and resumed from Drive's reported offset"""
+    print("🔍 Testing Drive resumable session persistence...")
+    http = types.ModuleType('googleapiclient.http')
+    http.MediaFileUpload = lambda *args, **kwargs: None
+    errors = types.ModuleType('googleapiclient.errors')
+    errors.HttpError = FakeHttpError
+    saved_modules = {name: sys.modules.get(name) for name in ('googleapiclient', 'googleapiclient.http',
+                                                              'googleapiclient.errors')}
+    sys.modules.update({'googleapiclient': types.ModuleType('googleapiclient'),
+                        'googleapiclient.http': http, 'googleapiclient.errors': errors})
+    try:
+        drive = FakeDrive(size=1000, chunk=250)
+        metadata = {'name': 'model.xlsx'}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write(os.path.join(tmp, 'model.xlsx'), 1000)
+            key = drive_upload_key(file_sha256(path), metadata)
+            manager = _drive_manager(tmp, drive)
+            drive.fail_at = 500
+            original_retries = transfer_manager.DRIVE_MAX_RETRIES
+            transfer_manager.DRIVE_MAX_RETRIES = 0  # give up at once, as a crash would
+            try:
+                manager.upload_drive('creds.json', path, metadata)
+                raise AssertionError('upload should have been interrupted')
+            except ConnectionError:
+                pass
+            finally:
+                transfer_manager.DRIVE_MAX_RETRIES = original_retries
+            assert manager.state.drive_session('creds.json', key) == 'https://upload.example/session-1'
+            manager.state.close()
+
+            # Restart: Drive reports 500 bytes received, the upload continues from there
+            manager = _drive_manager(tmp, drive)
+            response = manager.upload_drive('creds.json', path, metadata)
+            assert response['id'] == 'file-1'
+            assert drive.sent == [0, 250, 500, 750] and len(drive.sessions) == 1
+            assert drive.status_queries == ['https://upload.example/session-1']
+            assert manager.state.drive_session('creds.json', key) is None
+            print("   ✅ Restarted upload continued the saved session")
+
+            # Same content under a new name is a new upload, not a resume of the old session
+            drive.fail_at = 250
+            transfer_manager.DRIVE_MAX_RETRIES = 0
+            try:
+                manager.upload_drive('creds.json', path, metadata)
+            except ConnectionError:
+                pass
+            finally:
+                transfer_manager.DRIVE_MAX_RETRIES = original_retries
+            assert drive_upload_key(file_sha256(path), {'name': 'renamed.xlsx'}) != key
+            manager.upload_drive('creds.json', path, {'name': 'renamed.xlsx'})
+            assert drive.created[-1] == {'name': 'renamed.xlsx'} and drive.opened == 3
+            assert manager.state.drive_session('creds.json', key) == 'https://upload.example/session-2'
+
+            # An expired session (Drive answers 404) starts the file over
+            del drive.sessions['https://upload.example/session-2']
+            manager.upload_drive('creds.json', path, metadata)
+            assert drive.opened == 4 and drive.status_queries[-1] == 'https://upload.example/session-2'
+            assert drive.sessions['https://upload.example/session-4'] == 1000
+            assert manager.state.drive_session('creds.json', key) is None
+            manager.state.close()
+    finally:
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    print("   ✅ Metadata changes and expired sessions start a new upload")
+
+
+if __name__ == "__main__":
+    test_s3_multipart_resume_and_checksum_skip()
+    test_drive_session_survives_restart()
+    print("🎉 Transfer manager tests passed")
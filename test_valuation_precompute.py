@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test the watchlist precompute service: scheduling, incremental recompute and table reads
+"""
+
+from collections import Counter
+
+import pandas as pd
+
+from valuation_precompute import (DAY, EARNINGS_REFRESH_LAG, HOUR, PrecomputeService, extract_source,
+                                  is_serving_process, next_refresh)
+
+PERIODS = [pd.Timestamp('2024-12-31'), pd.Timestamp('2023-12-31'), pd.Timestamp('2022-12-31')]
+
+
+class FakeYahoo:
+    """Serves canned Yahoo sources and counts every pull."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.info = {'longName': 'Acme Corp', 'currentPrice': 50.0, 'sharesOutstanding': 1e9,
+                     'marketCap': 5e10, 'beta': 1.2, 'totalDebt': 1e10, 'totalCash': 4e9}
+        self.financials = pd.DataFrame(
+            [[12e9, 11e9, 10e9], [2.4e9, 2.1e9, 1.9e9], [3.0e9, 2.7e9, 2.4e9],
+             [1.8e9, 1.6e9, 1.4e9], [2.2e9, 2.0e9, 1.8e9], [0.44e9, 0.4e9, 0.36e9]],
+            index=['Total Revenue', 'Operating Income', 'EBITDA', 'Net Income', 'Pretax Income', 'Tax Provision'],
+            columns=PERIODS)
+
+    def __call__(self, ticker, sources):
+        result = {}
+        for source in sources:
+            self.calls[(ticker, source)] += 1
+            if source == 'info':
+                result[source] = dict(self.info)
+            elif source == 'financials':
+                result[source] = self.financials.copy()
+            elif source == 'balance_sheet':
+                result[source] = pd.DataFrame([[1e10]], index=['Total Debt'], columns=PERIODS[:1])
+            else:
+                result[source] = pd.DataFrame([[-0.7e9], [0.5e9]], index=['Capital Expenditure',
+                                                                           'Depreciation And Amortization'],
+                                              columns=PERIODS[:1])
+        return result
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_schedule_follows_ttls_and_earnings():
+    """Statements are due after their TTL, or just after an earnings release inside it"""
+    print("🔍 Testing refresh schedule...")
+    now = 1_700_000_000.0
+    assert next_refresh('info', now) == now + 15 * 60
+    assert next_refresh('financials', now) == now + 7 * DAY
+    assert next_refresh('financials', now, earnings_date=now + 2 * DAY) == now + 2 * DAY + EARNINGS_REFRESH_LAG
+    assert next_refresh('info', now, earnings_date=now + 2 * DAY) == now + 15 * 60
+    # Fetched just after a release but the figures had not moved yet: re-check soon
+    assert next_refresh('financials', now, earnings_date=now - 8 * HOUR, changed=False) == now + 12 * HOUR
+    print("✅ TTLs and earnings dates drive the schedule")
+
+
+def test_incremental_refresh_and_table_reads(tmp_path):
+    """Only due sources are fetched, only models whose inputs changed are rebuilt, hits carry timestamps"""
+    print("🔍 Testing watchlist precompute...")
+    yahoo, clock = FakeYahoo(), Clock()
+    service = PrecomputeService(db_path=str(tmp_path / 'precompute.db'), watchlist=['acme'],
+                                fetcher=yahoo, clock=clock, promote_after=2)
+
+    first = service.run_due()
+    assert sorted(first['ACME']['recomputed']) == ['comps', 'dcf', 'lbo']
+    dcf = service.lookup('ACME', 'dcf')
+    assert dcf['precomputed'] and dcf['age_seconds'] == 0 and dcf['refreshed_at']
+    outputs = dcf['outputs']
+    assert outputs['company_name'] == 'Acme Corp' and outputs['enterprise_value'] > 0
+    assert abs(outputs['equity_value'] - (outputs['enterprise_value'] - 6e9)) < 1e-3
+    assert abs(outputs['upside_downside'] - (outputs['implied_price'] / 50.0 - 1) * 100) < 1e-9
+    comps = service.lookup('ACME', 'comps')['outputs']
+    assert abs(comps['ev_ebitda'] - (5e10 + 6e9) / 3.0e9) < 1e-9
+    lbo = service.lookup('ACME', 'lbo')['outputs']
+    assert lbo['moic'] > 0 and lbo['irr'] is not None
+    print("✅ Headline DCF / comps / LBO precomputed")
+
+    # Twenty minutes later only the quote is due; nothing moved, so nothing is rebuilt
+    clock.now += 20 * 60
+    assert service.due() == {'ACME': ['info']}
+    second = service.run_due()['ACME']
+    assert second['recomputed'] == [] and sorted(second['unchanged']) == ['comps', 'dcf', 'lbo']
+    assert yahoo.calls[('ACME', 'financials')] == 1 and yahoo.calls[('ACME', 'info')] == 2
+    assert service.lookup('ACME', 'dcf')['computed_at'] == dcf['computed_at']
+
+    # A new beta feeds the discount rate only: comps keep their stored outputs
+    clock.now += 20 * 60
+    yahoo.info['beta'] = 1.5
+    third = service.run_due()['ACME']
+    assert sorted(third['recomputed']) == ['dcf', 'lbo'] and third['unchanged'] == ['comps']
+    assert service.lookup('ACME', 'dcf')['outputs']['enterprise_value'] < outputs['enterprise_value']
+    print("✅ Only models whose inputs changed were rebuilt")
+
+    # An upcoming earnings date pulls the statement refresh forward
+    yahoo.info['earningsTimestampStart'] = clock.now + 2 * DAY
+    clock.now += 20 * 60
+    service.run_due()
+    clock.now = yahoo.info['earningsTimestampStart'] + EARNINGS_REFRESH_LAG
+    assert 'financials' in service.due()['ACME']
+    print("✅ Statements re-pulled after the earnings release")
+
+    # Cold tickers miss (live path) and are promoted once they are popular
+    assert service.lookup('COLD', 'dcf') is None
+    assert 'COLD' not in service.watchlist()
+    assert service.lookup('cold', 'dcf') is None
+    assert service.watchlist()['COLD'] == 'promoted'
+    service.refresh('COLD')
+    assert service.lookup('COLD', 'dcf') is not None
+
+    # Results nobody refreshed for longer than max_age fall back to the live path
+    assert service.lookup('ACME', 'dcf', max_age=60) is None
+    assert service.lookup_all('ACME') == {}
+    service.run_due()
+    assert set(service.lookup_all('ACME')) == {'dcf', 'comps', 'lbo'}
+    service.close()
+    print("✅ Cold tickers fall back and popular ones join the watchlist")
+
+
+def test_statement_lines_cover_the_same_years():
+    """A line with a missing year does not borrow an older one from outside the window"""
+    periods = [pd.Timestamp(f'{year}-12-31') for year in range(2024, 2018, -1)]
+    financials = pd.DataFrame({
+        'Total Revenue': [600.0, 500.0, 400.0, 300.0, 200.0, 100.0],
+        'Operating Income': [60.0, None, 40.0, 30.0, 20.0, 10.0],
+    }, index=periods).T
+    extracted = extract_source('financials', financials)
+    assert extracted['revenue'] == [600.0, 500.0, 400.0, 300.0, 200.0]
+    assert extracted['operating_income'] == [60.0, 40.0, 30.0, 20.0]
+    print("✅ Statement lines truncated before NaNs are dropped")
+
+
+def test_refresher_skips_the_reloader_watcher():
+    """Under the debug reloader only the serving child starts the refresher"""
+    import os
+
+    saved = os.environ.pop('WERKZEUG_RUN_MAIN', None)
+    try:
+        assert is_serving_process(debug=False)
+        assert not is_serving_process(debug=True)
+        os.environ['WERKZEUG_RUN_MAIN'] = 'true'
+        assert is_serving_process(debug=True)
+    finally:
+        os.environ.pop('WERKZEUG_RUN_MAIN', None)
+        if saved is not None:
+            os.environ['WERKZEUG_RUN_MAIN'] = saved
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_schedule_follows_ttls_and_earnings()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_incremental_refresh_and_table_reads(Path(tmp))
+    test_statement_lines_cover_the_same_years()
+    test_refresher_skips_the_reloader_watcher()
+    print("🎉 Valuation precompute tests passed")
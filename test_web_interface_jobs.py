@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test the FinModAI web interface's background jobs: validation, SSE progress from generate_model, status
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+
+from finmodai.web_interface import WebInterface  # noqa: E402
+from progress_events import emit  # noqa: E402
+
+
+class FakePlatform:
+    """generate_model publishes through emit() the way the ingestion and Excel stages do"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_model(self, model_type, company_identifier, assumptions=None):
+        self.calls.append((model_type, company_identifier, assumptions))
+        emit('data', 'Trying Yahoo Finance', status='started', source='Yahoo Finance')
+        emit('excel', 'Sheets written: DCF', status='ok')
+        return {'status': 'success', 'model_type': model_type, 'output_files': [f'{company_identifier}_DCF.xlsx']}
+
+
+def test_job_streams_generate_model_progress():
+    """A job runs generate_model in the background and its emits reach the SSE stream"""
+    print("🔍 Testing FinModAI /api/jobs...")
+    platform = FakePlatform()
+    client = WebInterface(platform).app.test_client()
+
+    assert client.post('/api/jobs', json={'model_type': 'dcf'}).status_code == 400
+    assert client.post('/api/jobs', data='not json', content_type='application/json').status_code == 400
+    assert client.get('/api/jobs/unknown/events').status_code == 404
+    print("   ✅ Bad requests and unknown jobs rejected")
+
+    accepted = client.post('/api/jobs', json={'model_type': 'dcf', 'company_identifier': 'ACME',
+                                              'assumptions': {'wacc': 0.09}})
+    assert accepted.status_code == 202
+    job = accepted.get_json()
+    stream = client.get(job['events_url'])
+    assert stream.mimetype == 'text/event-stream'
+    events = [json.loads(line[len('data: '):]) for line in stream.get_data(as_text=True).splitlines()
+              if line.startswith('data: ')]
+    assert [event['stage'] for event in events] == ['queued', 'data', 'excel', 'complete']
+    assert events[-1]['result']['output_files'] == ['ACME_DCF.xlsx']
+    assert platform.calls == [('dcf', 'ACME', {'wacc': 0.09})]
+
+    status = client.get(job['status_url']).get_json()
+    assert status['status'] == 'complete' and status['meta']['company_identifier'] == 'ACME'
+    print("   ✅ generate_model progress streamed over SSE")
+
+
+if __name__ == "__main__":
+    test_job_streams_generate_model_progress()
+    print("🎉 Web interface job tests passed")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the streaming xlsx inspector against openpyxl
+"""
+
+import io
+import os
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.styles import Font
+from openpyxl.workbook.defined_name import DefinedName
+
+from xlsx_inspector import dimension_shape, head_rows, inspect_workbook, iter_cells, _sheet_elements
+
+
+def test_inspector_counts_formulas_errors_and_names():
+    """Formula counts, error cells, defined names and styles come from the raw XML"""
+    print("🔍 Testing xlsx inspector...")
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'DCF'
+    ws['A1'] = 'Revenue'
+    ws['A1'].font = Font(bold=True)
+    ws['B1'] = 1000
+    ws['B2'] = '=B1*1.1'
+    ws['B3'] = '=SUM(B1:B2)'
+    ws['B4'] = '#REF!'
+    wb.create_sheet('Summary')['A1'] = "=DCF!B3"
+    wb.defined_names['Revenue'] = DefinedName('Revenue', attr_text='DCF!$B$1')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.xlsx')
+        wb.save(path)
+        report = inspect_workbook(path)
+        cells = list(iter_cells(path, 'DCF'))
+        preview = head_rows(path, 'DCF', 2)
+
+    assert report['sheet_names'] == ['DCF', 'Summary']
+    assert report['sheets']['DCF']['formulas'] == 2
+    assert report['sheets']['Summary']['formulas'] == 1
+    assert report['sheets']['DCF']['error_cells'] == [('B4', '#REF!')]
+    assert report['defined_names'] == {'Revenue': 'DCF!$B$1'}
+    assert report['styles_used'] == 2
+    assert ('DCF', 'A1', 'Revenue', None) in cells
+    assert ('DCF', 'B2', None, '=B1*1.1') in cells
+    assert preview == [['Revenue', 1000.0], [None, '=B1*1.1']]
+    assert dimension_shape(report['sheets']['DCF']['dimension']) == (4, 2)
+    print("   ✅ Inspector working")
+
+
+def test_processed_rows_are_detached():
+    """The parsed tree never holds more than the row being read"""
+    rows = ''.join(f'<row r="{r}"><c r="A{r}"><v>{r}</v></c></row>' for r in range(1, 501))
+    xml = (f'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+           f'<sheetData>{rows}</sheetData></worksheet>').encode()
+    # sheetData is yielded when it closes; by then every row has been detached
+    held = []
+    for elem in _sheet_elements(io.BytesIO(xml)):
+        if elem.tag.endswith('sheetData'):
+            held.append(len(elem))
+    assert held == [0]
+
+
+if __name__ == "__main__":
+    test_inspector_counts_formulas_errors_and_names()
+    test_processed_rows_are_detached()
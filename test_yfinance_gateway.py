@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test the shared yfinance gateway (memoization, normalization, fan-out)
+"""
+
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from yfinance_gateway import YFinanceGateway, normalize_statement
+
+
+class FakeTicker:
+    """Counts every statement pull, like a yf.Ticker hitting the network."""
+
+    calls = Counter()
+    lock = threading.Lock()
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def _pull(self, name):
+        with self.lock:
+            self.calls[(self.symbol, name)] += 1
+
+    @property
+    def info(self):
+        self._pull('info')
+        return {'longName': f'{self.symbol} Inc.', 'marketCap': 1e9}
+
+    @property
+    def financials(self):
+        self._pull('financials')
+        # Oldest period first and padded labels, to exercise normalization
+        return pd.DataFrame({pd.Timestamp('2022-12-31'): ['90', 9.0], pd.Timestamp('2023-12-31'): [100.0, 10.0]},
+                            index=[' Total Revenue ', 'Net Income'])
+
+    @property
+    def balance_sheet(self):
+        self._pull('balance_sheet')
+        return None
+
+    @property
+    def cashflow(self):
+        self._pull('cashflow')
+        raise ConnectionError('rate limited')
+
+    def history(self, period):
+        return pd.DataFrame({'Close': [42.0]})
+
+
+def test_statements_memoized_and_normalized():
+    """Each (ticker, statement) is pulled once; statements come back normalized"""
+    print("🔍 Testing yfinance gateway...")
+    FakeTicker.calls.clear()
+    gateway = YFinanceGateway(ticker_factory=FakeTicker, max_workers=4)
+
+    first = gateway.fetch_many(['aapl', 'MSFT'])
+    second = gateway.fetch_many(['AAPL', 'MSFT'])
+
+    assert set(first) == {'AAPL', 'MSFT'}
+    assert all(count == 1 for key, count in FakeTicker.calls.items() if key[1] != 'cashflow')
+    assert first['AAPL']['cashflow'] is None                    # failures are returned as None
+    assert second['AAPL']['balance_sheet'].empty                # None normalized to an empty frame
+
+    income = second['MSFT']['financials']
+    assert list(income.index) == ['Total Revenue', 'Net Income']
+    assert income.columns[0] == pd.Timestamp('2023-12-31')      # newest period first
+    assert income.loc['Total Revenue'].tolist() == [100.0, 90.0]
+
+    # Callers get copies, so mutating a result cannot poison the cache
+    income.loc['Total Revenue'] = 0
+    assert gateway.get('MSFT', 'financials').loc['Total Revenue'].iloc[0] == 100.0
+
+    # yf.Ticker drop-in: statements via the cache, prices straight through
+    stock = gateway.ticker('AAPL')
+    assert stock.info['longName'] == 'AAPL Inc.'
+    assert stock.history(period='1d')['Close'].iloc[-1] == 42.0
+    assert FakeTicker.calls[('AAPL', 'info')] == 1
+    assert gateway.stats['hits'] >= 7
+
+    # refresh=True bypasses the memo and replaces the cached copy
+    gateway.statements('AAPL', ['info'], refresh=True)
+    gateway.get('AAPL', 'info')
+    assert FakeTicker.calls[('AAPL', 'info')] == 2
+    print("   ✅ Gateway memoization working")
+
+
+def test_info_expires_quickly_and_misses_are_shared():
+    """info (prices) expires after minutes while statements last the day; concurrent misses share one pull"""
+    print("🔍 Testing info TTL and in-flight dedupe...")
+    FakeTicker.calls.clear()
+    gateway = YFinanceGateway(ticker_factory=FakeTicker, info_ttl_seconds=0.05)
+
+    gateway.get('NVDA', 'info')
+    gateway.get('NVDA', 'financials')
+    time.sleep(0.1)
+    gateway.get('NVDA', 'info')
+    gateway.get('NVDA', 'financials')
+    assert FakeTicker.calls[('NVDA', 'info')] == 2
+    assert FakeTicker.calls[('NVDA', 'financials')] == 1
+
+    class SlowTicker(FakeTicker):
+        @property
+        def financials(self):
+            time.sleep(0.2)
+            return FakeTicker.financials.fget(self)
+
+    gateway = YFinanceGateway(ticker_factory=SlowTicker)
+    threads = [threading.Thread(target=gateway.get, args=('AMD', 'financials')) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert FakeTicker.calls[('AMD', 'financials')] == 1
+    assert gateway.stats == {'hits': 5, 'misses': 1, 'errors': 0}
+    print("   ✅ Prices stay fresh and concurrent misses share one request")
+
+
+def test_normalize_statement_handles_empty_input():
+    """None and empty inputs become empty DataFrames"""
+    assert normalize_statement(None).empty
+    assert normalize_statement(pd.DataFrame()).empty
+
+
+if __name__ == "__main__":
+    test_statements_memoized_and_normalized()
+    test_info_expires_quickly_and_misses_are_shared()
+    test_normalize_statement_handles_empty_input()
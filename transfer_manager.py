@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Transfer Manager - Cached provider clients and fast uploads for Excel sharing
+
+Features:
+- One client per provider, built once and reused across uploads (the Drive
+  OAuth token is unpickled and refreshed once, not per file)
+- Concurrent S3 multipart uploads with part sizes tuned to the file size
+- Resumable, chunked Google Drive uploads that retry failed chunks in place
+- Interrupted uploads resume across restarts: S3 upload IDs and Drive session
+  URIs are kept in a small SQLite state file until the upload completes; a
+  Drive session is resumed with the documented status query (an empty PUT
+  with Content-Range: bytes */<size>) and only for the same file content
+  and metadata
+- Unchanged files are not re-sent: objects carry the file's SHA-256 and an
+  upload whose checksum matches the stored object is skipped
+- S3-compatible endpoints (MinIO, moto server, LocalStack) via endpoint_url
+  or the S3_ENDPOINT_URL environment variable, for local testing
+
+Author: FinModAI Engineering Team
+"""
+
+import os
+import json
+import math
+import time
+import pickle
+import sqlite3
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('ExcelSharing')
+
+XLSX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+MB = 1024 * 1024
+S3_MIN_PART_SIZE = 8 * MB       # S3 minimum is 5 MB; 8 MB matches the AWS CLI default
+S3_MAX_PART_SIZE = 5 * 1024 * MB  # S3 limit
+S3_MAX_PARTS = 10_000
+S3_MAX_CONCURRENCY = 10
+
+DRIVE_SCOPES = ['https://www.googleapis.com/auth/drive.file']
+DRIVE_CHUNK_SIZE = 8 * MB        # Must be a multiple of 256 KB
+DRIVE_MAX_RETRIES = 5
+DRIVE_RETRY_STATUSES = {429, 500, 502, 503, 504}
+DRIVE_EXPIRED_STATUSES = {404, 410}  # Resumable session no longer known to Drive
+
+TRANSFER_STATE_PATH = os.getenv('TRANSFER_STATE_DB', 'transfer_state.db')
+S3_MISSING_CODES = {'404', 'NoSuchKey', 'NotFound'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS s3_uploads (
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    upload_id TEXT,
+    part_size INTEGER,
+    completed_at REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (bucket, key)
+);
+CREATE TABLE IF NOT EXISTS drive_upload_sessions (
+    credentials_path TEXT NOT NULL,
+    upload_key TEXT NOT NULL,
+    resumable_uri TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (credentials_path, upload_key)
+);
+"""
+
+
+def s3_part_size(file_size: int, max_concurrency: int = S3_MAX_CONCURRENCY) -> int:
+    """
+    Part size that keeps every worker busy on mid-sized files while staying
+    within S3's 10,000-part limit on very large ones (rounded to whole MB).
+    """
+    per_worker = math.ceil(file_size / max(max_concurrency, 1))
+    part_size = max(S3_MIN_PART_SIZE, per_worker, math.ceil(file_size / S3_MAX_PARTS))
+    return min(math.ceil(part_size / MB) * MB, S3_MAX_PART_SIZE)
+
+
+def file_sha256(file_path: str, block_size: int = MB) -> str:
+    """SHA-256 hex digest of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def drive_upload_key(sha256: str, metadata: Dict[str, Any]) -> str:
+    """Identity of a Drive upload: the file content plus its metadata (name, parents, ...)."""
+    canonical = json.dumps(metadata, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(f"{sha256}:{canonical}".encode('utf-8')).hexdigest()
+
+
+def _s3_error_code(error: Exception) -> Optional[str]:
+    """Error code of a botocore ClientError (None for anything else)."""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        return str(response.get('Error', {}).get('Code'))
+    return None
+
+
+class TransferState:
+    """SQLite record of in-flight S3 multipart uploads and Drive resumable sessions."""
+
+    def __init__(self, path: str = TRANSFER_STATE_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    # ---- S3 ----
+
+    def s3_upload(self, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT sha256, upload_id, part_size, completed_at FROM s3_uploads WHERE bucket = ? AND key = ?',
+                (bucket, key)).fetchone()
+        if row is None:
+            return None
+        return {'sha256': row[0], 'upload_id': row[1], 'part_size': row[2], 'completed_at': row[3]}
+
+    def s3_key_for(self, bucket: str, sha256: str) -> Optional[str]:
+        """Key of the latest upload (pending or complete) of this content to the bucket."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT key FROM s3_uploads WHERE bucket = ? AND sha256 = ? ORDER BY updated_at DESC LIMIT 1',
+                (bucket, sha256)).fetchone()
+        return row[0] if row else None
+
+    def save_s3_upload(self, bucket: str, key: str, sha256: str, upload_id: Optional[str],
+                       part_size: Optional[int], completed: bool = False):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO s3_uploads VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (bucket, key, sha256, upload_id, part_size, time.time() if completed else None, time.time()))
+            self._conn.commit()
+
+    # ---- Google Drive ----
+
+    def drive_session(self, credentials_path: str, upload_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT resumable_uri FROM drive_upload_sessions WHERE credentials_path = ? AND upload_key = ?',
+                (credentials_path, upload_key)).fetchone()
+        return row[0] if row else None
+
+    def save_drive_session(self, credentials_path: str, upload_key: str, resumable_uri: str):
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO drive_upload_sessions VALUES (?, ?, ?, ?)',
+                               (credentials_path, upload_key, resumable_uri, time.time()))
+            self._conn.commit()
+
+    def delete_drive_session(self, credentials_path: str, upload_key: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM drive_upload_sessions WHERE credentials_path = ? AND upload_key = ?',
+                               (credentials_path, upload_key))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TransferManager:
+    """Per-provider client cache plus tuned upload routines."""
+
+    def __init__(self, config, max_concurrency: int = S3_MAX_CONCURRENCY,
+                 state: Optional[TransferState] = None):
+        self.config = config
+        self.max_concurrency = max_concurrency
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._state = state
+
+    @property
+    def state(self) -> TransferState:
+        """Resume state, opened on first upload rather than when the manager is built."""
+        with self._lock:
+            if self._state is None:
+                self._state = TransferState()
+            return self._state
+
+    def _cached(self, key: str, factory):
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = factory()
+            return self._clients[key]
+
+    # ------------------------------------------------------------------ S3
+
+    def s3_client(self):
+        """Shared boto3 S3 client (clients are thread-safe)."""
+        def factory():
+            import boto3
+            from botocore.config import Config
+
+            endpoint_url = getattr(self.config, 'endpoint_url', None) or os.getenv('S3_ENDPOINT_URL')
+            return boto3.client(
+                's3',
+                endpoint_url=endpoint_url,
+                config=Config(max_pool_connections=self.max_concurrency * 2,
+                              retries={'max_attempts': 5, 'mode': 'adaptive'})
+            )
+        return self._cached('aws_s3', factory)
+
+    def s3_key_for(self, file_path: str, bucket: str) -> Optional[str]:
+        """Key this file was (or was being) uploaded to, so a re-share resumes or skips it."""
+        return self.state.s3_key_for(bucket, file_sha256(file_path))
+
+    def _s3_object_sha256(self, bucket: str, key: str) -> Optional[str]:
+        try:
+            head = self.s3_client().head_object(Bucket=bucket, Key=key)
+        except Exception as e:
+            if _s3_error_code(e) in S3_MISSING_CODES:
+                return None
+            raise
+        return head.get('Metadata', {}).get('sha256')
+
+    def _s3_uploaded_parts(self, bucket: str, key: str, upload_id: str) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Parts already stored for a multipart upload, or None if S3 no longer knows it."""
+        client = self.s3_client()
+        parts: Dict[int, Dict[str, Any]] = {}
+        kwargs = {'Bucket': bucket, 'Key': key, 'UploadId': upload_id}
+        try:
+            while True:
+                page = client.list_parts(**kwargs)
+                for part in page.get('Parts', []):
+                    parts[part['PartNumber']] = {'ETag': part['ETag'], 'Size': part['Size']}
+                if not page.get('IsTruncated'):
+                    return parts
+                kwargs['PartNumberMarker'] = page['NextPartNumberMarker']
+        except Exception as e:
+            if _s3_error_code(e) == 'NoSuchUpload':
+                return None
+            raise
+
+    def upload_s3(self, file_path: str, bucket: str, key: str) -> Dict[str, Any]:
+        """
+        Upload a file to S3, in concurrent parts when it is large enough.
+        Skips the upload when the object already holds this content and resumes
+        an interrupted multipart upload of the same file from its missing parts.
+        """
+        client = self.s3_client()
+        file_size = os.path.getsize(file_path)
+        sha256 = file_sha256(file_path)
+        start = time.time()
+        result = {'bucket': bucket, 'key': key, 'file_size': file_size, 'sha256': sha256,
+                  'part_size': file_size, 'parts': 1, 'resumed_parts': 0, 'skipped': False}
+
+        if self._s3_object_sha256(bucket, key) == sha256:
+            logger.info(f"⏭️ s3://{bucket}/{key} already holds this file, skipping upload")
+            self.state.save_s3_upload(bucket, key, sha256, None, None, completed=True)
+            return dict(result, parts=0, skipped=True, seconds=round(time.time() - start, 3))
+
+        if file_size < S3_MIN_PART_SIZE:
+            with open(file_path, 'rb') as f:
+                client.put_object(Bucket=bucket, Key=key, Body=f, ContentType=XLSX_MIME_TYPE,
+                                  Metadata={'sha256': sha256})
+            self.state.save_s3_upload(bucket, key, sha256, None, None, completed=True)
+            return dict(result, seconds=round(time.time() - start, 3))
+
+        # Resume a persisted upload of the same content, otherwise start a new one
+        saved = self.state.s3_upload(bucket, key)
+        uploaded: Dict[int, Dict[str, Any]] = {}
+        upload_id = None
+        part_size = s3_part_size(file_size, self.max_concurrency)
+        if saved and saved['upload_id'] and saved['sha256'] == sha256 and not saved['completed_at']:
+            existing = self._s3_uploaded_parts(bucket, key, saved['upload_id'])
+            if existing is not None:
+                upload_id, part_size, uploaded = saved['upload_id'], saved['part_size'], existing
+        if upload_id is None:
+            upload_id = client.create_multipart_upload(
+                Bucket=bucket, Key=key, ContentType=XLSX_MIME_TYPE, Metadata={'sha256': sha256}
+            )['UploadId']
+            self.state.save_s3_upload(bucket, key, sha256, upload_id, part_size)
+
+        part_count = math.ceil(file_size / part_size)
+
+        def expected_size(number: int) -> int:
+            return min(part_size, file_size - (number - 1) * part_size)
+
+        done = {n: part['ETag'] for n, part in uploaded.items() if part['Size'] == expected_size(n)}
+
+        def send(number: int):
+            with open(file_path, 'rb') as f:
+                f.seek((number - 1) * part_size)
+                body = f.read(expected_size(number))
+            response = client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                          PartNumber=number, Body=body)
+            return number, response['ETag']
+
+        missing = [n for n in range(1, part_count + 1) if n not in done]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, max(len(missing), 1))) as pool:
+            for number, etag in pool.map(send, missing):
+                done[number] = etag
+
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={'Parts': [{'PartNumber': n, 'ETag': done[n]} for n in range(1, part_count + 1)]}
+        )
+        self.state.save_s3_upload(bucket, key, sha256, None, None, completed=True)
+        return dict(result, part_size=part_size, parts=part_count, resumed_parts=part_count - len(missing),
+                    seconds=round(time.time() - start, 3))
+
+    # --------------------------------------------------------- Google Drive
+
+    def drive_credentials(self, credentials_path: str, token_file: str = 'google_drive_token.pickle'):
+        """Load (or obtain) Drive OAuth credentials once and refresh when expired."""
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+
+        creds = None
+        if os.path.exists(token_file):
+            with open(token_file, 'rb') as token:
+                creds = pickle.load(token)
+
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(credentials_path, DRIVE_SCOPES)
+                creds = flow.run_local_server(port=0)
+
+            # Save the credentials for the next run
+            with open(token_file, 'wb') as token:
+                pickle.dump(creds, token)
+        return creds
+
+    def drive_service(self, credentials_path: str):
+        """
+        Drive v3 service for the current thread. Credentials are loaded once
+        and shared; services are per thread because httplib2 is not thread-safe.
+        """
+        services = self._local.__dict__.setdefault('drive_services', {})
+        if credentials_path not in services:
+            from googleapiclient.discovery import build
+            creds = self._cached(f'google_drive:{credentials_path}',
+                                 lambda: self.drive_credentials(credentials_path))
+            services[credentials_path] = build('drive', 'v3', credentials=creds, cache_discovery=False)
+        return services[credentials_path]
+
+    def drive_http(self, credentials_path: str):
+        """Authorized HTTP session (google-auth) for calls outside the Drive client, e.g. session status."""
+        from google.auth.transport.requests import AuthorizedSession
+        creds = self._cached(f'google_drive:{credentials_path}', lambda: self.drive_credentials(credentials_path))
+        return AuthorizedSession(creds)
+
+    def drive_session_status(self, credentials_path: str, session_uri: str, size: int):
+        """
+        Ask Drive how much of a resumable session it has (an empty PUT with
+        Content-Range: bytes */size). Returns (bytes received, None), or
+        (size, file resource) when the upload already completed, or
+        (None, None) when the session expired.
+        """
+        response = self.drive_http(credentials_path).put(
+            session_uri, data=b'', headers={'Content-Length': '0', 'Content-Range': f'bytes */{size}'})
+        if response.status_code in (200, 201):
+            return size, response.json()
+        if response.status_code == 308:
+            received = response.headers.get('Range')  # e.g. "bytes=0-8388607"; absent if nothing arrived
+            return (int(received.rsplit('-', 1)[1]) + 1 if received else 0), None
+        if response.status_code in DRIVE_EXPIRED_STATUSES:
+            return None, None
+        response.raise_for_status()
+        raise ConnectionError(f"Unexpected Drive session status {response.status_code}")
+
+    def upload_drive(self, credentials_path: str, file_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Chunked resumable upload; a failed chunk is retried without restarting the
+        file, and a session interrupted by a restart is picked up where Drive left it
+        (only for the same file content and metadata).
+        """
+        from googleapiclient.http import MediaFileUpload
+        from googleapiclient.errors import HttpError
+
+        service = self.drive_service(credentials_path)
+        upload_key = drive_upload_key(file_sha256(file_path), metadata)
+        media = MediaFileUpload(file_path, mimetype=XLSX_MIME_TYPE, chunksize=DRIVE_CHUNK_SIZE, resumable=True)
+        request = service.files().create(body=metadata, media_body=media, fields='id,webViewLink,webContentLink')
+
+        response = None
+        saved_uri = self.state.drive_session(credentials_path, upload_key)
+        if saved_uri:
+            offset, response = self.drive_session_status(credentials_path, saved_uri, os.path.getsize(file_path))
+            if offset is None:
+                # Session expired (Drive keeps them about a week): start the file over
+                self.state.delete_drive_session(credentials_path, upload_key)
+                saved_uri = None
+            elif response is None:
+                request.resumable_uri = saved_uri
+                request.resumable_progress = offset
+                logger.info(f"🔁 Resuming interrupted Drive upload session at byte {offset:,}")
+
+        retries = 0
+        while response is None:
+            try:
+                _, response = request.next_chunk()
+                retries = 0
+                if response is None and request.resumable_uri and request.resumable_uri != saved_uri:
+                    saved_uri = request.resumable_uri
+                    self.state.save_drive_session(credentials_path, upload_key, saved_uri)
+            except HttpError as e:
+                if saved_uri and e.resp.status in DRIVE_EXPIRED_STATUSES:
+                    # Session expired (Drive keeps them about a week): start the file over
+                    self.state.delete_drive_session(credentials_path, upload_key)
+                    saved_uri = None
+                    request = service.files().create(body=metadata, media_body=media,
+                                                     fields='id,webViewLink,webContentLink')
+                    continue
+                if e.resp.status not in DRIVE_RETRY_STATUSES or retries >= DRIVE_MAX_RETRIES:
+                    raise
+                retries += 1
+                logger.warning(f"⚠️ Drive chunk failed ({e.resp.status}), resuming (retry {retries})")
+                time.sleep(min(2 ** retries, 30))
+            except (ConnectionError, TimeoutError) as e:
+                if retries >= DRIVE_MAX_RETRIES:
+                    raise
+                retries += 1
+                logger.warning(f"⚠️ Drive connection error ({e}), resuming (retry {retries})")
+                time.sleep(min(2 ** retries, 30))
+                if saved_uri:
+                    # The chunk may have partly arrived: continue from what Drive reports
+                    offset, response = self.drive_session_status(credentials_path, saved_uri,
+                                                                 os.path.getsize(file_path))
+                    if offset is not None:
+                        request.resumable_progress = offset
+        self.state.delete_drive_session(credentials_path, upload_key)
+
+        service.permissions().create(
+            fileId=response.get('id'),
+            body={'type': 'anyone', 'role': 'reader'}
+        ).execute()
+        return response
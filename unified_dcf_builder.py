@@ -15,6 +15,8 @@ from datetime import datetime
 from openpyxl import Workbook
 from urllib.parse import urljoin
 
+import finance_kernel
+
 def install_and_import(package, pip_name=None):
     """Auto-install missing packages."""
     pip_name = pip_name or package
@@ -54,6 +56,7 @@ try:
     import yfinance as yf
 except ImportError:
     yf = None
+import yfinance_gateway
 try:
     import tldextract
 except ImportError:
@@ -126,7 +129,7 @@ def get_yfinance_financials(ticker):
         print("yfinance not available")
         return {}
     try:
-        ticker_obj = yf.Ticker(ticker)
+        ticker_obj = yfinance_gateway.ticker(ticker)
         fin = ticker_obj.financials.T
         years = fin.index[-YEARS:]
         data = {}
@@ -262,9 +265,8 @@ def calculate_terminal_value(last_fcf, discount_rate=DISCOUNT_RATE, growth=TERMI
 
 def discount_cash_flows(fcfs, terminal_value, discount_rate=DISCOUNT_RATE):
     """Discount cash flows to present value."""
-    discounted = [fcf / ((1 + discount_rate) ** (i + 1)) for i, fcf in enumerate(fcfs)]
-    tv_discounted = terminal_value / ((1 + discount_rate) ** len(fcfs))
-    return discounted, tv_discounted
+    discounted, tv_discounted = finance_kernel.discount_cash_flows(fcfs, terminal_value, discount_rate)
+    return discounted.tolist(), float(tv_discounted)
 
 def write_to_excel(company, years, revenue, ebitda, ebit, fcf, terminal_value, enterprise_value, filename):
     """Write DCF model to Excel file."""
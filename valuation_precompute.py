@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+"""
+Valuation Precompute - Background refresher for a watchlist of tickers
+
+Keeps headline DCF / comps / LBO outputs for the tickers people ask about
+most in an indexed SQLite table, so the web routes can answer them without
+touching Yahoo Finance or rebuilding a model.
+
+Features:
+- Configurable watchlist (constructor, the WATCHLIST env var, or add/remove
+  at runtime); tickers requested often are promoted onto it automatically and
+  dropped again once nobody asks for them
+- Per-source refresh schedule: quotes and statements have their own TTLs, and
+  statements are re-pulled shortly after each earnings release
+- Incremental recompute: every model hashes only the inputs it reads and is
+  rebuilt only when that hash changes
+- Results keyed by (ticker, model type) with computed / refreshed timestamps,
+  so routes can show how fresh a number is
+- Cold tickers miss the table and fall back to the caller's live path
+
+Usage:
+    service = get_service()
+    if is_serving_process(app.debug):            # not in the reloader's watcher
+        service.start()                          # background refresher thread
+    hit = service.lookup('AAPL', 'dcf')          # None when cold or too old
+    outputs = hit['outputs'] if hit else live_dcf('AAPL')
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from finance_kernel import discount_cash_flows, irr
+from model_manifest import input_hash
+from serialization import to_builtin
+
+try:
+    import yfinance_gateway
+    YFINANCE_GATEWAY_AVAILABLE = True
+except ImportError:
+    YFINANCE_GATEWAY_AVAILABLE = False
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Anchored to the repository so the backend (run from its own directory) and root scripts share one table
+PRECOMPUTE_DB_PATH = os.getenv('PRECOMPUTE_DB_PATH',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'valuation_precompute.db'))
+DEFAULT_WATCHLIST = [t for t in os.getenv('WATCHLIST', '').replace(' ', '').upper().split(',') if t]
+
+# How long each Yahoo source stays current
+SOURCE_TTLS = {
+    'info': 15 * 60,            # quote, share count, earnings dates
+    'financials': 7 * DAY,
+    'balance_sheet': 7 * DAY,
+    'cashflow': 7 * DAY,
+}
+STATEMENT_SOURCES = ('financials', 'balance_sheet', 'cashflow')
+EARNINGS_REFRESH_LAG = 6 * HOUR      # statements reach Yahoo a few hours after the release
+EARNINGS_WATCH_WINDOW = 3 * DAY      # after a release, re-check statements until they change
+EARNINGS_RECHECK = 12 * HOUR
+RETRY_SECONDS = 15 * 60              # failed fetches are retried sooner than their TTL
+
+REFRESH_INTERVAL = int(os.getenv('PRECOMPUTE_INTERVAL_SECONDS', '60'))
+DEFAULT_MAX_AGE = 2 * DAY            # lookups older than this fall back to the live path
+PROMOTE_AFTER = int(os.getenv('PRECOMPUTE_PROMOTE_AFTER', '3'))
+PROMOTED_IDLE_SECONDS = 7 * DAY
+DEFAULT_MAX_WORKERS = 4
+
+# Market assumptions shared by the headline models
+RISK_FREE_RATE = 0.045
+MARKET_RISK_PREMIUM = 0.055
+PRE_TAX_COST_OF_DEBT = 0.055
+LBO_LEVERAGE = 5.0                   # x EBITDA, capped at LBO_MAX_DEBT_SHARE of entry EV
+LBO_MAX_DEBT_SHARE = 0.6
+LBO_PREMIUM = 0.20
+LBO_INTEREST_RATE = 0.08
+LBO_HOLD_YEARS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    ticker TEXT PRIMARY KEY,
+    origin TEXT NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS demand (
+    ticker TEXT PRIMARY KEY,
+    requests INTEGER NOT NULL,
+    last_requested REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_data (
+    ticker TEXT NOT NULL,
+    source TEXT NOT NULL,
+    payload TEXT,
+    data_hash TEXT,
+    fetched_at REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    next_due REAL NOT NULL,
+    PRIMARY KEY (ticker, source)
+);
+CREATE INDEX IF NOT EXISTS idx_source_due ON source_data (next_due);
+CREATE TABLE IF NOT EXISTS valuations (
+    ticker TEXT NOT NULL,
+    model_type TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    computed_at REAL NOT NULL,
+    refreshed_at REAL NOT NULL,
+    PRIMARY KEY (ticker, model_type)
+);
+CREATE INDEX IF NOT EXISTS idx_valuations_refreshed ON valuations (refreshed_at);
+"""
+
+
+# ----------------------------------------------------------------------------
+# Input extraction: one flat dict of plain numbers per ticker
+# ----------------------------------------------------------------------------
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _line(frame: Any, *labels: str, periods: int = 5) -> List[float]:
+    """
+    First matching statement line, most recent period first.
+
+    The line is cut to `periods` columns before NaNs are dropped, so a
+    missing year never pulls an older one into the window and every line
+    covers the same fiscal years.
+    """
+    if frame is None or getattr(frame, 'empty', True):
+        return []
+    for label in labels:
+        if label in frame.index:
+            values = [_number(v) for v in frame.loc[label].values[:periods]]
+            return [v for v in values if v is not None]
+    return []
+
+
+def _earnings_date(info: Dict[str, Any]) -> Optional[float]:
+    """Upcoming (else most recent) earnings release as epoch seconds."""
+    return _number(info.get('earningsTimestampStart')) or _number(info.get('earningsTimestamp'))
+
+
+def extract_source(source: str, value: Any) -> Dict[str, Any]:
+    """The fields the headline models read from one Yahoo source."""
+    if source == 'info':
+        info = value or {}
+        return {
+            'company_name': info.get('longName') or info.get('shortName'),
+            'currency': info.get('currency'),
+            'price': _number(info.get('currentPrice') or info.get('regularMarketPrice')),
+            'shares': _number(info.get('sharesOutstanding')),
+            'market_cap': _number(info.get('marketCap')),
+            'beta': _number(info.get('beta')),
+            'total_debt': _number(info.get('totalDebt')),
+            'cash': _number(info.get('totalCash')),
+            'earnings_date': _earnings_date(info),
+        }
+    if source == 'financials':
+        return {
+            'revenue': _line(value, 'Total Revenue', 'Operating Revenue'),
+            'operating_income': _line(value, 'Operating Income', 'EBIT'),
+            'ebitda': _line(value, 'EBITDA', 'Normalized EBITDA'),
+            'net_income': _line(value, 'Net Income', 'Net Income Common Stockholders'),
+            'pretax_income': _line(value, 'Pretax Income', 'Income Before Tax'),
+            'tax_provision': _line(value, 'Tax Provision'),
+        }
+    if source == 'balance_sheet':
+        return {
+            'balance_sheet_debt': _line(value, 'Total Debt', periods=1),
+            'balance_sheet_cash': _line(value, 'Cash And Cash Equivalents',
+                                        'Cash Cash Equivalents And Short Term Investments', periods=1),
+        }
+    if source == 'cashflow':
+        return {
+            'capex': _line(value, 'Capital Expenditure'),
+            'depreciation': _line(value, 'Depreciation And Amortization', 'Depreciation Amortization Depletion'),
+            'operating_cash_flow': _line(value, 'Operating Cash Flow'),
+        }
+    raise ValueError(f"Unknown source: {source}")
+
+
+# ----------------------------------------------------------------------------
+# Headline models (pure functions of the extracted inputs)
+# ----------------------------------------------------------------------------
+
+def _first(values: Optional[List[float]], default: Optional[float] = None) -> Optional[float]:
+    return values[0] if values else default
+
+
+def _net_debt(inputs: Dict[str, Any]) -> float:
+    debt = inputs.get('total_debt')
+    cash = inputs.get('cash')
+    if debt is None:
+        debt = _first(inputs.get('balance_sheet_debt'), 0.0)
+    if cash is None:
+        cash = _first(inputs.get('balance_sheet_cash'), 0.0)
+    return debt - cash
+
+
+def _ratio(numerators: List[float], denominators: List[float], periods: int = 3) -> List[float]:
+    return [n / d for n, d in zip(numerators[:periods], denominators[:periods]) if d and d > 0]
+
+
+def derive_assumptions(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Forecast assumptions from the historicals, using the same fade as the
+    web app's get_historical_assumptions (growth fades from the 2-year CAGR
+    to terminal growth, margins ease from the 3-year average).
+    """
+    revenues = inputs.get('revenue') or []
+    if len(revenues) < 3 or revenues[2] <= 0:
+        raise ValueError('Need at least 3 years of revenue data')
+
+    cagr = (revenues[0] / revenues[2]) ** 0.5 - 1
+    margins = _ratio(inputs.get('operating_income') or [], revenues)
+    avg_margin = sum(margins) / len(margins) if margins else 0.20
+    tax_rates = _ratio(inputs.get('tax_provision') or [], inputs.get('pretax_income') or [])
+    tax_rate = min(0.35, max(0.0, sum(tax_rates) / len(tax_rates))) if tax_rates else 0.21
+    terminal_growth = min(0.025, max(0.02, cagr * 0.3))
+
+    revenue_growth = [max(0.005, min(0.30, cagr * (1 - year / 4) + terminal_growth * year / 4)) for year in range(5)]
+    operating_margin = [max(0.05, min(0.50, avg_margin + 0.005 * (4 - year) / 4)) for year in range(5)]
+
+    capex = _first(inputs.get('capex'))
+    depreciation = _first(inputs.get('depreciation'))
+    return {
+        'revenue_growth': revenue_growth,
+        'operating_margin': operating_margin,
+        'tax_rate': tax_rate,
+        'wacc': _wacc(inputs, tax_rate),
+        'terminal_growth': terminal_growth,
+        'capex_percent_revenue': abs(capex) / revenues[0] if capex else 0.06,
+        'da_percent_revenue': depreciation / revenues[0] if depreciation else 0.04,
+        'nwc_percent_revenue': 0.03,
+        'revenue_cagr': cagr,
+        'avg_operating_margin': avg_margin,
+    }
+
+
+def _wacc(inputs: Dict[str, Any], tax_rate: float) -> float:
+    """CAPM cost of equity blended with after-tax debt at market weights (10% without a beta)."""
+    beta = inputs.get('beta')
+    if beta is None:
+        return 0.10
+    cost_of_equity = RISK_FREE_RATE + beta * MARKET_RISK_PREMIUM
+    equity = inputs.get('market_cap') or 0.0
+    debt = max(inputs.get('total_debt') or _first(inputs.get('balance_sheet_debt'), 0.0), 0.0)
+    if equity + debt <= 0:
+        return max(0.06, min(0.15, cost_of_equity))
+    wacc = (equity * cost_of_equity + debt * PRE_TAX_COST_OF_DEBT * (1 - tax_rate)) / (equity + debt)
+    return max(0.06, min(0.15, wacc))
+
+
+def dcf_headline(ticker: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Five-year unlevered DCF: enterprise value, equity value and implied share price."""
+    assumptions = derive_assumptions(inputs)
+    growth = np.asarray(assumptions['revenue_growth'])
+    revenue = inputs['revenue'][0] * np.cumprod(1 + growth)
+    prior_revenue = np.concatenate(([inputs['revenue'][0]], revenue[:-1]))
+
+    nopat = revenue * np.asarray(assumptions['operating_margin']) * (1 - assumptions['tax_rate'])
+    reinvestment = (revenue * (assumptions['capex_percent_revenue'] - assumptions['da_percent_revenue'])
+                    + (revenue - prior_revenue) * assumptions['nwc_percent_revenue'])
+    fcf = nopat - reinvestment
+
+    wacc, terminal_growth = assumptions['wacc'], assumptions['terminal_growth']
+    terminal_value = fcf[-1] * (1 + terminal_growth) / (wacc - terminal_growth)
+    pv_fcfs, pv_terminal = discount_cash_flows(fcf, terminal_value, wacc)
+
+    enterprise_value = float(pv_fcfs.sum() + pv_terminal)
+    equity_value = enterprise_value - _net_debt(inputs)
+    shares, price = inputs.get('shares'), inputs.get('price')
+    implied_price = equity_value / shares if shares else None
+    return {
+        'ticker': ticker,
+        'company_name': inputs.get('company_name') or ticker,
+        'enterprise_value': enterprise_value,
+        'equity_value': equity_value,
+        'implied_price': implied_price,
+        'current_price': price,
+        'upside_downside': (implied_price / price - 1) * 100 if implied_price and price else None,
+        'pv_terminal_share': float(pv_terminal) / enterprise_value if enterprise_value else None,
+        'free_cash_flow': fcf.tolist(),
+        'assumptions': assumptions,
+    }
+
+
+def comps_headline(ticker: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """The ticker's own trading multiples, as they appear on a comps sheet."""
+    market_cap = inputs.get('market_cap')
+    if not market_cap and inputs.get('price') and inputs.get('shares'):
+        market_cap = inputs['price'] * inputs['shares']
+    if not market_cap:
+        raise ValueError('No market capitalisation available')
+
+    enterprise_value = market_cap + _net_debt(inputs)
+    revenue = _first(inputs.get('revenue'))
+    ebitda = _first(inputs.get('ebitda'))
+    net_income = _first(inputs.get('net_income'))
+    return {
+        'ticker': ticker,
+        'company_name': inputs.get('company_name') or ticker,
+        'market_cap': market_cap,
+        'enterprise_value': enterprise_value,
+        'ev_revenue': enterprise_value / revenue if revenue and revenue > 0 else None,
+        'ev_ebitda': enterprise_value / ebitda if ebitda and ebitda > 0 else None,
+        'pe_ratio': market_cap / net_income if net_income and net_income > 0 else None,
+        'ebitda_margin': ebitda / revenue if ebitda and revenue else None,
+    }
+
+
+def lbo_headline(ticker: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Take-private at a premium to today's EV, cash sweep for five years, exit at the entry multiple."""
+    comps = comps_headline(ticker, inputs)
+    revenues = inputs.get('revenue') or []
+    ebitda = _first(inputs.get('ebitda'))
+    if not ebitda or ebitda <= 0 or not revenues:
+        raise ValueError('LBO needs positive EBITDA and revenue')
+
+    assumptions = derive_assumptions(inputs) if len(revenues) >= 3 else {
+        'revenue_cagr': 0.03, 'tax_rate': 0.21, 'capex_percent_revenue': 0.06, 'da_percent_revenue': 0.04}
+    growth = max(0.0, min(0.15, assumptions['revenue_cagr']))
+    margin = ebitda / revenues[0]
+
+    entry_ev = comps['enterprise_value'] * (1 + LBO_PREMIUM)
+    entry_multiple = entry_ev / ebitda
+    entry_debt = min(LBO_LEVERAGE * ebitda, LBO_MAX_DEBT_SHARE * entry_ev)
+    sponsor_equity = entry_ev - entry_debt
+
+    debt = entry_debt
+
+    revenue, cash = revenues[0], 0.0
+    for _ in range(LBO_HOLD_YEARS):
+        revenue *= 1 + growth
+        year_ebitda = revenue * margin
+        interest = debt * LBO_INTEREST_RATE
+        depreciation = revenue * assumptions['da_percent_revenue']
+        taxes = max(0.0, year_ebitda - depreciation - interest) * assumptions['tax_rate']
+        free_cash = year_ebitda - interest - taxes - revenue * assumptions['capex_percent_revenue']
+        paydown = min(debt, max(free_cash, 0.0))
+        debt -= paydown
+        cash += free_cash - paydown
+
+    exit_equity = entry_multiple * revenue * margin - debt + cash
+    flows = [-sponsor_equity] + [0.0] * (LBO_HOLD_YEARS - 1) + [exit_equity]
+    sponsor_irr = float(irr(flows))
+    return {
+        'ticker': ticker,
+        'company_name': inputs.get('company_name') or ticker,
+        'entry_enterprise_value': entry_ev,
+        'entry_multiple': entry_multiple,
+        'entry_debt': entry_debt,
+        'sponsor_equity': sponsor_equity,
+        'exit_equity': exit_equity,
+        'irr': sponsor_irr if math.isfinite(sponsor_irr) else None,
+        'moic': exit_equity / sponsor_equity if sponsor_equity > 0 else None,
+        'hold_years': LBO_HOLD_YEARS,
+    }
+
+
+_DCF_FIELDS = ('company_name', 'revenue', 'operating_income', 'pretax_income', 'tax_provision', 'capex',
+               'depreciation', 'beta', 'market_cap', 'total_debt', 'cash', 'balance_sheet_debt',
+               'balance_sheet_cash', 'shares', 'price')
+_COMPS_FIELDS = ('company_name', 'market_cap', 'price', 'shares', 'total_debt', 'cash', 'balance_sheet_debt',
+                 'balance_sheet_cash', 'revenue', 'ebitda', 'net_income')
+
+# model type -> builder(ticker, inputs) and the input fields its hash covers
+HEADLINE_MODELS = {
+    'dcf': {'build': dcf_headline, 'fields': _DCF_FIELDS},
+    'comps': {'build': comps_headline, 'fields': _COMPS_FIELDS},
+    'lbo': {'build': lbo_headline, 'fields': tuple(sorted(set(_DCF_FIELDS) | set(_COMPS_FIELDS)))},
+}
+
+
+def next_refresh(source: str, fetched_at: float, earnings_date: Optional[float] = None,
+                 ttls: Optional[Dict[str, float]] = None, changed: bool = True) -> float:
+    """
+    When a source is due again: its TTL, pulled in for statements so they are
+    re-fetched shortly after an earnings release (and re-checked every
+    EARNINGS_RECHECK within the watch window until the new figures appear).
+    """
+    ttls = ttls or SOURCE_TTLS
+    due = fetched_at + ttls[source]
+    if source not in STATEMENT_SOURCES or not earnings_date:
+        return due
+    release = earnings_date + EARNINGS_REFRESH_LAG
+    if fetched_at < release < due:
+        return release
+    if not changed and release <= fetched_at < release + EARNINGS_WATCH_WINDOW:
+        return min(due, fetched_at + EARNINGS_RECHECK)
+    return due
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class PrecomputeService:
+    """Watchlist refresher and the indexed table of precomputed outputs."""
+
+    def __init__(self, db_path: str = PRECOMPUTE_DB_PATH, watchlist: Optional[Iterable[str]] = None,
+                 models: Optional[Dict[str, Dict[str, Any]]] = None,
+                 fetcher: Optional[Callable[[str, List[str]], Dict[str, Any]]] = None,
+                 ttls: Optional[Dict[str, float]] = None, interval: float = REFRESH_INTERVAL,
+                 max_workers: int = DEFAULT_MAX_WORKERS, promote_after: int = PROMOTE_AFTER,
+                 clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.models = models if models is not None else HEADLINE_MODELS
+        self.fetcher = fetcher or self._fetch_yahoo
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.interval = interval
+        self.max_workers = max_workers
+        self.promote_after = promote_after
+        self.clock = clock
+        self.stats = {'hits': 0, 'misses': 0, 'fetched': 0, 'recomputed': 0, 'unchanged': 0, 'failed': 0}
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.add(DEFAULT_WATCHLIST if watchlist is None else watchlist)
+
+    # -- watchlist -------------------------------------------------------
+
+    def add(self, tickers: Iterable[str], origin: str = 'config'):
+        """Put tickers on the watchlist (configured entries are never dropped for inactivity)."""
+        now = self.clock()
+        with self._lock, self._conn:
+            for ticker in tickers:
+                self._conn.execute(
+                    'INSERT INTO watchlist (ticker, origin, added_at) VALUES (?, ?, ?) '
+                    "ON CONFLICT(ticker) DO UPDATE SET origin = CASE WHEN excluded.origin = 'config' "
+                    'THEN excluded.origin ELSE watchlist.origin END',
+                    (ticker.strip().upper(), origin, now))
+
+    def remove(self, tickers: Iterable[str]):
+        """Take tickers off the watchlist; their stored results age out on their own."""
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM watchlist WHERE ticker = ?',
+                                   [(ticker.strip().upper(),) for ticker in tickers])
+
+    def watchlist(self) -> Dict[str, str]:
+        """Watched ticker -> origin ('config' or 'promoted')."""
+        with self._lock:
+            return dict(self._conn.execute('SELECT ticker, origin FROM watchlist ORDER BY ticker').fetchall())
+
+    def _record_demand(self, ticker: str, now: float):
+        """Count a request; tickers asked for promote_after times join the watchlist."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO demand (ticker, requests, last_requested) VALUES (?, 1, ?) '
+                'ON CONFLICT(ticker) DO UPDATE SET requests = requests + 1, last_requested = excluded.last_requested',
+                (ticker, now))
+            requests, = self._conn.execute('SELECT requests FROM demand WHERE ticker = ?', (ticker,)).fetchone()
+            if self.promote_after and requests >= self.promote_after:
+                self._conn.execute("INSERT OR IGNORE INTO watchlist (ticker, origin, added_at) VALUES (?, 'promoted', ?)",
+                                   (ticker, now))
+
+    def _demote_idle(self, now: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM watchlist WHERE origin = 'promoted' AND ticker IN "
+                '(SELECT ticker FROM demand WHERE last_requested < ?)', (now - PROMOTED_IDLE_SECONDS,))
+
+    # -- reads -----------------------------------------------------------
+
+    def lookup(self, ticker: str, model_type: str, max_age: Optional[float] = DEFAULT_MAX_AGE,
+               record: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Precomputed outputs for (ticker, model type) with their timestamps, or
+        None when the ticker is cold or its inputs were last confirmed more
+        than max_age seconds ago (the caller then takes its live path).
+        """
+        ticker, now = ticker.strip().upper(), self.clock()
+        if record:
+            self._record_demand(ticker, now)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT outputs, input_hash, computed_at, refreshed_at FROM valuations '
+                'WHERE ticker = ? AND model_type = ?', (ticker, model_type)).fetchone()
+        if row is None or (max_age is not None and now - row[3] > max_age):
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        outputs, digest, computed_at, refreshed_at = row
+        return {
+            'ticker': ticker,
+            'model_type': model_type,
+            'outputs': json.loads(outputs),
+            'input_hash': digest,
+            'computed_at': _iso(computed_at),
+            'refreshed_at': _iso(refreshed_at),
+            'age_seconds': now - refreshed_at,
+            'precomputed': True,
+        }
+
+    def lookup_all(self, ticker: str, max_age: Optional[float] = DEFAULT_MAX_AGE,
+                   record: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Every model type the service precomputes that is available for a ticker."""
+        if record:
+            self._record_demand(ticker.strip().upper(), self.clock())
+        hits = {model_type: self.lookup(ticker, model_type, max_age, record=False) for model_type in self.models}
+        return {model_type: hit for model_type, hit in hits.items() if hit}
+
+    # -- refresh ---------------------------------------------------------
+
+    def _fetch_yahoo(self, ticker: str, sources: List[str]) -> Dict[str, Any]:
+        if not YFINANCE_GATEWAY_AVAILABLE:
+            raise ImportError("yfinance_gateway is not available")
+        # refresh=True: a due source must not be served from the gateway's per-day memo
+        return yfinance_gateway.get_gateway().statements(ticker, sources, refresh=True)
+
+    def due(self, now: Optional[float] = None) -> Dict[str, List[str]]:
+        """Watched ticker -> sources whose TTL has run out (never-fetched sources included)."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            watched = [row[0] for row in self._conn.execute('SELECT ticker FROM watchlist')]
+            fetched = {}
+            for ticker, source, next_due in self._conn.execute('SELECT ticker, source, next_due FROM source_data'):
+                fetched.setdefault(ticker, {})[source] = next_due
+        due = {}
+        for ticker in watched:
+            sources = [source for source in self.ttls
+                       if fetched.get(ticker, {}).get(source, 0.0) <= now]
+            if sources:
+                due[ticker] = sources
+        return due
+
+    def _inputs(self, ticker: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute('SELECT payload FROM source_data WHERE ticker = ? AND payload IS NOT NULL',
+                                      (ticker,)).fetchall()
+        inputs = {}
+        for payload, in rows:
+            inputs.update(json.loads(payload))
+        return inputs
+
+    def _store_sources(self, ticker: str, fetched: Dict[str, Any], sources: List[str], now: float) -> List[str]:
+        """Save extracted payloads and schedule each source; returns the sources whose data changed."""
+        with self._lock:
+            previous = {source: (digest, changed_at, fetched_at) for source, digest, changed_at, fetched_at in
+                        self._conn.execute('SELECT source, data_hash, changed_at, fetched_at FROM source_data '
+                                           'WHERE ticker = ?', (ticker,))}
+            earnings_row = self._conn.execute(
+                "SELECT payload FROM source_data WHERE ticker = ? AND source = 'info'", (ticker,)).fetchone()
+        earnings_date = json.loads(earnings_row[0]).get('earnings_date') if earnings_row and earnings_row[0] else None
+
+        payloads, changed = {}, []
+        for source in sources:
+            value = fetched.get(source)
+            if value is None:
+                continue
+            payloads[source] = extract_source(source, value)
+            if source == 'info':
+                earnings_date = payloads[source].get('earnings_date')
+
+        with self._lock, self._conn:
+            for source in sources:
+                if source not in payloads:
+                    # Failed fetch: keep the old payload and try again soon
+                    self._conn.execute(
+                        'INSERT INTO source_data (ticker, source, payload, data_hash, fetched_at, changed_at, next_due) '
+                        'VALUES (?, ?, NULL, NULL, 0, 0, ?) ON CONFLICT(ticker, source) DO UPDATE SET next_due = ?',
+                        (ticker, source, now + RETRY_SECONDS, now + RETRY_SECONDS))
+                    continue
+                digest = input_hash(payloads[source])
+                old_digest, changed_at, _ = previous.get(source, (None, now, 0.0))
+                is_changed = digest != old_digest
+                if is_changed:
+                    changed.append(source)
+                    changed_at = now
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO source_data '
+                    '(ticker, source, payload, data_hash, fetched_at, changed_at, next_due) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (ticker, source, json.dumps(payloads[source], default=to_builtin), digest, now, changed_at,
+                     next_refresh(source, now, earnings_date, self.ttls, changed=is_changed)))
+
+            # A new earnings date can pull statements that were fetched earlier forward
+            if 'info' in payloads and earnings_date:
+                for source in STATEMENT_SOURCES:
+                    if source in payloads or source not in previous or not previous[source][2]:
+                        continue
+                    self._conn.execute(
+                        'UPDATE source_data SET next_due = MIN(next_due, ?) WHERE ticker = ? AND source = ?',
+                        (next_refresh(source, previous[source][2], earnings_date, self.ttls), ticker, source))
+        return changed
+
+    def refresh(self, ticker: str, sources: Optional[List[str]] = None, force: bool = False) -> Dict[str, List[str]]:
+        """
+        Fetch a ticker's due sources (all of them by default) and rebuild the
+        models whose inputs changed. Also the live path for a cold ticker.
+        """
+        ticker, now = ticker.strip().upper(), self.clock()
+        sources = list(sources or self.ttls)
+        try:
+            fetched = self.fetcher(ticker, sources) or {}
+        except Exception as e:
+            print(f"⚠️ Precompute fetch failed for {ticker}: {e}")
+            fetched = {}
+        self.stats['fetched'] += sum(1 for source in sources if fetched.get(source) is not None)
+        changed = self._store_sources(ticker, fetched, sources, now)
+        summary = {'changed_sources': changed, 'recomputed': [], 'unchanged': [], 'failed': []}
+        if not fetched and not force:
+            return summary
+        self._recompute(ticker, self._inputs(ticker), now, force, summary)
+        return summary
+
+    def _recompute(self, ticker: str, inputs: Dict[str, Any], now: float, force: bool, summary: Dict[str, List[str]]):
+        with self._lock:
+            stored = dict(self._conn.execute('SELECT model_type, input_hash FROM valuations WHERE ticker = ?',
+                                             (ticker,)).fetchall())
+        for model_type, model in self.models.items():
+            digest = input_hash({field: inputs.get(field) for field in model['fields']})
+            if not force and stored.get(model_type) == digest:
+                with self._lock, self._conn:
+                    self._conn.execute('UPDATE valuations SET refreshed_at = ? WHERE ticker = ? AND model_type = ?',
+                                       (now, ticker, model_type))
+                summary['unchanged'].append(model_type)
+                continue
+            try:
+                outputs = model['build'](ticker, inputs)
+                if not isinstance(outputs, dict) or outputs.get('error'):
+                    raise ValueError((outputs or {}).get('error', 'builder returned no outputs'))
+            except Exception as e:
+                print(f"⚠️ Precompute {model_type} failed for {ticker}: {e}")
+                summary['failed'].append(model_type)
+                continue
+            with self._lock, self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO valuations (ticker, model_type, input_hash, outputs, computed_at, refreshed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (ticker, model_type, digest, json.dumps(outputs, default=to_builtin), now, now))
+            summary['recomputed'].append(model_type)
+
+        for key in ('recomputed', 'unchanged', 'failed'):
+            self.stats[key] += len(summary[key])
+
+    def run_due(self) -> Dict[str, Dict[str, List[str]]]:
+        """One scheduler pass: refresh every watched ticker with due sources."""
+        now = self.clock()
+        self._demote_idle(now)
+        due = self.due(now)
+        if not due:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due))) as pool:
+            results = dict(zip(due, pool.map(lambda item: self.refresh(*item), due.items())))
+        recomputed = sum(len(result['recomputed']) for result in results.values())
+        print(f"🔄 Precompute refreshed {len(results)} tickers, rebuilt {recomputed} models")
+        return results
+
+    # -- background thread -----------------------------------------------
+
+    def start(self):
+        """Run the scheduler every `interval` seconds on a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='valuation-precompute', daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                print(f"⚠️ Precompute pass failed: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+
+_service: Optional[PrecomputeService] = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> PrecomputeService:
+    """Process-wide service on PRECOMPUTE_DB_PATH with the headline models."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PrecomputeService()
+        return _service
+
+
+def is_serving_process(debug: bool) -> bool:
+    """
+    False in the Werkzeug reloader's watcher process.
+
+    With debug=True, app.run() executes the module twice: a parent that only
+    watches files and a child (WERKZEUG_RUN_MAIN=true) that serves requests.
+    The refresher belongs in the child, or two of them share one table.
+    """
+    return not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
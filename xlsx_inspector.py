@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+XLSX Inspector - Streaming read-only workbook inspection
+Reads the raw sheet XML inside the xlsx zip without building the openpyxl object model
+
+Features:
+- Formula counts per sheet (including shared and array formulas)
+- Error cells (#REF!, #DIV/0!, #VALUE!, ...) with coordinates
+- Defined names, sheet dimensions and non-empty cell counts
+- Style usage (cell format index -> count, with number format codes)
+- Streaming cell iterator with shared strings resolved, for examine_* tools
+- head_rows() previews the top of a sheet without reading the rest of it
+
+Memory stays flat regardless of workbook size: each <row> is cleared and
+detached from <sheetData> as soon as its cells have been processed.
+"""
+
+import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_C = f'{{{MAIN_NS}}}c'
+_F = f'{{{MAIN_NS}}}f'
+_V = f'{{{MAIN_NS}}}v'
+_IS = f'{{{MAIN_NS}}}is'
+_T = f'{{{MAIN_NS}}}t'
+_ROW = f'{{{MAIN_NS}}}row'
+_SHEET_DATA = f'{{{MAIN_NS}}}sheetData'
+_SI = f'{{{MAIN_NS}}}si'
+_DIMENSION = f'{{{MAIN_NS}}}dimension'
+
+EXCEL_ERRORS = ('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A')
+
+# Built-in number formats referenced by numFmtId without a <numFmt> entry
+BUILTIN_NUMBER_FORMATS = {
+    0: 'General', 1: '0', 2: '0.00', 3: '#,##0', 4: '#,##0.00', 9: '0%', 10: '0.00%',
+    11: '0.00E+00', 14: 'mm-dd-yy', 37: '#,##0 ;(#,##0)', 38: '#,##0 ;[Red](#,##0)',
+    39: '#,##0.00;(#,##0.00)', 40: '#,##0.00;[Red](#,##0.00)', 49: '@'
+}
+
+
+def _sheet_paths(archive: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """(sheet name, zip path) in workbook order."""
+    rels_root = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for rel in rels_root.iter(f'{{{PKG_REL_NS}}}Relationship'):
+        target = rel.get('Target')
+        path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+        targets[rel.get('Id')] = path
+
+    workbook_root = ET.fromstring(archive.read('xl/workbook.xml'))
+    sheets = workbook_root.find(f'{{{MAIN_NS}}}sheets')
+    return [(sheet.get('name'), targets[sheet.get(f'{{{REL_NS}}}id')])
+            for sheet in sheets.iter(f'{{{MAIN_NS}}}sheet')]
+
+
+def _defined_names(archive: zipfile.ZipFile) -> Dict[str, str]:
+    workbook_root = ET.fromstring(archive.read('xl/workbook.xml'))
+    names = {}
+    for name in workbook_root.iter(f'{{{MAIN_NS}}}definedName'):
+        key = name.get('name')
+        if name.get('localSheetId') is not None:
+            key = f"{key} (sheet {name.get('localSheetId')})"
+        names[key] = name.text or ''
+    return names
+
+
+def _cell_formats(archive: zipfile.ZipFile) -> List[Dict[str, Any]]:
+    """cellXfs entries (index = the 's' attribute of a cell)."""
+    if 'xl/styles.xml' not in archive.namelist():
+        return []
+    root = ET.fromstring(archive.read('xl/styles.xml'))
+    custom = {int(fmt.get('numFmtId')): fmt.get('formatCode')
+              for fmt in root.iter(f'{{{MAIN_NS}}}numFmt')}
+    cell_xfs = root.find(f'{{{MAIN_NS}}}cellXfs')
+    formats = []
+    for xf in (cell_xfs if cell_xfs is not None else []):
+        num_fmt_id = int(xf.get('numFmtId', 0))
+        formats.append({
+            'number_format': custom.get(num_fmt_id, BUILTIN_NUMBER_FORMATS.get(num_fmt_id, str(num_fmt_id))),
+            'font_id': int(xf.get('fontId', 0)),
+            'fill_id': int(xf.get('fillId', 0)),
+            'border_id': int(xf.get('borderId', 0))
+        })
+    return formats
+
+
+def split_coordinate(ref: str) -> Tuple[int, int]:
+    """'AB12' -> (column index 28, row 12), both 1-based."""
+    letters = ref.rstrip('0123456789')
+    column = 0
+    for letter in letters.upper():
+        column = column * 26 + ord(letter) - ord('A') + 1
+    return column, int(ref[len(letters):])
+
+
+def dimension_shape(ref: Optional[str]) -> Tuple[int, int]:
+    """(rows, columns) spanned by a <dimension> ref such as 'A1:F40'."""
+    if not ref:
+        return 0, 0
+    first, _, last = ref.partition(':')
+    first_column, first_row = split_coordinate(first)
+    last_column, last_row = split_coordinate(last or first)
+    return last_row - first_row + 1, last_column - first_column + 1
+
+
+def _sheet_elements(stream) -> Iterator[ET.Element]:
+    """
+    Yield the completed elements of a sheet's XML, streaming.
+
+    Each <row> is cleared and removed from <sheetData> once its cells have
+    been yielded, so the parsed tree never holds more than one row.
+    """
+    sheet_data = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == _SHEET_DATA:
+                sheet_data = elem
+            continue
+        if elem.tag == _ROW:
+            elem.clear()
+            if sheet_data is not None:
+                sheet_data.remove(elem)
+            continue
+        yield elem
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as stream:
+        for _, elem in ET.iterparse(stream):
+            if elem.tag == _SI:
+                strings.append(''.join(t.text or '' for t in elem.iter(_T)))
+                elem.clear()
+    return strings
+
+
+def _inspect_sheet(archive: zipfile.ZipFile, path: str, max_errors: int) -> Dict[str, Any]:
+    stats = {
+        'dimension': None,
+        'cells': 0,
+        'non_empty_cells': 0,
+        'formulas': 0,
+        'error_cells': [],
+        'error_count': 0,
+        'style_usage': Counter()
+    }
+    with archive.open(path) as stream:
+        for elem in _sheet_elements(stream):
+            tag = elem.tag
+            if tag == _C:
+                stats['cells'] += 1
+                stats['style_usage'][int(elem.get('s', 0))] += 1
+                value = elem.find(_V)
+                if elem.find(_F) is not None:
+                    stats['formulas'] += 1
+                if (value is not None and value.text not in (None, '')) or elem.find(_IS) is not None:
+                    stats['non_empty_cells'] += 1
+                if elem.get('t') == 'e' and value is not None:
+                    stats['error_count'] += 1
+                    if len(stats['error_cells']) < max_errors:
+                        stats['error_cells'].append((elem.get('r'), value.text))
+                elem.clear()
+            elif tag == _DIMENSION:
+                stats['dimension'] = elem.get('ref')
+    stats['style_usage'] = dict(stats['style_usage'])
+    return stats
+
+
+def inspect_workbook(file_path: str, max_errors_per_sheet: int = 100) -> Dict[str, Any]:
+    """
+    Stream every sheet of an xlsx file and summarize it.
+
+    Returns a dict with sheets (name -> stats), defined_names, cell_formats,
+    and workbook-wide totals for formulas, errors and style usage.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_paths = _sheet_paths(archive)
+        sheets = {name: _inspect_sheet(archive, path, max_errors_per_sheet)
+                  for name, path in sheet_paths}
+        defined_names = _defined_names(archive)
+        cell_formats = _cell_formats(archive)
+
+    style_usage = Counter()
+    for stats in sheets.values():
+        style_usage.update(stats['style_usage'])
+
+    error_types = Counter(error for stats in sheets.values() for _, error in stats['error_cells'])
+    return {
+        'file_path': file_path,
+        'file_size': os.path.getsize(file_path),
+        'sheet_names': [name for name, _ in sheet_paths],
+        'sheets': sheets,
+        'defined_names': defined_names,
+        'cell_formats': cell_formats,
+        'total_formulas': sum(stats['formulas'] for stats in sheets.values()),
+        'total_errors': sum(stats['error_count'] for stats in sheets.values()),
+        'error_types': dict(error_types),
+        'style_usage': dict(style_usage),
+        'styles_used': len(style_usage)
+    }
+
+
+def inspect_many(file_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Inspect several workbooks in parallel processes (results in input order)."""
+    if len(file_paths) < 2 or max_workers == 1:
+        return [inspect_workbook(path) for path in file_paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(inspect_workbook, file_paths))
+
+
+def iter_cells(file_path: str, sheet_name: Optional[str] = None) -> Iterator[Tuple[str, str, Any, Optional[str]]]:
+    """
+    Yield (sheet, coordinate, value, formula) for every non-empty cell, streaming.
+
+    Values are the cached values stored in the file (shared strings resolved,
+    numbers as float). sheet_name limits the walk to one sheet.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        strings = _shared_strings(archive)
+        for name, path in _sheet_paths(archive):
+            if sheet_name is not None and name != sheet_name:
+                continue
+            with archive.open(path) as stream:
+                for elem in _sheet_elements(stream):
+                    if elem.tag != _C:
+                        continue
+
+                    formula_elem = elem.find(_F)
+                    formula = f"={formula_elem.text}" if formula_elem is not None and formula_elem.text else None
+                    value_elem = elem.find(_V)
+                    cell_type = elem.get('t', 'n')
+                    value = None
+                    if cell_type == 'inlineStr':
+                        inline = elem.find(_IS)
+                        value = ''.join(t.text or '' for t in inline.iter(_T)) if inline is not None else None
+                    elif value_elem is not None and value_elem.text is not None:
+                        text = value_elem.text
+                        if cell_type == 's':
+                            value = strings[int(text)]
+                        elif cell_type == 'b':
+                            value = text == '1'
+                        elif cell_type in ('str', 'e'):
+                            value = text
+                        else:
+                            value = float(text)
+
+                    if value is not None or formula is not None:
+                        yield name, elem.get('r'), value, formula
+                    elem.clear()
+
+
+def head_rows(file_path: str, sheet_name: str, n: int = 20) -> List[List[Any]]:
+    """
+    First n rows of a sheet as lists (column A first), streaming.
+
+    Cells hold the cached value, or the formula where no value is cached.
+    Reading stops at the first cell below row n.
+    """
+    rows: Dict[int, Dict[int, Any]] = {}
+    for _, coordinate, value, formula in iter_cells(file_path, sheet_name):
+        column, row = split_coordinate(coordinate)
+        if row > n:
+            break
+        rows.setdefault(row, {})[column] = value if value is not None else formula
+
+    width = max((max(columns) for columns in rows.values()), default=0)
+    return [[rows.get(row, {}).get(column) for column in range(1, width + 1)]
+            for row in range(1, max(rows, default=0) + 1)]
+
+
+def main():
+    """Print an inspection summary for the workbooks given on the command line."""
+    import sys
+
+    for report in inspect_many(sys.argv[1:]):
+        print(f"\n📊 {report['file_path']} ({report['file_size'] / 1024:.1f} KB)")
+        for name, stats in report['sheets'].items():
+            print(f"   {name}: {stats['formulas']} formulas, {stats['non_empty_cells']} values, "
+                  f"{stats['error_count']} errors ({stats['dimension']})")
+        if report['defined_names']:
+            print(f"   Defined names: {', '.join(report['defined_names'])}")
+        if report['total_errors']:
+            print(f"   ⚠️ Errors: {report['error_types']}")
+        print(f"   Styles used: {report['styles_used']} of {len(report['cell_formats'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+YFinance Gateway - Shared, memoized access to Yahoo Finance
+
+Every module that needs Yahoo data (DCF builders, the Flask app, the
+FinModAI ingestion engine, the data integrator) goes through one gateway:
+
+Features:
+- One HTTP session and one yf.Ticker object per symbol, shared by all callers
+- Statements memoized per (ticker, statement, day): each statement is fetched
+  at most once per day, however many modules ask for it
+- info (price, market cap) memoized for minutes only (YFINANCE_INFO_TTL_SECONDS)
+- Concurrent misses on the same (ticker, statement) share one Yahoo request
+- Multi-ticker / multi-statement fetches fanned out over a thread pool
+- Normalized statements: DataFrame (never None), stripped string line items,
+  numeric values, period columns most recent first
+
+Usage:
+    from yfinance_gateway import get_gateway
+
+    stock = get_gateway().ticker('AAPL')      # drop-in for yf.Ticker('AAPL')
+    income = stock.financials
+    bundle = get_gateway().fetch_many(['AAPL', 'MSFT'], ['info', 'financials'])
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    yf = None
+    YFINANCE_AVAILABLE = False
+
+# Statements with period columns (normalized and sorted most recent first)
+STATEMENTS = ['financials', 'balance_sheet', 'cashflow',
+              'quarterly_financials', 'quarterly_balance_sheet', 'quarterly_cashflow']
+# Other tabular attributes (normalized to a DataFrame, otherwise left as is)
+TABLES = ['recommendations', 'institutional_holders']
+CORE_STATEMENTS = ['info', 'financials', 'balance_sheet', 'cashflow']
+
+DEFAULT_MAX_WORKERS = 8
+# info carries currentPrice / marketCap, so it is kept for minutes, not for the day
+INFO_TTL_SECONDS = float(os.getenv('YFINANCE_INFO_TTL_SECONDS', 300))
+
+
+def _default_session():
+    """
+    Shared HTTP session for yfinance. Recent yfinance releases require a
+    curl_cffi session; without curl_cffi, yfinance's own shared session is used.
+    """
+    try:
+        from curl_cffi import requests as curl_requests
+        return curl_requests.Session(impersonate='chrome')
+    except ImportError:
+        return None
+
+
+def normalize_statement(frame: Any) -> pd.DataFrame:
+    """Statement as a numeric DataFrame with string line items and newest period first."""
+    if frame is None or not isinstance(frame, pd.DataFrame) or frame.empty:
+        return pd.DataFrame()
+
+    normalized = frame.apply(pd.to_numeric, errors='coerce')
+    normalized.index = [str(label).strip() for label in normalized.index]
+    columns = pd.to_datetime(normalized.columns, errors='coerce')
+    if not columns.isna().any():
+        normalized.columns = columns
+        normalized = normalized[sorted(normalized.columns, reverse=True)]
+    return normalized
+
+
+def _normalize(name: str, value: Any) -> Any:
+    if name == 'info':
+        return dict(value or {})
+    if name in STATEMENTS:
+        return normalize_statement(value)
+    if name in TABLES:
+        return value if isinstance(value, pd.DataFrame) else pd.DataFrame()
+    return value
+
+
+def _copy(value: Any) -> Any:
+    """Callers get their own copy so cached results are never mutated."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class CachedTicker:
+    """yf.Ticker stand-in whose statement attributes are served by the gateway."""
+
+    def __init__(self, gateway: 'YFinanceGateway', symbol: str):
+        self._gateway = gateway
+        self.ticker = symbol
+
+    def __getattr__(self, name: str):
+        if name == 'info' or name in STATEMENTS or name in TABLES:
+            return self._gateway.get(self.ticker, name)
+        # Prices and anything else go straight to the shared yf.Ticker
+        return getattr(self._gateway.yf_ticker(self.ticker), name)
+
+
+class YFinanceGateway:
+    """Single entry point for Yahoo Finance data with per-day (info: per-minutes) memoization."""
+
+    def __init__(self, session: Any = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 ticker_factory: Optional[Callable[..., Any]] = None,
+                 info_ttl_seconds: float = INFO_TTL_SECONDS):
+        if ticker_factory is None and not YFINANCE_AVAILABLE:
+            raise ImportError("yfinance is not installed")
+        self.session = session if session is not None else (_default_session() if ticker_factory is None else None)
+        self.max_workers = max_workers
+        self.info_ttl_seconds = info_ttl_seconds
+        self._ticker_factory = ticker_factory or yf.Ticker
+        self._tickers: Dict[str, Any] = {}
+        # (symbol, statement) -> (fetched_at, value)
+        self._cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._fetch_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'errors': 0}
+
+    def yf_ticker(self, symbol: str):
+        """The shared yf.Ticker object for a symbol."""
+        symbol = symbol.upper()
+        with self._lock:
+            if symbol not in self._tickers:
+                if self.session is not None:
+                    self._tickers[symbol] = self._ticker_factory(symbol, session=self.session)
+                else:
+                    self._tickers[symbol] = self._ticker_factory(symbol)
+            return self._tickers[symbol]
+
+    def ticker(self, symbol: str) -> CachedTicker:
+        """Drop-in replacement for yf.Ticker(symbol)."""
+        return CachedTicker(self, symbol.upper())
+
+    def get(self, symbol: str, statement: str, refresh: bool = False) -> Any:
+        """
+        One statement ('info', 'financials', ...): statements are fetched at most
+        once per day, info at most once per info_ttl_seconds. Concurrent misses
+        wait for a single fetch. refresh=True pulls it again and replaces the
+        memoized copy.
+        """
+        symbol = symbol.upper()
+        key = (symbol, statement)
+        with self._lock:
+            if not refresh and self._is_fresh(key):
+                self.stats['hits'] += 1
+                return _copy(self._cache[key][1])
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+
+        with fetch_lock:
+            # Another thread may have fetched it while we waited
+            with self._lock:
+                if not refresh and self._is_fresh(key):
+                    self.stats['hits'] += 1
+                    return _copy(self._cache[key][1])
+
+            try:
+                value = _normalize(statement, getattr(self.yf_ticker(symbol), statement))
+            except Exception:
+                with self._lock:
+                    self.stats['errors'] += 1
+                raise
+
+            with self._lock:
+                self.stats['misses'] += 1
+                self._evict_stale()
+                self._cache[key] = (time.time(), value)
+        return _copy(value)
+
+    def _is_fresh(self, key: Tuple[str, str], now: Optional[float] = None) -> bool:
+        if key not in self._cache:
+            return False
+        fetched_at = self._cache[key][0]
+        now = time.time() if now is None else now
+        if key[1] == 'info':
+            return now - fetched_at < self.info_ttl_seconds
+        return date.fromtimestamp(fetched_at) == date.fromtimestamp(now)
+
+    def _evict_stale(self):
+        now = time.time()
+        for key in [key for key in self._cache if not self._is_fresh(key, now)]:
+            del self._cache[key]
+
+    def statements(self, symbol: str, statements: Iterable[str] = CORE_STATEMENTS,
+                   refresh: bool = False) -> Dict[str, Any]:
+        """Several statements for one ticker, fetched concurrently."""
+        return self.fetch_many([symbol], statements, refresh=refresh)[symbol.upper()]
+
+    def fetch_many(self, symbols: Iterable[str], statements: Iterable[str] = CORE_STATEMENTS,
+                   refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Statements for many tickers, fanned out over a thread pool.
+        Failed fetches are returned as None rather than raised.
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        statements = list(statements)
+        jobs = [(symbol, statement) for symbol in symbols for statement in statements]
+
+        def fetch(job):
+            try:
+                return self.get(*job, refresh=refresh)
+            except Exception as e:
+                print(f"⚠️ Yahoo Finance {job[1]} failed for {job[0]}: {e}")
+                return None
+
+        results: Dict[str, Dict[str, Any]] = {symbol: {} for symbol in symbols}
+        if len(jobs) <= 1 or self.max_workers == 1:
+            values = [fetch(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+                values = list(executor.map(fetch, jobs))
+        for (symbol, statement), value in zip(jobs, values):
+            results[symbol][statement] = value
+        return results
+
+    def clear(self, symbol: Optional[str] = None):
+        """Drop memoized results (for one ticker, or all)."""
+        with self._lock:
+            if symbol is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] == symbol.upper()]:
+                    del self._cache[key]
+
+
+_gateway: Optional[YFinanceGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> YFinanceGateway:
+    """Process-wide gateway shared by every caller."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = YFinanceGateway()
+        return _gateway
+
+
+def ticker(symbol: str) -> CachedTicker:
+    """Shortcut for get_gateway().ticker(symbol)."""
+    return get_gateway().ticker(symbol)
+
+
+def fetch_many(symbols: List[str], statements: Iterable[str] = CORE_STATEMENTS) -> Dict[str, Dict[str, Any]]:
+    """Shortcut for get_gateway().fetch_many(...)."""
+    return get_gateway().fetch_many(symbols, statements)